@@ -0,0 +1,320 @@
+"""
+Pozisyon analizi önbelleği
+
+Aynı pozisyon tekrar tekrar analiz edilir: art arda çevirmeler, başarısız
+bir çevirmeden sonra yeniden tıklama, farklı oyunlarda aynı açılış
+pozisyonları. Bu modül analiz sonuçlarını Zobrist anahtarıyla tutan,
+boyutu sınırlı bir LRU önbellek sağlar. Anahtar, polyglot Zobrist
+değerine rok hakları ve geçerken alma karesi de eklenerek oluşturulur.
+
+FEN'den gelen isteklerde tahtayı kurmak ve Zobrist değerini hesaplamak,
+taş analizinin kendisinden pahalıdır. Bu yüzden FEN'in pozisyonu
+belirleyen ilk dört alanı da ayrı bir dizinde anahtara eşlenir; daha önce
+görülen bir FEN ne ayrıştırılır ne de yeniden analiz edilir.
+
+Kıyaslama için:
+
+    python analysis_cache.py --games 200
+"""
+import argparse
+import random
+import threading
+import time
+
+import chess
+import chess.polyglot
+
+from piece_analysis import PIECE_NAMES, movable_piece_types, piece_label
+from position_cache import LRUCache
+
+# Önceden analiz edilecek yaygın açılışlar (UCI hamleleri)
+OPENING_LINES = {
+    "İtalyan": "e2e4 e7e5 g1f3 b8c6 f1c4 f8c5 c2c3 g8f6 d2d3 d7d6",
+    "İspanyol": "e2e4 e7e5 g1f3 b8c6 f1b5 a7a6 b5a4 g8f6 e1g1 f8e7",
+    "Sicilya Najdorf": "e2e4 c7c5 g1f3 d7d6 d2d4 c5d4 f3d4 g8f6 b1c3 a7a6",
+    "Sicilya Alapin": "e2e4 c7c5 c2c3 d7d5 e4d5 d8d5 d2d4 g8f6",
+    "Fransız": "e2e4 e7e6 d2d4 d7d5 b1c3 g8f6 c1g5 f8e7",
+    "Caro-Kann": "e2e4 c7c6 d2d4 d7d5 b1c3 d5e4 c3e4 c8f5",
+    "İskandinav": "e2e4 d7d5 e4d5 d8d5 b1c3 d5a5 d2d4 g8f6",
+    "Vezir Gambiti": "d2d4 d7d5 c2c4 e7e6 b1c3 g8f6 c1g5 f8e7",
+    "Slav": "d2d4 d7d5 c2c4 c7c6 g1f3 g8f6 b1c3 d5c4",
+    "Londra": "d2d4 d7d5 c1f4 g8f6 e2e3 e7e6 g1f3 c7c5",
+    "Şah Hint": "d2d4 g8f6 c2c4 g7g6 b1c3 f8g7 e2e4 d7d6 g1f3 e8g8",
+    "İngiliz": "c2c4 e7e5 b1c3 g8f6 g2g3 d7d5 c4d5 f6d5",
+    "Réti": "g1f3 d7d5 c2c4 e7e6 g2g3 g8f6 f1g2 f8e7",
+}
+
+
+def position_key(board):
+    """
+    Tahtanın önbellek anahtarını üretir: (Zobrist, rok hakları, geçerken alma karesi).
+    """
+    return chess.polyglot.zobrist_hash(board), board.castling_rights, board.ep_square
+
+
+def fen_key(fen):
+    """
+    FEN'in pozisyonu belirleyen ilk dört alanını (taşlar, sıra, rok, geçerken alma) döndürür.
+
+    Yarım hamle sayacı ve hamle numarası hareket edebilen taşları etkilemez.
+    """
+    return " ".join(fen.split()[:4])
+
+
+class PositionAnalysis:
+    """
+    Tek bir pozisyonun taş analizi.
+
+    Hareket edebilen taş tipleri hemen hesaplanır; tiplere göre hamle
+    listeleri tüm yasal hamlelerin üretilmesini gerektirdiği için ilk
+    istendiklerinde hesaplanıp saklanır.
+    """
+    def __init__(self, board, key=None):
+        """
+        Parametreler:
+            board (chess.Board): Analiz edilecek pozisyon (kopyası saklanır)
+            key (tuple): Pozisyonun önbellek anahtarı (bkz. position_key)
+        """
+        self.key = key
+        self.board = board.copy(stack=False)
+        self.types = movable_piece_types(self.board)
+        self._moves = None
+
+    @property
+    def names(self):
+        """
+        Hareket edebilen taşların Türkçe isimleri.
+        """
+        return [PIECE_NAMES[piece_type] for piece_type in self.types]
+
+    def moves_by_type(self):
+        """
+        Yasal hamleleri hamle yapan taşın tipine göre gruplar.
+
+        Dönüş değeri:
+            dict: Taş tipi -> chess.Move listesi
+        """
+        if self._moves is None:
+            moves = {piece_type: [] for piece_type in self.types}
+            for move in self.board.legal_moves:
+                moves[self.board.piece_type_at(move.from_square)].append(move)
+            self._moves = moves
+        return self._moves
+
+    def instances(self):
+        """
+        Hareket edebilen her bir taşı tip sırasına, aynı tipte kare sırasına göre listeler.
+
+        Dönüş değeri:
+            list: (taş tipi, kare) ikilileri
+        """
+        moves = self.moves_by_type()
+        return [(piece_type, square) for piece_type in self.types
+                for square in sorted({move.from_square for move in moves[piece_type]})]
+
+    def labels(self, per_piece=False):
+        """
+        Dümen dilimi etiketleri: taş tipi başına ("At") ya da taş başına ("At g1").
+        """
+        if not per_piece:
+            return self.names
+        return [piece_label(piece_type, square) for piece_type, square in self.instances()]
+
+    def mobility(self):
+        """
+        Her taş tipinin yasal hamle sayısını ve hareket edebilen taş sayısını döndürür.
+
+        İkisi de tek bir hamle üretimi geçişinden (`moves_by_type`) hesaplanır.
+
+        Dönüş değeri:
+            dict: Taş tipi -> {"moves": hamle sayısı, "pieces": hareket edebilen taş sayısı}
+        """
+        return {
+            piece_type: {"moves": len(moves), "pieces": len({move.from_square for move in moves})}
+            for piece_type, moves in self.moves_by_type().items()
+        }
+
+
+class AnalysisCache:
+    """
+    Pozisyon analizlerini Zobrist anahtarıyla tutan, boyutu sınırlı LRU önbellek.
+
+    Birden çok iş parçacığından (arayüz, ön yükleyici) güvenle kullanılabilir.
+    """
+    def __init__(self, maxsize=4096):
+        """
+        Parametreler:
+            maxsize (int): Tutulacak en fazla pozisyon sayısı
+        """
+        self.entries = LRUCache(maxsize)
+        self.fen_index = LRUCache(maxsize)  # FEN'in ilk dört alanı -> pozisyon anahtarı
+        self._lock = threading.Lock()
+
+        # İsabet istatistikleri
+        self.hits = 0
+        self.misses = 0
+
+    def analyze(self, board):
+        """
+        Tahtanın analizini önbellekten döndürür, yoksa analiz edip saklar.
+
+        Parametreler:
+            board (chess.Board): Analiz edilecek pozisyon
+
+        Dönüş değeri:
+            PositionAnalysis: Pozisyonun analizi
+        """
+        key = position_key(board)
+        with self._lock:
+            analysis = self.entries.get(key)
+            if analysis is not None:
+                self.hits += 1
+                return analysis
+            self.misses += 1
+
+        analysis = PositionAnalysis(board, key)
+        with self._lock:
+            self.entries.put(key, analysis)
+        return analysis
+
+    def analyze_fen(self, fen):
+        """
+        `piece_analysis.analyze_fen` ile aynı sonucu önbellek üzerinden döndürür.
+
+        Daha önce görülen bir pozisyonun FEN'i ayrıştırılmaz; saklanan tahtanın
+        kopyası yalnızca saat alanları güncellenerek döndürülür.
+
+        Parametreler:
+            fen (str): Analiz edilecek pozisyonun FEN gösterimi
+
+        Dönüş değeri:
+            tuple: (chess.Board, hareket edebilen taş isimleri listesi)
+        """
+        with self._lock:
+            key = self.fen_index.get(fen_key(fen))
+            analysis = self.entries.get(key) if key is not None else None
+            if analysis is not None:
+                self.hits += 1
+
+        if analysis is None:
+            board = chess.Board(fen)
+            analysis = self.analyze(board)
+            with self._lock:
+                self.fen_index.put(fen_key(fen), analysis.key)
+            return board, analysis.names
+
+        # Saklanan tahtanın saatlerini bu FEN'e göre ayarla
+        board = analysis.board.copy(stack=False)
+        fields = fen.split()
+        if len(fields) >= 6:
+            board.halfmove_clock = int(fields[4])
+            board.fullmove_number = int(fields[5])
+        return board, analysis.names
+
+    def seed_openings(self, lines=None, depth=2):
+        """
+        Başlangıç pozisyonundan `depth` hamleye kadar tüm pozisyonları ve
+        yaygın açılışların pozisyonlarını önceden analiz eder.
+
+        Parametreler:
+            lines (dict): Açılış adı -> UCI hamleleri, varsayılan OPENING_LINES
+            depth (int): Tüm hamlelerin taranacağı derinlik (yarım hamle)
+
+        Dönüş değeri:
+            int: Önbelleğe eklenen pozisyon sayısı
+        """
+        before = len(self.entries.entries)
+
+        def walk(board, remaining):
+            self.remember(board)
+            if remaining == 0:
+                return
+            for move in list(board.legal_moves):
+                board.push(move)
+                walk(board, remaining - 1)
+                board.pop()
+
+        walk(chess.Board(), depth)
+
+        for moves in (lines or OPENING_LINES).values():
+            board = chess.Board()
+            for uci in moves.split():
+                board.push_uci(uci)
+                self.remember(board)
+
+        # Tohumlama isabet istatistiklerini etkilemesin
+        self.hits = self.misses = 0
+        return len(self.entries.entries) - before
+
+    def remember(self, board):
+        """
+        Tahtayı analiz edip hem Zobrist hem de FEN dizinine ekler.
+        """
+        analysis = self.analyze(board)
+        with self._lock:
+            self.fen_index.put(fen_key(board.fen()), analysis.key)
+        return analysis
+
+    def hit_rate(self):
+        """
+        İsabet oranını 0 ile 1 arasında döndürür (istek yoksa 0).
+        """
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Analiz önbelleği kıyaslaması")
+    parser.add_argument("--games", type=int, default=200, help="Taklit edilen oyun sayısı")
+    parser.add_argument("--spins", type=int, default=3, help="Her pozisyonda yapılan çevirme sayısı")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    from piece_analysis import analyze_fen
+
+    # Açılış hamleleriyle başlayıp rastgele devam eden oyunlar; her pozisyonda birkaç çevirme
+    rng = random.Random(args.seed)
+    fens = []
+    lines = list(OPENING_LINES.values())
+    for _ in range(args.games):
+        board = chess.Board()
+        for uci in rng.choice(lines).split()[:rng.randint(2, 8)]:
+            board.push_uci(uci)
+        for _ in range(rng.randint(10, 40)):
+            moves = list(board.legal_moves)
+            if not moves:
+                break
+            fens.extend([board.fen()] * args.spins)
+            board.push(rng.choice(moves))
+
+    cache = AnalysisCache()
+    start = time.perf_counter()
+    seeded = cache.seed_openings()
+    print(f"Tohumlama: {seeded} pozisyon, {(time.perf_counter() - start) * 1000:.0f} ms")
+
+    start = time.perf_counter()
+    for fen in fens:
+        analyze_fen(fen)
+    uncached = (time.perf_counter() - start) / len(fens)
+
+    start = time.perf_counter()
+    for fen in fens:
+        cache.analyze_fen(fen)
+    cached = (time.perf_counter() - start) / len(fens)
+    print(f"{len(fens)} analiz: önbelleksiz {uncached * 1e6:.1f} µs, önbellekli {cached * 1e6:.1f} µs, "
+          f"isabet oranı %{cache.hit_rate() * 100:.0f} ({cache.hits} isabet, {cache.misses} ıska)")
+
+    # Sonuçların önbelleksiz yolla aynı olduğunu doğrula
+    mismatches = sum(1 for fen in fens if cache.analyze_fen(fen)[1] != analyze_fen(fen)[1])
+    print(f"Doğrulama: {mismatches} uyumsuzluk")
+
+    # Zobrist anahtarının tahtadan gelen pozisyonlarda da çalıştığını göster
+    boards = [chess.Board(fen) for fen in fens[:2000]]
+    start = time.perf_counter()
+    for board in boards:
+        cache.analyze(board).moves_by_type()
+    print(f"Tahtadan analiz + tip başına hamleler: {(time.perf_counter() - start) / len(boards) * 1e6:.1f} µs")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,362 @@
+"""
+Toplu oyun analizi
+
+Binlerce oyunda hangi taş tiplerinin ne sıklıkla hareket edebildiğini ve
+dümenin kaç dilimli olduğunu çıkaran komut satırı aracı. Girdi yerel PGN
+dosyaları, NDJSON biçiminde kaydedilmiş bir dışa aktarım ya da Lichess'ten
+akış olarak indirilen bir kullanıcının oyunları olabilir.
+
+Ana süreç girdiyi yalnızca oyunlara böler (PGN ayrıştırmaz); oyunlar
+parçalar halinde süreç havuzuna gönderilir ve her işçi `chess.pgn` ile
+oyunları oynatıp her pozisyonu `movable_piece_types` ile analiz eder.
+Sonuçlar oyun başına bir satır olacak şekilde sütun sütun (her sütun bir
+tamsayı listesi) sıkıştırılmış JSON olarak yazılır.
+
+    python batch_analysis.py oyunlar.pgn --out istatistik.json
+    python batch_analysis.py disa_aktarim.ndjson --workers 8
+    python batch_analysis.py --user kullanici --max 2000
+    python batch_analysis.py --sample 2000 --workers 4
+"""
+import argparse
+import collections
+import io
+import json
+import os
+import random
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import chess
+import chess.pgn
+
+from piece_analysis import movable_piece_types
+
+# Sütun adları: oyun ID'si, pozisyon sayısı, hata, taş tipi başına hareket
+# edebildiği pozisyon sayısı ve dümen genişliği (0-6 dilim) dağılımı
+TYPE_COLUMNS = [f"movable_{chess.piece_name(piece_type)}" for piece_type in chess.PIECE_TYPES]
+WIDTH_COLUMNS = [f"width_{width}" for width in range(len(chess.PIECE_TYPES) + 1)]
+COUNT_COLUMNS = ["positions", "errors"] + TYPE_COLUMNS + WIDTH_COLUMNS
+COLUMNS = ["game_id"] + COUNT_COLUMNS
+
+
+class PlyStatsVisitor(chess.pgn.BaseVisitor):
+    """
+    Oyun ağacı kurmadan ana hattaki her pozisyonu analiz eden PGN ziyaretçisi.
+
+    Yan varyantlar atlanır; geçersiz hamlede oyunun geri kalanı bırakılır
+    ve hata sayılır.
+    """
+    def begin_game(self):
+        self.game_id = None
+        self.counts = [0] * len(COUNT_COLUMNS)
+        self.failed = False
+
+    def visit_header(self, tagname, tagvalue):
+        if tagname == "GameId" or (tagname == "Site" and self.game_id is None):
+            self.game_id = tagvalue.rsplit("/", 1)[-1]
+
+    def begin_variation(self):
+        return chess.pgn.SKIP
+
+    def visit_board(self, board):
+        if not self.failed:
+            record_position(self.counts, board)
+
+    def handle_error(self, error):
+        self.failed = True
+        self.counts[1] = 1
+
+    def result(self):
+        return self.game_id, self.counts
+
+
+def record_position(counts, board):
+    """
+    Pozisyonun analizini oyunun sayaçlarına ekler.
+
+    Parametreler:
+        counts (list): COUNT_COLUMNS sırasındaki sayaçlar
+        board (chess.Board): Analiz edilecek pozisyon
+    """
+    types = movable_piece_types(board)
+    counts[0] += 1
+    for piece_type in types:
+        counts[1 + piece_type] += 1
+    counts[2 + len(TYPE_COLUMNS) + len(types)] += 1
+
+
+def analyze_moves(game_id, moves, initial_fen=None):
+    """
+    NDJSON dışa aktarımındaki SAN hamle dizisini oynatıp her pozisyonu analiz eder.
+
+    Dönüş değeri:
+        tuple: (oyun ID'si, COUNT_COLUMNS sırasında sayaçlar)
+    """
+    counts = [0] * len(COUNT_COLUMNS)
+    board = chess.Board(initial_fen) if initial_fen else chess.Board()
+    record_position(counts, board)
+    for san in moves.split():
+        try:
+            board.push_san(san)
+        except ValueError:
+            counts[1] = 1
+            break
+        record_position(counts, board)
+    return game_id, counts
+
+
+def analyze_chunk(games):
+    """
+    Bir parça oyunu analiz eder; süreç havuzunun işçilerinde çalışır.
+
+    Parametreler:
+        games (list): ("pgn", metin) ya da ("moves", oyun ID'si, SAN hamleler, başlangıç FEN'i) öğeleri
+
+    Dönüş değeri:
+        dict: COLUMNS sırasında sütun adı -> değer listesi
+    """
+    columns = {name: [] for name in COLUMNS}
+    for game in games:
+        if game[0] == "pgn":
+            result = chess.pgn.read_game(io.StringIO(game[1]), Visitor=PlyStatsVisitor)
+            if result is None:
+                continue
+        else:
+            result = analyze_moves(*game[1:])
+
+        game_id, counts = result
+        columns["game_id"].append(game_id)
+        for name, value in zip(COUNT_COLUMNS, counts):
+            columns[name].append(value)
+    return columns
+
+
+def split_pgn(lines):
+    """
+    PGN satırlarını ayrıştırmadan oyun metinlerine böler.
+
+    Hamle metninden sonra gelen ilk başlık satırı ("[") yeni bir oyun başlatır.
+
+    Parametreler:
+        lines: Satırları veren yinelenebilir (dosya ya da akış)
+
+    Dönüş değeri:
+        generator: ("pgn", oyun metni) öğeleri
+    """
+    current = []
+    in_movetext = False
+    for line in lines:
+        if line.startswith("[") and in_movetext:
+            yield "pgn", "".join(current)
+            current = []
+            in_movetext = False
+        elif line.strip() and not line.startswith("["):
+            in_movetext = True
+        current.append(line)
+    if any(line.strip() for line in current):
+        yield "pgn", "".join(current)
+
+
+def split_ndjson(lines):
+    """
+    Lichess NDJSON dışa aktarımının satırlarını oyun öğelerine çevirir.
+
+    PGN içeren satırlar (pgnInJson=true) PGN olarak, diğerleri SAN hamle
+    dizisi olarak analiz edilir. Boş satırlar (canlı tutma) atlanır.
+    """
+    for line in lines:
+        if isinstance(line, bytes):
+            line = line.decode("utf-8")
+        if not line.strip():
+            continue
+        data = json.loads(line)
+        if data.get("pgn"):
+            yield "pgn", data["pgn"]
+        else:
+            yield "moves", data.get("id"), data.get("moves", ""), data.get("initialFen")
+
+
+def chunked(games, size):
+    """
+    Oyunları en fazla `size` öğelik listeler halinde verir.
+    """
+    chunk = []
+    for game in games:
+        chunk.append(game)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def run_batch(games, workers=None, chunk_size=200, progress=None):
+    """
+    Oyunları süreç havuzunda analiz edip sütunları girdi sırasıyla birleştirir.
+
+    Bellekte aynı anda en fazla işçi sayısının iki katı parça bekletilir;
+    böylece çok büyük dışa aktarımlar da akış halinde işlenebilir.
+
+    Parametreler:
+        games: Oyun öğelerini veren yinelenebilir (bkz. split_pgn, split_ndjson)
+        workers (int): İşçi süreç sayısı; 0 ise aynı süreçte çalışır, None ise işlemci sayısı
+        chunk_size (int): Bir parçadaki oyun sayısı
+        progress (callable): Her parça bittiğinde birleşmiş sütunlarla çağrılır
+
+    Dönüş değeri:
+        dict: COLUMNS sırasında sütun adı -> değer listesi
+    """
+    columns = {name: [] for name in COLUMNS}
+
+    def merge(part):
+        for name in COLUMNS:
+            columns[name].extend(part[name])
+        if progress:
+            progress(columns)
+
+    if workers == 0:
+        for chunk in chunked(games, chunk_size):
+            merge(analyze_chunk(chunk))
+        return columns
+
+    workers = workers or os.cpu_count() or 1
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        limit = 2 * workers
+        pending = collections.deque()
+        for chunk in chunked(games, chunk_size):
+            pending.append(executor.submit(analyze_chunk, chunk))
+            if len(pending) >= limit:
+                merge(pending.popleft().result())
+        while pending:
+            merge(pending.popleft().result())
+    return columns
+
+
+def summarize(columns):
+    """
+    Sütunlardan toplamları ve oranları hesaplar.
+
+    Dönüş değeri:
+        dict: Oyun ve pozisyon sayısı, taş tipi başına hareket edebilme oranı,
+        dümen genişliği dağılımı ve ortalama genişlik
+    """
+    positions = sum(columns["positions"])
+    totals = {name: sum(columns[name]) for name in COUNT_COLUMNS}
+    widths = [totals[name] for name in WIDTH_COLUMNS]
+    return {
+        "games": len(columns["game_id"]),
+        "positions": positions,
+        "errors": totals["errors"],
+        "movable_share": {name: round(totals[name] / positions, 4) if positions else 0.0
+                          for name in TYPE_COLUMNS},
+        "width_histogram": widths,
+        "mean_width": round(sum(width * count for width, count in enumerate(widths)) / positions, 3)
+                      if positions else 0.0,
+    }
+
+
+def sample_pgn(count, seed=0, max_plies=120):
+    """
+    Deneme için rastgele oynanmış oyunlardan bir PGN metni üretir.
+    """
+    rng = random.Random(seed)
+    games = []
+    for index in range(count):
+        board = chess.Board()
+        for _ in range(rng.randint(20, max_plies)):
+            moves = list(board.legal_moves)
+            if not moves:
+                break
+            board.push(rng.choice(moves))
+        game = chess.pgn.Game.from_board(board)
+        game.headers["Site"] = f"https://lichess.org/sample{index:05d}"
+        games.append(str(game))
+    return "\n\n".join(games) + "\n"
+
+
+def open_input(path):
+    """
+    Girdi dosyasını uzantısına göre oyun öğelerine çevirir ("-" standart girdi, PGN kabul edilir).
+    """
+    handle = sys.stdin if path == "-" else open(path, encoding="utf-8-sig")
+    if path.endswith(".ndjson") or path.endswith(".jsonl"):
+        return split_ndjson(handle)
+    return split_pgn(handle)
+
+
+def stream_user_games(username, base_url, max_games=None, token=None):
+    """
+    Kullanıcının oyunlarını Lichess'ten NDJSON akışı olarak indirir.
+
+    Dönüş değeri:
+        generator: Oyun öğeleri (bkz. split_ndjson)
+    """
+    from lichess_api import LichessSession
+
+    session = LichessSession(base_url)
+    headers = {"Accept": "application/x-ndjson"}
+    if token:
+        headers["Authorization"] = f"Bearer {token}"
+    params = {"moves": "true", "clocks": "false", "evals": "false", "opening": "false"}
+    if max_games:
+        params["max"] = max_games
+
+    response = session.get(f"/api/games/user/{username}", stream=True, timeout=(10, 60),
+                           params=params, headers=headers)
+    response.raise_for_status()
+    with response:
+        yield from split_ndjson(response.iter_lines())
+
+
+def main():
+    parser = argparse.ArgumentParser(description="PGN ve NDJSON oyunlarının toplu taş analizi")
+    parser.add_argument("inputs", nargs="*", help="PGN ya da NDJSON dosyaları (\"-\" standart girdi)")
+    parser.add_argument("--user", help="Oyunları Lichess'ten indirilecek kullanıcı")
+    parser.add_argument("--max", type=int, help="İndirilecek en fazla oyun sayısı")
+    parser.add_argument("--token", default=os.environ.get("LICHESS_TOKEN"), help="Lichess API anahtarı")
+    parser.add_argument("--base-url", default=os.environ.get("DUMEN_LICHESS_URL", "https://lichess.org"))
+    parser.add_argument("--sample", type=int, help="Girdi yerine bu kadar rastgele oyun üret")
+    parser.add_argument("--workers", type=int, help="İşçi süreç sayısı (0: tek süreç)")
+    parser.add_argument("--chunk-size", type=int, default=200, help="Bir parçadaki oyun sayısı")
+    parser.add_argument("--out", help="Sütunların yazılacağı JSON dosyası")
+    args = parser.parse_args()
+
+    # Rastgele oyunlar ölçümden önce üretilir
+    sample = sample_pgn(args.sample) if args.sample else None
+
+    def games():
+        if sample:
+            yield from split_pgn(io.StringIO(sample))
+        for path in args.inputs:
+            yield from open_input(path)
+        if args.user:
+            yield from stream_user_games(args.user, args.base_url, args.max, args.token)
+
+    if not (args.sample or args.inputs or args.user):
+        parser.error("PGN/NDJSON dosyası, --user ya da --sample gerekli")
+
+    start = time.perf_counter()
+
+    def progress(columns):
+        elapsed = time.perf_counter() - start
+        positions = sum(columns["positions"])
+        print(f"\r{len(columns['game_id'])} oyun, {positions} pozisyon, "
+              f"{positions / elapsed:.0f} pozisyon/sn", end="", file=sys.stderr)
+
+    columns = run_batch(games(), args.workers, args.chunk_size, progress)
+    elapsed = time.perf_counter() - start
+    print(file=sys.stderr)
+
+    summary = summarize(columns)
+    summary["seconds"] = round(elapsed, 3)
+    summary["positions_per_second"] = round(summary["positions"] / elapsed) if elapsed else 0
+    print(json.dumps(summary, ensure_ascii=False, indent=2))
+
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as handle:
+            json.dump({"columns": columns, "summary": summary}, handle, separators=(",", ":"))
+
+
+if __name__ == "__main__":
+    main()
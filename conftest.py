@@ -0,0 +1,7 @@
+"""
+pytest ayarları
+
+Modüller kök dizinde durduğundan testler onları doğrudan içe aktarır;
+depodaki sanal ortam ve PyInstaller çıktısı test olarak taranmaz.
+"""
+collect_ignore = ["dumenv", "build"]
@@ -15,13 +15,54 @@ from tkinter import messagebox
 import requests 
 import threading
 import chess
-import re
-from bs4 import BeautifulSoup 
 import os
 from PIL import Image, ImageTk
 import math
 import time
 import random
+import collections
+
+from lichess_api import (LICHESS_URL, CURRENT_GAME_PARAMS, LichessSession, find_game_id,
+                         find_time_control, format_timings, read_current_game)
+from lichess_stream import GameFollower, EventStreamWatcher
+from page_extractor import read_page_data
+from position_cache import PositionCache
+from position_tracker import PositionTracker
+from prefetcher import PositionPrefetcher
+from request_scheduler import PRIORITY_BACKGROUND, PRIORITY_INTERACTIVE, RateLimited
+from analysis_cache import AnalysisCache
+from piece_analysis import legal_moves_of, parse_piece_label
+from wheel_layout import RingItems, SpinTrajectory, WheelSectors
+from engine_pool import EnginePool
+from opening_book import OpeningBook
+from frame_cache import RotationFrameCache
+from wheel_bitmap import compose_wheel
+from overlay_server import OverlayServer, spin_event
+
+# Taş dümeni durduktan sonra hamle dümeni çevrilmeden önceki duraklama (ms)
+MOVE_WHEEL_DELAY = 1200
+
+# Kare önbelleği gibi ayrıntılı ölçümleri konsola yaz (DUMEN_DEBUG=1 ile açılır)
+DEBUG = os.environ.get("DUMEN_DEBUG", "") not in ("", "0")
+
+# Ayarlar penceresinin boyutu (piksel)
+SETTINGS_WIDTH = 400
+SETTINGS_HEIGHT = 1030
+
+# Görsel etiket modunda saklanan birleşik görsel önbelleği sayısı (ör. notsuz ve notlu
+# etiketler); kare bütçesi aralarında bölünür, toplam bellek tek bütçeyi aşmaz
+LABEL_FRAME_CACHES = 2
+
+
+def parse_port(value):
+    """
+    Port ayarını sayıya çevirir; boş ya da geçersiz değer 0 (kapalı) sayılır.
+    """
+    try:
+        port = int(str(value).strip() or 0)
+    except ValueError:
+        return 0
+    return port if 0 <= port <= 65535 else 0
 
 class DumenApp:
     """
@@ -47,11 +88,34 @@ class DumenApp:
         self.username = None  # Lichess kullanıcı adı
         self.board = chess.Board()  # Satranç tahtası
         self.movable_pieces = []  # Hareket edebilecek taşların listesi
+        self.time_control = None  # Aktif oyunun süre ayarı (ör. "180+2")
+        self.prefetcher = None  # Pozisyonu ve analizini arka planda hazır tutan işçi
+        self.event_watcher = None  # Hesabın olay akışını dinleyen işçi
+        self.user_color = None  # Kullanıcının aktif oyundaki rengi (olay akışından)
+        self.armed_fen = None  # Otomatik çevirmenin en son tetiklendiği pozisyon
+        self.follower = None  # Aktif oyunu canlı takip eden arka plan işçisi
+        self.tracker = None  # Birden çok kullanıcıyı takip eden servis
+        self.position_cache = None  # Oyun ID'si ve FEN önbelleği
+        self.analysis_cache = AnalysisCache()  # Zobrist anahtarlı taş analizi önbelleği
+        self.engine_pool = None  # Dilimlere en iyi hamle önerisi veren UCI motor havuzu
+        self.hints = {}  # Bu çevirmede hazır olan öneriler: taş adı -> öneri
+        self.spin_id = 0  # Eski çevirmelerden gelen önerileri ayırt etmek için sayaç
+        self.opening_book = None  # Dilimlere kitap hamlesi notu ekleyen polyglot açılış kitabı
+        self.book_moves = {}  # Bu çevirmedeki kitap hamleleri: taş adı -> kitap hamlesi
+        self.wheel_stage = "piece"  # Dönen dümen: "piece" taş dümeni, "move" hamle dümeni
+        self.move_options = {}  # Taş dümenindeki her dilimin yasal hamleleri (SAN): taş adı -> liste
+        self.selected_piece = None  # Hamle dümeninin açıldığı, taş dümeninde seçilen taş
+        self.overlay = None  # Çevirme olaylarını yayın katmanlarına ileten yerel SSE sunucusu
         
         # Görsel referanslarını çöp toplayıcının silmemesi için sakla
         self.wheel_image = None  # Dümen görüntüsü
         self.wheel_image_original = None  # Orijinal dümen görüntüsü
-        self.wheel_images_cache = {}  # Döndürülmüş görüntüler için önbellek
+        self.frame_cache = None  # Açıya göre yuvarlanmış döndürülmüş dümen kareleri (bkz. frame_cache.py)
+        self.wheel_frame = None  # Tuvalde gösterilen dönmüş kare
+        self.spin_frames = None  # Etiketleri işlenmiş dümenin bu çevirmedeki kareleri (görsel etiket modu)
+        self.label_frames = collections.OrderedDict()  # Etiket düzeni -> kare önbelleği (LRU sırasıyla)
+        self.label_style = None  # Görsele işlenen etiketlerin (yazı boyutu, dik mi, sınır açıları)
+        self.labels_dirty = False  # Etiket notu değişti, birleşik görsel dümen durunca yeniden oluşturulacak
         self.arrow_image = None  # Ok işareti görüntüsü
         
         # Animasyon ayarları
@@ -61,6 +125,15 @@ class DumenApp:
         self.current_angle = 0  # Mevcut dönüş açısı
         self.rotation_count = 0  # Tamamlanan tur sayısı
         self.target_rotations = 3  # Hedef tur sayısı
+        self.trajectory = None  # Çevirme başlarken belirlenen yörünge (son açı ve eğri)
+        self.spin_outcome = None  # Yörüngenin son açısından bulunan, dümenin duracağı dilim
+        
+        # Dümen dilimleri (her çevirmede yeniden hesaplanır)
+        self.wheel_sectors = None  # Dilim açıları (WheelSectors)
+        self.wheel_pieces = []  # Dilimlerdeki taş isimleri
+        self.piece_positions = []  # Taş isimlerinin tuval öğeleri
+        self.ring = None  # Dümenle dönen, karede tek Tcl çağrısıyla güncellenen öğeler
+        self.ring_angle = None  # Toplu öğelerin en son yerleştirildiği açı
         
         # Aynı isimde birden fazla taşa izin ver
         # Global olarak tanımla
@@ -69,9 +142,49 @@ class DumenApp:
         
         # Uygulama ayarları
         self.settings = {
-            "rotation_time": 5  # Varsayılan dönüş süresi (saniye)
+            "rotation_time": 5,  # Varsayılan dönüş süresi (saniye)
+            "follow_game": True,  # Aktif oyunu canlı akıştan takip et
+            "tracked_users": "",  # Aynı anda takip edilecek kullanıcılar (virgülle ayrılmış)
+            "disk_cache": False,  # Pozisyon önbelleğini diske de yaz
+            "api_token": "",  # Olay akışı için Lichess kişisel API anahtarı
+            "auto_spin": False,  # Sıra kullanıcıya geçtiğinde dümeni kendiliğinden çevir
+            # Lichess sunucusunun adresi (yerel taklit sunucu için değiştirilebilir)
+            "base_url": os.environ.get("DUMEN_LICHESS_URL", LICHESS_URL),
+            # Dilim boyutları: "equal" eşit, "moves" yasal hamle sayısı, "pieces" hareket edebilen taş sayısı
+            "slice_weighting": "equal",
+            "piece_slices": False,  # Her hareket edebilen taşa ayrı dilim (ör. "Piyon e2")
+            "move_wheel": False,  # Taş seçildikten sonra o taşın hamleleri için ikinci dümeni çevir
+            # Öneriler için UCI motoru (ör. stockfish); boşsa öneri gösterilmez
+            "engine_path": os.environ.get("DUMEN_ENGINE", ""),
+            "engine_time": 1.0,  # Çevirme başına motor analiz süresi (saniye)
+            # Dilimlerde kitap hamlesi göstermek için polyglot (.bin) açılış kitabı; boşsa kapalı
+            "book_path": os.environ.get("DUMEN_BOOK", ""),
+            "frame_step": 1.0,  # Döndürülmüş karelerin açı adımı (derece)
+            "frame_cache_mb": 160,  # Döndürülmüş kare önbelleğinin bellek bütçesi (MB)
+            # Çevirmelerin rastgele sayı tohumu; verilirse aynı çevirme dizisi tekrarlanır
+            "spin_seed": os.environ.get("DUMEN_SEED"),
+            "instant_result": False,  # Animasyonu atlayıp sonucu hemen göster
+            # Dilim etiketleri: "bitmap" dümen görseline işlenir, "canvas" ayrı tuval yazıları
+            "label_mode": "bitmap",
+            # Yayın katmanı (OBS tarayıcı kaynağı) olay sunucusunun portu; 0 ise kapalı
+            "overlay_port": parse_port(os.environ.get("DUMEN_OVERLAY_PORT", ""))
         }
         
+        # Çevirmelerin son açılarını çeken rastgele sayı üreteci
+        self.spin_rng = random.Random(self.settings["spin_seed"])
+        
+        # Tüm Lichess çağrılarının paylaştığı HTTP oturumu
+        self.session = LichessSession(self.settings["base_url"])
+        
+        # Pozisyon önbelleğini ayarlara göre oluştur
+        self.create_position_cache()
+        
+        # Yaygın açılış pozisyonlarını arka planda önceden analiz et
+        threading.Thread(target=self.analysis_cache.seed_openings, daemon=True).start()
+        
+        # Motor ayarlandıysa havuzu arka planda başlat
+        self.restart_engine_pool()
+        
         # Modern temayı ayarla
         self.set_theme()
         
@@ -81,6 +194,13 @@ class DumenApp:
         # Dümen resmini hemen yükle
         self.preload_wheel_image()
         
+        # Açılış kitabını bir kez aç (belleğe eşlenir, dosya okunmaz); hata
+        # durum satırında gösterildiğinden arayüz kurulduktan sonra açılır
+        self.load_opening_book()
+        
+        # Yayın katmanı sunucusunu başlat (port ayarlandıysa; port doluysa durum satırında bildirilir)
+        self.restart_overlay()
+        
     def set_theme(self):
         """
         Uygulama için modern ve tutarlı bir tema ayarlar.
@@ -249,6 +369,320 @@ class DumenApp:
         # Kullanıcı adı başarıyla ayarlandı
         self.status_var.set(f"Dümen hazır. {self.username}")
         
+        # İlk çevirmede el sıkışma beklememek için bağlantıyı önceden kur
+        self.session.warm()
+        
+        # Canlı takip açıksa aktif oyunu arka planda izlemeye başla
+        self.restart_follower()
+        
+        # Pozisyonu ve analizini çevirmeden önce hazır tutmaya başla
+        self.restart_prefetcher()
+        
+        # API anahtarı varsa oyun başlangıçlarını olay akışından dinle
+        self.restart_event_watcher()
+        
+    def restart_follower(self, game_id=None):
+        """
+        Aktif oyunun canlı takibini yeniden başlatır.
+        
+        Önceki takipçiyi durdurur ve ayarlarda canlı takip açıksa
+        mevcut kullanıcı adı için yeni bir takipçi başlatır.
+        
+        Parametreler:
+            game_id (str): Biliniyorsa doğrudan takip edilecek oyunun ID'si
+        """
+        # Önceki takipçiyi durdur
+        if self.follower:
+            self.follower.stop()
+            self.follower = None
+        
+        # Canlı takip kapalıysa ya da kullanıcı adı yoksa işlem yapma
+        if not self.settings["follow_game"] or not self.username:
+            return
+        
+        self.follower = GameFollower(self.username, session=self.session,
+                                     on_update=self.on_follower_update, game_id=game_id)
+        self.follower.start()
+    
+    def restart_event_watcher(self):
+        """
+        Hesap olay akışı dinleyicisini ayarlardaki API anahtarıyla yeniden başlatır.
+        """
+        if self.event_watcher:
+            self.event_watcher.stop()
+            self.event_watcher = None
+        
+        # API anahtarı yoksa olay akışı kullanılamaz; current-game sorgularıyla devam edilir
+        if not self.settings["api_token"] or not self.username:
+            return
+        
+        self.event_watcher = EventStreamWatcher(self.settings["api_token"], session=self.session,
+                                                on_event=self.on_account_event)
+        self.event_watcher.start()
+    
+    def on_account_event(self, event):
+        """
+        Olay akışından gelen oyun başlangıcı ve bitişi olaylarını işler.
+        
+        Olay dinleyicisinin iş parçacığından çağrılır; arayüz işlemleri
+        ana iş parçacığına aktarılır.
+        
+        Parametreler:
+            event (dict): Olay akışı satırının JSON içeriği
+        """
+        game = event.get("game") or {}
+        game_id = game.get("gameId") or game.get("id")
+        
+        if event.get("type") == "gameStart" and game_id:
+            self.root.after(0, lambda: self.on_game_start(game_id, game))
+        elif event.get("type") == "gameFinish":
+            self.user_color = None
+            self.root.after(0, lambda: self.status_var.set(f"Oyun bitti ({game_id}). Yeni oyun bekleniyor..."))
+    
+    def on_game_start(self, game_id, game):
+        """
+        Yeni başlayan oyunu hemen yükler ve gerekirse dümeni çevirir.
+        
+        Parametreler:
+            game_id (str): Başlayan oyunun ID'si
+            game (dict): gameStart olayındaki oyun bilgisi
+        """
+        # Olay akışı yeniden bağlandığında süren oyunların gameStart'ı tekrar gelir;
+        # aynı oyun zaten takip ediliyorsa akışı koparmamak ve aynı pozisyonda
+        # yeniden çevirmemek için yok say
+        same_game = game_id == self.game_id
+        if same_game and self.follower and self.follower.is_alive():
+            return
+        
+        self.game_id = game_id
+        self.user_color = chess.WHITE if game.get("color") == "white" else chess.BLACK
+        if not same_game:
+            self.armed_fen = None
+            self.status_var.set(f"Yeni oyun başladı: {game_id}")
+        
+        # current-game beklemeden oyunun akışına bağlan
+        self.restart_follower(game_id=game_id)
+        
+        # Sıra kullanıcıdaysa ve otomatik çevirme açıksa dümeni çevir (bu pozisyonda çevrilmediyse)
+        if self.settings["auto_spin"] and game.get("isMyTurn") and game.get("fen") \
+                and game["fen"] != self.armed_fen:
+            self.armed_fen = game["fen"]
+            self.turn_wheel()
+    
+    def restart_prefetcher(self):
+        """
+        Arka plan pozisyon ön yükleyicisini mevcut kullanıcı için yeniden başlatır.
+        """
+        if self.prefetcher:
+            self.prefetcher.stop()
+        
+        self.prefetcher = PositionPrefetcher(self.prefetch_position, self.analysis_cache.analyze_fen)
+        self.prefetcher.start()
+    
+    def prefetch_position(self):
+        """
+        Ön yükleyici için güncel pozisyonu sessizce getirir.
+        
+        Önce canlı takipçilere bakar, yoksa koşullu isteklerle ağdan alır.
+        Ön yükleyicinin iş parçacığından çağrılır.
+        
+        Dönüş değeri:
+            tuple: (oyun ID'si, FEN, TimeControl), aktif oyun yoksa None
+        """
+        username = self.username
+        
+        snapshot = self.live_snapshot()
+        if snapshot:
+            return snapshot[0], snapshot[1], self.time_control
+        
+        position = self.download_position(report=lambda message: None)
+        # Kullanıcı bu arada değiştiyse sonucu kullanma
+        if not position or username != self.username:
+            return None
+        
+        # Oyun bilgisini ana iş parçacığında kaydet; arayüz bu alanları okurken yazılmasın
+        self.root.after(0, lambda: self.set_current_game(position["game_id"], position["time_control"]))
+        return position["game_id"], position["fen"], position["time_control"] or self.time_control
+    
+    def set_current_game(self, game_id, time_control=None):
+        """
+        Aktif oyunun ID'sini ve biliniyorsa süre ayarını kaydeder.
+        
+        Tk ana iş parçacığında çalışır; arka plan iş parçacıkları root.after ile çağırır.
+        
+        Parametreler:
+            game_id (str): Aktif oyunun ID'si
+            time_control (str): Süre ayarı (ör. "180+2"), None ise önceki değer korunur
+        """
+        self.game_id = game_id
+        if time_control:
+            self.time_control = time_control
+    
+    def live_snapshot(self):
+        """
+        Canlı takipçilerin bellekteki pozisyonunu ağa gitmeden döndürür.
+        
+        Dönüş değeri:
+            tuple: (oyun ID'si, FEN), yoksa None
+        """
+        snapshot = self.tracker.snapshot(self.username) if self.tracker else None
+        if not snapshot and self.follower:
+            snapshot = self.follower.snapshot()
+        return snapshot
+    
+    def set_base_url(self, base_url):
+        """
+        Lichess sunucusunun adresini değiştirir ve ağ bileşenlerini yeniden başlatır.
+        
+        Eski sunucuya ait önbellek kayıtları karışmasın diye pozisyon önbelleği
+        de yeniden oluşturulur; disk deposunda kayıtlar sunucu adresiyle ayrılır.
+        
+        Parametreler:
+            base_url (str): Yeni sunucu adresi (ör. http://127.0.0.1:8080)
+        """
+        self.session.base_url = base_url.rstrip("/")
+        self.game_id = None
+        self.create_position_cache()
+        
+        if self.username:
+            self.session.warm()
+            self.restart_follower()
+            self.restart_prefetcher()
+            self.restart_event_watcher()
+        self.restart_tracker()
+
+    def create_position_cache(self):
+        """
+        Pozisyon önbelleğini ayarlara göre (yalnızca bellek ya da bellek + disk) oluşturur.
+        
+        Disk kayıtları oturumun sunucu adresiyle ad alanına ayrılır.
+        """
+        cache_path = None
+        if self.settings["disk_cache"]:
+            cache_path = os.path.join(os.path.dirname(sys.executable), "dumen_cache.sqlite")
+        self.position_cache = PositionCache(path=cache_path, namespace=self.session.base_url)
+    
+    def restart_engine_pool(self):
+        """
+        UCI motor havuzunu ayarlardaki motorla yeniden oluşturur.
+        
+        Motorlar arka planda başlatılır; böylece ilk çevirme motorun açılmasını
+        beklemez. Motor yolu boşsa havuz kapatılır ve öneri gösterilmez.
+        """
+        if self.engine_pool:
+            self.engine_pool.close()
+            self.engine_pool = None
+        
+        engine_path = self.settings["engine_path"]
+        if not engine_path:
+            return
+        
+        pool = EnginePool(engine_path)
+        self.engine_pool = pool
+        
+        def start():
+            try:
+                pool.start()
+            except Exception as e:
+                print(f"Motor başlatılamadı: {e}")
+                self.root.after(0, lambda: self.status_var.set(f"Motor başlatılamadı: {engine_path}"))
+        
+        threading.Thread(target=start, daemon=True).start()
+    
+    def load_opening_book(self):
+        """
+        Ayarlardaki açılış kitabını açar; önceki kitap varsa kapatılır.
+        
+        Kitap belleğe eşlenerek açıldığından dosyanın boyutundan bağımsız
+        olarak hemen hazırdır. Kitap yolu boşsa kitap notları gösterilmez.
+        """
+        if self.opening_book:
+            self.opening_book.close()
+            self.opening_book = None
+        
+        book_path = self.settings["book_path"]
+        if not book_path:
+            return
+        
+        try:
+            self.opening_book = OpeningBook(book_path)
+            if DEBUG:
+                print(f"Açılış kitabı: {book_path}, {len(self.opening_book)} giriş")
+        except (OSError, ValueError) as e:
+            print(f"Açılış kitabı açılamadı: {e}")
+            self.status_var.set(f"Açılış kitabı açılamadı: {book_path}")
+    
+    def restart_overlay(self):
+        """
+        Yayın katmanı olay sunucusunu ayarlardaki portla yeniden başlatır.
+        
+        Sunucu yalnızca çevirme başlangıcını, etiket değişikliklerini ve
+        sonucu küçük olaylar olarak gönderir; animasyonu katman kendisi çizer.
+        Port 0 ise sunucu kapatılır.
+        """
+        if self.overlay:
+            self.overlay.stop()
+            self.overlay = None
+        
+        port = self.settings["overlay_port"]
+        if not port:
+            return
+        
+        try:
+            self.overlay = OverlayServer(port=port).start()
+            if DEBUG:
+                print(f"Yayın katmanı: {self.overlay.url}")
+        except OSError as e:
+            print(f"Yayın katmanı sunucusu başlatılamadı: {e}")
+            self.status_var.set(f"Yayın katmanı sunucusu başlatılamadı (port {port})")
+    
+    def restart_tracker(self):
+        """
+        Çok kullanıcılı pozisyon takipçisini ayarlardaki listeyle yeniden başlatır.
+        
+        Listedeki kullanıcılardan biri seçildiğinde dümen, takipçinin
+        bellekte tuttuğu pozisyonla ağ beklemeden çevrilebilir.
+        """
+        # Önceki takipçiyi durdur
+        if self.tracker:
+            self.tracker.stop()
+            self.tracker = None
+        
+        # Virgülle ayrılmış listeden boş olmayan kullanıcı adlarını al
+        usernames = [name.strip() for name in self.settings["tracked_users"].split(",") if name.strip()]
+        if not usernames:
+            return
+        
+        self.tracker = PositionTracker(usernames, base_url=self.session.base_url,
+                                       scheduler=self.session.scheduler)
+        self.tracker.start_in_thread()
+    
+    def on_follower_update(self, follower):
+        """
+        Takipçi yeni bir pozisyon aldığında durum bilgisini günceller.
+        
+        Takipçinin iş parçacığından çağrılır; arayüz güncellemesi
+        ana iş parçacığına aktarılır.
+        
+        Parametreler:
+            follower (GameFollower): Güncellemeyi gönderen takipçi
+        """
+        # Eski bir takipçiden gelen güncellemeleri yok say
+        if follower is not self.follower or self.is_animating:
+            return
+        
+        message = f"Canlı takip: {follower.game_id}"
+        if follower.last_move:
+            message += f" (son hamle: {follower.last_move})"
+        self.root.after(0, lambda: self.status_var.set(message))
+        
+        # Sıra kullanıcıya geçtiyse ve otomatik çevirme açıksa dümeni çevir
+        snapshot = follower.snapshot()
+        if (snapshot and self.settings["auto_spin"] and self.user_color is not None
+                and follower.board.turn == self.user_color and snapshot[1] != self.armed_fen):
+            self.armed_fen = snapshot[1]
+            self.root.after(0, self.turn_wheel)
+        
     def turn_wheel(self):
         """
         Lichess'ten güncel oyun verilerini çeker ve dümeni çevirir.
@@ -266,74 +700,96 @@ class DumenApp:
         if self.is_animating:
             return
         
+        # Ön yükleyicinin hazır tuttuğu pozisyon güncelse beklemeden çevir
+        if self.spin_prefetched():
+            return
+        
         # Kullanıcıya bilgi ver
         self.status_var.set(f"{self.username} için oyun verisi alınıyor...")
         
         # Kullanıcı arayüzünü dondurmamak için ayrı bir iş parçacığında veri çekme işlemini başlat
         threading.Thread(target=self.fetch_game_data, daemon=True).start()
     
+    def spin_prefetched(self):
+        """
+        Ön yükleyicinin hazır tuttuğu pozisyon ve analizle dümeni hemen çevirir.
+        
+        Canlı takipçi daha yeni bir pozisyon biliyorsa ya da ön yüklenen
+        pozisyon birkaç sorgu aralığından eskiyse kullanılmaz.
+        
+        Dönüş değeri:
+            bool: Dümen çevrildiyse True
+        """
+        state = self.prefetcher.latest if self.prefetcher else None
+        if not state or not state["pieces"]:
+            return False
+        
+        # Ön yüklenen pozisyon çok eskiyse ağdan al
+        age = self.prefetcher.age()
+        if age is None or age > self.prefetcher.interval * 2:
+            return False
+        
+        # Canlı takipçi farklı bir pozisyon biliyorsa onu kullan
+        snapshot = self.live_snapshot()
+        if snapshot and snapshot[1] != state["fen"]:
+            return False
+        
+        # Analiz zaten hazır: tahtayı ve taşları al, dümeni çevir
+        self.game_id = state["game_id"]
+        self.board = state["board"].copy()
+        self.movable_pieces = list(state["pieces"])
+        self.status_var.set(f"Önceden yüklenen pozisyon kullanılıyor ({age:.1f} sn önce doğrulandı)")
+        self.spin_wheel(self.movable_pieces)
+        return True
+    
     def fetch_game_data(self):
         """
         Lichess API'den kullanıcının güncel oyun verilerini çeker ve işler.
         
         Bu metod, belirtilen kullanıcı adına ait aktif satranç oyununu bulur,
         oyun sayfasından FEN pozisyonunu çıkarır ve analiz edilmek üzere
-        process_fen metoduna gönderir.
+        process_fen metoduna gönderir. Önbellekte bilinen bir pozisyon varsa
+        dümen onunla hemen çevrilir; bayatsa arka planda yenilenir.
         """
         try:
-            # Kullanıcı bilgisi göster
-            self.status_var.set(f"{self.username} için aktif oyun aranıyor...")
-            
-            # Lichess API URL'ini hazırla
-            api_url = f"https://lichess.org/api/user/{self.username}/current-game"
-            
-            # API istekleri için gerekli başlık bilgileri
-            headers = {
-                'User-Agent': 'DumenDunyam/1.0 (Satranc tas secim ruleti uygulamasi)'
-            }
-            
-            # API'den oyun verilerini çek, 10 saniye zaman aşımı ile
-            self.status_var.set(f"{self.username} kullanıcısının aktif oyun verisi alınıyor...")
-            api_response = requests.get(api_url, headers=headers, timeout=10)
-            
-            # Başarılı cevap kontrolü
-            if api_response.status_code == 200:
-                # PGN verisinden oyun ID'sini çıkar
-                game_data = api_response.text
-                game_id_match = re.search(r'\[GameId "([^"]+)"\]', game_data)
-                
-                # Oyun ID'si bulundu mu kontrolü
-                if game_id_match:
-                    # Oyun ID'sini kaydet
-                    self.game_id = game_id_match.group(1)
-                    
-                    # Adım 2: Bu oyun için HTML sayfasını çek
-                    game_url = f"https://lichess.org/{self.game_id}"
-                    self.status_var.set(f"Oyun sayfası alınıyor: {self.game_id}")
-                    
-                    # Oyun sayfasını çek
-                    html_response = requests.get(game_url, headers=headers, timeout=10)
-                    
-                    # Sayfa başarıyla alındıysa işle
-                    if html_response.status_code == 200:
-                        # Adım 3: HTML içeriğinden FEN verilerini çıkar ve işle
-                        fen_text = self.extract_fen(html_response.text)
-                        if fen_text:
-                            # FEN pozisyonunu işle ve yasal hamleleri bul
-                            self.process_fen(fen_text)
-                        else:
-                            # FEN bulunamadıysa hata mesajı göster
-                            self.status_var.set("FEN verisi çıkarılamadı. Oyun henüz başlamamış olabilir.")
-                    else:
-                        # HTTP hata durumunda bilgi ver
-                        self.status_var.set(f"Oyun sayfası alınırken hata oluştu (Kod: {html_response.status_code})")
+            # Canlı takip pozisyonu hazırsa ağa gitmeden kullan
+            snapshot = self.live_snapshot()
+            if snapshot:
+                game_id, fen_text = snapshot
+                self.root.after(0, lambda: self.set_current_game(game_id))
+                # Takipçi aynı pozisyonu biliyorsa akışta artımlı yapılmış analizi kullan
+                live = self.follower.analysis() if self.follower else None
+                if live and live["fen"] == fen_text:
+                    self.process_fen(fen_text, analyzed=(live["board"], live["pieces"]))
                 else:
-                    # Aktif oyun bulunamadı bilgisi
-                    self.status_var.set(f"{self.username} için aktif bir oyun bulunamadı. Lichess'te oyun başlatın ve tekrar deneyin.")
-            else:
-                # API hata durumunda bilgi ver
-                self.status_var.set(f"Lichess API hatası: {api_response.status_code} - Lütfen kullanıcı adını kontrol edin.")
+                    self.process_fen(fen_text)
+                return
+            
+            # Önbellekte son bilinen pozisyon varsa beklemeden kullan
+            cached = self.position_cache.lookup_position(self.username)
+            if cached:
+                self.root.after(0, lambda: self.set_current_game(cached["game_id"]))
+                if cached["fresh"]:
+                    self.status_var.set(f"Önbellekteki pozisyon kullanılıyor ({cached['age']:.1f} sn önce alındı)")
+                else:
+                    # Bayat pozisyonu kullan, arka planda yenile ve kullanıcıyı uyar
+                    self.status_var.set(
+                        f"⚠ Pozisyon {cached['age']:.0f} sn önce alındı, bir hamle geride olabilir. Yenileniyor...")
+                    threading.Thread(target=self.revalidate_position, daemon=True).start()
+                self.process_fen(cached["fen"])
+                return
+            
+            # Önbellekte yoksa pozisyonu ağdan al; hız sınırı yüzünden 3 saniyeden
+            # fazla beklenecekse kullanıcıyı bekletmek yerine hemen bildir
+            position = self.download_position(priority=PRIORITY_INTERACTIVE, max_wait=3)
+            if position:
+                self.root.after(0, lambda: self.set_current_game(position["game_id"], position["time_control"]))
+                # FEN pozisyonunu işle ve yasal hamleleri bul
+                self.process_fen(position["fen"])
                 
+        except RateLimited as e:
+            # Hız sınırı: tekrar tıklamak sınırı uzatır, ne kadar beklenmesi gerektiğini göster
+            self.status_var.set(f"Lichess istek sınırına ulaşıldı. Lütfen {e.retry_in:.0f} sn sonra tekrar deneyin.")
         except requests.exceptions.Timeout:
             # Zaman aşımı hatası için özel mesaj
             self.status_var.set("Lichess sunucusu yanıt vermedi. Lütfen internet bağlantınızı kontrol edin ve tekrar deneyin.")
@@ -345,30 +801,180 @@ class DumenApp:
             error_msg = str(e)
             self.root.after(0, lambda msg=error_msg: self.status_var.set(f"Hata oluştu: {msg}"))
 
-    def extract_fen(self, html_content):
-        try:
-            soup = BeautifulSoup(html_content, 'html.parser')
+    def download_position(self, report=None, priority=PRIORITY_BACKGROUND, max_wait=None):
+        """
+        Aktif oyunu ve güncel FEN pozisyonunu Lichess'ten indirir.
+        
+        Pozisyon, current-game yanıtındaki PGN'in hamleleri oynanarak tek
+        istekte bulunur. PGN'den pozisyon çıkarılamazsa oyun sayfası yedek
+        yol olarak indirilir. İstekler önbellekteki doğrulayıcılarla koşullu
+        yapılır; sunucu 304 döndürürse önbellekteki değer kullanılır.
+        Sonuçlar önbelleğe yazılır. Arka plan iş parçacıklarından çağrıldığı
+        için uygulamanın durumunu değiştirmez; oyun bilgisi sonuçla döner.
+        
+        Parametreler:
+            report (callable): Durum mesajlarını alacak fonksiyon, varsayılan status_var.set
+            priority (int): İsteklerin zamanlayıcı önceliği
+            max_wait (float): Zamanlayıcıda en fazla bekleme süresi (saniye), None ise süresiz
+        
+        Dönüş değeri:
+            dict: {"game_id", "fen", "time_control"} (süre ayarı bilinmiyorsa None),
+            pozisyon alınamazsa None
+        
+        Hatalar:
+            RateLimited: Lichess istek sınırına ulaşıldıysa
+        """
+        report = report or self.status_var.set
+        cache = self.position_cache
+        user_key = f"user:{self.username.lower()}"
+        
+        # Kullanıcı bilgisi göster
+        report(f"{self.username} için aktif oyun aranıyor...")
+        
+        # API'den oyun verilerini çek, 10 saniye zaman aşımı ile; saat, değerlendirme
+        # ve açılış bilgileri gerekmediği için küçültülmüş PGN iste
+        report(f"{self.username} kullanıcısının aktif oyun verisi alınıyor...")
+        api_response = self.session.get(f"/api/user/{self.username}/current-game", timeout=10,
+                                        params=CURRENT_GAME_PARAMS,
+                                        headers=cache.conditional_headers(user_key),
+                                        priority=priority, max_wait=max_wait)
+        
+        current_game = None
+        time_control = None
+        # PGN değişmediyse pozisyon da değişmemiştir: önbellekteki pozisyonu kullan
+        if api_response.status_code == 304 and cache.get(user_key):
+            cache.touch(user_key)
+            game_id = cache.get(user_key)["value"]
+            cached = cache.lookup_position(self.username)
+            if cached and cached["game_id"] == game_id:
+                cache.touch(f"latest:{game_id}")
+                report(f"Oyun verisi değişmedi ({format_timings(api_response.timings)})")
+                return {"game_id": game_id, "fen": cached["fen"], "time_control": None}
+        # Başarılı cevap kontrolü
+        elif api_response.status_code == 200:
+            # PGN'i oku: oyun ID'si, süre ayarı ve hamlelerden son pozisyon
+            current_game = read_current_game(api_response.text)
+            if current_game:
+                game_id = current_game["game_id"]
+                time_control = current_game["time_control"]
+            else:
+                # PGN okunamadıysa başlıkları düz metinde ara
+                game_id = find_game_id(api_response.text)
+                time_control = find_time_control(api_response.text)
+            if game_id:
+                cache.store_game_id(self.username, game_id, api_response)
+        else:
+            # API hata durumunda bilgi ver
+            report(f"Lichess API hatası: {api_response.status_code} - Lütfen kullanıcı adını kontrol edin.")
+            return None
+        
+        # Oyun ID'si bulundu mu kontrolü
+        if not game_id:
+            # Aktif oyun bulunamadı bilgisi
+            report(f"{self.username} için aktif bir oyun bulunamadı. Lichess'te oyun başlatın ve tekrar deneyin.")
+            return None
+        
+        latest_key = f"latest:{game_id}"
+        
+        # PGN'den pozisyon çıktıysa oyun sayfasına gerek yok
+        if current_game and current_game["fen"]:
+            fen_text = current_game["fen"]
+            cache.store_fen(game_id, fen_text)
+            report(f"Oyun verisi alındı ({format_timings(api_response.timings)})")
+            return {"game_id": game_id, "fen": fen_text, "time_control": time_control}
+        
+        # Yedek yol: bu oyun için HTML sayfasını çek
+        report(f"Oyun sayfası alınıyor: {game_id}")
+        
+        # Oyun sayfasını çek
+        html_response = self.session.get(f"/{game_id}", stream=True, timeout=10,
+                                         headers=cache.conditional_headers(latest_key),
+                                         priority=priority, max_wait=max_wait)
+        
+        # Sayfa değişmediyse önbellekteki pozisyonu kullan
+        if html_response.status_code == 304 and cache.get(latest_key):
+            html_response.close()
+            cache.touch(latest_key)
+            cached = cache.lookup_position(self.username)
+            return {"game_id": game_id, "fen": cached["fen"], "time_control": time_control} if cached else None
+        
+        # Sayfa alınamadıysa hata bildir
+        if html_response.status_code != 200:
+            html_response.close()
+            # HTTP hata durumunda bilgi ver
+            report(f"Oyun sayfası alınırken hata oluştu (Kod: {html_response.status_code})")
+            return None
+        
+        # Sayfayı page-init-data bloğu bitene kadar oku ve FEN'i çıkar
+        fen_text = self.extract_fen(html_response)
+        if not fen_text:
+            # FEN bulunamadıysa hata mesajı göster
+            report("FEN verisi çıkarılamadı. Oyun henüz başlamamış olabilir.")
+            return None
+        
+        # Pozisyonu önbelleğe yaz ve isteklerin aşama sürelerini göster
+        cache.store_fen(game_id, fen_text, html_response)
+        report(f"Oyun verisi alındı ({format_timings(api_response.timings)} + "
+               f"{format_timings(html_response.timings)})")
+        return {"game_id": game_id, "fen": fen_text, "time_control": time_control}
 
-            # script tag ile sayfa içeriğini al
-            script_tag = soup.select_one('script#page-init-data')
+    def revalidate_position(self):
+        """
+        Bayat önbellek kaydını arka planda yeniler.
+        
+        Dümen bayat pozisyonla çevrilirken çalışır; yeni pozisyon bir sonraki
+        çevirmede kullanılır. Sonuç durum çubuğunda gösterilir.
+        """
+        previous = self.position_cache.lookup_position(self.username)
+        try:
+            # Ara durum mesajlarıyla dümen animasyonunu rahatsız etme
+            position = self.download_position(report=lambda message: None)
+        except requests.exceptions.RequestException as e:
+            print(f"Pozisyon yenilenirken hata oluştu: {e}")
+            return
+        
+        if not position:
+            return
+        fen_text = position["fen"]
+        self.root.after(0, lambda: self.set_current_game(position["game_id"], position["time_control"]))
+        
+        # Pozisyon değiştiyse çevrilen dümenin geride kaldığını bildir
+        if previous and previous["fen"] != fen_text:
+            message = "⚠ Pozisyon güncellendi: son çevirme bir hamle geride kalmış olabilir."
+        else:
+            message = "Pozisyon güncel."
+        self.root.after(0, lambda: self.status_var.set(message))
 
-            if not script_tag:
-                return None
+    def extract_fen(self, html_response):
+        """
+        Oyun sayfası yanıtından güncel FEN pozisyonunu çıkarır.
+        
+        Sayfa parça parça okunur ve page-init-data bloğu kapandığı anda
+        okuma durur; yalnızca bu blok JSON olarak çözülür. download_position
+        gibi arka plan iş parçacıklarından çağrıldığı için uygulamanın
+        durumunu değiştirmez.
+        
+        Parametreler:
+            html_response (requests.Response): Akış olarak açılmış oyun sayfası yanıtı
+        
+        Dönüş değeri:
+            str: FEN pozisyonu, bulunamazsa None
+        """
+        try:
+            # Sayfa verisini erken çıkışla oku
+            page_data = read_page_data(html_response)
             
-            # son FEN pozisyonunu çıkar
-            fen = script_tag.get_text().split('"fen":"')[-1].split('"')[0]
-            print(fen)
-
-            if not fen:
+            if not page_data or not page_data["fen"]:
                 return None
-
-            return fen
+            
+            return page_data["fen"]
             
         except Exception as e:
-            self.status_var.set(f"FEN değeri işlenirken hata oldu: {str(e)}")
+            # Arka plan iş parçacığında çalışır; durumu çağıran bildirir
+            print(f"FEN değeri işlenirken hata oldu: {str(e)}")
             return None
 
-    def process_fen(self, fen):
+    def process_fen(self, fen, analyzed=None):
         """
         FEN pozisyonunu işleyerek hareket edebilen taşları belirler.
         
@@ -378,50 +984,24 @@ class DumenApp:
         
         Parametreler:
             fen (str): İşlenecek satranç pozisyonunun FEN gösterimi
+            analyzed (tuple): Pozisyon zaten analiz edildiyse (chess.Board, taş isimleri);
+                verilirse FEN yeniden ayrıştırılmaz
         """
         try:
-            # FEN ile yeni bir satranç tahtası oluştur
-            self.board = chess.Board(fen)
-            
-            # Tüm yasal hamleleri al
-            legal_moves = list(self.board.legal_moves)
-            
-            # Hareket edebilen benzersiz taşları tespit et
-            piece_map = self.board.piece_map()
-            movable_pieces = []
-
-            # Taş tiplerini Türkçe isimlerle eşleştir
-            piece_names = {
-                chess.PAWN: "Piyon",
-                chess.KNIGHT: "At",
-                chess.BISHOP: "Fil",
-                chess.ROOK: "Kale",
-                chess.QUEEN: "Vezir",
-                chess.KING: "Şah"
-            }
+            if analyzed:
+                # Canlı takipçinin akışla güncellediği tahta ve taşlar
+                self.board, movable_pieces = analyzed
+            else:
+                # FEN ile yeni bir satranç tahtası oluştur ve hareket edebilen taşları bul;
+                # daha önce görülen pozisyonlar önbellekten gelir
+                self.board, movable_pieces = self.analysis_cache.analyze_fen(fen)
+            if DEBUG and not analyzed:
+                print(f"Analiz önbelleği: {self.analysis_cache.hits} isabet, "
+                      f"{self.analysis_cache.misses} ıska")
             
             # Hangi oyuncunun sırası olduğunu belirle
             turn_color = self.board.turn
             print(f"Sıra rengi: {turn_color}")  # Debug bilgisi
-
-            # Hareket edebilen tüm taşları bul
-            for move in legal_moves:
-                # Hamlenin başlangıç karesini al
-                from_square = move.from_square
-                
-                # Karede bir taş olup olmadığını kontrol et
-                if from_square in piece_map:
-                    # Taş nesnesini al
-                    piece = piece_map[from_square]
-                    
-                    # Taşın sırası gelen oyuncuya ait olup olmadığını kontrol et
-                    if piece.color == turn_color:
-                        # Taşın Türkçe adını al
-                        piece_name = piece_names[piece.piece_type]
-                        
-                        # Eğer listede yoksa taş adını ekle
-                        if piece_name not in movable_pieces:
-                            movable_pieces.append(piece_name)
             
             # Hareket edebilen taşları sınıf değişkenine kaydet
             self.movable_pieces = movable_pieces
@@ -457,13 +1037,16 @@ class DumenApp:
         # Yeni bir üst düzey pencere oluştur
         settings_dialog = tk.Toplevel(self.root)
         settings_dialog.title("Ayarlar")
-        settings_dialog.geometry("400x300")
+        settings_dialog.geometry(f"{SETTINGS_WIDTH}x{SETTINGS_HEIGHT}")
         settings_dialog.transient(self.root)  # İletişim kutusunu modal yap
         settings_dialog.grab_set()  # Odağı bu pencereye kilitle
         
         # Pencereyi ana pencerenin ortasına yerleştir
-        x = self.root.winfo_x() + (self.root.winfo_width() // 2) - (400 // 2)
-        y = self.root.winfo_y() + (self.root.winfo_height() // 2) - (300 // 2)
+        x = self.root.winfo_x() + (self.root.winfo_width() // 2) - (SETTINGS_WIDTH // 2)
+        y = self.root.winfo_y() + (self.root.winfo_height() // 2) - (SETTINGS_HEIGHT // 2)
+        
+        # Kısa ekranlarda pencerenin üstü ekranın dışına taşmasın
+        y = max(0, min(y, self.root.winfo_screenheight() - SETTINGS_HEIGHT))
         settings_dialog.geometry(f"+{x}+{y}")
         
         # İçerik için dolgu ile bir çerçeve oluştur
@@ -496,6 +1079,77 @@ class DumenApp:
         
         rotation_scale.bind("<Motion>", update_value)
         
+        # Canlı oyun takibi seçeneği
+        follow_var = tk.BooleanVar(value=self.settings["follow_game"])
+        ttk.Checkbutton(frame, text="Aktif oyunu canlı takip et", variable=follow_var).pack(pady=5)
+        
+        # Disk önbelleği seçeneği
+        disk_cache_var = tk.BooleanVar(value=self.settings["disk_cache"])
+        ttk.Checkbutton(frame, text="Pozisyon önbelleğini diske kaydet", variable=disk_cache_var).pack(pady=5)
+        
+        # Olay akışı için API anahtarı
+        ttk.Label(frame, text="Lichess API anahtarı (olay akışı için):").pack(pady=(5, 0))
+        token_entry = ttk.Entry(frame, width=40, show="*")
+        token_entry.insert(0, self.settings["api_token"])
+        token_entry.pack(pady=5)
+        
+        # Otomatik çevirme seçeneği
+        auto_spin_var = tk.BooleanVar(value=self.settings["auto_spin"])
+        ttk.Checkbutton(frame, text="Sıra bana geçince dümeni otomatik çevir", variable=auto_spin_var).pack(pady=5)
+        
+        # Aynı anda takip edilecek kullanıcılar
+        ttk.Label(frame, text="Takip edilen kullanıcılar (virgülle):").pack(pady=(5, 0))
+        tracked_entry = ttk.Entry(frame, width=40)
+        tracked_entry.insert(0, self.settings["tracked_users"])
+        tracked_entry.pack(pady=5)
+        
+        # Dilim boyutlarının nasıl belirleneceği
+        weighting_labels = {"equal": "Eşit", "moves": "Hamle sayısına göre", "pieces": "Taş sayısına göre"}
+        ttk.Label(frame, text="Dilim boyutları:").pack(pady=(5, 0))
+        weighting_combo = ttk.Combobox(frame, values=list(weighting_labels.values()), state="readonly", width=25)
+        weighting_combo.set(weighting_labels[self.settings["slice_weighting"]])
+        weighting_combo.pack(pady=5)
+        
+        # Taş başına dilim seçeneği
+        piece_slices_var = tk.BooleanVar(value=self.settings["piece_slices"])
+        ttk.Checkbutton(frame, text="Her taşa ayrı dilim (ör. Piyon e2)", variable=piece_slices_var).pack(pady=5)
+        
+        # İkinci aşama: seçilen taşın hamleleri için dümen
+        move_wheel_var = tk.BooleanVar(value=self.settings["move_wheel"])
+        ttk.Checkbutton(frame, text="Taştan sonra hamle dümenini de çevir", variable=move_wheel_var).pack(pady=5)
+        
+        # Animasyonu atlayıp sonucu hemen gösterme seçeneği
+        instant_var = tk.BooleanVar(value=self.settings["instant_result"])
+        ttk.Checkbutton(frame, text="Animasyonsuz, anında sonuç", variable=instant_var).pack(pady=5)
+        
+        # Dilim etiketlerinin dümen görseline işlenmesi
+        bitmap_labels_var = tk.BooleanVar(value=self.settings["label_mode"] == "bitmap")
+        ttk.Checkbutton(frame, text="Etiketleri dümen görseline işle", variable=bitmap_labels_var).pack(pady=5)
+        
+        # Dilim önerileri için UCI motoru
+        ttk.Label(frame, text="UCI motoru (öneriler için, boş: kapalı):").pack(pady=(5, 0))
+        engine_entry = ttk.Entry(frame, width=40)
+        engine_entry.insert(0, self.settings["engine_path"])
+        engine_entry.pack(pady=5)
+        
+        # Dilimlerde kitap hamlesi göstermek için açılış kitabı
+        ttk.Label(frame, text="Açılış kitabı (.bin, boş: kapalı):").pack(pady=(5, 0))
+        book_entry = ttk.Entry(frame, width=40)
+        book_entry.insert(0, self.settings["book_path"])
+        book_entry.pack(pady=5)
+        
+        # Yayın katmanı olay sunucusunun portu
+        ttk.Label(frame, text="Yayın katmanı portu (0: kapalı):").pack(pady=(5, 0))
+        overlay_entry = ttk.Entry(frame, width=10)
+        overlay_entry.insert(0, str(self.settings["overlay_port"]))
+        overlay_entry.pack(pady=5)
+        
+        # Lichess sunucusunun adresi (ör. yerel taklit sunucu)
+        ttk.Label(frame, text="Sunucu adresi:").pack(pady=(5, 0))
+        base_url_entry = ttk.Entry(frame, width=40)
+        base_url_entry.insert(0, self.settings["base_url"])
+        base_url_entry.pack(pady=5)
+        
         # Ayarları kaydetme fonksiyonu
         def save_settings():
             # Yuvarlanan değeri ayarlara kaydet
@@ -504,6 +1158,72 @@ class DumenApp:
             # Yeni değeri animasyon süresine uygula (ms cinsinden)
             self.animation_duration = self.settings["rotation_time"] * 1000
             
+            # Canlı takip ayarı değiştiyse takipçiyi yeniden başlat
+            if follow_var.get() != self.settings["follow_game"]:
+                self.settings["follow_game"] = follow_var.get()
+                self.restart_follower()
+            
+            # Disk önbelleği ayarı değiştiyse önbelleği yeniden oluştur
+            if disk_cache_var.get() != self.settings["disk_cache"]:
+                self.settings["disk_cache"] = disk_cache_var.get()
+                self.create_position_cache()
+            
+            # Otomatik çevirme ayarını kaydet
+            self.settings["auto_spin"] = auto_spin_var.get()
+            
+            # Dilim boyutu ayarını kaydet (bir sonraki çevirmede uygulanır)
+            for mode, label in weighting_labels.items():
+                if weighting_combo.get() == label:
+                    self.settings["slice_weighting"] = mode
+            
+            # Taş başına dilim ayarını kaydet (bir sonraki çevirmede uygulanır)
+            self.settings["piece_slices"] = piece_slices_var.get()
+            
+            # Hamle dümeni ayarını kaydet (bir sonraki çevirmede uygulanır)
+            self.settings["move_wheel"] = move_wheel_var.get()
+            
+            # Anında sonuç ayarını kaydet
+            self.settings["instant_result"] = instant_var.get()
+            
+            # Etiket modunu kaydet (bir sonraki çevirmede uygulanır)
+            self.settings["label_mode"] = "bitmap" if bitmap_labels_var.get() else "canvas"
+            
+            # Motor değiştiyse havuzu yeni motorla yeniden başlat
+            engine_path = engine_entry.get().strip()
+            if engine_path != self.settings["engine_path"]:
+                self.settings["engine_path"] = engine_path
+                self.restart_engine_pool()
+            
+            # Açılış kitabı değiştiyse yeni kitabı aç
+            book_path = book_entry.get().strip()
+            if book_path != self.settings["book_path"]:
+                self.settings["book_path"] = book_path
+                self.load_opening_book()
+            
+            # Katman portu değiştiyse sunucuyu yeni portta başlat
+            overlay_port = parse_port(overlay_entry.get())
+            if overlay_port != self.settings["overlay_port"]:
+                self.settings["overlay_port"] = overlay_port
+                self.restart_overlay()
+            
+            # API anahtarı değiştiyse olay akışı dinleyicisini yeniden başlat
+            api_token = token_entry.get().strip()
+            if api_token != self.settings["api_token"]:
+                self.settings["api_token"] = api_token
+                self.restart_event_watcher()
+            
+            # Takip listesi değiştiyse çok kullanıcılı takipçiyi yeniden başlat
+            tracked_users = tracked_entry.get().strip()
+            if tracked_users != self.settings["tracked_users"]:
+                self.settings["tracked_users"] = tracked_users
+                self.restart_tracker()
+            
+            # Sunucu adresi değiştiyse tüm ağ bileşenlerini yeni adrese yönlendir
+            base_url = base_url_entry.get().strip().rstrip("/") or LICHESS_URL
+            if base_url != self.settings["base_url"]:
+                self.settings["base_url"] = base_url
+                self.set_base_url(base_url)
+            
             # Ayarlar penceresini kapat
             settings_dialog.destroy()
         
@@ -554,6 +1274,14 @@ class DumenApp:
             # Dümeni hemen göster
             self.display_initial_wheel()
             
+            # Eski görselin kareleri artık geçersiz; yenileri gerektiğinde kurulur
+            self.reset_frame_caches()
+            
+            # Tuval etiket modunda döndürülmüş kareleri arka planda hazırla;
+            # çevirmeler ana iş parçacığında PIL çalıştırmaz
+            if self.settings["label_mode"] == "canvas":
+                self.wheel_frames()
+            
             # İşlemin başarılı olduğunu kullanıcıya bildir
             self.status_var.set("Dümen resmi yüklendi. Çevirmeye hazır.")
             
@@ -611,20 +1339,27 @@ class DumenApp:
                     tags=("arrow",)
                 )
 
-    def spin_wheel(self, pieces):
+    def spin_wheel(self, pieces, stage="piece"):
         """
         Dümen çevirme animasyonunu başlatır.
         
         Bu metod, dümen çarkının dönüş animasyonunu hazırlar ve başlatır.
         Taşları dümenin etrafına yerleştirir ve kullanıcının seçeceği
-        taşı belirlemek için animasyon sürecini yönetir.
+        taşı belirlemek için animasyon sürecini yönetir. Hamle dümeni de
+        aynı animasyonu ve döndürülmüş görüntü önbelleğini kullanır.
         
         Parametreler:
             pieces (list): Dümen etrafına yerleştirilecek taş isimleri listesi
+            stage (str): "piece" taş dümeni, "move" seçilen taşın hamle (SAN) dümeni
         """
         # Zaten animasyon çalışıyorsa işlemi engelle
         if self.is_animating:
             return
+        self.wheel_stage = stage
+        
+        # Taş başına dilim modunda tipleri tek tek taşlara aç
+        if stage == "piece" and self.settings["piece_slices"] and pieces:
+            pieces = self.analysis_cache.analyze(self.board).labels(per_piece=True)
             
         # Önceki sonucu temizle
         self.result_var.set("")
@@ -660,8 +1395,38 @@ class DumenApp:
                 tags=("arrow",)
             )
         
-        # Taşları dümenin etrafına yerleştir
-        self.position_pieces_around_wheel(pieces, center_x, center_y)
+        # Önceki çevirmenin motor önerileri ve kitap notları yeni dilimlere işlenmesin
+        self.hints = {}
+        self.book_moves = {}
+        
+        # Taşları dümenin etrafına yerleştir (ağırlıklı modda dilimler hareketliliğe göre)
+        weights = self.slice_weights(pieces) if stage == "piece" else None
+        self.position_pieces_around_wheel(pieces, center_x, center_y, weights)
+        
+        if stage == "piece":
+            # Dümen dönerken her dilim için motor önerisini hazırlamaya başla
+            self.start_hints(pieces)
+            
+            # Kitap notlarını ilk kare çizildikten sonra ekle; çevirmenin başlamasını geciktirmesin
+            if self.opening_book:
+                spin_id = self.spin_id
+                self.root.after(0, lambda: self.show_book_moves(spin_id, pieces))
+            
+            # Hamle dümeninin dilimlerini taş dümeni dönerken hazırla
+            self.prepare_move_options(pieces)
+        else:
+            # Hamle dümeninde öneri ve kitap notu yok; taş dümeninden geç gelenler yok sayılır
+            self.spin_id += 1
+        
+        # Yörüngeyi baştan belirle; sonuç son açıdan ve dilim düzeninden hemen bilinir
+        self.trajectory = SpinTrajectory.random(self.spin_rng, self.target_rotations, self.animation_duration)
+        self.spin_outcome = None
+        if self.wheel_sectors:
+            self.spin_outcome = self.wheel_pieces[self.trajectory.outcome(self.wheel_sectors)]
+        
+        # Etiketli dümenin yörüngede uğranacak karelerini animasyonun önünde döndür
+        if self.spin_frames and not self.settings["instant_result"]:
+            self.spin_frames.prerender(self.spin_frames.trajectory_indices(self.trajectory))
         
         # Animasyon değişkenlerini başlat
         self.is_animating = True
@@ -669,22 +1434,343 @@ class DumenApp:
         self.current_angle = 0
         self.rotation_count = 0
         
+        # Katmanlara yörüngeyi bildir; anında sonuçta katman da doğrudan son açıyı gösterir
+        if self.overlay and self.wheel_sectors:
+            started_at = self.animation_start_time
+            if self.settings["instant_result"]:
+                started_at -= self.trajectory.duration_ms
+            self.overlay.publish("spin", spin_event(
+                self.spin_id, stage, [self.slice_text(piece) for piece in self.wheel_pieces],
+                self.wheel_sectors, self.trajectory, started_at))
+        
+        # Anında sonuç modunda dümen doğrudan son açıya getirilir
+        if self.settings["instant_result"]:
+            self.finish_animation()
+            return
+        
         # Animasyonu başlat
         self.animate_wheel()
 
-    def position_pieces_around_wheel(self, pieces, center_x, center_y):
+    def prepare_move_options(self, pieces):
+        """
+        Taş dümenindeki her dilimin yasal hamlelerini arka planda hesaplar.
+        
+        Seçilecek taş henüz bilinmediğinden tüm dilimler hazırlanır; hamle
+        üretimi dilimin taşlarıyla maskelenir. Böylece taş dümeni durduğunda
+        hamle dümeni beklemeden çevrilebilir.
+        
+        Parametreler:
+            pieces (list): Taş dümenindeki taş isimleri
+        """
+        self.move_options = {}
+        if not self.settings["move_wheel"] or not pieces:
+            return
+        
+        spin_id = self.spin_id
+        board = self.board.copy(stack=False)
+        
+        def work():
+            options = {}
+            for piece in pieces:
+                piece_type, square = parse_piece_label(piece)
+                options[piece] = [board.san(move) for move in legal_moves_of(board, piece_type, square)]
+            
+            def store():
+                # Bu arada yeni bir çevirme başladıysa eski hamleleri saklama
+                if spin_id == self.spin_id:
+                    self.move_options = options
+            self.root.after(0, store)
+        
+        threading.Thread(target=work, daemon=True).start()
+    
+    def spin_move_wheel(self, spin_id, piece):
+        """
+        Taş dümeninde seçilen taşın yasal hamleleriyle ikinci dümeni çevirir.
+        
+        Parametreler:
+            spin_id (int): Hamle dümeninin ait olduğu taş çevirmesi
+            piece (str): Taş dümeninde seçilen taşın adı
+        """
+        # Bu arada yeni bir çevirme başladıysa hamle dümenini açma
+        if spin_id != self.spin_id or self.is_animating:
+            return
+        
+        moves = self.move_options.get(piece)
+        if moves is None:
+            # Hazırlık henüz bitmediyse yalnızca bu taşın hamlelerini hemen üret
+            piece_type, square = parse_piece_label(piece)
+            moves = [self.board.san(move) for move in legal_moves_of(self.board, piece_type, square)]
+        
+        self.selected_piece = piece
+        self.spin_wheel(moves, stage="move")
+    
+    def start_hints(self, pieces):
+        """
+        Dümendeki tüm taş tipleri için motor analizini çevirme sürerken başlatır.
+        
+        Seçilecek taş henüz bilinmediğinden tüm dilimler analiz edilir; süre
+        bütçesi animasyondan uzun tutulmaz, böylece öneri sonuç gösterildiğinde
+        çoğunlukla hazırdır. Hazır olan öneriler dilim etiketlerine eklenir.
+        
+        Parametreler:
+            pieces (list): Dümendeki taş isimleri
+        """
+        self.spin_id += 1
+        self.hints = {}
+        if not self.engine_pool or not pieces:
+            return
+        
+        spin_id = self.spin_id
+        budget = min(self.settings["engine_time"], self.animation_duration / 1000)
+        targets = [parse_piece_label(piece) for piece in pieces]
+        futures = self.engine_pool.speculate(self.board, targets, budget)
+        
+        for index, piece in enumerate(pieces):
+            def done(future, index=index, piece=piece):
+                # Motorun iş parçacığından çağrılır; arayüz güncellemesi ana iş parçacığına aktarılır
+                if not future.cancelled() and future.exception() is None and future.result():
+                    self.root.after(0, lambda: self.show_hint(spin_id, index, piece, future.result()))
+            futures[targets[index]].add_done_callback(done)
+    
+    def show_hint(self, spin_id, index, piece, hint):
+        """
+        Hazır olan motor önerisini dilim etiketine ve gerekirse sonuca ekler.
+        
+        Parametreler:
+            spin_id (int): Önerinin ait olduğu çevirme
+            index (int): Dilimin sırası
+            piece (str): Dilimdeki taşın adı
+            hint (dict): Motor önerisi ({"move", "san", "score"})
+        """
+        # Bu arada yeni bir çevirme başladıysa eski öneriyi gösterme
+        if spin_id != self.spin_id:
+            return
+        
+        self.hints[piece] = hint
+        self.update_slice_label(index, piece)
+        
+        # Animasyon öneriden önce bittiyse sonucu şimdi tamamla
+        if not self.is_animating and self.determine_selected_piece() == piece:
+            self.show_result(piece)
+    
+    def show_book_moves(self, spin_id, pieces):
+        """
+        Açılış kitabında hamlesi olan dilimlerin etiketlerine kitap hamlesini ekler.
+        
+        Kitap pozisyon başına bir kez aranır ve sonuç önbelleğe alınır; tüm
+        dilimler aynı gruplanmış sonuçtan okunur.
+        
+        Parametreler:
+            spin_id (int): Notların ait olduğu çevirme
+            pieces (list): Dümendeki taş isimleri
+        """
+        # Bu arada yeni bir çevirme başladıysa eski notları gösterme
+        if spin_id != self.spin_id or not self.opening_book:
+            return
+        
+        targets = [parse_piece_label(piece) for piece in pieces]
+        annotations = self.opening_book.annotate(self.board, targets)
+        
+        for index, piece in enumerate(pieces):
+            book_move = annotations.get(targets[index])
+            if not book_move:
+                continue
+            self.book_moves[piece] = book_move
+            self.update_slice_label(index, piece)
+        
+        # Animasyon notlardan önce bittiyse sonucu notla birlikte yeniden göster
+        if not self.is_animating and self.book_moves:
+            result = self.determine_selected_piece()
+            if result in self.book_moves:
+                self.show_result(result)
+    
+    def slice_weights(self, pieces):
+        """
+        Ayarlara göre her taş diliminin ağırlığını hesaplar.
+        
+        Hamle ve taş sayıları, pozisyonun analiz önbelleğindeki tek hamle
+        üretimi geçişinden alınır. Taş başına dilim modunda hamle sayısı
+        yalnızca o karedeki taşın hamleleridir.
+        
+        Parametreler:
+            pieces (list): Dümendeki taş isimleri (ör. "At" ya da "At g1")
+        
+        Dönüş değeri:
+            list: Taşlarla aynı sırada ağırlıklar, eşit dilim modunda None
+        """
+        mode = self.settings["slice_weighting"]
+        if mode == "equal" or not pieces:
+            return None
+        
+        analysis = self.analysis_cache.analyze(self.board)
+        mobility = analysis.mobility()
+        weights = []
+        for piece in pieces:
+            piece_type, square = parse_piece_label(piece)
+            if square is None:
+                weight = mobility.get(piece_type, {}).get(mode, 1)
+            elif mode == "moves":
+                weight = sum(1 for move in analysis.moves_by_type().get(piece_type, [])
+                             if move.from_square == square)
+            else:
+                weight = 1  # Her dilim zaten tek bir taş
+            weights.append(max(1, weight))
+        return weights
+
+    def label_text(self, piece):
+        """
+        Dilim etiketinin tuvalde gösterilecek metni; taş başına etiketler iki satıra bölünür.
+        """
+        return piece.replace(" ", "\n")
+    
+    def slice_text(self, piece):
+        """
+        Dilim etiketinin varsa kitap hamlesi ve motor önerisiyle birlikte metni.
+        """
+        lines = [self.label_text(piece)]
+        book_move = self.book_moves.get(piece)
+        if book_move:
+            lines.append(f"Kitap: {book_move['san']}")
+        hint = self.hints.get(piece)
+        if hint:
+            lines.append(hint["san"])
+        return "\n".join(lines)
+
+    def update_slice_label(self, index, piece):
+        """
+        Dilim etiketinin metnini (kitap hamlesi, motor önerisi) günceller.
+        
+        Görsel etiket modunda etiketler dümen görseline işlendiğinden görsel
+        yeniden oluşturulur; aynı anda gelen notlar tek seferde, dönüş
+        sırasında gelenler dümen durunca işlenir.
+        
+        Parametreler:
+            index (int): Dilimin sırası
+            piece (str): Dilimdeki taşın adı
+        """
+        if index >= len(self.piece_positions):
+            return
+        if self.overlay:
+            self.overlay.publish("label", {"spin_id": self.spin_id, "index": index, "text": self.slice_text(piece)})
+        if self.spin_frames:
+            # Dönüş sırasında görseli yeniden oluşturmak önceden döndürülmüş kareleri
+            # boşa çıkarır; not dümen durunca işlenir (bkz. finish_animation)
+            if not self.labels_dirty:
+                self.labels_dirty = True
+                if not self.is_animating:
+                    self.root.after(0, self.recompose_labels)
+        else:
+            self.canvas.itemconfig(self.piece_positions[index]["id"], text=self.slice_text(piece))
+    
+    def wheel_frames(self):
+        """
+        Tuvalde gösterilen dümenin kare önbelleğini döndürür.
+        
+        Görsel etiket modunda bu çevirmenin etiketli görselinin önbelleği,
+        yoksa düz dümenin önbelleği kullanılır. Düz dümenin önbelleği ilk
+        gerektiğinde kurulur; tüm tur yalnızca her çevirmede kullanıldığı
+        tuval etiket modunda önceden hazırlanır.
+        """
+        if self.spin_frames:
+            return self.spin_frames
+        if not self.frame_cache:
+            self.frame_cache = RotationFrameCache(self.wheel_image_original, self.settings["frame_step"],
+                                                  self.settings["frame_cache_mb"] * 1024 * 1024)
+            if self.settings["label_mode"] == "canvas":
+                cache = self.frame_cache
+                on_done = None
+                if DEBUG:
+                    on_done = lambda: print(
+                        f"Dümen kareleri hazır: {len(cache.frames)} kare, {cache.size // (1024 * 1024)} MB")
+                cache.prewarm(self.root, on_done=on_done)
+        return self.frame_cache
+    
+    def reset_frame_caches(self, plain=True, labels=True):
         """
-        Taş isimlerini dümenin etrafına düzenli bir şekilde yerleştirir.
+        Kare önbelleklerini durdurur ve bırakır (dümen görseli ya da etiket modu değiştiğinde).
         
-        Bu metod, oynanabilir taş isimlerini dümen çarkının etrafında eşit aralıklarla
-        konumlandırır. Her taşın adını, dümenin dönüşüne uygun şekilde yerleştirir ve
-        animasyon sırasında pozisyonlarını güncellemek için gerekli bilgileri saklar.
+        Parametreler:
+            plain (bool): Düz dümenin önbelleği bırakılsın mı
+            labels (bool): Etiketli görsellerin önbellekleri bırakılsın mı
+        """
+        if plain and self.frame_cache:
+            self.frame_cache.stop()
+            self.frame_cache = None
+        if labels:
+            for cache in self.label_frames.values():
+                cache.stop()
+            self.label_frames.clear()
+            self.spin_frames = None
+    
+    def compose_spin_wheel(self):
+        """
+        Dilim etiketlerini ve sınırlarını dümen görseline işler ve bu çevirmenin kare önbelleğini seçer.
+        
+        Aynı etiket düzeni (ör. aynı konumda yeniden çevirme ya da notların
+        gelmesinden önceki görünüm) daha önce işlendiyse önbelleği kareleriyle
+        birlikte yeniden kullanılır. En fazla LABEL_FRAME_CACHES önbellek
+        saklanır ve kare bütçesi aralarında bölünür.
+        """
+        font_size, upright, boundaries = self.label_style
+        labels = [self.slice_text(piece) for piece in self.wheel_pieces]
+        key = (tuple(labels), tuple(self.wheel_sectors.centers), font_size, upright, tuple(boundaries))
+        self.labels_dirty = False
+        
+        cache = self.label_frames.pop(key, None)
+        if cache is None:
+            image = compose_wheel(self.wheel_image_original, labels, self.wheel_sectors.centers,
+                                  font_size, boundaries, upright)
+            cache = RotationFrameCache(image, self.settings["frame_step"],
+                                       self.settings["frame_cache_mb"] * 1024 * 1024 // LABEL_FRAME_CACHES)
+        self.label_frames[key] = cache
+        
+        # En uzun süredir kullanılmayan önbellekleri bırak
+        while len(self.label_frames) > LABEL_FRAME_CACHES:
+            _, old_cache = self.label_frames.popitem(last=False)
+            old_cache.stop()
+        
+        if self.spin_frames and self.spin_frames is not cache:
+            self.spin_frames.cancel()
+        self.spin_frames = cache
+    
+    def recompose_labels(self):
+        """
+        Değişen notlarla birleşik görseli yeniden oluşturur ve gösterir.
+        
+        Dönüş sırasında hiçbir şey yapmaz; o sırada gelen notlar dümen
+        durunca finish_animation tarafından tek seferde işlenir.
+        """
+        if not self.labels_dirty or self.is_animating or not self.spin_frames:
+            return
+        
+        self.compose_spin_wheel()
+        self.rotate_wheel_to_angle(self.current_angle)
+    
+    def position_pieces_around_wheel(self, pieces, center_x, center_y, weights=None):
+        """
+        Taş isimlerini dümenin etrafına dilimlerinin ortasına gelecek şekilde yerleştirir.
+        
+        Bu metod, oynanabilir taş isimlerini dümen çarkının etrafında eşit ya da
+        ağırlıklarla orantılı dilimlere yerleştirir. Her taşın adını dilimin
+        ortasına koyar, ağırlıklı modda dilim sınırlarını kısa çizgilerle gösterir
+        ve animasyon sırasında pozisyonlarını güncellemek için gerekli bilgileri saklar.
         
         Parametreler:
             pieces (list): Yerleştirilecek taş isimlerinin listesi
             center_x (int): Dümenin merkez X koordinatı
             center_y (int): Dümenin merkez Y koordinatı
+            weights (list): Dilim ağırlıkları, None ise tüm dilimler eşit
         """
+        # Animasyon için taş konumlarını sakla
+        self.piece_positions = []
+        self.ring = RingItems(str(self.canvas))
+        if self.spin_frames:
+            self.spin_frames.cancel()
+            self.spin_frames = None
+        self.ring_angle = None
+        self.wheel_pieces = list(pieces)
+        self.wheel_sectors = None
+        
         # Eğer taş listesi boşsa işlemi sonlandır
         if not pieces:
             return
@@ -692,17 +1778,38 @@ class DumenApp:
         # Dümen çarkının yarıçapını hesapla
         wheel_radius = self.wheel_image.width() // 2
         
-        # Taşların yerleştirileceği açıları hesapla
-        num_pieces = len(pieces)
-        angle_step = 360 / num_pieces  # Taşlar arasındaki açı farkı
+        # Dilimlerin açılarını hesapla (okun gösterdiği dilim açıya göre bulunur)
+        self.wheel_sectors = WheelSectors(weights or [1] * len(pieces))
+        
+        # Taş başına modda etiketler dik durur ve toplu güncellenir;
+        # her karede onlarca döndürülmüş yazıyı yeniden çizmek 60 FPS'i düşürür
+        upright = self.settings["piece_slices"] or self.wheel_stage == "move"
+        font_size = 16 if len(pieces) <= 8 else 11
+        
+        # Görsel etiket modunda etiketler ve sınırlar dümen görseline bir kez işlenir;
+        # karede yalnızca tek görsel döner, maliyet dilim sayısıyla artmaz
+        if self.settings["label_mode"] == "bitmap":
+            self.label_style = (font_size, upright, self.wheel_sectors.starts if weights else ())
+            for angle in self.wheel_sectors.centers:
+                self.piece_positions.append({"id": None, "angle": angle, "radius": wheel_radius + 40, "upright": True})
+            # Düz dümenin (tuval modunda önceden hazırlanmış) kareleri bu modda kullanılmaz
+            self.reset_frame_caches(labels=False)
+            self.compose_spin_wheel()
+            return
         
-        # Animasyon için taş konumlarını sakla
-        self.piece_positions = []
+        # Tuval etiket modunda etiketli görsellerin kareleri kullanılmaz
+        self.reset_frame_caches(plain=False)
+        
+        # Ağırlıklı dilimlerin sınırlarını göster
+        if weights:
+            for start in self.wheel_sectors.starts:
+                line_id = self.canvas.create_line(0, 0, 0, 0, fill="#888888", width=2, tags=("boundary",))
+                self.ring.add(line_id, start, wheel_radius + 10, wheel_radius + 70)
         
         # Her bir taş için metin öğeleri oluştur
         for i, piece in enumerate(pieces):
-            # Taşın açı değerini hesapla
-            angle = i * angle_step
+            # Taşın açı değerini hesapla (dilimin ortası)
+            angle = self.wheel_sectors.centers[i]
             radians = math.radians(angle)
             
             # Metni dümenin dışında konumlandır
@@ -715,10 +1822,11 @@ class DumenApp:
             # Benzersiz bir etiketle metin oluştur
             text_id = self.canvas.create_text(
                 x, y, 
-                text=piece,  # Taşın adı
-                font=("Arial", 16, "bold"),  # Kalın yazı tipi
+                text=self.label_text(piece),  # Taşın adı
+                font=("Arial", font_size, "bold"),  # Kalın yazı tipi
                 fill="black",  # Siyah renk
-                angle=-angle,  # Okunaklı kalması için metni ters döndür
+                justify=tk.CENTER,  # Çok satırlı etiketleri ortala
+                angle=0 if upright else -angle,  # Okunaklı kalması için metni ters döndür
                 tags=(f"piece_{i}", "piece")  # Tanımlama etiketleri
             )
             
@@ -726,8 +1834,14 @@ class DumenApp:
             self.piece_positions.append({
                 "id": text_id,      # Tuval üzerindeki metin öğesinin ID'si
                 "angle": angle,     # Taşın başlangıç açısı
-                "radius": text_radius  # Merkeze olan uzaklığı
+                "radius": text_radius,  # Merkeze olan uzaklığı
+                "upright": upright  # Toplu güncellenen dik etiket mi
             })
+            if upright:
+                self.ring.add(text_id, angle, text_radius)
+        
+        # Toplu öğeleri başlangıç konumlarına yerleştir
+        self.update_ring_positions(0)
 
     def animate_wheel(self):
         """
@@ -750,22 +1864,9 @@ class DumenApp:
             self.finish_animation()
             return
 
-        # İlerleme oranını hesapla (0-1 arası)
-        progress = elapsed / self.animation_duration
-        
-        # Geliştirilmiş yumuşatma faktörünü hesapla
-        # Animasyonun sonuna doğru daha dramatik bir yavaşlama efekti için
-        # easeOutCubic ve easeOutQuint kombinasyonu kullanılıyor
-        if progress < 0.7:  # Animasyonun ilk %70'i - daha sabit hız
-            eased_progress = 0.7 * progress / 0.7
-        else:  # Son %30 - dramatik yavaşlama
-            p = (progress - 0.7) / 0.3  # Bu segment için 0-1 aralığına normalize et
-            # Daha belirgin yavaşlama eğrisi
-            eased_progress = 0.7 + 0.3 * (1 - (1 - p) ** 5)
-        
-        # Tam olarak hedef dönüş sayısı artı rastgele bir bitiş pozisyonu sağla
-        total_rotations = self.target_rotations + (random.random() * 0.8 + 0.1)  # Rastgele final pozisyonu
-        target_angle = total_rotations * 360 * eased_progress
+        # Açıyı çevirme başında belirlenen yörüngeden oku (ilk %70 sabit hız,
+        # son %30 easeOutQuint ile belirgin yavaşlama; bkz. wheel_layout.ease_out)
+        target_angle = self.trajectory.angle_at(elapsed)
         
         # Tekerleğin dönüşünü hesaplanan açıya göre güncelle
         self.rotate_wheel_to_angle(target_angle)
@@ -784,34 +1885,26 @@ class DumenApp:
         """
         Dümen çarkını belirtilen açıya döndürür.
         
-        Bu metod, performans optimizasyonu için önbellek mekanizması kullanır.
-        Her 10 derecelik açı için döndürülmüş resimler önbelleğe alınarak
-        tekrar hesaplama maliyetinden kaçınılır.
+        Görüntü, açıyı ayarlardaki adıma yuvarlayan kare önbelleğinden
+        alınır; kareler dümen yüklenirken önceden hazırlandığından dönüş
+        sırasında döndürme yapılmaz. Taşlar ve sonuç tam açıyı kullanır.
         
         Parametreler:
             angle (float): Dümenin döndürüleceği açı değeri (derece cinsinden)
         """
-        # Performans optimizasyonu için belirli aralıklarla önbelleğe alma
-        cache_key = int(angle / 10) * 10  # Her 10 derecede bir önbelleğe al
-        
-        if cache_key in self.wheel_images_cache:
-            # Eğer bu açı için daha önce hesaplanmış bir görüntü varsa kullan
-            rotated_image = self.wheel_images_cache[cache_key]
-        else:
-            # Orijinal görüntüyü istenilen açıya döndür
-            # Saat yönünde dönüş için negatif açı kullanılır
-            rotated_img = self.wheel_image_original.rotate(-angle)
-            rotated_image = ImageTk.PhotoImage(rotated_img)
-            
-            # Bellek yönetimini optimize etmek için sadece 10'un katı olan açıları önbelleğe al
-            if angle % 10 < 0.1:
-                self.wheel_images_cache[cache_key] = rotated_image
+        # Yuvarlanmış açının karesini önbellekten al (yoksa üretilip eklenir);
+        # görsel etiket modunda etiketleri işlenmiş bu çevirmenin görseli döner
+        rotated_image = self.wheel_frames().get(angle)
         
         # Dümen görselini güncelle
         self.canvas.itemconfig("wheel", image=rotated_image)
         
-        # Çöp toplayıcının görüntüyü silmemesi için referansı sakla
-        self.wheel_image = rotated_image
+        # Çöp toplayıcının görüntüyü silmemesi için referansı sakla (birleşik
+        # görsel dümenden büyük olduğundan boyutlar için wheel_image korunur)
+        self.wheel_frame = rotated_image
+        
+        # Sonucun açıdan bulunabilmesi için son açıyı sakla
+        self.current_angle = angle
         
         # Taşların konumlarını yeni açıya göre güncelle
         self.update_piece_positions(angle)
@@ -827,6 +1920,10 @@ class DumenApp:
         Parametreler:
             angle (float): Dümenin mevcut dönüş açısı (derece cinsinden)
         """
+        # Görsel etiket modunda etiketler dümenle birlikte döner; güncellenecek öğe yok
+        if self.spin_frames:
+            return
+        
         # Tuval boyutlarını al ve merkez koordinatlarını hesapla
         canvas_width = self.canvas.winfo_width()
         canvas_height = self.canvas.winfo_height()
@@ -835,6 +1932,10 @@ class DumenApp:
         
         # Tüm taş konumları için yeni pozisyonları hesapla ve uygula
         for pos in self.piece_positions:
+            # Dik etiketler aşağıda toplu olarak güncellenir
+            if pos["upright"]:
+                continue
+            
             # Taşın yeni açısını hesapla (başlangıç açısı + dümen dönüş açısı)
             new_angle = pos["angle"] + angle
             # Açıyı radyana çevir (trigonometrik hesaplamalar için)
@@ -848,76 +1949,126 @@ class DumenApp:
             self.canvas.coords(pos["id"], x, y)
             # Metnin dönüş açısını güncelle (okunabilirliği korumak için ters döndür)
             self.canvas.itemconfig(pos["id"], angle=-new_angle)  # Metni ters yönde döndür
+        
+        # Sınır çizgilerini ve dik etiketleri tek seferde döndür
+        self.update_ring_positions(angle)
+
+    def update_ring_positions(self, angle):
+        """
+        Dümenle dönen toplu öğeleri (sınır çizgileri, dik etiketler) tek bir Tcl çağrısıyla yerleştirir.
+        
+        Dönüşün sonundaki yavaşlamada açı çok az değişir; çeyrek dereceden
+        küçük değişimlerde öğeler yeniden yerleştirilmez.
+        
+        Parametreler:
+            angle (float): Dümenin mevcut dönüş açısı (derece cinsinden)
+        """
+        if not self.ring:
+            return
+        if self.ring_angle is not None and abs(angle - self.ring_angle) < 0.25:
+            return
+        self.ring_angle = angle
+        
+        center_x = self.canvas.winfo_width() // 2
+        center_y = self.canvas.winfo_height() // 2
+        self.canvas.tk.eval(self.ring.script(center_x, center_y, angle))
 
     def finish_animation(self):
         """
         Dümen animasyonunu sonlandırır ve sonucu belirler.
         
-        Bu metot animasyonun bitiminde çalışır, dümeni durdurur ve
-        ok işaretinin gösterdiği taşı belirleyerek kullanıcıya sonucu gösterir.
-        Sonuç, görsel olarak vurgulanır ve kullanıcıya hangi taşla hamle yapması
-        gerektiği bildirilir.
+        Bu metot animasyonun bitiminde (anında sonuç modunda hemen) çalışır,
+        dümeni yörüngenin son açısına getirir ve çevirme başında son açıdan
+        bulunan taşı kullanıcıya gösterir. Sonuç, görsel olarak vurgulanır ve
+        kullanıcıya hangi taşla hamle yapması gerektiği bildirilir.
         """
         
         self.is_animating = False  # Animasyon durumunu kapat
-        # Ok işaretinin gösterdiği taşı bul
-        result = self.determine_selected_piece()
-
+        
+        # Son karede dümeni tam olarak yörüngenin bittiği açıya getir
+        if self.trajectory:
+            self.rotate_wheel_to_angle(self.trajectory.final_angle)
+        
+        # Bu çevirmede kullanılan (görsel etiket modunda etiketli görselin) önbelleği
+        if DEBUG:
+            cache = self.wheel_frames()
+            print(f"Kare önbelleği: isabet oranı %{cache.hit_rate() * 100:.1f}, "
+                  f"{len(cache.frames)} kare")
+        
+        # Dönüş sırasında gelen notları dümen durduktan sonra tek seferde işle
+        self.recompose_labels()
+        
+        # Sonuç çevirme başında son açıdan bulundu; yoksa okun gösterdiği taşı bul
+        result = self.spin_outcome or self.determine_selected_piece()
         
         if result:
-            # Hamle sırasının hangi renkte olduğunu belirle
-            turn_color = "Beyaz" if self.board.turn else "Siyah"
-            
-            # Sonucu görüntüle
-            result_text = f"{turn_color} TAŞ: {result.upper()}"
-            self.result_var.set(result_text)
+            self.show_result(result)
             
-            # Sonucu görsel olarak vurgula
-            self.result_label.configure(foreground="#FF5722")  # Turuncu renk ile vurgula
+            # Ayar açıksa kısa bir duraklamadan sonra seçilen taşın hamle dümenini çevir
+            if self.wheel_stage == "piece" and self.settings["move_wheel"]:
+                spin_id = self.spin_id
+                self.root.after(MOVE_WHEEL_DELAY, lambda: self.spin_move_wheel(spin_id, result))
         else:
             # Sonuç bulunamazsa hata mesajı göster
             self.result_var.set("Sonuç belirlenemedi!")
 
+    def show_result(self, result):
+        """
+        Seçilen taşı ve varsa motorun o taş için önerdiği hamleyi gösterir.
+        
+        Parametreler:
+            result (str): Seçilen taşın adı, hamle dümeninde seçilen hamle (SAN)
+        """
+        # Hamle sırasının hangi renkte olduğunu belirle
+        turn_color = "Beyaz" if self.board.turn else "Siyah"
+        
+        # Hamle dümeninde taşla birlikte seçilen hamleyi göster
+        if self.wheel_stage == "move":
+            self.result_var.set(f"{turn_color} TAŞ: {self.selected_piece.upper()}, HAMLE: {result}")
+            self.result_label.configure(foreground="#FF5722")
+            self.publish_result()
+            return
+        
+        # Sonucu görüntüle
+        result_text = f"{turn_color} TAŞ: {result.upper()}"
+        hint = self.hints.get(result)
+        if hint:
+            result_text += f" (öneri: {hint['san']})"
+        book_move = self.book_moves.get(result)
+        if book_move:
+            result_text += f" (kitap: {book_move['san']})"
+        self.result_var.set(result_text)
+        
+        # Sonucu görsel olarak vurgula
+        self.result_label.configure(foreground="#FF5722")  # Turuncu renk ile vurgula
+        self.publish_result()
+    
+    def publish_result(self):
+        """
+        Gösterilen sonuç metnini yayın katmanlarına iletir (öneri gelince yeniden).
+        """
+        if self.overlay:
+            self.overlay.publish("result", {"spin_id": self.spin_id, "text": self.result_var.get()})
+
     def determine_selected_piece(self):
         """
         Ok işaretinin gösterdiği taşı belirler.
         
-        Bu metot, ok işaretinin konumunu alır ve dümende bulunan
-        taş isimleri arasından oka en yakın olanı tespit eder. 
-        Uzaklık hesaplaması için Öklid mesafesi kullanılır.
+        Ok 0° yönündedir; dümenin son dönüş açısından okun hangi dilime
+        denk geldiği, dilim sınırları üzerinde ikili aramayla bulunur.
+        Böylece eşit olmayan dilimler de doğru değerlendirilir.
         
         Dönüş değeri:
             str: Seçilen taşın adı, tespit edilemezse None
         """
         try:
-            # Ok işaretinin konumunu al
-            arrow_item = self.canvas.find_withtag("arrow")
-            if not arrow_item:
+            # Dümende dilim yoksa sonuç yok
+            if not self.wheel_sectors:
                 return None
-                
-            arrow_x, arrow_y = self.canvas.coords(arrow_item[0])
             
-            # Oka en yakın taşı bul
-            nearest_piece = None
-            min_distance = float('inf')  # Başlangıçta sonsuz mesafe
-            
-            # Tüm taş konumlarını kontrol et
-            for pos in self.piece_positions:
-                piece_id = pos["id"]
-                piece_x, piece_y = self.canvas.coords(piece_id)
-                
-                # Öklid mesafesini hesapla
-                distance = math.sqrt((piece_x - arrow_x) ** 2 + (piece_y - arrow_y) ** 2)
-                
-                # Eğer daha yakınsa güncelle
-                if distance < min_distance:
-                    min_distance = distance
-                    nearest_piece = piece_id
-            
-            # Eğer bir taş bulunduysa adını döndür
-            if nearest_piece:
-                piece_text = self.canvas.itemcget(nearest_piece, "text")
-                return piece_text
+            # Okun gösterdiği dilimi açıya göre bul
+            index = self.wheel_sectors.index_at(self.current_angle)
+            return self.wheel_pieces[index]
         
         except Exception as e:
             # Hata durumunda konsola bilgi ver
@@ -929,6 +2080,14 @@ def main():
     root = tk.Tk()
     app = DumenApp(root)
     root.mainloop()
+    
+    # Motor süreçlerini, açılış kitabını ve katman sunucusunu kapat
+    if app.engine_pool:
+        app.engine_pool.close()
+    if app.opening_book:
+        app.opening_book.close()
+    if app.overlay:
+        app.overlay.stop()
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,334 @@
+"""
+UCI motor havuzu
+
+Dümenin her dilimini o taş tipiyle oynanabilecek en iyi hamleyle
+işaretlemek için uzun ömürlü UCI motor süreçleri. Her çevirmede yeni bir
+motor başlatmak (süreç açma, `uci`/`isready` el sıkışması) çevirmenin
+kendisinden uzun sürebilir; havuz motorları bir kez başlatır ve açık tutar.
+
+Analiz `root_moves` ile yalnızca ilgili taş tipinin hamleleriyle sınırlanır
+ve çevirmeye ayrılan süre dilimler arasında paylaştırılır. Sonuçlar
+pozisyonun Zobrist anahtarı ve taş tipiyle önbelleğe alınır; aynı analiz
+zaten sürüyorsa ikinci kez başlatılmaz.
+
+Gerçek bir motor olmadan denemek için (bkz. uci_standin.py):
+
+    python engine_pool.py --spins 20
+    python engine_pool.py --engine /usr/bin/stockfish --budget 1
+"""
+import argparse
+import os
+import queue
+import random
+import sys
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+
+import chess
+import chess.engine
+
+from analysis_cache import position_key
+from piece_analysis import legal_moves_of, piece_label
+from position_cache import LRUCache
+
+# Tek bir taş tipine ayrılacak en kısa analiz süresi (saniye)
+MIN_TIME_PER_TYPE = 0.05
+
+
+def standin_command(*args):
+    """
+    Deneme motorunu (uci_standin.py) çalıştıracak komutu döndürür.
+    """
+    return [sys.executable, os.path.join(os.path.dirname(os.path.abspath(__file__)), "uci_standin.py"), *args]
+
+
+class EnginePool:
+    """
+    Açık tutulan UCI motorlarından oluşan, iş parçacıklarından güvenle kullanılabilen havuz.
+
+    Motorlar ilk ihtiyaç duyulduğunda ya da `start` ile önceden başlatılır.
+    Çöken bir motor havuzdan çıkarılır; yerine bir sonraki istekte yenisi açılır.
+    """
+    def __init__(self, command, size=1, options=None, cache_size=1024):
+        """
+        Parametreler:
+            command (str | list): Motoru başlatan komut (ör. "stockfish")
+            size (int): Aynı anda açık tutulacak motor sayısı
+            options (dict): Motorlara gönderilecek UCI seçenekleri (ör. {"Threads": 1})
+            cache_size (int): Önbellekte tutulacak en fazla öneri sayısı
+        """
+        self.command = command
+        self.size = max(1, size)
+        self.options = options or {}
+
+        self.cache = LRUCache(cache_size)  # (pozisyon anahtarı, taş tipi) -> öneri
+        self._pending = {}  # Sürmekte olan analizler: anahtar -> Future
+        self._idle = queue.Queue()  # Boştaki motorlar
+        self._engines = []  # Açık olan tüm motorlar
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=self.size, thread_name_prefix="engine")
+        self._closed = False
+
+        # İstatistikler
+        self.hits = 0
+        self.misses = 0
+        self.started = 0
+
+    def start(self):
+        """
+        Havuzdaki tüm motorları önceden başlatır; ilk çevirme el sıkışmasını beklemez.
+
+        Hatalar:
+            OSError, chess.engine.EngineError: Motor başlatılamazsa
+        """
+        engines = []
+        while True:
+            with self._lock:
+                if len(self._engines) + len(engines) >= self.size:
+                    break
+            engines.append(self._open())
+        for engine in engines:
+            self._checkin(engine)
+
+    def _open(self):
+        """
+        Yeni bir motor süreci başlatıp havuza kaydeder.
+        """
+        engine = chess.engine.SimpleEngine.popen_uci(self.command)
+        if self.options:
+            engine.configure(self.options)
+        with self._lock:
+            self._engines.append(engine)
+            self.started += 1
+        return engine
+
+    def _checkout(self):
+        """
+        Boştaki bir motoru alır; yoksa ve havuz dolmadıysa yenisini başlatır, doluysa bekler.
+        """
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+        with self._lock:
+            can_open = len(self._engines) < self.size
+        return self._open() if can_open else self._idle.get()
+
+    def _checkin(self, engine):
+        self._idle.put(engine)
+
+    def _discard(self, engine):
+        """
+        Çöken ya da yanıt vermeyen motoru havuzdan çıkarır.
+        """
+        with self._lock:
+            if engine in self._engines:
+                self._engines.remove(engine)
+        try:
+            engine.close()
+        except Exception:
+            pass
+
+    def best_move(self, board, piece_type, time_limit, square=None):
+        """
+        `piece_type` tipindeki taşlarla (ya da `square` karesindeki taşla) oynanabilecek en iyi hamleyi bulur.
+
+        Tek yasal hamle varsa motora sorulmaz. Sonuç önbelleğe alınır.
+
+        Parametreler:
+            board (chess.Board): Analiz edilecek pozisyon
+            piece_type (int): Taş tipi (chess.PAWN ... chess.KING)
+            time_limit (float): Analiz süresi (saniye)
+            square (int): Yalnızca bu karedeki taşın hamleleri (taş başına dilim modu)
+
+        Dönüş değeri:
+            dict: {"move", "san", "score"} ya da o tipte yasal hamle yoksa / motor çöktüyse None
+        """
+        key = (position_key(board), piece_type, square)
+        with self._lock:
+            hint = self.cache.get(key)
+            if hint is not None:
+                self.hits += 1
+                return hint
+            self.misses += 1
+
+        moves = legal_moves_of(board, piece_type, square)
+        if not moves:
+            return None
+
+        if len(moves) == 1:
+            move, score = moves[0], None
+        else:
+            engine = self._checkout()
+            try:
+                info = engine.analyse(board, chess.engine.Limit(time=time_limit), root_moves=moves)
+            except (chess.engine.EngineError, OSError) as e:
+                print(f"Motor analizi başarısız oldu: {e}")
+                self._discard(engine)
+                return None
+            self._checkin(engine)
+
+            # Motor bir şey bulamadıysa ya da sınırın dışına çıktıysa ilk hamleyi kullanma
+            pv = info.get("pv")
+            if not pv or pv[0] not in moves:
+                return None
+            move, score = pv[0], info.get("score")
+
+        hint = {
+            "move": move,
+            "san": board.san(move),
+            "score": score.pov(board.turn) if score is not None else None,
+        }
+        with self._lock:
+            self.cache.put(key, hint)
+        return hint
+
+    def submit(self, board, piece_type, time_limit, square=None):
+        """
+        Analizi havuzun iş parçacıklarında başlatır.
+
+        Önbellekteki sonuçlar hemen tamamlanmış bir Future olarak döner; aynı
+        analiz zaten sürüyorsa onun Future'ı paylaşılır.
+
+        Dönüş değeri:
+            concurrent.futures.Future: `best_move` sonucunu taşıyan Future
+        """
+        board = board.copy(stack=False)
+        key = (position_key(board), piece_type, square)
+        with self._lock:
+            hint = self.cache.get(key)
+            if hint is not None:
+                self.hits += 1
+                future = Future()
+                future.set_result(hint)
+                return future
+
+            future = self._pending.get(key)
+            if future is not None:
+                return future
+
+            future = self._executor.submit(self.best_move, board, piece_type, time_limit, square)
+            self._pending[key] = future
+
+        def forget(_):
+            with self._lock:
+                self._pending.pop(key, None)
+        future.add_done_callback(forget)
+        return future
+
+    def speculate(self, board, targets, budget):
+        """
+        Dümendeki tüm dilimler için analizleri çevirme sürerken başlatır.
+
+        Süre bütçesi motor sayısına ve dilim sayısına göre paylaştırılır;
+        böylece tüm öneriler yaklaşık `budget` saniye içinde hazır olur.
+
+        Parametreler:
+            board (chess.Board): Çevirmenin yapıldığı pozisyon
+            targets (list): Dilimlerin (taş tipi, kare ya da None) ikilileri
+            budget (float): Çevirme başına toplam süre (saniye)
+
+        Dönüş değeri:
+            dict: (taş tipi, kare) -> Future
+        """
+        if not targets:
+            return {}
+        per_slice = max(MIN_TIME_PER_TYPE, budget * self.size / len(targets))
+        return {(piece_type, square): self.submit(board, piece_type, per_slice, square)
+                for piece_type, square in targets}
+
+    def hit_rate(self):
+        """
+        İsabet oranını 0 ile 1 arasında döndürür (istek yoksa 0).
+        """
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def close(self):
+        """
+        Bekleyen analizleri bırakır ve tüm motorları kapatır.
+        """
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            engines = list(self._engines)
+            self._engines.clear()
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        for engine in engines:
+            try:
+                engine.quit()
+            except Exception:
+                try:
+                    engine.close()
+                except Exception:
+                    pass
+
+
+def main():
+    parser = argparse.ArgumentParser(description="UCI motor havuzu denemesi ve kıyaslaması")
+    parser.add_argument("--engine", help="Motor komutu (verilmezse uci_standin.py kullanılır)")
+    parser.add_argument("--size", type=int, default=2, help="Havuzdaki motor sayısı")
+    parser.add_argument("--spins", type=int, default=20, help="Taklit edilen çevirme sayısı")
+    parser.add_argument("--budget", type=float, default=0.2, help="Çevirme başına süre (saniye)")
+    parser.add_argument("--delay", type=float, default=0.02, help="Deneme motorunun düşünme süresi")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    from piece_analysis import movable_piece_types, random_positions
+
+    command = args.engine or standin_command("--delay", str(args.delay), "--pick", "capture")
+    boards = [board for board in random_positions(random.Random(args.seed), args.spins * 3, 60)
+              if movable_piece_types(board)][:args.spins]
+
+    # Her çevirmede motoru yeniden başlatan eski yöntem: yalnızca seçilen tipin analizi
+    start = time.perf_counter()
+    for board in boards:
+        engine = chess.engine.SimpleEngine.popen_uci(command)
+        piece_type = movable_piece_types(board)[0]
+        engine.analyse(board, chess.engine.Limit(time=args.budget), root_moves=legal_moves_of(board, piece_type))
+        engine.quit()
+    cold = (time.perf_counter() - start) / len(boards)
+    print(f"Çevirme başına motor başlatma: {cold * 1000:.0f} ms")
+
+    # Havuz: tüm dilimler aynı bütçeyle önceden analiz edilir
+    pool = EnginePool(command, size=args.size)
+    start = time.perf_counter()
+    pool.start()
+    print(f"Havuz başlatma ({args.size} motor): {(time.perf_counter() - start) * 1000:.0f} ms")
+
+    start = time.perf_counter()
+    violations = 0
+    for board in boards:
+        targets = [(piece_type, None) for piece_type in movable_piece_types(board)]
+        futures = pool.speculate(board, targets, args.budget)
+        for (piece_type, _), future in futures.items():
+            hint = future.result()
+            if hint and hint["move"] not in legal_moves_of(board, piece_type):
+                violations += 1
+    warm = (time.perf_counter() - start) / len(boards)
+    print(f"Havuzla tüm dilimler: {warm * 1000:.0f} ms / çevirme, {violations} sınır ihlali")
+
+    # Aynı pozisyonlar ikinci kez: öneriler önbellekten gelir
+    start = time.perf_counter()
+    for board in boards:
+        targets = [(piece_type, None) for piece_type in movable_piece_types(board)]
+        for future in pool.speculate(board, targets, args.budget).values():
+            future.result()
+    print(f"Önbellekten: {(time.perf_counter() - start) / len(boards) * 1000:.2f} ms / çevirme, "
+          f"isabet oranı %{pool.hit_rate() * 100:.0f}")
+
+    # Taş başına dilim modu: her taş yalnızca kendi hamleleriyle analiz edilir
+    board = boards[0]
+    targets = [(piece_type, square) for piece_type in movable_piece_types(board)
+               for square in sorted({move.from_square for move in legal_moves_of(board, piece_type)})]
+    for (piece_type, square), future in pool.speculate(board, targets, args.budget).items():
+        hint = future.result()
+        print(f"  {piece_label(piece_type, square)}: {hint['san'] if hint else '-'}")
+
+    pool.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,330 @@
+"""
+Döndürülmüş dümen kareleri önbelleği
+
+Dümen her karede `Image.rotate` ile döndürülüp yeni bir `ImageTk.PhotoImage`
+oluşturulduğunda, 60 FPS'lik animasyonun her karesi ana iş parçacığında
+PIL çalışması demektir. Bu modül açıları ayarlanabilir bir adıma (ör. 1°)
+yuvarlar ve her adımın karesini bir kez üretir.
+
+Kareler dümen görseli yüklendikten sonra önceden hazırlanır: döndürme bir
+işçi iş parçacığında yapılır, yalnızca Tk'nın gerektirdiği PhotoImage
+dönüşümü ana iş parçacığında, arayüzü bekletmeyecek kısa partiler halinde
+yapılır. Önbellek bayt bütçesiyle sınırlıdır; bütçe aşılınca en uzun
+süredir kullanılmayan kare atılır.
+
+Etiketleri işlenmiş dümen (bkz. wheel_bitmap.py) her çevirmede değiştiği
+için tüm tur önceden hazırlanamaz; bunun yerine çevirmenin yörüngesinin
+uğrayacağı kareler sırasıyla ve animasyonun biraz önünde döndürülür.
+
+Kıyaslama için:
+
+    python frame_cache.py --step 1 --spins 5
+"""
+import argparse
+import collections
+import queue
+import threading
+import time
+
+from wheel_layout import SpinTrajectory
+
+# Bir PhotoImage karesinin piksel başına bellek maliyeti (Tk kareleri 32 bit tutar)
+BYTES_PER_PIXEL = 4
+
+
+class RotationFrameCache:
+    """
+    Açıya göre yuvarlanmış, bayt bütçesiyle sınırlı döndürülmüş kare önbelleği.
+
+    `get` ve `prewarm` Tk ana iş parçacığından çağrılmalıdır; işçi iş
+    parçacığı yalnızca PIL görüntüleri üretir ve kuyruğa koyar.
+    """
+    def __init__(self, image, step=1.0, max_bytes=160 * 1024 * 1024, to_photo=None):
+        """
+        Parametreler:
+            image (PIL.Image.Image): Döndürülecek dümen görseli
+            step (float): Açıların yuvarlanacağı adım (derece)
+            max_bytes (int): Önbelleğin en fazla bellek kullanımı (bayt)
+            to_photo (callable): PIL görüntüsünü tuvalde gösterilecek nesneye çevirir
+                (varsayılan ImageTk.PhotoImage)
+        """
+        if to_photo is None:
+            from PIL import ImageTk
+            to_photo = ImageTk.PhotoImage
+
+        self.image = image
+        self.step = step
+        self.count = max(1, round(360 / step))  # Tam turdaki kare sayısı
+        self.max_bytes = max_bytes
+        self.frame_bytes = image.width * image.height * BYTES_PER_PIXEL
+        self.to_photo = to_photo
+
+        self.frames = collections.OrderedDict()  # Kare sırası -> PhotoImage (LRU sırasıyla)
+        self.size = 0  # Önbellekteki karelerin toplam baytı
+        self._rendered = queue.Queue()  # İşçinin döndürdüğü (sıra, PIL görüntüsü) ikilileri
+        self._ahead = collections.OrderedDict()  # Yörüngenin önünde döndürülmüş kareler (yörünge sırasıyla)
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._generation = 0  # Her prerender çağrısında artar; eski işçiler bunu görünce durur
+
+        # İstatistikler
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def index_of(self, angle):
+        """
+        Açının yuvarlandığı karenin sırası (0 ile count - 1 arası).
+        """
+        return round((angle % 360) / self.step) % self.count
+
+    def render(self, index):
+        """
+        `index` sıradaki kareyi PIL ile döndürür (saat yönünde dönüş için negatif açı).
+        """
+        return self.image.rotate(-index * self.step)
+
+    def get(self, angle):
+        """
+        Açıya en yakın karenin görüntüsünü döndürür; yoksa üretip önbelleğe ekler.
+
+        Parametreler:
+            angle (float): Dümenin açısı (derece)
+
+        Dönüş değeri:
+            Tuvalde gösterilecek görüntü (varsayılan ImageTk.PhotoImage)
+        """
+        index = self.index_of(angle)
+        frame = self.frames.get(index)
+        if frame is not None:
+            self.frames.move_to_end(index)
+            self.hits += 1
+            return frame
+
+        self.misses += 1
+        image = None
+        with self._lock:
+            if index in self._ahead:
+                # Yörüngede bu kareden önce gelen (animasyonun atladığı) kareler artık gerekmez
+                while image is None:
+                    key, rendered = self._ahead.popitem(last=False)
+                    if key == index:
+                        image = rendered
+        if image is None:
+            image = self.render(index)
+        return self._store(index, self.to_photo(image))
+
+    def _store(self, index, frame):
+        """
+        Kareyi önbelleğe ekler ve bütçe aşıldıysa en eski kareleri atar.
+        """
+        if index not in self.frames:
+            self.size += self.frame_bytes
+        self.frames[index] = frame
+        self.frames.move_to_end(index)
+        while self.size > self.max_bytes and len(self.frames) > 1:
+            self.frames.popitem(last=False)
+            self.size -= self.frame_bytes
+            self.evictions += 1
+        return frame
+
+    def capacity(self):
+        """
+        Bütçeye sığan kare sayısı (en az bir).
+        """
+        return max(1, min(self.count, self.max_bytes // self.frame_bytes))
+
+    def prewarm(self, root, batch_ms=8, on_done=None):
+        """
+        Kareleri arka planda önceden üretir.
+
+        Döndürme işçi iş parçacığında yapılır; hazır kareler ana iş
+        parçacığında her turda en fazla `batch_ms` milisaniye sürecek
+        partiler halinde PhotoImage'e çevrilir. Bütçe tüm turu almıyorsa
+        yalnızca sığan kadar kare (eşit aralıklı değil, baştan) hazırlanır.
+
+        Parametreler:
+            root: Tk kök penceresi (after ile zamanlama için)
+            batch_ms (float): Bir partide ana iş parçacığında harcanacak en fazla süre
+            on_done (callable): Tüm kareler hazır olunca çağrılır
+        """
+        total = self.capacity()
+
+        def work():
+            for index in range(total):
+                if self._stop_event.is_set():
+                    return
+                if index not in self.frames:
+                    self._rendered.put((index, self.render(index)))
+
+        def drain():
+            if self._stop_event.is_set():
+                return
+            deadline = time.perf_counter() + batch_ms / 1000
+            while time.perf_counter() < deadline:
+                try:
+                    index, image = self._rendered.get_nowait()
+                except queue.Empty:
+                    break
+                if index not in self.frames:
+                    self._store(index, self.to_photo(image))
+
+            if worker.is_alive() or not self._rendered.empty():
+                root.after(15, drain)
+            elif on_done:
+                on_done()
+
+        worker = threading.Thread(target=work, daemon=True)
+        worker.start()
+        root.after(0, drain)
+
+    def trajectory_indices(self, trajectory, frame_ms=16, start_ms=0):
+        """
+        Yörüngenin `start_ms`'den sonra uğrayacağı karelerin sıraları (art arda tekrarlar olmadan).
+        """
+        indices = []
+        for elapsed in range(int(start_ms), int(trajectory.duration_ms) + frame_ms, frame_ms):
+            index = self.index_of(trajectory.angle_at(elapsed))
+            if not indices or indices[-1] != index:
+                indices.append(index)
+        return indices
+
+    def prerender(self, indices, ahead=32):
+        """
+        Verilen sıradaki kareleri işçi iş parçacığında animasyonun önünde döndürür.
+
+        Ana iş parçacığında `get` yalnızca PhotoImage dönüşümü yapar. Bellek
+        için işçi en fazla `ahead` kare önde bekler. Önbellekte zaten olan
+        kareler atlanır; önceki prerender çağrısının işçisi iptal edilir.
+
+        Parametreler:
+            indices (list): Karelerin istenecekleri sırayla sıraları (bkz. trajectory_indices)
+            ahead (int): Önceden döndürülüp bekletilecek en fazla kare sayısı
+        """
+        self.cancel()
+        generation = self._generation
+        indices = [index for index in indices if index not in self.frames]
+
+        def cancelled():
+            return self._stop_event.is_set() or self._generation != generation
+
+        def work():
+            for index in indices:
+                while not cancelled():
+                    with self._lock:
+                        if len(self._ahead) < ahead:
+                            break
+                    time.sleep(0.002)
+                if cancelled():
+                    return
+                image = self.render(index)
+                with self._lock:
+                    if self._generation == generation:
+                        self._ahead[index] = image
+
+        threading.Thread(target=work, daemon=True).start()
+
+    def cancel(self):
+        """
+        Süren önceden döndürmeyi iptal eder; önbellekteki kareler korunur.
+        """
+        with self._lock:
+            self._generation += 1
+            self._ahead.clear()
+
+    def stop(self):
+        """
+        Önceden üretmeyi kalıcı olarak durdurur (ör. dümen görseli değiştiğinde).
+        """
+        self._stop_event.set()
+        self.cancel()
+
+    def hit_rate(self):
+        """
+        İsabet oranını 0 ile 1 arasında döndürür (istek yoksa 0).
+        """
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+def spin_angles(rotations, duration_ms=5000, frame_ms=16, finish=0.5):
+    """
+    Uygulamadaki animasyonun (easing dahil) bir çevirmede ürettiği açılar.
+    """
+    trajectory = SpinTrajectory((rotations + finish) * 360, duration_ms)
+    return [trajectory.angle_at(elapsed) for elapsed in range(0, duration_ms, frame_ms)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Döndürülmüş kare önbelleği kıyaslaması")
+    parser.add_argument("--image", help="Dümen görseli (verilmezse çizilmiş bir daire)")
+    parser.add_argument("--size", type=int, default=300, help="Dümenin piksel boyutu")
+    parser.add_argument("--step", type=float, default=1.0, help="Açı adımı (derece)")
+    parser.add_argument("--budget-mb", type=float, default=160, help="Önbellek bütçesi (MB)")
+    parser.add_argument("--spins", type=int, default=5, help="Taklit edilen çevirme sayısı")
+    args = parser.parse_args()
+
+    import random
+
+    from PIL import Image, ImageDraw
+
+    if args.image:
+        image = Image.open(args.image).convert("RGBA").resize((args.size, args.size))
+    else:
+        image = Image.new("RGBA", (args.size, args.size))
+        draw = ImageDraw.Draw(image)
+        draw.ellipse((0, 0, args.size - 1, args.size - 1), fill="#8B5A2B", outline="black", width=4)
+        for spoke in range(8):
+            draw.line((args.size // 2, args.size // 2, args.size * (spoke % 3) // 2, args.size * (spoke // 3) // 2),
+                      fill="black", width=6)
+
+    # Tk varsa gerçek PhotoImage, ekransız ortamda piksel kopyası ölçülür
+    try:
+        import tkinter
+        from PIL import ImageTk
+        root = tkinter.Tk()
+        root.withdraw()
+        to_photo = ImageTk.PhotoImage
+    except Exception:
+        root = None
+        to_photo = Image.Image.copy
+    print(f"Kare dönüşümü: {'ImageTk.PhotoImage' if root else 'PIL kopyası (ekran yok)'}")
+
+    rng = random.Random(0)
+    spins = [spin_angles(rng.randint(3, 6), finish=rng.random()) for _ in range(args.spins)]
+    frames = sum(len(angles) for angles in spins)
+
+    # Eski yöntem: her karede döndür ve dönüştür
+    start = time.perf_counter()
+    for angles in spins:
+        for angle in angles:
+            to_photo(image.rotate(-angle))
+    old = (time.perf_counter() - start) * 1000 / frames
+    print(f"Her karede döndürme: {old:.2f} ms / kare")
+
+    cache = RotationFrameCache(image, args.step, int(args.budget_mb * 1024 * 1024), to_photo)
+    start = time.perf_counter()
+    if root:
+        done = threading.Event()
+        cache.prewarm(root, on_done=done.set)
+        while not done.is_set():
+            root.update()
+    else:
+        # Ekransız: önceden üretimi ana iş parçacığında taklit et
+        for index in range(cache.capacity()):
+            cache._store(index, to_photo(cache.render(index)))
+    print(f"Önceden üretim: {len(cache.frames)} kare, {cache.size / 1024 / 1024:.0f} MB, "
+          f"{time.perf_counter() - start:.2f} s")
+
+    start = time.perf_counter()
+    for angles in spins:
+        for angle in angles:
+            cache.get(angle)
+    new = (time.perf_counter() - start) * 1000 / frames
+    print(f"Önbellekten: {new * 1000:.1f} µs / kare, isabet oranı %{cache.hit_rate() * 100:.1f}, "
+          f"{cache.evictions} atılan kare")
+    print(f"Ana iş parçacığında kare başına PIL süresi {old:.2f} ms -> {new:.4f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,406 @@
+"""
+Lichess API yardımcıları
+
+Dümen Dünyam'ın Lichess ile konuşan tüm bileşenlerinin paylaştığı
+sunucu adresini, başlık bilgilerini, ortak HTTP oturumunu ve küçük
+ayrıştırma yardımcılarını içerir.
+
+Pozisyonu tek istekle (current-game PGN'i) ve eski yolla (current-game +
+oyun sayfası) çözmenin gecikme kıyaslaması için:
+
+    python lichess_api.py --latency 0.05 --repeat 30
+"""
+import argparse
+import io
+import random
+import re
+import threading
+import time
+from collections import deque
+
+import chess
+import chess.pgn
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+from request_scheduler import PRIORITY_BACKGROUND, RateLimited, RequestScheduler, endpoint_for
+
+# Lichess sunucusunun kök adresi
+LICHESS_URL = "https://lichess.org"
+
+# API istekleri için gerekli başlık bilgileri
+HEADERS = {
+    'User-Agent': 'DumenDunyam/1.0 (Satranc tas secim ruleti uygulamasi)'
+}
+
+# current-game yanıtını küçültmek için kapatılan PGN ayrıntıları (hamleler ve başlıklar kalır)
+CURRENT_GAME_PARAMS = {
+    "clocks": "false",
+    "evals": "false",
+    "opening": "false",
+    "literate": "false",
+}
+
+# Geçici sunucu hatalarında yeniden denenecek HTTP kodları
+RETRY_STATUSES = (500, 502, 503, 504)
+
+# Bağlantı kurma sürelerini istek yapan iş parçacığına göre tutar
+_connect_timing = threading.local()
+
+
+def find_game_id(pgn_text):
+    """
+    current-game yanıtındaki PGN metninden oyun ID'sini çıkarır.
+
+    Parametreler:
+        pgn_text (str): Lichess'in döndürdüğü PGN metni
+
+    Dönüş değeri:
+        str: Oyun ID'si, bulunamazsa None
+    """
+    game_id_match = re.search(r'\[GameId "([^"]+)"\]', pgn_text)
+    if game_id_match:
+        return game_id_match.group(1)
+    return None
+
+
+def find_time_control(pgn_text):
+    """
+    PGN metnindeki TimeControl başlığını çıkarır.
+
+    Parametreler:
+        pgn_text (str): Lichess'in döndürdüğü PGN metni
+
+    Dönüş değeri:
+        str: Ör. "180+2" ya da yazışmalı oyunlar için "-", bulunamazsa None
+    """
+    time_control_match = re.search(r'\[TimeControl "([^"]+)"\]', pgn_text)
+    if time_control_match:
+        return time_control_match.group(1)
+    return None
+
+
+class CurrentGameVisitor(chess.pgn.BoardBuilder):
+    """
+    PGN'i oyun ağacı kurmadan okuyup başlıkları ve son pozisyonu toplayan ziyaretçi.
+
+    Yan varyantlar atlanır. Geçersiz bir hamle görülürse pozisyon
+    güvenilmez sayılır ve sonuçta FEN verilmez.
+    """
+    def begin_game(self):
+        super().begin_game()
+        self.headers = {}
+        self.errors = []
+
+    def visit_header(self, tagname, tagvalue):
+        self.headers[tagname] = tagvalue
+
+    def handle_error(self, error):
+        self.errors.append(error)
+
+    def result(self):
+        board = getattr(self, "board", None)
+        if self.errors or board is None:
+            board = None
+        return self.headers, board
+
+
+def read_current_game(pgn_text):
+    """
+    current-game yanıtındaki PGN'den oyun ID'sini, süre ayarını ve güncel pozisyonu çıkarır.
+
+    Hamleler başlangıç pozisyonundan (ya da FEN başlığındaki pozisyondan)
+    oynanarak son pozisyon bulunur; böylece oyun sayfasını indirmeye gerek kalmaz.
+
+    Parametreler:
+        pgn_text (str): Lichess'in döndürdüğü PGN metni
+
+    Dönüş değeri:
+        dict: {"game_id", "time_control", "fen", "last_move"}; FEN çıkarılamazsa
+        "fen" None olur, PGN hiç okunamazsa None döner
+    """
+    result = chess.pgn.read_game(io.StringIO(pgn_text), Visitor=CurrentGameVisitor)
+    if result is None:
+        return None
+
+    headers, board = result
+    last_move = board.peek().uci() if board is not None and board.move_stack else None
+    return {
+        "game_id": headers.get("GameId"),
+        "time_control": headers.get("TimeControl"),
+        "fen": board.fen() if board is not None else None,
+        "last_move": last_move,
+    }
+
+
+def format_timings(timings):
+    """
+    İstek aşama sürelerini kısa, okunabilir bir metne çevirir.
+
+    Parametreler:
+        timings (dict): LichessSession.get tarafından üretilen süre sözlüğü
+
+    Dönüş değeri:
+        str: Ör. "bağlantı 85 ms, ilk bayt 120 ms, gövde 14 ms"
+    """
+    text = (f"bağlantı {timings['connect']:.0f} ms, "
+            f"ilk bayt {timings['ttfb']:.0f} ms, "
+            f"gövde {timings['body']:.0f} ms")
+    if timings["attempts"] > 1:
+        text += f", {timings['attempts']} deneme"
+    return text
+
+
+class TimedHTTPConnection(HTTPConnection):
+    """
+    Bağlantı kurma süresini ölçen HTTP bağlantısı.
+    """
+    def connect(self):
+        start = time.perf_counter()
+        super().connect()
+        _connect_timing.value = getattr(_connect_timing, "value", 0.0) + time.perf_counter() - start
+
+
+class TimedHTTPSConnection(HTTPSConnection):
+    """
+    TCP ve TLS el sıkışma süresini ölçen HTTPS bağlantısı.
+    """
+    def connect(self):
+        start = time.perf_counter()
+        super().connect()
+        _connect_timing.value = getattr(_connect_timing, "value", 0.0) + time.perf_counter() - start
+
+
+class TimedHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = TimedHTTPConnection
+
+
+class TimedHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = TimedHTTPSConnection
+
+
+class TimedAdapter(HTTPAdapter):
+    """
+    Bağlantı havuzlarında süre ölçen bağlantı sınıflarını kullanan adaptör.
+    """
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            "http": TimedHTTPConnectionPool,
+            "https": TimedHTTPSConnectionPool,
+        }
+
+
+class LichessSession:
+    """
+    Tüm Lichess çağrılarının paylaştığı, bağlantıları canlı tutan HTTP oturumu.
+
+    Oturum, bağlantıları çevirmeler arasında yeniden kullanır, kullanıcı adı
+    seçildiğinde bağlantıyı önceden ısıtır, idempotent GET isteklerini
+    rastgele gecikmeli geri çekilme ile yeniden dener ve her isteğin aşama
+    sürelerini (bağlantı, ilk bayt, gövde) kaydeder. Tüm istekler hız
+    sınırını gözeten ortak bir zamanlayıcıdan izin alarak gönderilir.
+    """
+    def __init__(self, base_url=LICHESS_URL, max_retries=2, backoff=0.25, pool_size=10,
+                 scheduler=None):
+        """
+        Parametreler:
+            base_url (str): Lichess sunucusunun kök adresi
+            max_retries (int): Başarısız bir GET isteğinin en fazla kaç kez yeniden deneneceği
+            backoff (float): Geri çekilme için taban bekleme süresi (saniye)
+            pool_size (int): Sunucu başına canlı tutulacak en fazla bağlantı sayısı
+            scheduler (RequestScheduler): Ortak istek zamanlayıcısı, None ise yenisi oluşturulur
+        """
+        self.base_url = base_url.rstrip("/")
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.scheduler = scheduler or RequestScheduler()
+
+        # Bağlantı havuzlu oturum
+        self.session = requests.Session()
+        self.session.headers.update(HEADERS)
+        adapter = TimedAdapter(pool_connections=4, pool_maxsize=pool_size)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+        # Son isteklerin aşama süreleri
+        self.last_timings = None
+        self.timings = deque(maxlen=50)
+
+    def url(self, path):
+        """
+        Göreli bir yolu tam adrese çevirir; tam adresleri olduğu gibi bırakır.
+        """
+        if path.startswith("http://") or path.startswith("https://"):
+            return path
+        return self.base_url + path
+
+    def warm(self):
+        """
+        Sunucuyla bağlantıyı arka planda önceden kurar.
+
+        DNS çözümü, TCP ve TLS el sıkışması böylece ilk çevirmeden önce
+        tamamlanır ve bağlantı havuzda hazır bekler. İstek diğerleri gibi
+        zamanlayıcıdan izin alır.
+        """
+        def warm_connection():
+            url = self.base_url + "/"
+            try:
+                # Isıtma da zamanlayıcıdan izin alır; 5 saniyeden uzun beklenecekse vazgeçer
+                self.scheduler.acquire(endpoint_for(url), PRIORITY_BACKGROUND, timeout=5)
+                response = self.session.head(url, timeout=10)
+                response.close()
+                if response.status_code == 429:
+                    self.scheduler.report_rate_limited(response.headers.get("Retry-After"))
+            except requests.exceptions.RequestException as e:
+                print(f"Bağlantı ısıtılırken hata oluştu: {e}")
+
+        threading.Thread(target=warm_connection, daemon=True).start()
+
+    def get(self, path, stream=False, timeout=10, priority=PRIORITY_BACKGROUND, max_wait=None,
+            **kwargs):
+        """
+        Yeniden deneme ve süre ölçümüyle bir GET isteği yapar.
+
+        Her deneme önce zamanlayıcıdan izin alır. Bağlantı hataları, zaman
+        aşımları ve geçici sunucu hataları rastgele gecikmeli üstel geri
+        çekilmeyle yeniden denenir. Akış isteklerinde yalnızca bağlantının
+        kurulması yeniden denenir. 429 yanıtı yeniden denenmez; zamanlayıcı
+        tüm istekleri Retry-After süresi kadar bekletir.
+
+        Parametreler:
+            path (str): İstek yolu (ör. "/api/user/x/current-game") ya da tam adres
+            stream (bool): Yanıt gövdesi akış olarak mı okunacak?
+            timeout: requests zaman aşımı değeri
+            priority (int): Zamanlayıcı önceliği (request_scheduler.PRIORITY_*)
+            max_wait (float): Zamanlayıcıda en fazla bekleme süresi (saniye), None ise süresiz
+
+        Dönüş değeri:
+            requests.Response: Yanıt; aşama süreleri `timings` özniteliğindedir
+
+        Hatalar:
+            RateLimited: Sunucu 429 döndürdüyse ya da izin `max_wait` içinde alınamadıysa
+        """
+        url = self.url(path)
+        endpoint = endpoint_for(url)
+        attempts = 0
+
+        while True:
+            attempts += 1
+            self.scheduler.acquire(endpoint, priority, max_wait)
+            _connect_timing.value = 0.0
+            start = time.perf_counter()
+
+            try:
+                # Başlıklar gelene kadar bekle (ilk bayt süresi)
+                response = self.session.get(url, stream=True, timeout=timeout, **kwargs)
+                first_byte = time.perf_counter()
+
+                # Hız sınırı aşıldı: herkesi beklet, aynı isteği tekrar gönderme
+                if response.status_code == 429:
+                    response.close()
+                    raise RateLimited(self.scheduler.report_rate_limited(response.headers.get("Retry-After")))
+
+                # Geçici sunucu hatalarını yeniden dene
+                if response.status_code in RETRY_STATUSES and attempts <= self.max_retries:
+                    response.close()
+                    self.sleep_backoff(attempts)
+                    continue
+
+                # Akış değilse gövdeyi hemen oku
+                if not stream:
+                    response.content
+
+            except (requests.exceptions.ConnectionError,
+                    requests.exceptions.Timeout,
+                    requests.exceptions.ChunkedEncodingError):
+                if attempts > self.max_retries:
+                    raise
+                self.sleep_backoff(attempts)
+                continue
+
+            end = time.perf_counter()
+            connect = _connect_timing.value
+            timings = {
+                "url": url,
+                "connect": connect * 1000,
+                "ttfb": (first_byte - start - connect) * 1000,
+                "body": 0.0 if stream else (end - first_byte) * 1000,
+                "total": (end - start) * 1000,
+                "attempts": attempts,
+                "reused": connect == 0.0,
+            }
+            response.timings = timings
+            self.last_timings = timings
+            self.timings.append(timings)
+            return response
+
+    def sleep_backoff(self, attempt):
+        """
+        Yeniden denemeden önce rastgele gecikmeli üstel bir süre bekler.
+
+        Parametreler:
+            attempt (int): Başarısız olan denemenin sırası (1'den başlar)
+        """
+        time.sleep(random.uniform(0, self.backoff * (2 ** (attempt - 1))))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Pozisyon çözme gecikmesi: sayfa kazıma ve PGN karşılaştırması")
+    parser.add_argument("--latency", type=float, default=0.05,
+                        help="Taklit sunucunun her yanıta eklediği gecikme (saniye), gidiş-dönüş süresini taklit eder")
+    parser.add_argument("--repeat", type=int, default=30)
+    parser.add_argument("--plies", type=int, default=80, help="Üretilen oyunun hamle sayısı")
+    parser.add_argument("--fixtures", help="Üretilmiş oyun yerine kayıt klasöründeki ilk oyunu kullan")
+    args = parser.parse_args()
+
+    from lichess_mock import MockGame, MockLichessServer, random_moves
+    from page_extractor import read_page_data
+    from request_scheduler import ENDPOINT_LIMITS, RequestScheduler
+
+    server = MockLichessServer().start()
+    if args.fixtures:
+        game = server.load_fixtures(args.fixtures)[0]
+    else:
+        game = server.add_game(MockGame("benchgame", "beyaz", "siyah",
+                                        random_moves(random.Random(0), args.plies), move_delay=0))
+    server.configure_faults(latency=args.latency)
+
+    # Kıyaslamayı hız sınırı bozmasın
+    scheduler = RequestScheduler({name: (10000, 10000) for name in ENDPOINT_LIMITS})
+    session = LichessSession(server.url, scheduler=scheduler)
+    path = f"/api/user/{game.white}/current-game"
+
+    def resolve_with_page():
+        # Eski yol: current-game'den yalnızca oyun ID'si, FEN oyun sayfasından
+        response = session.get(path)
+        page = session.get(f"/{find_game_id(response.text)}", stream=True)
+        return read_page_data(page)["fen"], 2
+
+    def resolve_with_pgn():
+        # Yeni yol: küçültülmüş PGN'in hamlelerinden son pozisyon
+        response = session.get(path, params=CURRENT_GAME_PARAMS)
+        return read_current_game(response.text)["fen"], 1
+
+    # Bağlantıyı ısıt ve iki yolun aynı pozisyonu verdiğini doğrula
+    expected = resolve_with_page()[0]
+    if resolve_with_pgn()[0] != expected:
+        print(f"UYUMSUZLUK: sayfa={expected!r} PGN={resolve_with_pgn()[0]!r}")
+
+    for name, resolve in (("sayfa kazıma (önce)", resolve_with_page), ("PGN (sonra)", resolve_with_pgn)):
+        durations = []
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            _, round_trips = resolve()
+            durations.append((time.perf_counter() - start) * 1000)
+        durations.sort()
+        print(f"{name}: {round_trips} istek, medyan {durations[len(durations) // 2]:.1f} ms, "
+              f"p95 {durations[int(len(durations) * 0.95) - 1]:.1f} ms")
+
+    server.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,998 @@
+"""
+Yerel Lichess taklit sunucusu
+
+Bu modül, Dümen Dünyam'ın ağ bileşenlerini lichess.org'a gitmeden denemek
+için küçük bir HTTP sunucusu sağlar. Sunucu önceden tanımlanmış oyunları
+zamana bağlı olarak "oynar" ve şu uç noktaları taklit eder:
+
+    /api/user/{kullanıcı}/current-game   PGN biçiminde aktif oyun
+    /api/users/status?ids=a,b             Toplu kullanıcı durumu
+    /api/stream/game/{id}                 NDJSON oyun akışı
+    /api/stream/event                     Hesap olay akışı (gameStart / gameFinish)
+    /api/games/user/{kullanıcı}           Oyun dışa aktarımı (NDJSON ya da PGN)
+    /{id}                                 page-init-data içeren oyun sayfası
+
+Oyunlar ya koddan üretilir (MockGame) ya da diske kaydedilmiş gerçek
+yanıtlardan (fixture) bayt bayt geri oynatılır (RecordedGame). Ağ hatalarını
+denemek için her isteğe gecikme, 429 (Retry-After ile), yarıda kesilen
+gövde ve yanıtsız kalan bağlantı (zaman aşımı) eklenebilir; hatalar tohumlu
+bir rastgele sayı üreteciyle seçildiği için aynı ayarlarla aynı sırada
+tekrarlanır.
+
+Komut satırından çalıştırıldığında örnek bir oyunla ayağa kalkar:
+
+    python lichess_mock.py --port 8080
+    python lichess_mock.py --fixtures fixtures --latency 0.2 --rate-limit 0.1 --truncate 0.05
+
+Uygulamayı bu sunucuya yönlendirmek için Ayarlar'daki sunucu adresine
+http://127.0.0.1:8080 yazılabilir ya da DUMEN_LICHESS_URL ortam değişkeni
+kullanılabilir.
+"""
+import argparse
+import glob
+import hashlib
+import io
+import json
+import os
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+import chess
+import chess.pgn
+
+
+class MockGame:
+    """
+    Taklit sunucuda zamana bağlı olarak ilerleyen tek bir oyun.
+
+    Oyun, oluşturulduğu andan itibaren her `move_delay` saniyede bir hamle
+    ilerler; böylece akış, PGN ve sayfa uç noktaları aynı anda tutarlı bir
+    pozisyon gösterir.
+    """
+    def __init__(self, game_id, white, black, moves, move_delay=1.0, clock=180):
+        """
+        Parametreler:
+            game_id (str): Oyunun ID'si
+            white (str): Beyaz oyuncunun kullanıcı adı
+            black (str): Siyah oyuncunun kullanıcı adı
+            moves (list): UCI biçiminde hamle listesi
+            move_delay (float): Hamleler arasındaki süre (saniye)
+            clock (int): Başlangıç saati (saniye)
+        """
+        self.game_id = game_id
+        self.white = white
+        self.black = black
+        self.moves = [chess.Move.from_uci(uci) for uci in moves]
+        self.move_delay = move_delay
+        self.clock = clock
+        self.started_at = time.monotonic()
+
+    def current_ply(self):
+        """
+        Şu ana kadar oynanmış hamle sayısını döndürür.
+        """
+        if self.move_delay <= 0:
+            return len(self.moves)
+
+        elapsed = time.monotonic() - self.started_at
+        return min(len(self.moves), int(elapsed / self.move_delay))
+
+    def is_finished(self):
+        """
+        Tüm hamleler oynandıysa True döndürür.
+        """
+        return self.current_ply() >= len(self.moves)
+
+    def board_at(self, ply):
+        """
+        Belirtilen hamle sayısındaki tahtayı döndürür.
+        """
+        board = chess.Board()
+        for move in self.moves[:ply]:
+            board.push(move)
+        return board
+
+    def pgn(self, ply=None):
+        """
+        Oyunun o anki halini Lichess'in current-game yanıtına benzer PGN olarak döndürür.
+
+        Parametreler:
+            ply (int): Belirli bir hamle sayısındaki hali üret, None ise o anki hali
+        """
+        board = self.board_at(self.current_ply() if ply is None else ply)
+        game = chess.pgn.Game.from_board(board)
+        game.headers["Event"] = "Rated Blitz game"
+        game.headers["Site"] = f"https://lichess.org/{self.game_id}"
+        game.headers["White"] = self.white
+        game.headers["Black"] = self.black
+        game.headers["GameId"] = self.game_id
+        game.headers["TimeControl"] = f"{self.clock}+0"
+        return str(game) + "\n"
+
+    def stream_line(self, ply, first=False):
+        """
+        Oyun akışı için tek bir NDJSON satırı üretir.
+
+        Parametreler:
+            ply (int): Satırın gösterdiği hamle sayısı
+            first (bool): Akışın ilk (tam oyun bilgisi içeren) satırı mı?
+        """
+        board = self.board_at(ply)
+        last_move = self.moves[ply - 1].uci() if ply else None
+
+        if first or ply >= len(self.moves):
+            # İlk ve son satırlar tam oyun bilgisini taşır
+            if ply >= len(self.moves):
+                status = "mate" if board.is_checkmate() else "outoftime"
+            else:
+                status = "started"
+            return {
+                "id": self.game_id,
+                "variant": {"key": "standard"},
+                "speed": "blitz",
+                "fen": board.fen(),
+                "lastMove": last_move,
+                "turns": ply,
+                "status": {"name": status},
+                "players": {
+                    "white": {"user": {"name": self.white}},
+                    "black": {"user": {"name": self.black}},
+                },
+            }
+
+        return {"fen": board.fen(), "lm": last_move, "wc": self.clock, "bc": self.clock}
+
+    def iter_stream(self, server):
+        """
+        Oyun akışının satırlarını, hamleler oynandıkça üretir.
+
+        İlk satır oyunun o anki halini taşır; ardından her yeni hamle için bir
+        satır gelir. Oyun bittiğinde ya da sunucu durdurulduğunda biter.
+
+        Parametreler:
+            server (MockLichessServer): Durma bayrağının okunacağı sunucu
+        """
+        # İlk satır: oyunun o anki hali
+        sent_ply = self.current_ply()
+        yield self.stream_line(sent_ply, first=True)
+
+        # Sonraki satırlar: her yeni hamle
+        while sent_ply < len(self.moves) and not server.stopping:
+            ply = self.current_ply()
+            while sent_ply < ply:
+                sent_ply += 1
+                yield self.stream_line(sent_ply)
+
+            # Bir sonraki hamlenin zamanına kadar uyu
+            next_move_at = self.started_at + (sent_ply + 1) * self.move_delay
+            time.sleep(min(0.5, max(0.001, next_move_at - time.monotonic())))
+
+    def event_payload(self, username):
+        """
+        Hesap olay akışındaki gameStart / gameFinish olayının "game" alanını üretir.
+
+        Parametreler:
+            username (str): Olayın gönderildiği kullanıcı
+        """
+        ply = self.current_ply()
+        board = self.board_at(ply)
+        color = "white" if username.lower() == self.white.lower() else "black"
+        opponent = self.black if color == "white" else self.white
+        return {
+            "gameId": self.game_id,
+            "id": self.game_id,
+            "fen": board.fen(),
+            "color": color,
+            "lastMove": self.moves[ply - 1].uci() if ply else "",
+            "isMyTurn": board.turn == (color == "white"),
+            "speed": "blitz",
+            "opponent": {"username": opponent},
+            "secondsLeft": self.clock,
+        }
+
+    def page_html(self, ply=None):
+        """
+        page-init-data betiğini içeren basit bir oyun sayfası üretir.
+
+        Parametreler:
+            ply (int): Belirli bir hamle sayısındaki sayfayı üret, None ise o anki sayfayı
+        """
+        ply = self.current_ply() if ply is None else ply
+        board = chess.Board()
+        steps = [{"ply": 0, "uci": None, "san": None, "fen": board.fen()}]
+        for index, move in enumerate(self.moves[:ply], start=1):
+            san = board.san(move)
+            board.push(move)
+            steps.append({"ply": index, "uci": move.uci(), "san": san, "fen": board.fen()})
+
+        color = "white" if board.turn else "black"
+        init_data = {
+            "data": {
+                "game": {"id": self.game_id, "fen": board.fen(), "turns": ply, "player": color},
+                "player": {"color": "white", "user": {"username": self.white}},
+                "opponent": {"color": "black", "user": {"username": self.black}},
+                "clock": {"white": self.clock, "black": self.clock},
+                "steps": steps,
+            }
+        }
+
+        # Gerçek sayfaya benzemesi için betiğin etrafına dolgu ekle
+        filler = "<div class=\"filler\">" + ("x" * 200) + "</div>\n"
+        return (
+            "<!DOCTYPE html><html><head><title>" + self.game_id + "</title></head><body>\n"
+            + filler * 20
+            + "<script type=\"application/json\" id=\"page-init-data\">"
+            + json.dumps(init_data, separators=(",", ":"))
+            + "</script>\n"
+            + filler * 20
+            + "</body></html>\n"
+        )
+
+
+class RecordedGame:
+    """
+    Diske kaydedilmiş Lichess yanıtlarını geri oynatan oyun.
+
+    Bir oyun, kayıt klasöründeki üç dosyadan oluşur:
+
+        {id}.pgn      current-game yanıtı (PGN)
+        {id}.html     oyun sayfası (page-init-data ile)
+        {id}.ndjson   oyun akışı satırları (isteğe bağlı)
+
+    PGN ve sayfa kaydedildikleri gibi, bayt bayt aynı döndürülür. Akış
+    satırları `replay_delay` aralıklarla yeniden gönderilir. Oyuncular ve
+    oyunun bitip bitmediği PGN başlıklarından okunur.
+    """
+    def __init__(self, game_id, pgn_text, html, stream_lines=None, replay_delay=0.5):
+        """
+        Parametreler:
+            game_id (str): Oyunun ID'si
+            pgn_text (str): Kayıtlı current-game yanıtı
+            html (str): Kayıtlı oyun sayfası
+            stream_lines (list): Kayıtlı akış satırları (sözlük olarak)
+            replay_delay (float): Akış satırları arasındaki süre (saniye)
+        """
+        self.game_id = game_id
+        self.pgn_text = pgn_text
+        self.html = html
+        self.stream_lines = stream_lines or []
+        self.replay_delay = replay_delay
+
+        game = chess.pgn.read_game(io.StringIO(pgn_text))
+        self.white = game.headers.get("White", "?")
+        self.black = game.headers.get("Black", "?")
+        self.result = game.headers.get("Result", "*")
+        self.board = game.end().board()
+
+    @classmethod
+    def load(cls, directory, game_id, replay_delay=0.5):
+        """
+        Kayıt klasöründen bir oyunu yükler.
+
+        Parametreler:
+            directory (str): Kayıtların bulunduğu klasör
+            game_id (str): Yüklenecek oyunun ID'si
+            replay_delay (float): Akış satırları arasındaki süre (saniye)
+        """
+        base = os.path.join(directory, game_id)
+        with open(base + ".pgn", encoding="utf-8") as pgn_file:
+            pgn_text = pgn_file.read()
+        with open(base + ".html", encoding="utf-8") as html_file:
+            html = html_file.read()
+
+        stream_lines = []
+        if os.path.exists(base + ".ndjson"):
+            with open(base + ".ndjson", encoding="utf-8") as stream_file:
+                stream_lines = [json.loads(line) for line in stream_file if line.strip()]
+
+        return cls(game_id, pgn_text, html, stream_lines, replay_delay)
+
+    def is_finished(self):
+        """
+        PGN'deki sonuç belirlenmişse (ör. "1-0") True döndürür.
+        """
+        return self.result != "*"
+
+    def pgn(self):
+        return self.pgn_text
+
+    def page_html(self):
+        return self.html
+
+    def iter_stream(self, server):
+        """
+        Kayıtlı akış satırlarını sırayla, aralarında bekleyerek üretir.
+
+        Akış kaydı yoksa PGN'deki son pozisyondan tek bir satır üretilir.
+        """
+        if not self.stream_lines:
+            yield {"id": self.game_id, "fen": self.board.fen(), "turns": self.board.ply(),
+                   "status": {"name": "started" if not self.is_finished() else "resign"}}
+            return
+
+        for index, line in enumerate(self.stream_lines):
+            if server.stopping:
+                return
+            if index:
+                time.sleep(self.replay_delay)
+            yield line
+
+    def event_payload(self, username):
+        """
+        Hesap olay akışındaki gameStart / gameFinish olayının "game" alanını üretir.
+        """
+        color = "white" if username.lower() == self.white.lower() else "black"
+        opponent = self.black if color == "white" else self.white
+        last_move = self.board.peek().uci() if self.board.move_stack else ""
+        return {
+            "gameId": self.game_id,
+            "id": self.game_id,
+            "fen": self.board.fen(),
+            "color": color,
+            "lastMove": last_move,
+            "isMyTurn": self.board.turn == (color == "white"),
+            "opponent": {"username": opponent},
+        }
+
+
+def export_json(game, with_pgn=False):
+    """
+    Oyunu Lichess'in NDJSON dışa aktarımındaki biçimde bir sözlüğe çevirir.
+
+    Parametreler:
+        game (MockGame | RecordedGame): Dışa aktarılacak oyun
+        with_pgn (bool): PGN'i de "pgn" alanına ekle (Lichess'te pgnInJson=true)
+    """
+    pgn_text = game.pgn()
+    parsed = chess.pgn.read_game(io.StringIO(pgn_text))
+    board = parsed.board()
+    sans = []
+    for move in parsed.mainline_moves():
+        sans.append(board.san(move))
+        board.push(move)
+
+    data = {
+        "id": game.game_id,
+        "rated": True,
+        "variant": "standard",
+        "speed": "blitz",
+        "perf": "blitz",
+        "status": "started" if parsed.headers.get("Result", "*") == "*" else "mate",
+        "players": {
+            "white": {"user": {"name": game.white, "id": game.white.lower()}},
+            "black": {"user": {"name": game.black, "id": game.black.lower()}},
+        },
+        "moves": " ".join(sans),
+    }
+    if parsed.headers.get("FEN"):
+        data["initialFen"] = parsed.headers["FEN"]
+    if with_pgn:
+        data["pgn"] = pgn_text
+    return data
+
+
+class MockLichessHandler(BaseHTTPRequestHandler):
+    """
+    Taklit sunucunun HTTP istek işleyicisi.
+    """
+    protocol_version = "HTTP/1.1"
+
+    # Başlık ve gövde ayrı yazıldığında Nagle gecikmesi ölçümleri bozmasın
+    disable_nagle_algorithm = True
+
+    # Bu isteğin gövdesi yarıda kesilecek mi? (inject_faults belirler)
+    truncate = False
+
+    def log_message(self, format, *args):
+        # Deneme çıktısını kirletmemek için istek günlüğünü kapat
+        pass
+
+    def do_HEAD(self):
+        # Bağlantı ısıtma istekleri için boş bir yanıt
+        self.send_response(200)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def do_GET(self):
+        mock = self.server.mock
+        if self.inject_faults():
+            return
+
+        url = urlsplit(self.path)
+        parts = url.path.strip("/").split("/")
+
+        if parts == ["api", "users", "status"]:
+            query = parse_qs(url.query)
+            ids = query.get("ids", [""])[0].split(",")
+            with_game_ids = query.get("withGameIds", ["false"])[0] == "true"
+            statuses = mock.user_statuses(ids[:100], with_game_ids)
+            self.send_text(200, json.dumps(statuses), "application/json")
+        elif len(parts) == 4 and parts[:2] == ["api", "user"] and parts[3] == "current-game":
+            game = mock.current_game(parts[2])
+            if game is None:
+                self.send_text(404, "No ongoing game\n")
+            else:
+                self.send_text(200, game.pgn(), "application/x-chess-pgn")
+        elif len(parts) == 4 and parts[:3] == ["api", "stream", "game"]:
+            game = mock.games.get(parts[3])
+            if game is None:
+                self.send_text(404, "Not found\n")
+            else:
+                self.stream_game(game)
+        elif len(parts) == 4 and parts[:3] == ["api", "games", "user"]:
+            self.export_games(parts[3], parse_qs(url.query))
+        elif parts == ["api", "stream", "event"]:
+            token = self.headers.get("Authorization", "").replace("Bearer ", "", 1)
+            username = mock.tokens.get(token)
+            if username is None:
+                self.send_text(401, "No such token\n")
+            else:
+                self.stream_events(username)
+        elif len(parts) == 1 and parts[0] in mock.games:
+            self.send_text(200, mock.games[parts[0]].page_html(), "text/html; charset=utf-8")
+        else:
+            self.send_text(404, "Not found\n")
+
+    def inject_faults(self):
+        """
+        Sunucunun hata ayarlarına göre isteği geciktirir ya da bozar.
+
+        Gecikme her isteğe eklenir. Ardından istek sırasıyla 429 ile
+        reddedilebilir, hiç yanıtlanmadan bekletilebilir (istemci tarafında
+        zaman aşımı) ya da gövdesi yarıda kesilmek üzere işaretlenebilir.
+
+        Dönüş değeri:
+            bool: Yanıt hata olarak verildiyse (istek işlenmemeli) True
+        """
+        mock = self.server.mock
+        rate_limited, hang, truncate = mock.roll_faults()
+        self.truncate = truncate
+
+        if mock.latency:
+            time.sleep(mock.latency)
+
+        if rate_limited:
+            body = b"Too many requests. Try again later.\n"
+            self.send_response(429)
+            self.send_header("Content-Type", "text/plain")
+            self.send_header("Content-Length", str(len(body)))
+            self.send_header("Retry-After", str(mock.retry_after))
+            self.end_headers()
+            self.wfile.write(body)
+            return True
+
+        if hang:
+            # Yanıt vermeden bekle, sonra bağlantıyı kapat
+            deadline = time.monotonic() + mock.hang_time
+            while time.monotonic() < deadline and not mock.stopping:
+                time.sleep(0.05)
+            self.close_connection = True
+            return True
+
+        return False
+
+    def send_text(self, status, body, content_type="text/plain"):
+        """
+        Uzunluğu bilinen bir metin yanıtı gönderir.
+
+        İstek yarıda kesilmek üzere işaretlendiyse başlıkta tam uzunluk
+        bildirilir ama gövdenin yalnızca yarısı gönderilip bağlantı kapatılır.
+        """
+        data = body.encode("utf-8")
+
+        # Başarılı yanıtlarda ETag ile koşullu istekleri destekle
+        etag = None
+        if status == 200:
+            etag = '"' + hashlib.sha1(data).hexdigest()[:16] + '"'
+            if self.headers.get("If-None-Match") == etag:
+                self.send_response(304)
+                self.send_header("ETag", etag)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(data)))
+        if etag:
+            self.send_header("ETag", etag)
+        self.end_headers()
+
+        if self.truncate and status == 200:
+            self.wfile.write(data[:len(data) // 2])
+            self.close_connection = True
+            return
+        self.wfile.write(data)
+
+    def start_stream(self, content_type="application/x-ndjson"):
+        """
+        Lichess gibi parçalı (chunked) bir akış başlatır (varsayılan NDJSON).
+        """
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Transfer-Encoding", "chunked")
+        self.send_header("Connection", "close")
+        self.end_headers()
+        self.close_connection = True
+
+    def end_stream(self):
+        """
+        Parçalı akışı düzgün biçimde sonlandırır.
+        """
+        self.wfile.write(b"0\r\n\r\n")
+        self.wfile.flush()
+
+    def stream_game(self, game):
+        """
+        Oyunu bitene kadar NDJSON satırları olarak akıtır.
+
+        İstek yarıda kesilmek üzere işaretlendiyse ilk satırdan sonra yarım
+        bir parça gönderilir ve bağlantı sonlandırma parçası olmadan kapatılır.
+        """
+        self.start_stream()
+
+        try:
+            for index, line in enumerate(game.iter_stream(self.server.mock)):
+                if self.truncate and index == 1:
+                    data = (json.dumps(line, separators=(",", ":")) + "\n").encode("utf-8")
+                    self.wfile.write(f"{len(data):x}\r\n".encode("ascii") + data[:len(data) // 2])
+                    self.wfile.flush()
+                    return
+                self.write_line(line)
+
+            self.end_stream()
+        except (BrokenPipeError, ConnectionResetError):
+            # İstemci bağlantıyı kapattı
+            pass
+
+    def export_games(self, username, query):
+        """
+        Kullanıcının oyunlarını Lichess'in dışa aktarımı gibi teker teker akıtır.
+
+        Accept başlığı application/x-ndjson ise her oyun bir JSON satırıdır
+        (`pgnInJson=true` ile PGN de eklenir); değilse oyunlar PGN olarak gönderilir.
+        """
+        games = self.server.mock.user_games(username)
+        if "max" in query:
+            games = games[:int(query["max"][0])]
+        as_json = "application/x-ndjson" in self.headers.get("Accept", "")
+        with_pgn = query.get("pgnInJson", ["false"])[0] == "true"
+
+        self.start_stream("application/x-ndjson" if as_json else "application/x-chess-pgn")
+        try:
+            for game in games:
+                if as_json:
+                    self.write_line(export_json(game, with_pgn))
+                else:
+                    self.write_chunk((game.pgn().strip() + "\n\n\n").encode("utf-8"))
+            self.end_stream()
+        except (BrokenPipeError, ConnectionResetError):
+            # İstemci bağlantıyı kapattı
+            pass
+
+    def stream_events(self, username):
+        """
+        Kullanıcının hesap olaylarını akıtır.
+
+        Oyun başladığında gameStart, bittiğinde gameFinish gönderilir; arada
+        bağlantıyı canlı tutmak için boş satırlar yollanır. Sunucunun
+        `event_drop_after` ayarı bağlantıyı belirli bir süre sonra koparır,
+        `event_stall_after` ise soketi açık bırakıp hiçbir şey göndermeyerek
+        yarı açık bir bağlantıyı taklit eder.
+        """
+        mock = self.server.mock
+        mock.event_connections += 1
+        self.start_stream()
+
+        started_at = time.monotonic()
+        last_write = started_at
+        announced = None  # gameStart gönderilen oyun
+
+        try:
+            while not mock.stopping:
+                now = time.monotonic()
+
+                # Bağlantıyı aniden kopar
+                if mock.event_drop_after is not None and now - started_at > mock.event_drop_after:
+                    return
+
+                # Yarı açık bağlantı: soketi tut ama hiçbir şey gönderme
+                if mock.event_stall_after is not None and now - started_at > mock.event_stall_after:
+                    time.sleep(0.05)
+                    continue
+
+                game = mock.current_game(username)
+                if game is not None and game.game_id != announced and not game.is_finished():
+                    announced = game.game_id
+                    self.write_line({"type": "gameStart", "game": game.event_payload(username)})
+                    last_write = now
+                elif announced is not None and game is not None and game.game_id == announced \
+                        and game.is_finished():
+                    self.write_line({"type": "gameFinish", "game": game.event_payload(username)})
+                    announced = None
+                    last_write = now
+                elif now - last_write > mock.keepalive_interval:
+                    self.write_chunk(b"\n")
+                    last_write = now
+
+                time.sleep(0.02)
+        except (BrokenPipeError, ConnectionResetError):
+            # İstemci bağlantıyı kapattı
+            pass
+
+    def write_chunk(self, data):
+        """
+        Tek bir parça gönderir ve tamponu boşaltır.
+        """
+        self.wfile.write(f"{len(data):x}\r\n".encode("ascii") + data + b"\r\n")
+        self.wfile.flush()
+
+    def write_line(self, data):
+        """
+        Tek bir NDJSON satırını ayrı bir parça olarak gönderir.
+        """
+        self.write_chunk((json.dumps(data, separators=(",", ":")) + "\n").encode("utf-8"))
+
+
+class MockHTTPServer(ThreadingHTTPServer):
+    """
+    Yüzlerce eşzamanlı bağlantıyı kaldırabilen iş parçacıklı HTTP sunucusu.
+    """
+    daemon_threads = True
+    request_queue_size = 1024
+
+
+class MockLichessServer:
+    """
+    Arka planda çalışan yerel Lichess taklit sunucusu.
+    """
+    def __init__(self, host="127.0.0.1", port=0):
+        """
+        Parametreler:
+            host (str): Dinlenecek adres
+            port (int): Dinlenecek port, 0 ise boş bir port seçilir
+        """
+        self.games = {}  # Oyun ID'si -> MockGame
+        self.players = {}  # Kullanıcı adı (küçük harf) -> oyun ID'si
+        self.tokens = {}  # API anahtarı -> kullanıcı adı (olay akışı için)
+        self.stopping = False
+
+        # Olay akışı ayarları
+        self.keepalive_interval = 6  # Boş satırlar arasındaki süre (saniye)
+        self.event_drop_after = None  # Bu süre sonra bağlantıyı kopar (saniye)
+        self.event_stall_after = None  # Bu süre sonra sessizce beklet (saniye)
+        self.event_connections = 0  # Açılan olay akışı bağlantısı sayısı
+
+        # Hata ekleme ayarları (bkz. configure_faults)
+        self.configure_faults()
+
+        self.httpd = MockHTTPServer((host, port), MockLichessHandler)
+        self.httpd.mock = self
+        self._thread = None
+
+    @property
+    def url(self):
+        """
+        Sunucunun kök adresi (ör. http://127.0.0.1:54321).
+        """
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def add_game(self, game):
+        """
+        Sunucuya bir oyun ekler ve iki oyuncuyu da bu oyuna bağlar.
+
+        Parametreler:
+            game (MockGame): Eklenecek oyun
+        """
+        self.games[game.game_id] = game
+        self.players[game.white.lower()] = game.game_id
+        self.players[game.black.lower()] = game.game_id
+        return game
+
+    def current_game(self, username):
+        """
+        Kullanıcının oyununu döndürür, yoksa None.
+        """
+        game_id = self.players.get(username.lower())
+        return self.games.get(game_id) if game_id else None
+
+    def user_games(self, username):
+        """
+        Kullanıcının beyaz ya da siyah oynadığı tüm oyunları döndürür.
+        """
+        username = username.lower()
+        return [game for game in self.games.values() if username in (game.white.lower(), game.black.lower())]
+
+    def populate(self, players, move_delay=2.0, plies=80, seed=0):
+        """
+        Rastgele oyunlar oynayan çok sayıda sanal oyuncu ekler.
+
+        Oyuncular ikişer ikişer eşleştirilir ve her çift rastgele hamlelerle
+        ilerleyen bir oyuna bağlanır. Oyunların başlangıçları, hamlelerin aynı
+        anda gelmemesi için hamle süresi içinde rastgele kaydırılır.
+
+        Parametreler:
+            players (int): Sanal oyuncu sayısı
+            move_delay (float): Hamleler arasındaki süre (saniye)
+            plies (int): Her oyunun en fazla hamle sayısı
+            seed (int): Rastgele sayı üreteci tohumu
+
+        Dönüş değeri:
+            list: Eklenen oyuncuların kullanıcı adları
+        """
+        rng = random.Random(seed)
+        usernames = [f"oyuncu{index:04d}" for index in range(players)]
+
+        for index in range(0, players - 1, 2):
+            game = MockGame(f"game{index // 2:04d}", usernames[index], usernames[index + 1],
+                            random_moves(rng, plies), move_delay)
+            game.started_at -= rng.random() * move_delay
+            self.add_game(game)
+
+        return usernames
+
+    def load_fixtures(self, directory, replay_delay=0.5):
+        """
+        Kayıt klasöründeki tüm oyunları sunucuya ekler.
+
+        Parametreler:
+            directory (str): {id}.pgn / {id}.html / {id}.ndjson dosyalarının klasörü
+            replay_delay (float): Akış satırları arasındaki süre (saniye)
+
+        Dönüş değeri:
+            list: Eklenen RecordedGame nesneleri
+        """
+        games = []
+        for path in sorted(glob.glob(os.path.join(directory, "*.pgn"))):
+            game_id = os.path.splitext(os.path.basename(path))[0]
+            games.append(self.add_game(RecordedGame.load(directory, game_id, replay_delay)))
+        return games
+
+    def configure_faults(self, latency=0.0, rate_limit=0.0, truncate=0.0, timeout=0.0,
+                         hang_time=15.0, retry_after=60, seed=0):
+        """
+        İsteklere eklenecek gecikme ve hataları ayarlar.
+
+        Oranlar 0 ile 1 arasındadır ve her istek için bağımsız olarak
+        uygulanır. Rastgele sayı üreteci her çağrıda aynı tohumla yeniden
+        kurulduğundan aynı istek sırası aynı hataları görür.
+
+        Parametreler:
+            latency (float): Her yanıttan önce eklenecek gecikme (saniye)
+            rate_limit (float): 429 Too Many Requests döndürülecek isteklerin oranı
+            truncate (float): Gövdesi yarıda kesilecek isteklerin oranı
+            timeout (float): Hiç yanıtlanmayacak isteklerin oranı
+            hang_time (float): Yanıtlanmayan isteklerin bağlantıyı tutma süresi (saniye)
+            retry_after (int): 429 yanıtlarındaki Retry-After değeri (saniye)
+            seed (int): Rastgele sayı üreteci tohumu
+        """
+        self.latency = latency
+        self.rate_limit_rate = rate_limit
+        self.truncate_rate = truncate
+        self.timeout_rate = timeout
+        self.hang_time = hang_time
+        self.retry_after = retry_after
+
+        self._fault_rng = random.Random(seed)
+        self._fault_lock = threading.Lock()
+
+        # Sayaçlar
+        self.request_count = 0
+        self.fault_counts = {"rate_limit": 0, "timeout": 0, "truncate": 0}
+
+    def roll_faults(self):
+        """
+        Bir istek için hangi hataların uygulanacağını seçer ve sayaçları günceller.
+
+        Dönüş değeri:
+            tuple: (429 döndür, yanıt verme, gövdeyi kes)
+        """
+        with self._fault_lock:
+            self.request_count += 1
+            rate_limited = self._fault_rng.random() < self.rate_limit_rate
+            hang = not rate_limited and self._fault_rng.random() < self.timeout_rate
+            truncate = not (rate_limited or hang) and self._fault_rng.random() < self.truncate_rate
+
+            if rate_limited:
+                self.fault_counts["rate_limit"] += 1
+            elif hang:
+                self.fault_counts["timeout"] += 1
+            elif truncate:
+                self.fault_counts["truncate"] += 1
+            return rate_limited, hang, truncate
+
+    def user_statuses(self, usernames, with_game_ids=False):
+        """
+        /api/users/status yanıtını üretir; bilinmeyen kullanıcılar atlanır.
+        """
+        statuses = []
+        for username in usernames:
+            game = self.current_game(username)
+            if game is None:
+                continue
+
+            status = {"id": username.lower(), "name": username, "online": True}
+            if not game.is_finished():
+                status["playing"] = True
+                if with_game_ids:
+                    status["playingId"] = game.game_id
+            statuses.append(status)
+        return statuses
+
+    def start(self):
+        """
+        Sunucuyu arka plan iş parçacığında başlatır.
+        """
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """
+        Sunucuyu durdurur.
+        """
+        self.stopping = True
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+def random_moves(rng, plies):
+    """
+    Rastgele yasal hamlelerden oluşan bir oyun üretir.
+
+    Parametreler:
+        rng (random.Random): Rastgele sayı üreteci
+        plies (int): En fazla hamle sayısı
+
+    Dönüş değeri:
+        list: UCI biçiminde hamleler
+    """
+    board = chess.Board()
+    moves = []
+    while len(moves) < plies and not board.is_game_over():
+        move = rng.choice(list(board.legal_moves))
+        board.push(move)
+        moves.append(move.uci())
+    return moves
+
+
+def export_fixtures(directory, games):
+    """
+    Üretilmiş oyunları RecordedGame'in okuyabileceği kayıt dosyalarına yazar.
+
+    Parametreler:
+        directory (str): Dosyaların yazılacağı klasör
+        games (list): (MockGame, ply) çiftleri; oyun verilen hamle sayısında kaydedilir
+    """
+    os.makedirs(directory, exist_ok=True)
+    for game, ply in games:
+        base = os.path.join(directory, game.game_id)
+        with open(base + ".pgn", "w", encoding="utf-8", newline="\n") as pgn_file:
+            pgn_file.write(game.pgn(ply))
+        with open(base + ".html", "w", encoding="utf-8", newline="\n") as html_file:
+            html_file.write(game.page_html(ply))
+        with open(base + ".ndjson", "w", encoding="utf-8", newline="\n") as stream_file:
+            for line_ply in range(ply + 1):
+                line = game.stream_line(line_ply, first=line_ply == 0)
+                stream_file.write(json.dumps(line, separators=(",", ":")) + "\n")
+
+
+def record_fixtures(username, directory, base_url="https://lichess.org", stream_seconds=10):
+    """
+    Bir kullanıcının aktif oyununu gerçek sunucudan kayıt dosyalarına yazar.
+
+    current-game yanıtı ve oyun sayfası olduğu gibi kaydedilir; oyun akışı
+    `stream_seconds` saniye boyunca dinlenir.
+
+    Parametreler:
+        username (str): Aktif oyunu kaydedilecek kullanıcı
+        directory (str): Dosyaların yazılacağı klasör
+        base_url (str): Sunucunun kök adresi
+        stream_seconds (float): Oyun akışının dinleneceği süre (saniye)
+
+    Dönüş değeri:
+        str: Kaydedilen oyunun ID'si
+    """
+    import requests
+
+    from lichess_api import HEADERS, find_game_id
+
+    session = requests.Session()
+    session.headers.update(HEADERS)
+
+    pgn_response = session.get(f"{base_url}/api/user/{username}/current-game", timeout=10)
+    pgn_response.raise_for_status()
+    game_id = find_game_id(pgn_response.text)
+    if not game_id:
+        raise ValueError(f"{username} için aktif oyun bulunamadı")
+
+    page_response = session.get(f"{base_url}/{game_id}", timeout=10)
+    page_response.raise_for_status()
+
+    os.makedirs(directory, exist_ok=True)
+    base = os.path.join(directory, game_id)
+    with open(base + ".pgn", "w", encoding="utf-8", newline="\n") as pgn_file:
+        pgn_file.write(pgn_response.text)
+    with open(base + ".html", "w", encoding="utf-8", newline="\n") as html_file:
+        html_file.write(page_response.text)
+
+    # Akışı belirli bir süre dinle
+    deadline = time.monotonic() + stream_seconds
+    with session.get(f"{base_url}/api/stream/game/{game_id}", stream=True,
+                     timeout=(10, stream_seconds)) as stream_response, \
+            open(base + ".ndjson", "w", encoding="utf-8", newline="\n") as stream_file:
+        try:
+            for line in stream_response.iter_lines():
+                if line:
+                    stream_file.write(line.decode("utf-8") + "\n")
+                if time.monotonic() > deadline:
+                    break
+        except requests.exceptions.RequestException:
+            # Okuma zaman aşımı: o ana kadar gelen satırlar yeterli
+            pass
+
+    return game_id
+
+
+# Örnek oyun: İtalyan açılışı
+SAMPLE_MOVES = [
+    "e2e4", "e7e5", "g1f3", "b8c6", "f1c4", "f8c5", "c2c3", "g8f6",
+    "d2d3", "d7d6", "e1g1", "e8g8", "b1d2", "a7a6", "a2a4", "c8e6",
+]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Yerel Lichess taklit sunucusu")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--move-delay", type=float, default=3.0)
+    parser.add_argument("--fixtures", help="Geri oynatılacak kayıt klasörü")
+    parser.add_argument("--replay-delay", type=float, default=0.5,
+                        help="Kayıtlı akış satırları arasındaki süre (saniye)")
+    parser.add_argument("--latency", type=float, default=0.0, help="Her yanıta eklenecek gecikme (saniye)")
+    parser.add_argument("--rate-limit", type=float, default=0.0, help="429 döndürülecek isteklerin oranı")
+    parser.add_argument("--truncate", type=float, default=0.0, help="Gövdesi kesilecek isteklerin oranı")
+    parser.add_argument("--timeout", type=float, default=0.0, help="Yanıtlanmayacak isteklerin oranı")
+    parser.add_argument("--hang-time", type=float, default=15.0)
+    parser.add_argument("--retry-after", type=int, default=60)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--export", metavar="KLASÖR",
+                        help="Örnek oyunları kayıt dosyası olarak yaz ve çık")
+    parser.add_argument("--record", metavar="KULLANICI",
+                        help="Kullanıcının lichess.org'daki aktif oyununu --fixtures klasörüne kaydet ve çık")
+    args = parser.parse_args()
+
+    if args.export:
+        rng = random.Random(args.seed)
+        export_fixtures(args.export, [
+            (MockGame("italian1", "beyaz", "siyah", SAMPLE_MOVES), 12),
+            (MockGame("random01", "oyuncuA", "oyuncuB", random_moves(rng, 120)), 60),
+        ])
+        print(f"Kayıtlar yazıldı: {args.export}")
+        return
+
+    if args.record:
+        game_id = record_fixtures(args.record, args.fixtures or "fixtures")
+        print(f"Kaydedildi: {game_id}")
+        return
+
+    server = MockLichessServer(port=args.port)
+    server.configure_faults(latency=args.latency, rate_limit=args.rate_limit, truncate=args.truncate,
+                            timeout=args.timeout, hang_time=args.hang_time,
+                            retry_after=args.retry_after, seed=args.seed)
+
+    if args.fixtures:
+        games = server.load_fixtures(args.fixtures, args.replay_delay)
+        players = ", ".join(f"{game.white}/{game.black}" for game in games)
+        print(f"Taklit sunucu çalışıyor: {server.url} (kayıtlı oyunlar: {players})")
+    else:
+        server.add_game(MockGame("mockgame", "beyaz", "siyah", SAMPLE_MOVES, args.move_delay))
+        print(f"Taklit sunucu çalışıyor: {server.url} (kullanıcılar: beyaz, siyah)")
+    server.httpd.serve_forever()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,366 @@
+"""
+Lichess canlı oyun takibi
+
+Bu modül, kullanıcının aktif oyununu Lichess'in NDJSON oyun akışı
+(/api/stream/game/{id}) üzerinden takip eden arka plan bileşenlerini içerir.
+Takipçi tek bir uzun ömürlü bağlantı tutar ve her hamleden sonra bellekteki
+satranç tahtasını günceller; böylece dümen çevrildiğinde pozisyon ağ
+gecikmesi olmadan okunabilir.
+"""
+import json
+import random
+import threading
+
+import requests
+
+from lichess_api import LichessSession, find_game_id
+from live_board import LiveBoard
+from piece_analysis import PIECE_NAMES
+from request_scheduler import PRIORITY_LIVE
+
+
+def is_finished_status(status):
+    """
+    Akıştaki oyun durumunun bitmiş bir oyunu gösterip göstermediğini söyler.
+
+    Parametreler:
+        status (dict | str | None): Akıştan gelen "status" alanı
+
+    Dönüş değeri:
+        bool: Oyun bittiyse True
+    """
+    if not status:
+        return False
+
+    # Lichess durumu {"id": 20, "name": "started"} biçiminde gönderir
+    if isinstance(status, dict):
+        status = status.get("name")
+
+    return status not in ("created", "started")
+
+
+class GameFollower:
+    """
+    Bir kullanıcının aktif oyununu canlı olarak takip eden arka plan işçisi.
+
+    Takipçi önce current-game ile aktif oyunu bulur, ardından oyun akışına
+    bağlanır ve her satırda tahtayı günceller. Akış kapandığında oyunu yeniden
+    çözer; aktif oyun yoksa belirli aralıklarla tekrar dener.
+    """
+    def __init__(self, username, session=None, on_update=None,
+                 idle_interval=5, read_timeout=60, game_id=None):
+        """
+        Takipçiyi başlatmaya hazırlar.
+
+        Parametreler:
+            username (str): Takip edilecek Lichess kullanıcı adı
+            session (LichessSession): Paylaşılan HTTP oturumu, verilmezse yenisi oluşturulur
+            on_update (callable): Her pozisyon güncellemesinde takipçiyle çağrılır
+            idle_interval (float): Aktif oyun yokken yeniden deneme aralığı (saniye)
+            read_timeout (float): Akışta veri gelmezse bağlantının yenilenme süresi (saniye)
+            game_id (str): Biliniyorsa ilk takip edilecek oyun; current-game sorgusu atlanır
+        """
+        self.username = username
+        self.session = session or LichessSession()
+        self.on_update = on_update
+        self.idle_interval = idle_interval
+        self.read_timeout = read_timeout
+
+        # Takip edilen oyunun durumu
+        self.game_id = None  # Takip edilen oyunun ID'si
+        self.board = None  # Son bilinen pozisyon
+        self.live = LiveBoard()  # Hamleleri mevcut tahtaya uygulayan artımlı takip
+        self.last_move = None  # Son hamle (UCI)
+        self.finished = False  # Oyun bitti mi?
+
+        # İş parçacığı yönetimi
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._response = None
+        self._thread = None
+        self._pending_game_id = game_id
+
+    def start(self):
+        """
+        Takip iş parçacığını başlatır.
+        """
+        if self._thread and self._thread.is_alive():
+            return
+
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """
+        Takibi durdurur ve açık akış bağlantısını kapatır.
+        """
+        self._stop_event.set()
+
+        # Bekleyen akış okumasını serbest bırakmak için bağlantıyı kapat
+        response = self._response
+        if response is not None:
+            response.close()
+
+    def is_alive(self):
+        """
+        Takip iş parçacığı çalışıyor ve durdurulmamış mı?
+        """
+        return bool(self._thread and self._thread.is_alive() and not self._stop_event.is_set())
+
+    def snapshot(self):
+        """
+        Son bilinen pozisyonu ağa gitmeden döndürür.
+
+        Dönüş değeri:
+            tuple: (oyun ID'si, FEN) ikilisi, pozisyon yoksa ya da oyun bittiyse None
+        """
+        with self._lock:
+            if self.board is None or self.finished:
+                return None
+            return self.game_id, self.board.fen()
+
+    def analysis(self):
+        """
+        Son bilinen pozisyonu, akışla artımlı güncellenen taş analiziyle birlikte döndürür.
+
+        Dönüş değeri:
+            dict: "game_id", "fen", "board" (kopya) ve "pieces" (hareket edebilen
+                taş isimleri) alanları; pozisyon yoksa ya da oyun bittiyse None
+        """
+        with self._lock:
+            if self.board is None or self.finished:
+                return None
+            return {
+                "game_id": self.game_id,
+                "fen": self.board.fen(),
+                "board": self.board.copy(stack=False),
+                "pieces": [PIECE_NAMES[piece_type] for piece_type in self.live.types],
+            }
+
+    def _run(self):
+        """
+        Aktif oyunu bulup akışını takip eden ana döngü.
+        """
+        while not self._stop_event.is_set():
+            try:
+                # Olay akışından bildirilen oyun varsa doğrudan ona bağlan
+                game_id = self._pending_game_id or self._resolve_game()
+                self._pending_game_id = None
+
+                # Aktif oyun yoksa bir süre bekleyip tekrar dene
+                if not game_id:
+                    self._stop_event.wait(self.idle_interval)
+                    continue
+
+                self._follow(game_id)
+
+                # Biten oyunun akışına hemen tekrar bağlanmamak için bekle
+                if self.finished:
+                    self._stop_event.wait(self.idle_interval)
+
+            except Exception as e:
+                # Durdurulurken kapatılan bağlantının hatalarını yok say
+                if self._stop_event.is_set():
+                    break
+                # Ağ ya da ayrıştırma hatasında kısa bir süre sonra yeniden dene
+                print(f"Oyun takibi sırasında hata oluştu: {e}")
+                self._stop_event.wait(self.idle_interval)
+
+    def _resolve_game(self):
+        """
+        Kullanıcının aktif oyununun ID'sini current-game ile bulur.
+
+        Dönüş değeri:
+            str: Oyun ID'si, aktif oyun yoksa None
+        """
+        response = self.session.get(f"/api/user/{self.username}/current-game", priority=PRIORITY_LIVE)
+
+        if response.status_code != 200:
+            return None
+
+        return find_game_id(response.text)
+
+    def _follow(self, game_id):
+        """
+        Oyun akışına bağlanır ve kapanana kadar her satırı işler.
+
+        Parametreler:
+            game_id (str): Takip edilecek oyunun ID'si
+        """
+        response = self.session.get(
+            f"/api/stream/game/{game_id}",
+            stream=True,
+            timeout=(10, self.read_timeout),
+            priority=PRIORITY_LIVE
+        )
+        self._response = response
+
+        try:
+            if response.status_code != 200:
+                self._stop_event.wait(self.idle_interval)
+                return
+
+            for line in response.iter_lines():
+                if self._stop_event.is_set():
+                    break
+
+                # Boş satırlar bağlantıyı canlı tutmak için gönderilir
+                if not line:
+                    continue
+
+                self._apply(game_id, json.loads(line))
+        finally:
+            self._response = None
+            response.close()
+
+    def _apply(self, game_id, data):
+        """
+        Akıştan gelen tek bir satırı tahtaya uygular.
+
+        Parametreler:
+            game_id (str): Satırın ait olduğu oyunun ID'si
+            data (dict): Akış satırının JSON içeriği
+        """
+        fen = data.get("fen")
+        if not fen:
+            return
+
+        with self._lock:
+            # Yeni oyunda eski tahtaya hamle uygulanmasın
+            if game_id != self.game_id:
+                self.live = LiveBoard()
+            self.live.apply(fen, data.get("lm") or data.get("lastMove"))
+
+            self.game_id = game_id
+            self.board = self.live.board
+            self.last_move = data.get("lm") or data.get("lastMove")
+            self.finished = is_finished_status(data.get("status"))
+
+        if self.on_update:
+            self.on_update(self)
+
+
+class EventStreamWatcher:
+    """
+    Hesabın olay akışını (/api/stream/event) dinleyen arka plan işçisi.
+
+    current-game'i sorgulamak yerine oyunun başladığını (gameStart) ve
+    bittiğini (gameFinish) anında öğrenir. Lichess akışı canlı tutmak için
+    düzenli olarak boş satır gönderir; belirlenen süre boyunca hiçbir veri
+    gelmezse bağlantı yarı açık kabul edilip yeniden kurulur. Kopan
+    bağlantılar rastgele gecikmeli üstel geri çekilmeyle yenilenir.
+    """
+    def __init__(self, token, session=None, on_event=None, read_timeout=20,
+                 retry_delay=1, max_retry_delay=30):
+        """
+        Parametreler:
+            token (str): Lichess kişisel API anahtarı
+            session (LichessSession): Paylaşılan HTTP oturumu, verilmezse yenisi oluşturulur
+            on_event (callable): Her olayda olayın JSON içeriğiyle çağrılır
+            read_timeout (float): Bu süre veri gelmezse bağlantı yarı açık sayılır (saniye)
+            retry_delay (float): İlk yeniden bağlanma beklemesi (saniye)
+            max_retry_delay (float): En uzun yeniden bağlanma beklemesi (saniye)
+        """
+        self.token = token
+        self.session = session or LichessSession()
+        self.on_event = on_event
+        self.read_timeout = read_timeout
+        self.retry_delay = retry_delay
+        self.max_retry_delay = max_retry_delay
+
+        # Bağlantı durumu
+        self.connected = False  # Akış şu an açık mı?
+        self.reconnects = 0  # Kaç kez yeniden bağlanıldı
+
+        self._stop_event = threading.Event()
+        self._response = None
+        self._thread = None
+
+    def start(self):
+        """
+        Dinleme iş parçacığını başlatır.
+        """
+        if self._thread and self._thread.is_alive():
+            return
+
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """
+        Dinlemeyi durdurur ve açık akışı kapatır.
+        """
+        self._stop_event.set()
+        response = self._response
+        if response is not None:
+            response.close()
+
+    def _run(self):
+        """
+        Olay akışına bağlanan ve koptuğunda yeniden bağlanan ana döngü.
+        """
+        failures = 0
+
+        while not self._stop_event.is_set():
+            try:
+                # Akıştan en az bir satır geldiyse bağlantı sağlıklıydı
+                if self._listen():
+                    failures = 0
+            except Exception as e:
+                if self._stop_event.is_set():
+                    break
+                print(f"Olay akışı bağlantısı koptu: {e}")
+            finally:
+                self.connected = False
+
+            if self._stop_event.is_set():
+                break
+
+            # Art arda başarısızlıklarda bekleme süresini katla
+            failures += 1
+            self.reconnects += 1
+            delay = min(self.max_retry_delay, self.retry_delay * 2 ** (failures - 1))
+            self._stop_event.wait(random.uniform(delay / 2, delay))
+
+    def _listen(self):
+        """
+        Olay akışını kapanana ya da zaman aşımına uğrayana kadar okur.
+
+        Dönüş değeri:
+            bool: Akıştan en az bir satır (boş satırlar dahil) alındıysa True
+        """
+        response = self.session.get(
+            "/api/stream/event",
+            stream=True,
+            timeout=(10, self.read_timeout),
+            headers={"Authorization": f"Bearer {self.token}"},
+            priority=PRIORITY_LIVE
+        )
+        self._response = response
+        received = False
+
+        try:
+            if response.status_code != 200:
+                print(f"Olay akışı açılamadı (Kod: {response.status_code})")
+                return False
+
+            self.connected = True
+            for line in response.iter_lines():
+                if self._stop_event.is_set():
+                    break
+
+                # Boş satırlar da bağlantının canlı olduğunu gösterir
+                received = True
+                if not line:
+                    continue
+
+                event = json.loads(line)
+                if self.on_event:
+                    self.on_event(event)
+        finally:
+            self._response = None
+            response.close()
+
+        return received
@@ -0,0 +1,367 @@
+"""
+Artımlı tahta takibi
+
+Canlı oyun akışında her satır yeni pozisyonun FEN'ini ve son hamleyi
+(`lm`) taşır. Her satırda FEN'den yeni bir tahta kurmak ve tüm taş
+tiplerini yeniden analiz etmek yerine son hamle mevcut tahtaya uygulanır,
+yalnızca hamlenin değiştirdiği sıralar akıştaki FEN ile karşılaştırılır
+ve hareket edebilen taş tipleri yalnızca hamlelerin etkileyebileceği
+tipler için yeniden hesaplanır. Hamle uygulanamazsa (satır kaçırıldı,
+hamle sayısı atladı) ya da tahtalar uyuşmazsa FEN'den baştan kurulur.
+
+Bir tip için ancak şu durumda yeniden analiz gerekir: o tipin bir taşı
+değişen bir karedeyse ya da değişen bir kareye (at sıçrayışı, hat üzerinde
+görüş, piyon ilerleyişi/alışı yoluyla) ulaşabiliyorsa. Şah çekilmişse,
+şahın hatlarında (açmaz olabilecek yerlerde) bir kare değiştiyse tüm tipler;
+geçerken alma mümkünse piyonlar; şah ise her zaman yeniden değerlendirilir.
+
+Farklılık denetimi ve kıyaslama için:
+
+    python live_board.py --games 300
+"""
+import argparse
+import random
+import time
+
+import chess
+
+from piece_analysis import movable_piece_types
+
+
+def board_from_stream_fen(fen):
+    """
+    Akıştan gelen FEN değerinden bir satranç tahtası oluşturur.
+
+    Lichess akışları bazen yalnızca taş dizilimini ve sıra bilgisini
+    gönderir. Bu durumda rok hakları taşların konumuna göre tahmin edilir.
+
+    Parametreler:
+        fen (str): Tam ya da kısaltılmış FEN metni
+
+    Dönüş değeri:
+        chess.Board: FEN'e karşılık gelen satranç tahtası
+    """
+    parts = fen.split()
+
+    # Tam FEN ise doğrudan kullan
+    if len(parts) >= 6:
+        return chess.Board(fen)
+
+    # Kısaltılmış FEN: tüm rok haklarını ver, sonra geçersizleri temizle
+    board = chess.Board(" ".join(parts[:2]))
+    if len(parts) < 3:
+        board.castling_rights = chess.BB_CORNERS
+        board.castling_rights = board.clean_castling_rights()
+    return board
+
+
+def rank_fen(board, rank):
+    """
+    Tahtanın tek bir sırasını FEN gösterimiyle döndürür (ör. "rnbqkbnr", "4P3").
+    """
+    occupied = board.occupied
+    white = board.occupied_co[chess.WHITE]
+    text = ""
+    empty = 0
+    for square in range(8 * rank, 8 * rank + 8):
+        mask = chess.BB_SQUARES[square]
+        if not occupied & mask:
+            empty += 1
+            continue
+        if empty:
+            text += str(empty)
+            empty = 0
+        symbol = chess.PIECE_SYMBOLS[board.piece_type_at(square)]
+        text += symbol.upper() if white & mask else symbol
+    return text + str(empty) if empty else text
+
+
+def changed_squares(board, move):
+    """
+    Hamlenin içeriğini değiştirdiği kareler (hamle yapılmadan önce çağrılır).
+
+    Geçerken almada alınan piyonun karesi, rokta kalenin bulunduğu sıra eklenir.
+    """
+    changed = chess.BB_SQUARES[move.from_square] | chess.BB_SQUARES[move.to_square]
+    if board.is_en_passant(move):
+        changed |= chess.BB_SQUARES[chess.square(chess.square_file(move.to_square),
+                                                 chess.square_rank(move.from_square))]
+    elif board.is_castling(move):
+        changed |= chess.BB_RANKS[chess.square_rank(move.from_square)]
+    return changed
+
+
+def slider_view(square, occupied):
+    """
+    Karenin fil ve kale hatları boyunca ilk engellere kadar gördüğü kareler (engeller dahil).
+    """
+    return (chess.BB_DIAG_ATTACKS[square][chess.BB_DIAG_MASKS[square] & occupied],
+            chess.BB_RANK_ATTACKS[square][chess.BB_RANK_MASKS[square] & occupied]
+            | chess.BB_FILE_ATTACKS[square][chess.BB_FILE_MASKS[square] & occupied])
+
+
+def pin_zone(board, king):
+    """
+    Şahın hatları boyunca açmazları ve şahları belirleyebilen kareler.
+
+    Şahtan ilk engele kadar olan kareler ve ilk engelin arkasındaki ikinci
+    engele kadar olan kareler (x-ışını); açmaz yalnızca bu karelerdeki bir
+    değişiklikle oluşur ya da kalkar.
+    """
+    occupied = board.occupied
+    diagonal, straight = slider_view(king, occupied)
+    # İlk engeller kaldırılmış gibi bakınca görülen kareler (x-ışını)
+    diagonal_xray = slider_view(king, occupied & ~diagonal)[0]
+    straight_xray = slider_view(king, occupied & ~straight)[1]
+    return chess.BB_SQUARES[king] | diagonal | straight | diagonal_xray | straight_xray
+
+
+class LiveBoard:
+    """
+    Akıştaki hamlelerle artımlı güncellenen tahta ve sırası gelen tarafın hareket edebilen taş tipleri.
+
+    Her renk için son analiz (tipler, taş bitboard'ları, şah durumu) ve o
+    analizden bu yana değişen kareler saklanır; aynı renk yeniden sıraya
+    geldiğinde yalnızca etkilenen tipler yeniden hesaplanır.
+    """
+    def __init__(self):
+        self.board = None  # Güncel tahta
+        self.types = []  # Sırası gelen tarafın hareket edebilen taş tipleri
+        self.ranks = None  # Tahtanın FEN sıraları (8. sıradan 1. sıraya)
+
+        self._memo = {chess.WHITE: None, chess.BLACK: None}  # Renk -> son analiz
+        self._changed = {chess.WHITE: 0, chess.BLACK: 0}  # Renk -> o analizden beri değişen kareler
+
+        # İstatistikler
+        self.pushes = 0  # Hamleyle artımlı güncellenen satırlar
+        self.resyncs = 0  # FEN'den baştan kurulan satırlar
+        self.reanalyzed = 0  # Yeniden hesaplanan tip sayısı
+        self.reused = 0  # Önceki analizden aynen alınan tip sayısı
+
+    def apply(self, fen, last_move=None):
+        """
+        Akış satırını tahtaya uygular.
+
+        Pozisyon değişmediyse (ör. yeniden bağlanınca gelen ilk satır) hiçbir
+        şey yapılmaz. Son hamle mevcut tahtada yasalsa uygulanır ve değişen
+        sıralar FEN ile doğrulanır; aksi halde tahta FEN'den yeniden kurulur.
+
+        Parametreler:
+            fen (str): Satırdaki tam ya da kısaltılmış FEN
+            last_move (str): Satırdaki son hamle (UCI), yoksa None
+
+        Dönüş değeri:
+            bool: Pozisyon değiştiyse True
+        """
+        fields = fen.split()
+        ranks = fields[0].split("/")
+        turn = len(fields) < 2 or fields[1] == "w"
+
+        if self.board is not None:
+            # Aynı pozisyon: yeniden bağlanma ya da tekrar eden satır
+            if ranks == self.ranks and self.board.turn == turn:
+                return False
+
+            if last_move and self._push(last_move, ranks, turn):
+                self.pushes += 1
+                self._analyze()
+                return True
+
+        self.reset(board_from_stream_fen(fen))
+        return True
+
+    def _push(self, last_move, ranks, turn):
+        """
+        Son hamleyi tahtaya uygular; FEN'le uyuşmazsa geri alır.
+
+        Dönüş değeri:
+            bool: Hamle uygulandı ve tahta FEN'le uyuşuyorsa True
+        """
+        board = self.board
+        try:
+            move = chess.Move.from_uci(last_move)
+            if not board.is_legal(move):
+                # Rok "e1h1" gibi şahın kaleye gittiği gösterimle de gelebilir
+                move = board.parse_uci(last_move)
+        except ValueError:
+            return False
+
+        changed = changed_squares(board, move)
+        board.push(move)
+
+        # Yalnızca hamlenin değiştirdiği sıraları yeniden üret; diğerleri zaten doğrulandı
+        own = list(self.ranks)
+        for rank in {chess.square_rank(move.from_square), chess.square_rank(move.to_square)}:
+            own[7 - rank] = rank_fen(board, rank)
+        if own != ranks or board.turn != turn:
+            board.pop()
+            return False
+
+        self.ranks = own
+        self._changed[chess.WHITE] |= changed
+        self._changed[chess.BLACK] |= changed
+        return True
+
+    def reset(self, board):
+        """
+        Tahtayı baştan kurar ve tüm tipleri yeniden analiz eder.
+        """
+        self.board = board
+        self.ranks = board.board_fen().split("/")
+        self._memo = {chess.WHITE: None, chess.BLACK: None}
+        self._changed = {chess.WHITE: 0, chess.BLACK: 0}
+        self.resyncs += 1
+        self._analyze()
+
+    def dirty_types(self, memo, changed):
+        """
+        Önceki analizden bu yana hareket edebilirliği değişmiş olabilecek tipler.
+
+        Parametreler:
+            memo (dict): Sırası gelen rengin son analizi
+            changed (int): O analizden bu yana değişen kareler (bitboard)
+
+        Dönüş değeri:
+            tuple: Yeniden değerlendirilmesi gereken taş tipleri; None ise hepsi
+        """
+        board = self.board
+        turn = board.turn
+        king = board.king(turn)
+
+        # Şah çekiliyken ya da açmazlar değişmiş olabilirken tüm tipler etkilenir
+        if memo is None or king is None or memo["check"] or board.is_check() or changed & pin_zone(board, king):
+            return None
+
+        # Değişen karelere ulaşabilen kareler (at sıçrayışı, hat görüşü, piyon hamlesi)
+        knights = diagonal = straight = pawns = 0
+        for square in chess.scan_forward(changed):
+            knights |= chess.BB_KNIGHT_ATTACKS[square]
+            diagonal_view, straight_view = slider_view(square, board.occupied)
+            diagonal |= diagonal_view
+            straight |= straight_view
+            pawns |= chess.BB_PAWN_ATTACKS[not turn][square]
+        pawns |= (changed >> 8 | changed >> 16) if turn == chess.WHITE else (changed << 8 | changed << 16)
+        reach = {
+            chess.PAWN: pawns & chess.BB_ALL,
+            chess.KNIGHT: knights,
+            chess.BISHOP: diagonal,
+            chess.ROOK: straight,
+            chess.QUEEN: diagonal | straight,
+        }
+
+        dirty = [chess.KING]
+        for piece_type, squares in reach.items():
+            mask = board.pieces_mask(piece_type, turn)
+            if (mask | memo["masks"][piece_type]) & changed or mask & squares:
+                dirty.append(piece_type)
+            elif piece_type == chess.PAWN and (board.ep_square is not None or memo["ep"]):
+                dirty.append(piece_type)
+        return tuple(dirty)
+
+    def _analyze(self):
+        """
+        Sırası gelen tarafın hareket edebilen tiplerini günceller.
+        """
+        board = self.board
+        turn = board.turn
+        memo = self._memo[turn]
+        dirty = self.dirty_types(memo, self._changed[turn])
+
+        if dirty is None:
+            types = set(movable_piece_types(board))
+            self.reanalyzed += len(chess.PIECE_TYPES)
+        else:
+            types = (memo["types"] - set(dirty)) | set(movable_piece_types(board, dirty))
+            self.reanalyzed += len(dirty)
+            self.reused += len(chess.PIECE_TYPES) - len(dirty)
+
+        self._memo[turn] = {
+            "types": types,
+            "masks": {piece_type: board.pieces_mask(piece_type, turn) for piece_type in chess.PIECE_TYPES},
+            "check": board.is_check(),
+            "ep": board.ep_square is not None,
+        }
+        self._changed[turn] = 0
+        self.types = [piece_type for piece_type in chess.PIECE_TYPES if piece_type in types]
+
+
+def stream_lines(board, moves, abbreviated=False):
+    """
+    Bir oyunu Lichess oyun akışındaki gibi (FEN, son hamle) satırlarına çevirir.
+    """
+    lines = [(board.fen(), None)]
+    for move in moves:
+        board.push(move)
+        fen = board.fen()
+        if abbreviated:
+            fen = " ".join(fen.split()[:2])
+        lines.append((fen, move.uci()))
+    return lines
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Artımlı tahta takibi denetimi ve kıyaslaması")
+    parser.add_argument("--games", type=int, default=300, help="Rastgele oyun sayısı")
+    parser.add_argument("--plies", type=int, default=160, help="Oyun başına en fazla hamle")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    # Rastgele oyunları akış satırlarına çevir; bazı oyunlarda satır atla (hamle sayısı atlar)
+    rng = random.Random(args.seed)
+    games = []
+    for _ in range(args.games):
+        board = chess.Board()
+        moves = []
+        for _ in range(rng.randint(20, args.plies)):
+            legal = list(board.legal_moves)
+            if not legal:
+                break
+            move = rng.choice(legal)
+            moves.append(move)
+            board.push(move)
+        lines = stream_lines(chess.Board(), moves)
+        if rng.random() < 0.1 and len(lines) > 10:
+            del lines[rng.randrange(1, len(lines) - 1)]
+        games.append(lines)
+    total = sum(len(lines) for lines in games)
+
+    # Eski yol: her satırda FEN'den tahta kur ve tüm tipleri analiz et
+    start = time.perf_counter()
+    for lines in games:
+        for fen, _ in lines:
+            movable_piece_types(board_from_stream_fen(fen))
+    rebuild = (time.perf_counter() - start) / total
+
+    # Artımlı yol
+    live_boards = []
+    start = time.perf_counter()
+    for lines in games:
+        live = LiveBoard()
+        for fen, last_move in lines:
+            live.apply(fen, last_move)
+        live_boards.append(live)
+    incremental = (time.perf_counter() - start) / total
+
+    # Her satırda sonucu FEN'den yapılan analizle karşılaştır
+    mismatches = 0
+    for lines in games:
+        live = LiveBoard()
+        for fen, last_move in lines:
+            live.apply(fen, last_move)
+            board = chess.Board(fen)
+            if live.types != movable_piece_types(board) or live.board.fen() != fen:
+                mismatches += 1
+
+    pushes = sum(live.pushes for live in live_boards)
+    resyncs = sum(live.resyncs for live in live_boards)
+    reanalyzed = sum(live.reanalyzed for live in live_boards)
+    reused = sum(live.reused for live in live_boards)
+    print(f"{total} satır: FEN'den kurma {rebuild * 1e6:.1f} µs, artımlı {incremental * 1e6:.1f} µs "
+          f"({rebuild / incremental:.1f}x)")
+    print(f"{pushes} hamle uygulandı, {resyncs} kez FEN'den kuruldu; "
+          f"tiplerin %{reused / (reused + reanalyzed) * 100:.0f}'i önceki analizden alındı")
+    print(f"Denetim: {mismatches} uyumsuzluk")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,249 @@
+"""
+Açılış kitabı notları
+
+Açılışta dümenin her diliminde, o taş tipinin (ya da taş başına dilim
+modunda o taşın) kitapta bir hamlesi olup olmadığını ve hangisi olduğunu
+göstermek için polyglot (.bin) açılış kitabı okuyucusu. Kitap
+`chess.polyglot.open_reader` ile belleğe eşlenerek (mmap) açılır; dosya
+belleğe okunmaz, aramalar dosya üzerinde ikili arama ile yapılır.
+
+Her pozisyon için Zobrist anahtarı bir kez hesaplanır, kitaptaki tüm
+girişler tek aramada okunur ve taş tiplerine göre gruplanarak önbelleğe
+alınır; aynı çevirmedeki diğer dilimler ve sonraki çevirmeler kitaba
+yeniden gitmez.
+
+Küçük bir deneme kitabı üretip doğrulamak ve kıyaslamak için:
+
+    python opening_book.py --games 200
+    python opening_book.py --out deneme.bin
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+from collections import Counter
+
+import chess
+import chess.polyglot
+
+from analysis_cache import OPENING_LINES, position_key
+from position_cache import LRUCache
+
+
+class OpeningBook:
+    """
+    Belleğe eşlenmiş polyglot kitabından taş tiplerine göre gruplanmış kitap hamleleri.
+    """
+    def __init__(self, path, cache_size=4096):
+        """
+        Parametreler:
+            path (str): Polyglot (.bin) kitap dosyası
+            cache_size (int): Önbellekte tutulacak en fazla pozisyon sayısı
+
+        Hatalar:
+            OSError: Dosya açılamazsa
+            ValueError: Dosya boyutu polyglot giriş boyutunun katı değilse
+        """
+        self.path = path
+        self.reader = chess.polyglot.open_reader(path)
+        self.cache = LRUCache(cache_size)  # Pozisyon anahtarı -> {taş tipi: kitap hamleleri}
+
+        # İstatistikler
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self.reader)
+
+    def moves_by_type(self, board):
+        """
+        Pozisyonun kitap hamlelerini taş tiplerine göre gruplar.
+
+        Zobrist anahtarı bir kez hesaplanır; kitaptaki girişler tek aramada
+        okunur. Ağırlığı 0 olan (silinmiş) girişler ve bu pozisyonda yasal
+        olmayan hamleler (anahtar çakışması) atlanır.
+
+        Parametreler:
+            board (chess.Board): Sorgulanan pozisyon
+
+        Dönüş değeri:
+            dict: Taş tipi -> ağırlığa göre azalan sırada {"move", "san", "weight", "share"} listesi
+        """
+        key = position_key(board)
+        groups = self.cache.get(key)
+        if groups is not None:
+            self.hits += 1
+            return groups
+        self.misses += 1
+
+        entries = []
+        for entry in self.reader.find_all(key[0]):
+            try:
+                # Polyglot rokları şahın kaleye gidişi (e1h1) olarak yazar; parse_uci bunu e1g1'e çevirir
+                move = board.parse_uci(entry.move.uci())
+            except ValueError:
+                continue
+            entries.append((move, entry.weight))
+
+        total = sum(weight for _, weight in entries)
+        groups = {}
+        for move, weight in entries:
+            groups.setdefault(board.piece_type_at(move.from_square), []).append({
+                "move": move,
+                "san": board.san(move),
+                "weight": weight,
+                "share": weight / total,
+            })
+        for moves in groups.values():
+            moves.sort(key=lambda book_move: -book_move["weight"])
+
+        self.cache.put(key, groups)
+        return groups
+
+    def annotate(self, board, targets):
+        """
+        Dümenin dilimleri için en ağır kitap hamlelerini bulur.
+
+        Tüm dilimler için pozisyon bir kez aranır.
+
+        Parametreler:
+            board (chess.Board): Çevirmenin yapıldığı pozisyon
+            targets (list): Dilimlerin (taş tipi, kare ya da None) ikilileri
+
+        Dönüş değeri:
+            dict: (taş tipi, kare) -> {"move", "san", "weight", "share"}; kitapta hamlesi olmayan dilimler yer almaz
+        """
+        groups = self.moves_by_type(board)
+        annotations = {}
+        for piece_type, square in targets:
+            for book_move in groups.get(piece_type, ()):
+                if square is None or book_move["move"].from_square == square:
+                    annotations[piece_type, square] = book_move
+                    break
+        return annotations
+
+    def hit_rate(self):
+        """
+        İsabet oranını 0 ile 1 arasında döndürür (istek yoksa 0).
+        """
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def close(self):
+        self.reader.close()
+
+
+def raw_move(board, move):
+    """
+    Hamleyi polyglot giriş biçimine çevirir (rok, şahın kaleye gidişi olarak yazılır).
+    """
+    to_square = move.to_square
+    if board.is_castling(move):
+        rook_file = 7 if board.is_kingside_castling(move) else 0
+        to_square = chess.square(rook_file, chess.square_rank(move.from_square))
+    promotion = move.promotion - 1 if move.promotion else 0
+    return to_square | (move.from_square << 6) | (promotion << 12)
+
+
+def write_book(path, games, max_plies=20):
+    """
+    Oyunlardan küçük bir polyglot kitabı yazar; ağırlık hamlenin kaç oyunda oynandığıdır.
+
+    Parametreler:
+        path (str): Yazılacak .bin dosyası
+        games (iterable): UCI hamle listeleri
+        max_plies (int): Her oyundan kitaba alınacak en fazla hamle sayısı
+
+    Dönüş değeri:
+        int: Yazılan giriş sayısı
+    """
+    counts = Counter()
+    for moves in games:
+        board = chess.Board()
+        for uci in moves[:max_plies]:
+            move = chess.Move.from_uci(uci)
+            counts[chess.polyglot.zobrist_hash(board), raw_move(board, move)] += 1
+            board.push(move)
+
+    # Polyglot girişleri anahtara göre sıralı olmalı; aynı anahtarda ağır hamle önce
+    entries = sorted(counts.items(), key=lambda item: (item[0][0], -item[1]))
+    with open(path, "wb") as f:
+        for (key, raw), weight in entries:
+            f.write(chess.polyglot.ENTRY_STRUCT.pack(key, raw, min(weight, 0xFFFF), 0))
+    return len(entries)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Açılış kitabı notlarının doğrulanması ve kıyaslaması")
+    parser.add_argument("--games", type=int, default=200, help="Kitaba eklenecek rastgele oyun sayısı")
+    parser.add_argument("--plies", type=int, default=12, help="Her oyundan kitaba alınacak hamle sayısı")
+    parser.add_argument("--out", help="Kitabı bu dosyaya yaz (verilmezse geçici dosya)")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    from lichess_mock import random_moves
+    from piece_analysis import movable_piece_types
+
+    # Yaygın açılışlar ağır basacak şekilde açılış satırları ve rastgele oyunlar
+    rng = random.Random(args.seed)
+    games = [moves.split() for moves in OPENING_LINES.values()] * 5
+    games += [random_moves(rng, args.plies) for _ in range(args.games)]
+
+    path = args.out or os.path.join(tempfile.mkdtemp(), "deneme.bin")
+    count = write_book(path, games, args.plies)
+    print(f"Kitap: {path}, {count} giriş, {os.path.getsize(path)} bayt")
+
+    # Denetim: gruplanmış sonuçlar kitaplığın kendi aramasıyla aynı mı?
+    book = OpeningBook(path)
+    mismatches = 0
+    positions = []
+    for moves in games:
+        board = chess.Board()
+        for uci in moves[:args.plies]:
+            positions.append(board.copy(stack=False))
+            board.push_uci(uci)
+
+    for board in positions:
+        expected = {(entry.move, entry.weight) for entry in book.reader.find_all(board)}
+        grouped = {(book_move["move"], book_move["weight"])
+                   for moves in book.moves_by_type(board).values() for book_move in moves}
+        if grouped != expected:
+            mismatches += 1
+    print(f"Denetim: {len(positions)} pozisyon, {mismatches} uyumsuzluk")
+
+    # Kıyaslama: dilim başına ayrı arama ile pozisyon başına tek gruplanmış arama
+    unique = list({position_key(board): board for board in positions}.values())
+    types = [movable_piece_types(board) for board in unique]
+
+    start = time.perf_counter()
+    for board, piece_types in zip(unique, types):
+        for piece_type in piece_types:
+            [entry for entry in book.reader.find_all(board)
+             if board.piece_type_at(entry.move.from_square) == piece_type]
+    per_slice = (time.perf_counter() - start) / len(unique)
+
+    book = OpeningBook(path)
+    targets = [[(piece_type, None) for piece_type in piece_types] for piece_types in types]
+    start = time.perf_counter()
+    for board, slices in zip(unique, targets):
+        book.annotate(board, slices)
+    cold = (time.perf_counter() - start) / len(unique)
+
+    start = time.perf_counter()
+    for board, slices in zip(unique, targets):
+        book.annotate(board, slices)
+    warm = (time.perf_counter() - start) / len(unique)
+
+    print(f"Pozisyon başına (tüm dilimler): dilim başına arama {per_slice * 1e6:.0f} µs, "
+          f"gruplanmış {cold * 1e6:.0f} µs, önbellekten {warm * 1e6:.1f} µs")
+
+    board = chess.Board()
+    for piece_type, moves in sorted(book.moves_by_type(board).items()):
+        print(f"  {chess.piece_name(piece_type)}: " +
+              ", ".join(f"{m['san']} %{m['share'] * 100:.0f}" for m in moves[:3]))
+    book.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,438 @@
+"""
+Yayın katmanı için yerel olay sunucusu
+
+OBS tarayıcı kaynakları ve ikinci ekranlar dümeni ekran yakalamadan
+göstersin diye çevirme durumunu Server-Sent Events (SSE) ile yayınlar.
+Kare gönderilmez; yalnızca küçük JSON olayları gider ve animasyonu
+istemci kendisi çizer:
+
+    spin    Çevirme başladı: dilim etiketleri ve genişlikleri, son açı,
+            süre ve başlangıç zamanı (istemci açıyı `SpinTrajectory` ile
+            aynı eğriden hesaplar, bkz. wheel_layout.py)
+    label   Dilim etiketi değişti (kitap hamlesi, motor önerisi)
+    result  Sonuç metni
+
+Her istemcinin kendi sınırlı kuyruğu vardır. `publish` olayı bir kez
+kodlar ve kuyruklara beklemeden (put_nowait) ekler; Tk ana döngüsü hiçbir
+soket yazmasını beklemez. Kuyruğu dolan (yavaş ya da takılmış) istemcinin
+bağlantısı kesilir, diğerleri etkilenmez; tarayıcının EventSource'u
+yeniden bağlanır. Yeni bağlanan istemciye önce son çevirmenin olayları
+gönderilir, böylece çevirmenin ortasında açılan katman da yetişir.
+
+    http://127.0.0.1:8765/          Hazır katman sayfası
+    http://127.0.0.1:8765/events    Olay akışı (text/event-stream)
+
+Yayın maliyetini ve yavaş istemcilerin atılmasını ölçmek için:
+
+    python overlay_server.py --clients 50 --slow 5 --events 5000
+"""
+import argparse
+import json
+import queue
+import socket
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Olay akışında sessizlik bu süreyi (saniye) geçince yorum satırı gönderilir
+KEEPALIVE_INTERVAL = 15
+
+# Akış soketinin çekirdek gönderme tamponu (bayt); takılan istemcinin
+# olayları çekirdekte birikmez, kuyruğu dolar ve istemci atılır
+SEND_BUFFER = 16 * 1024
+
+OVERLAY_PAGE = """<!DOCTYPE html>
+<html>
+<head>
+<meta charset="utf-8">
+<title>Dümen</title>
+<style>
+  html, body { margin: 0; background: transparent; overflow: hidden; }
+  #result { font: bold 28px Arial, sans-serif; color: #FF5722; text-align: center; }
+</style>
+</head>
+<body>
+<canvas id="wheel" width="560" height="480"></canvas>
+<div id="result"></div>
+<script>
+const canvas = document.getElementById("wheel");
+const ctx = canvas.getContext("2d");
+const resultEl = document.getElementById("result");
+let spin = null;
+
+// wheel_layout.ease_out ile aynı eğri
+function easeOut(p) {
+  if (p < 0.7) return p;
+  const q = (p - 0.7) / 0.3;
+  return 0.7 + 0.3 * (1 - Math.pow(1 - q, 5));
+}
+
+function angleAt(now) {
+  const elapsed = now - spin.started_at;
+  if (elapsed >= spin.duration_ms) return spin.final_angle;
+  return spin.final_angle * easeOut(Math.max(0, elapsed / spin.duration_ms));
+}
+
+function draw() {
+  ctx.clearRect(0, 0, canvas.width, canvas.height);
+  if (spin) {
+    const cx = 240, cy = 240, r = 150;
+    const angle = angleAt(Date.now());
+    ctx.save();
+    ctx.translate(cx, cy);
+    ctx.rotate(angle * Math.PI / 180);
+    ctx.beginPath(); ctx.arc(0, 0, r, 0, 2 * Math.PI);
+    ctx.fillStyle = "#8B5A2B"; ctx.fill(); ctx.lineWidth = 4; ctx.stroke();
+    let start = spin.offset;
+    spin.spans.forEach((span, i) => {
+      const a = start * Math.PI / 180;
+      ctx.beginPath(); ctx.moveTo(0, 0); ctx.lineTo(r * Math.cos(a), r * Math.sin(a)); ctx.stroke();
+      const mid = (start + span / 2) * Math.PI / 180;
+      ctx.save();
+      ctx.translate((r + 40) * Math.cos(mid), (r + 40) * Math.sin(mid));
+      ctx.rotate(mid);
+      ctx.fillStyle = "black"; ctx.font = "bold 14px Arial"; ctx.textAlign = "center";
+      spin.labels[i].split("\\n").forEach((line, j) => ctx.fillText(line, 0, j * 16));
+      ctx.restore();
+      start += span;
+    });
+    ctx.restore();
+    ctx.beginPath();
+    ctx.moveTo(cx + r + 30, cy - 15); ctx.lineTo(cx + r + 60, cy); ctx.lineTo(cx + r + 30, cy + 15);
+    ctx.fillStyle = "red"; ctx.fill();
+  }
+  requestAnimationFrame(draw);
+}
+
+const events = new EventSource("events");
+events.addEventListener("spin", e => { spin = JSON.parse(e.data); resultEl.textContent = ""; });
+events.addEventListener("label", e => {
+  const data = JSON.parse(e.data);
+  if (spin && data.spin_id === spin.spin_id) spin.labels[data.index] = data.text;
+});
+events.addEventListener("result", e => {
+  const data = JSON.parse(e.data);
+  const wait = spin ? spin.started_at + spin.duration_ms - Date.now() : 0;
+  setTimeout(() => { resultEl.textContent = data.text; }, Math.max(0, wait));
+});
+requestAnimationFrame(draw);
+</script>
+</body>
+</html>
+"""
+
+
+class OverlayClient:
+    """
+    Bağlı bir olay akışı istemcisinin sınırlı kuyruğu.
+    """
+    def __init__(self, queue_size):
+        self.queue = queue.Queue(maxsize=queue_size)  # Gönderilecek kodlanmış olaylar
+        self.closed = False  # Kuyruk dolduğu için atıldı mı
+        self.sent = 0
+
+
+class OverlayHandler(BaseHTTPRequestHandler):
+    """
+    Katman sayfasını ve olay akışını sunan HTTP istek işleyicisi.
+    """
+    protocol_version = "HTTP/1.1"
+
+    # Olaylar küçük ve ayrı ayrı yazılır; Nagle gecikmesi animasyonu geciktirmesin
+    disable_nagle_algorithm = True
+
+    # Takılan istemcinin soket yazması bu süreden (saniye) uzun beklemesin
+    timeout = 30
+
+    def log_message(self, format, *args):
+        # Her bağlantıda konsolu kirletmemek için istek günlüğünü kapat
+        pass
+
+    def do_GET(self):
+        path = self.path.split("?")[0]
+        if path == "/events":
+            self.stream_events()
+        elif path in ("/", "/index.html"):
+            body = OVERLAY_PAGE.encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "text/html; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+        else:
+            self.send_error(404)
+
+    def stream_events(self):
+        """
+        İstemciyi kaydeder ve kuyruğundaki olayları gelir gelmez yazar.
+        """
+        overlay = self.server.overlay
+        self.connection.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, SEND_BUFFER)
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-cache")
+        self.send_header("Access-Control-Allow-Origin", "*")
+        self.send_header("Connection", "close")
+        self.end_headers()
+        self.close_connection = True
+
+        client, snapshot = overlay.connect()
+        try:
+            self.wfile.write(b"".join(snapshot))
+            self.wfile.flush()
+            while not overlay.stopping and not client.closed:
+                try:
+                    message = client.queue.get(timeout=KEEPALIVE_INTERVAL)
+                except queue.Empty:
+                    message = b": ping\n\n"
+                if message is None or client.closed:
+                    break
+                self.wfile.write(message)
+                self.wfile.flush()
+                client.sent += 1
+        except (BrokenPipeError, ConnectionResetError, socket.timeout):
+            # İstemci gitti ya da yazma zaman aşımına uğradı
+            pass
+        finally:
+            overlay.disconnect(client)
+
+
+class OverlayHTTPServer(ThreadingHTTPServer):
+    """
+    Her istemciyi ayrı iş parçacığında sunan HTTP sunucusu.
+    """
+    daemon_threads = True
+    request_queue_size = 128
+
+
+class OverlayServer:
+    """
+    Çevirme olaylarını bağlı tüm katmanlara yayınlayan arka plan sunucusu.
+    """
+    def __init__(self, host="127.0.0.1", port=8765, queue_size=64):
+        """
+        Parametreler:
+            host (str): Dinlenecek adres (ikinci ekranlar için "0.0.0.0")
+            port (int): Dinlenecek port, 0 ise boş bir port seçilir
+            queue_size (int): İstemci başına bekleyebilecek en fazla olay
+
+        Hatalar:
+            OSError: Port kullanımdaysa
+        """
+        self.queue_size = queue_size
+        self.clients = set()
+        self.snapshot = []  # Son çevirmenin kodlanmış olayları (yeni istemcilere gönderilir)
+        self.stopping = False
+        self._lock = threading.Lock()
+
+        # İstatistikler
+        self.published = 0
+        self.dropped = 0
+
+        self.httpd = OverlayHTTPServer((host, port), OverlayHandler)
+        self.httpd.overlay = self
+        self._thread = None
+
+    @property
+    def url(self):
+        """
+        Katman sayfasının adresi (ör. http://127.0.0.1:8765/).
+        """
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}/"
+
+    def start(self):
+        """
+        Sunucuyu arka plan iş parçacığında başlatır.
+        """
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """
+        Sunucuyu durdurur ve bekleyen akışları sonlandırır.
+        """
+        self.stopping = True
+        with self._lock:
+            for client in self.clients:
+                client.closed = True
+                try:
+                    client.queue.put_nowait(None)
+                except queue.Full:
+                    pass
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def connect(self):
+        """
+        Yeni bir istemci kaydeder.
+
+        Dönüş değeri:
+            tuple: (OverlayClient, son çevirmenin kodlanmış olayları)
+        """
+        client = OverlayClient(self.queue_size)
+        with self._lock:
+            self.clients.add(client)
+            return client, list(self.snapshot)
+
+    def disconnect(self, client):
+        with self._lock:
+            self.clients.discard(client)
+
+    def publish(self, event, data):
+        """
+        Olayı tüm istemcilere beklemeden iletir; Tk ana iş parçacığından çağrılabilir.
+
+        Olay bir kez kodlanır. Kuyruğu dolu istemci atılır; soket yazmaları
+        istemcilerin kendi iş parçacıklarında yapılır.
+
+        Parametreler:
+            event (str): Olay adı ("spin", "label" ya da "result")
+            data (dict): JSON'a çevrilebilir olay verisi
+        """
+        message = f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False, separators=(',', ':'))}\n\n"
+        message = message.encode("utf-8")
+
+        with self._lock:
+            # Yeni bağlanan katman son çevirmeyi baştan izleyebilsin
+            if event == "spin":
+                self.snapshot = []
+            self.snapshot.append(message)
+
+            slow = []
+            for client in self.clients:
+                try:
+                    client.queue.put_nowait(message)
+                except queue.Full:
+                    slow.append(client)
+            for client in slow:
+                client.closed = True
+                self.clients.discard(client)
+            self.published += 1
+            self.dropped += len(slow)
+
+    def client_count(self):
+        with self._lock:
+            return len(self.clients)
+
+
+def spin_event(spin_id, stage, labels, sectors, trajectory, started_at):
+    """
+    Çevirme başlangıcı olayının verisi.
+
+    Parametreler:
+        spin_id (int): Çevirmenin kimliği (geç gelen etiket olaylarını ayırmak için)
+        stage (str): "piece" taş dümeni, "move" hamle dümeni
+        labels (list): Dilim etiketleri
+        sectors (WheelSectors): Dilim düzeni
+        trajectory (SpinTrajectory): Çevirmenin yörüngesi
+        started_at (float): Başlangıç zamanı (Unix zamanı, milisaniye)
+
+    Dönüş değeri:
+        dict: `publish` için olay verisi
+    """
+    return {
+        "spin_id": spin_id,
+        "stage": stage,
+        "labels": list(labels),
+        "spans": [round(span, 3) for span in sectors.spans],
+        "offset": round(sectors.offset, 3),
+        "final_angle": round(trajectory.final_angle, 3),
+        "duration_ms": trajectory.duration_ms,
+        "started_at": round(started_at),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Katman olay sunucusunun yayın kıyaslaması")
+    parser.add_argument("--port", type=int, default=0, help="Dinlenecek port (0: boş bir port)")
+    parser.add_argument("--clients", type=int, default=50, help="Olayları okuyan istemci sayısı")
+    parser.add_argument("--slow", type=int, default=5, help="Bağlanıp hiç okumayan istemci sayısı")
+    parser.add_argument("--events", type=int, default=5000, help="Yayınlanacak olay sayısı")
+    parser.add_argument("--serve", action="store_true", help="Kıyaslama yerine örnek çevirmeleri yayınla")
+    args = parser.parse_args()
+
+    import random
+
+    from wheel_layout import SpinTrajectory, WheelSectors
+
+    server = OverlayServer(port=args.port).start()
+    labels = ["Piyon", "At", "Fil", "Kale", "Vezir", "Şah"]
+    sectors = WheelSectors([8, 2, 2, 2, 1, 1])
+    rng = random.Random(0)
+
+    if args.serve:
+        # Tarayıcıda katman sayfasını denemek için birkaç saniyede bir çevirme
+        print(f"Katman: {server.url}")
+        spin_id = 0
+        while True:
+            spin_id += 1
+            trajectory = SpinTrajectory.random(rng, 3, 5000)
+            server.publish("spin", spin_event(spin_id, "piece", labels, sectors, trajectory, time.time() * 1000))
+            winner = labels[trajectory.outcome(sectors)]
+            server.publish("result", {"spin_id": spin_id, "text": f"Beyaz TAŞ: {winner.upper()}"})
+            time.sleep(8)
+
+    host, port = server.httpd.server_address[:2]
+
+    def connect(receive_buffer=None):
+        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        if receive_buffer:
+            # Takılan istemcinin çekirdek tamponu çabuk dolsun
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, receive_buffer)
+        sock.connect((host, port))
+        sock.sendall(b"GET /events HTTP/1.1\r\nHost: overlay\r\n\r\n")
+        return sock
+
+    received = [0] * args.clients
+
+    def read(index, sock):
+        # Olay sonları ("\n\n") sayılır
+        tail = b""
+        while True:
+            data = sock.recv(65536)
+            if not data:
+                return
+            received[index] += (tail + data).count(b"\n\n")
+            tail = data[-1:]
+
+    readers = []
+    for index in range(args.clients):
+        thread = threading.Thread(target=read, args=(index, connect()), daemon=True)
+        thread.start()
+        readers.append(thread)
+    stalled = [connect(4096) for _ in range(args.slow)]
+    while server.client_count() < args.clients + args.slow:
+        time.sleep(0.01)
+
+    trajectory = SpinTrajectory.random(rng, 3, 5000)
+    event = spin_event(1, "piece", labels, sectors, trajectory, time.time() * 1000)
+    size = len(json.dumps(event, ensure_ascii=False, separators=(",", ":")).encode("utf-8"))
+
+    # Yayın süresi, Tk ana döngüsünün bir olay için bekleyeceği süredir
+    worst = 0.0
+    start = time.perf_counter()
+    for index in range(args.events):
+        before = time.perf_counter()
+        server.publish("label", {"spin_id": 1, "index": index % len(labels), "text": labels[index % len(labels)]})
+        worst = max(worst, time.perf_counter() - before)
+        if index % 32 == 31:
+            # 30 dilimli bir çevirmenin etiketleri kadar olay art arda, sonra kısa ara
+            # (gerçekte olaylar saniyede birkaç tanedir)
+            time.sleep(0.02)
+    elapsed = time.perf_counter() - start - args.events // 32 * 0.02
+
+    time.sleep(1)
+    print(f"{args.clients} okuyan + {args.slow} takılan istemci, {args.events} olay, çevirme olayı {size} bayt")
+    print(f"Yayın: olay başına ortalama {elapsed / args.events * 1e6:.1f} µs, en kötü {worst * 1000:.2f} ms")
+    print(f"Atılan istemci: {server.dropped}, bağlı kalan: {server.client_count()}")
+    print(f"Okuyan istemcilere ulaşan olay: en az {min(received)}, en çok {max(received)}")
+
+    for sock in stalled:
+        sock.close()
+    server.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,234 @@
+"""
+Oyun sayfası akış ayıklayıcısı
+
+Lichess oyun sayfasındaki `script#page-init-data` bloğunu, sayfanın
+tamamını indirip BeautifulSoup ağacı kurmadan bulur. Yanıt parça parça
+okunur; blok kapandığı anda okuma durur, bağlantı kapatılır ve yalnızca
+blok bir kez JSON olarak çözülür. Böylece büyük sayfalarda hem indirme
+hem de ayrıştırma maliyeti (ve animasyon sırasında tutulan GIL süresi)
+azalır.
+
+Mevcut BeautifulSoup yoluyla karşılaştırmalı kıyaslama için:
+
+    python page_extractor.py [kayıtlı_sayfa.html ...] --repeat 200
+"""
+import argparse
+import json
+import re
+import time
+
+# page-init-data betiğinin açılış etiketi
+SCRIPT_START = re.compile(rb'<script[^>]*\bid="page-init-data"[^>]*>')
+
+# Betiğin kapanış etiketi
+SCRIPT_END = b"</script>"
+
+# Parça sınırına denk gelen açılış etiketini kaçırmamak için tutulan kuyruk uzunluğu
+TAIL_SIZE = 256
+
+
+def find_init_script(chunks):
+    """
+    Parça parça gelen sayfadan page-init-data betiğinin içeriğini çıkarır.
+
+    Betik kapandığında parçaları okumayı bırakır; sayfanın kalanı tüketilmez.
+
+    Parametreler:
+        chunks (iterable): Sayfanın bayt parçaları
+
+    Dönüş değeri:
+        bytes: Betiğin ham içeriği, bulunamazsa None
+    """
+    buffer = b""
+    body_start = None
+
+    for chunk in chunks:
+        buffer += chunk
+
+        # Açılış etiketini ara; bulunamazsa yalnızca kuyruğu sakla
+        if body_start is None:
+            match = SCRIPT_START.search(buffer)
+            if not match:
+                buffer = buffer[-TAIL_SIZE:]
+                continue
+            buffer = buffer[match.end():]
+            body_start = 0
+            search_from = 0
+        else:
+            # Önceki parçalar zaten tarandı; yalnızca sınıra taşan etiketi kaçırmamak için geri başla
+            search_from = max(0, len(buffer) - len(chunk) - len(SCRIPT_END))
+
+        # Kapanış etiketi geldiyse hemen dur
+        end = buffer.find(SCRIPT_END, search_from)
+        if end != -1:
+            return buffer[:end]
+
+    return None
+
+
+def last_fen(data):
+    """
+    JSON içinde belge sırasına göre en son geçen "fen" değerini bulur.
+
+    Eski `split('"fen":"')[-1]` davranışının yapılandırılmış karşılığıdır:
+    hamle listesi varsa son hamlenin pozisyonunu verir.
+    """
+    found = None
+    if isinstance(data, dict):
+        for key, value in data.items():
+            if key == "fen" and isinstance(value, str):
+                found = value
+            else:
+                found = last_fen(value) or found
+    elif isinstance(data, list):
+        for item in data:
+            found = last_fen(item) or found
+    return found
+
+
+def parse_init_data(script):
+    """
+    page-init-data içeriğini bir kez çözer ve dümen için gereken alanları döndürür.
+
+    Parametreler:
+        script (bytes | str): Betiğin ham JSON içeriği
+
+    Dönüş değeri:
+        dict: {"fen", "last_move", "clock", "player_color", "opponent_color"}
+    """
+    init_data = json.loads(script)
+    data = init_data.get("data", init_data)
+    game = data.get("game", {})
+    steps = data.get("steps") or []
+
+    # Son pozisyon: hamle listesinin sonu, yoksa belgedeki son FEN
+    fen = steps[-1].get("fen") if steps else None
+    fen = fen or last_fen(init_data)
+
+    # Son hamle: oyun bilgisi, yoksa son adım
+    last_move = game.get("lastMove")
+    if not last_move and steps:
+        last_move = steps[-1].get("uci")
+
+    clock = data.get("clock") or {}
+    return {
+        "fen": fen,
+        "last_move": last_move,
+        "clock": {"white": clock.get("white"), "black": clock.get("black")},
+        "player_color": (data.get("player") or {}).get("color"),
+        "opponent_color": (data.get("opponent") or {}).get("color"),
+    }
+
+
+def extract_page_data(chunks):
+    """
+    Sayfa parçalarından oyun verisini çıkarır.
+
+    Parametreler:
+        chunks (iterable): Sayfanın bayt parçaları
+
+    Dönüş değeri:
+        dict: parse_init_data çıktısı, betik bulunamazsa None
+    """
+    script = find_init_script(chunks)
+    if script is None:
+        return None
+    return parse_init_data(script)
+
+
+def read_page_data(response, chunk_size=8192):
+    """
+    `stream=True` ile alınmış bir yanıttan oyun verisini erken çıkışla okur.
+
+    Betik bulunduktan sonra bağlantı kapatılır; sayfanın kalanı indirilmez.
+    Bağlantı havuza dönmediğinden sonraki istek yeni bir el sıkışma yapar;
+    oyun sayfası yalnızca PGN'den pozisyon çıkmadığında istendiği için bu,
+    sayfanın tamamını indirmekten ucuzdur.
+
+    Parametreler:
+        response (requests.Response): Akış olarak açılmış oyun sayfası yanıtı
+        chunk_size (int): Okuma parçası boyutu (bayt)
+
+    Dönüş değeri:
+        dict: parse_init_data çıktısı, betik bulunamazsa None
+    """
+    try:
+        return extract_page_data(response.iter_content(chunk_size=chunk_size))
+    finally:
+        response.close()
+
+
+def extract_fen_bs4(html_content):
+    """
+    Karşılaştırma için BeautifulSoup tabanlı eski FEN çıkarma yolu.
+    """
+    from bs4 import BeautifulSoup
+
+    soup = BeautifulSoup(html_content, 'html.parser')
+    script_tag = soup.select_one('script#page-init-data')
+    if not script_tag:
+        return None
+    return script_tag.get_text().split('"fen":"')[-1].split('"')[0] or None
+
+
+def sample_pages():
+    """
+    Kayıtlı sayfa verilmediğinde kıyaslama için taklit sunucudan sayfalar üretir.
+    """
+    import random
+
+    from lichess_mock import MockGame, random_moves
+
+    rng = random.Random(0)
+    pages = []
+    for plies in (20, 80, 200):
+        game = MockGame(f"bench{plies}", "beyaz", "siyah", random_moves(rng, plies), move_delay=0)
+        pages.append((f"üretilmiş {plies} ply", game.page_html().encode("utf-8")))
+    return pages
+
+
+def main():
+    parser = argparse.ArgumentParser(description="page-init-data ayıklayıcı kıyaslaması")
+    parser.add_argument("pages", nargs="*", help="Kayıtlı oyun sayfaları (HTML)")
+    parser.add_argument("--repeat", type=int, default=200)
+    parser.add_argument("--chunk-size", type=int, default=8192)
+    args = parser.parse_args()
+
+    if args.pages:
+        pages = []
+        for path in args.pages:
+            with open(path, "rb") as page_file:
+                pages.append((path, page_file.read()))
+    else:
+        pages = sample_pages()
+
+    for name, html in pages:
+        chunks = [html[index:index + args.chunk_size] for index in range(0, len(html), args.chunk_size)]
+
+        # İki yolun aynı sonucu verdiğini doğrula
+        expected = extract_fen_bs4(html.decode("utf-8"))
+        streamed = extract_page_data(chunks)
+        if (streamed or {}).get("fen") != expected:
+            print(f"UYUMSUZLUK {name}: bs4={expected!r} akış={(streamed or {}).get('fen')!r}")
+
+        start = time.perf_counter()
+        for _ in range(args.repeat):
+            extract_fen_bs4(html.decode("utf-8"))
+        bs4_time = (time.perf_counter() - start) / args.repeat
+
+        start = time.perf_counter()
+        consumed = 0
+        for _ in range(args.repeat):
+            iterator = iter(chunks)
+            extract_page_data(iterator)
+            consumed = sum(1 for _ in iterator)
+        stream_time = (time.perf_counter() - start) / args.repeat
+
+        read_ratio = 1 - consumed / len(chunks)
+        print(f"{name}: {len(html) / 1024:.0f} KB, bs4 {bs4_time * 1000:.2f} ms, "
+              f"akış {stream_time * 1000:.3f} ms ({bs4_time / stream_time:.0f}x), "
+              f"okunan parça oranı %{read_ratio * 100:.0f}")
+
+
+if __name__ == "__main__":
+    main()
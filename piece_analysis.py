@@ -0,0 +1,329 @@
+"""
+Taş analizi
+
+Bir pozisyonda sırası gelen oyuncunun hangi taş tiplerini hareket
+ettirebileceğini belirleyen analiz fonksiyonları. Hem arayüz hem de arka
+plan bileşenleri (ön yükleyici, toplu analiz) aynı analizi kullanır.
+
+Hızlı yol (`movable_piece_types`) tüm yasal hamleleri üretmek yerine her
+taş tipini bitboard'lar üzerinden ayrı ayrı değerlendirir ve ilk yasal
+hamleyi bulduğu anda o tipi bırakır.
+Eski algoritma (`movable_piece_names`) karşılaştırma için referans olarak
+korunur. Farklılık denetimi ve mikro kıyaslama için:
+
+    python piece_analysis.py --check 1000000 --bench 20000
+"""
+import argparse
+import random
+import time
+
+import chess
+
+# Taş tiplerini Türkçe isimlerle eşleştir
+PIECE_NAMES = {
+    chess.PAWN: "Piyon",
+    chess.KNIGHT: "At",
+    chess.BISHOP: "Fil",
+    chess.ROOK: "Kale",
+    chess.QUEEN: "Vezir",
+    chess.KING: "Şah"
+}
+
+# Türkçe isimden taş tipine ters eşleme
+PIECE_TYPES_BY_NAME = {name: piece_type for piece_type, name in PIECE_NAMES.items()}
+
+
+def piece_label(piece_type, square=None):
+    """
+    Dümen dilimi etiketi üretir: taş tipi modunda "At", taş başına modda "At g1".
+    """
+    if square is None:
+        return PIECE_NAMES[piece_type]
+    return f"{PIECE_NAMES[piece_type]} {chess.square_name(square)}"
+
+
+def parse_piece_label(label):
+    """
+    `piece_label` ile üretilen etiketi çözer.
+
+    Dönüş değeri:
+        tuple: (taş tipi, kare ya da taş tipi modunda None)
+    """
+    name, _, square = label.partition(" ")
+    return PIECE_TYPES_BY_NAME[name], chess.parse_square(square) if square else None
+
+
+def movable_piece_names(board):
+    """
+    Sırası gelen oyuncunun hareket ettirebileceği taş tiplerini bulur.
+
+    Tüm yasal hamleleri üreten eski algoritma; hızlı yolun doğruluğunu
+    denetlemek için referans olarak tutulur. Taş isimleri, ilgili tipin ilk
+    yasal hamlesinin sırasına göre listelenir.
+
+    Parametreler:
+        board (chess.Board): Analiz edilecek pozisyon
+
+    Dönüş değeri:
+        list: Hareket edebilen taşların Türkçe isimleri
+    """
+    # Tüm yasal hamleleri al
+    legal_moves = list(board.legal_moves)
+
+    # Hareket edebilen benzersiz taşları tespit et
+    piece_map = board.piece_map()
+    movable_pieces = []
+
+    # Hangi oyuncunun sırası olduğunu belirle
+    turn_color = board.turn
+
+    # Hareket edebilen tüm taşları bul
+    for move in legal_moves:
+        # Hamlenin başlangıç karesini al
+        from_square = move.from_square
+
+        # Karede bir taş olup olmadığını kontrol et
+        if from_square in piece_map:
+            # Taş nesnesini al
+            piece = piece_map[from_square]
+
+            # Taşın sırası gelen oyuncuya ait olup olmadığını kontrol et
+            if piece.color == turn_color:
+                # Taşın Türkçe adını al
+                piece_name = PIECE_NAMES[piece.piece_type]
+
+                # Eğer listede yoksa taş adını ekle
+                if piece_name not in movable_pieces:
+                    movable_pieces.append(piece_name)
+
+    return movable_pieces
+
+
+# Hamle kümesi saldırı bitboard'undan okunabilen taş tipleri
+ATTACK_MASK_TYPES = (chess.KNIGHT, chess.BISHOP, chess.ROOK, chess.QUEEN)
+
+
+def has_legal_move(board, from_mask):
+    """
+    `from_mask` karelerinden başlayan en az bir yasal hamle olup olmadığını bulur.
+
+    Hamleler tembel üretilir; ilk yasal hamlede durulur.
+    """
+    for _ in board.generate_legal_moves(from_mask=from_mask):
+        return True
+    return False
+
+
+def pinned_pieces(board, king):
+    """
+    Sırası gelen tarafın açmazdaki taşlarını bulur.
+
+    Şahın hatlarındaki her rakip uzun menzilli taş için aradaki kareler
+    taranır; arada tek taş varsa ve bizimse o taş açmazdadır. Sonuç
+    `board.is_pinned` ile aynıdır, ancak taş başına değil şah başına bir
+    kez hesaplanır.
+
+    Parametreler:
+        board (chess.Board): Pozisyon
+        king (int): Sırası gelen tarafın şahının karesi
+
+    Dönüş değeri:
+        int: Açmazdaki taşların bitboard'u
+    """
+    turn = board.turn
+    snipers = board.occupied_co[not turn] & (
+        (chess.BB_RANK_ATTACKS[king][0] | chess.BB_FILE_ATTACKS[king][0]) & (board.rooks | board.queens)
+        | chess.BB_DIAG_ATTACKS[king][0] & (board.bishops | board.queens))
+
+    pinned = 0
+    for sniper in chess.scan_forward(snipers):
+        between = chess.between(king, sniper) & board.occupied
+        # Arada tam bir taş varsa açmaz olabilir
+        if between and not between & (between - 1):
+            pinned |= between
+    return pinned & board.occupied_co[turn]
+
+
+def movable_piece_types(board, piece_types=chess.PIECE_TYPES):
+    """
+    Sırası gelen oyuncunun hareket ettirebileceği taş tiplerini bitboard'larla bulur.
+
+    Tüm yasal hamleleri üretmek yerine her taş tipi ayrı ele alınır. Şah
+    çekilmemişken açmaza girmemiş (pinned olmayan) bir at, fil, kale ya da
+    vezir, kendi taşı olmayan bir kareye saldırıyorsa; piyon bir kare ileri
+    gidebiliyor ya da taş alabiliyorsa; şah saldırı altında olmayan bir
+    komşu kareye gidebiliyorsa o tip hareket edebilir. Bu kısa yolların
+    karar veremediği durumlarda (açmazdaki taşlar, geçerken alma, şah
+    altındaki pozisyon) yalnızca o tipin kareleri için `from_mask` ile
+    yasal hamle aranır ve ilk hamlede durulur.
+
+    Tipler sabit sırayla (piyon, at, fil, kale, vezir, şah) döndürülür.
+
+    Parametreler:
+        board (chess.Board): Analiz edilecek pozisyon
+        piece_types (tuple): Yalnızca bu tipleri değerlendir (artımlı güncelleme için)
+
+    Dönüş değeri:
+        list: Hareket edebilen taş tipleri (chess.PAWN ... chess.KING)
+    """
+    turn = board.turn
+    ours = board.occupied_co[turn]
+    king_mask = board.kings & ours
+
+    # Şah altındaysa kaçış hamleleri gerekir: her tip için ilk yasal hamleyi ara
+    if not king_mask or board.is_check():
+        return [piece_type for piece_type in chess.PIECE_TYPES
+                if piece_type in piece_types and has_legal_move(board, board.pieces_mask(piece_type, turn))]
+
+    king = chess.msb(king_mask)
+    theirs = board.occupied_co[not turn]
+    # Şaha giden hattı tek başına kapatan (açmazdaki) kendi taşlarımız
+    pinned = pinned_pieces(board, king)
+    movable_types = []
+
+    # Piyonlar: serbest bir piyonun önü boşsa ya da alabileceği bir taş varsa yeterli
+    pawns = board.pawns & ours
+    if pawns and chess.PAWN in piece_types:
+        free_pawns = pawns & ~pinned
+        pushes = ((free_pawns << 8) if turn == chess.WHITE else (free_pawns >> 8)) & ~board.occupied
+        found = bool(pushes & chess.BB_ALL) or any(
+            chess.BB_PAWN_ATTACKS[turn][square] & theirs for square in chess.scan_forward(free_pawns))
+        if found or has_legal_move(board, pawns):
+            movable_types.append(chess.PAWN)
+
+    # At ve uzun menzilli taşlar: serbest bir taşın boş ya da rakip taşlı bir hedefi yeterli
+    for piece_type in ATTACK_MASK_TYPES:
+        mask = board.pieces_mask(piece_type, turn)
+        if not mask or piece_type not in piece_types:
+            continue
+
+        found = any(board.attacks_mask(square) & ~ours for square in chess.scan_forward(mask & ~pinned))
+        if found or (mask & pinned and has_legal_move(board, mask & pinned)):
+            movable_types.append(piece_type)
+
+    # Şah: saldırı altında olmayan bir komşu kare yeterli (rok da böyle bir kare gerektirir)
+    for square in chess.scan_forward(chess.BB_KING_ATTACKS[king] & ~ours if chess.KING in piece_types else 0):
+        if not board.is_attacked_by(not turn, square):
+            movable_types.append(chess.KING)
+            break
+
+    return movable_types
+
+
+def legal_moves_of(board, piece_type, square=None):
+    """
+    Sıradaki tarafın `piece_type` tipindeki taşlarının (`square` verilirse
+    yalnızca o karedeki taşın) yasal hamleleri.
+
+    Hamle üretimi taşların kareleriyle maskelenir; diğer taşların hamleleri hiç üretilmez.
+
+    Parametreler:
+        board (chess.Board): Pozisyon
+        piece_type (int): Taş tipi (chess.PAWN ... chess.KING)
+        square (int): Yalnızca bu karedeki taş (taş başına dilim modu)
+
+    Dönüş değeri:
+        list: chess.Move listesi
+    """
+    if square is not None:
+        from_mask = chess.BB_SQUARES[square]
+    else:
+        from_mask = board.pieces_mask(piece_type, board.turn)
+    return list(board.generate_legal_moves(from_mask=from_mask))
+
+
+def analyze_fen(fen):
+    """
+    FEN pozisyonunu çözer ve hareket edebilen taş tiplerini bulur.
+
+    Parametreler:
+        fen (str): Analiz edilecek pozisyonun FEN gösterimi
+
+    Dönüş değeri:
+        tuple: (chess.Board, hareket edebilen taş isimleri listesi)
+    """
+    board = chess.Board(fen)
+    return board, [PIECE_NAMES[piece_type] for piece_type in movable_piece_types(board)]
+
+
+def random_positions(rng, count, max_plies=200):
+    """
+    Rastgele oynanan oyunlardan pozisyon üretir.
+
+    Oyun bittiğinde ya da `max_plies` hamleye ulaşıldığında yeni oyuna
+    başlanır; mat ve pat pozisyonları da üretilir.
+
+    Parametreler:
+        rng (random.Random): Rastgele sayı üreteci
+        count (int): Üretilecek pozisyon sayısı
+        max_plies (int): Bir oyunun en fazla hamle sayısı
+
+    Dönüş değeri:
+        generator: Her adımda aynı chess.Board nesnesi (kopyalanmadan)
+    """
+    board = chess.Board()
+    for _ in range(count):
+        yield board
+
+        moves = list(board.legal_moves)
+        if not moves or board.ply() >= max_plies:
+            board.reset()
+        else:
+            board.push(rng.choice(moves))
+
+
+def check_against_reference(count, seed=0):
+    """
+    Hızlı yolu eski algoritmayla rastgele pozisyonlarda karşılaştırır.
+
+    Tip kümeleri karşılaştırılır; sıra, hızlı yolda sabit olduğundan farklı olabilir.
+
+    Dönüş değeri:
+        list: Uyuşmayan pozisyonların FEN'leri
+    """
+    mismatches = []
+    for index, board in enumerate(random_positions(random.Random(seed), count), start=1):
+        expected = set(movable_piece_names(board))
+        found = {PIECE_NAMES[piece_type] for piece_type in movable_piece_types(board)}
+        if expected != found:
+            mismatches.append(board.fen())
+            print(f"UYUMSUZLUK {board.fen()}: eski={sorted(expected)} hızlı={sorted(found)}")
+
+        if index % 100000 == 0:
+            print(f"{index} pozisyon denetlendi, {len(mismatches)} uyumsuzluk")
+    return mismatches
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Taş analizi farklılık denetimi ve mikro kıyaslaması")
+    parser.add_argument("--check", type=int, default=100000, help="Denetlenecek rastgele pozisyon sayısı")
+    parser.add_argument("--bench", type=int, default=20000, help="Kıyaslamada kullanılacak pozisyon sayısı")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    if args.check:
+        start = time.perf_counter()
+        mismatches = check_against_reference(args.check, args.seed)
+        print(f"Denetim: {args.check} pozisyon, {len(mismatches)} uyumsuzluk "
+              f"({time.perf_counter() - start:.1f} sn)")
+
+    if args.bench:
+        boards = [board.copy(stack=False)
+                  for board in random_positions(random.Random(args.seed + 1), args.bench)]
+
+        start = time.perf_counter()
+        for board in boards:
+            movable_piece_names(board)
+        reference_time = (time.perf_counter() - start) / len(boards)
+
+        start = time.perf_counter()
+        for board in boards:
+            movable_piece_types(board)
+        fast_time = (time.perf_counter() - start) / len(boards)
+
+        print(f"Kıyaslama: {len(boards)} pozisyon, eski {reference_time * 1e6:.1f} µs, "
+              f"hızlı {fast_time * 1e6:.1f} µs ({reference_time / fast_time:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
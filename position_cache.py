@@ -0,0 +1,227 @@
+"""
+Pozisyon önbelleği
+
+Aynı oyunda art arda yapılan çevirmelerin current-game ve oyun sayfasını
+yeniden indirmemesi için iki katmanlı bir önbellek: bellekte LRU, isteğe
+bağlı olarak diskte SQLite. Kayıtlar süre (TTL) ile tazeliğini yitirir ve
+ETag / Last-Modified doğrulayıcılarıyla koşullu olarak yenilenebilir.
+
+Anahtarlar:
+    user:{kullanıcı}         -> oyun ID'si
+    fen:{oyun ID'si}:{ply}   -> FEN
+    latest:{oyun ID'si}      -> bilinen en son ply
+"""
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+import chess
+
+
+class LRUCache:
+    """
+    Boyutu sınırlı, en uzun süre kullanılmayanı atan bellek önbelleği.
+    """
+    def __init__(self, maxsize=256):
+        """
+        Parametreler:
+            maxsize (int): Tutulacak en fazla kayıt sayısı
+        """
+        self.maxsize = maxsize
+        self.entries = OrderedDict()
+
+    def get(self, key):
+        entry = self.entries.get(key)
+        if entry is not None:
+            self.entries.move_to_end(key)
+        return entry
+
+    def put(self, key, entry):
+        self.entries[key] = entry
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.maxsize:
+            self.entries.popitem(last=False)
+
+
+class DiskStore:
+    """
+    Önbellek kayıtlarını uygulama yeniden başlasa da saklayan SQLite deposu.
+
+    Anahtarlar ad alanıyla (ör. sunucu adresi) öneklenir; aynı dosyayı
+    paylaşan farklı sunucuların kayıtları birbirine karışmaz.
+    """
+    def __init__(self, path, namespace=""):
+        """
+        Parametreler:
+            path (str): SQLite dosyasının yolu
+            namespace (str): Kayıtların ad alanı (ör. "https://lichess.org")
+        """
+        self.prefix = f"{namespace}|" if namespace else ""
+        self.connection = sqlite3.connect(path, check_same_thread=False)
+        self.connection.execute(
+            "CREATE TABLE IF NOT EXISTS cache (key TEXT PRIMARY KEY, entry TEXT NOT NULL)")
+        self.connection.commit()
+
+    def get(self, key):
+        row = self.connection.execute("SELECT entry FROM cache WHERE key = ?", (self.prefix + key,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def put(self, key, entry):
+        self.connection.execute(
+            "INSERT OR REPLACE INTO cache (key, entry) VALUES (?, ?)", (self.prefix + key, json.dumps(entry)))
+        self.connection.commit()
+
+
+class PositionCache:
+    """
+    Kullanıcı -> oyun ID'si ve oyun ID'si + ply -> FEN eşlemelerini tutan önbellek.
+
+    Süresi geçmiş kayıtlar silinmez; "bayat" olarak döndürülür. Böylece
+    arayüz son bilinen pozisyonu hemen kullanıp arka planda yenileme
+    yapabilir (stale-while-revalidate).
+    """
+    def __init__(self, game_ttl=30, fen_ttl=3, maxsize=256, path=None, namespace=""):
+        """
+        Parametreler:
+            game_ttl (float): Kullanıcı -> oyun ID'si kaydının taze sayıldığı süre (saniye)
+            fen_ttl (float): Pozisyon kaydının taze sayıldığı süre (saniye)
+            maxsize (int): Bellekte tutulacak en fazla kayıt sayısı
+            path (str): Disk deposunun yolu, None ise yalnızca bellek kullanılır
+            namespace (str): Disk kayıtlarının ad alanı; sunucu adresi verilirse başka
+                sunuculara ait kayıtlar (ör. taklit sunucu) okunmaz
+        """
+        self.game_ttl = game_ttl
+        self.fen_ttl = fen_ttl
+        self.memory = LRUCache(maxsize)
+        self.disk = DiskStore(path, namespace) if path else None
+        self._lock = threading.Lock()
+
+        # İsabet istatistikleri
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        """
+        Kaydı önce bellekten, yoksa diskten getirir.
+
+        Dönüş değeri:
+            dict: {"value", "stored_at", "etag", "last_modified"} ya da None
+        """
+        with self._lock:
+            entry = self.memory.get(key)
+            if entry is None and self.disk:
+                entry = self.disk.get(key)
+                if entry is not None:
+                    self.memory.put(key, entry)
+
+            if entry is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+            return entry
+
+    def put(self, key, value, response=None):
+        """
+        Kaydı iki katmana da yazar.
+
+        Parametreler:
+            key (str): Önbellek anahtarı
+            value: JSON'a çevrilebilir değer
+            response (requests.Response): Doğrulayıcıların alınacağı yanıt
+        """
+        headers = response.headers if response is not None else {}
+        entry = {
+            "value": value,
+            "stored_at": time.time(),
+            "etag": headers.get("ETag"),
+            "last_modified": headers.get("Last-Modified"),
+        }
+        with self._lock:
+            self.memory.put(key, entry)
+            if self.disk:
+                self.disk.put(key, entry)
+
+    def touch(self, key):
+        """
+        304 yanıtından sonra kaydın tazelik süresini yeniler.
+        """
+        entry = self.get(key)
+        if entry is not None:
+            self.put_entry(key, dict(entry, stored_at=time.time()))
+
+    def put_entry(self, key, entry):
+        with self._lock:
+            self.memory.put(key, entry)
+            if self.disk:
+                self.disk.put(key, entry)
+
+    def conditional_headers(self, key):
+        """
+        Kaydın doğrulayıcılarından koşullu istek başlıklarını üretir.
+
+        Dönüş değeri:
+            dict: If-None-Match / If-Modified-Since başlıkları (yoksa boş)
+        """
+        entry = self.get(key)
+        headers = {}
+        if entry:
+            if entry.get("etag"):
+                headers["If-None-Match"] = entry["etag"]
+            if entry.get("last_modified"):
+                headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def store_game_id(self, username, game_id, response=None):
+        """
+        Kullanıcının aktif oyun ID'sini kaydeder.
+        """
+        self.put(f"user:{username.lower()}", game_id, response)
+
+    def store_fen(self, game_id, fen, response=None):
+        """
+        Oyunun bir pozisyonunu ply numarasıyla birlikte kaydeder.
+
+        Dönüş değeri:
+            int: Pozisyonun ply numarası
+        """
+        ply = chess.Board(fen).ply()
+        self.put(f"fen:{game_id}:{ply}", fen, response)
+
+        # Bilinen en son ply'ı ilerlet
+        latest = self.get(f"latest:{game_id}")
+        if latest is None or latest["value"] <= ply:
+            self.put(f"latest:{game_id}", ply, response)
+        return ply
+
+    def lookup_position(self, username):
+        """
+        Kullanıcının son bilinen pozisyonunu tazelik bilgisiyle döndürür.
+
+        Parametreler:
+            username (str): Lichess kullanıcı adı
+
+        Dönüş değeri:
+            dict: {"game_id", "fen", "ply", "age", "fresh"} ya da kayıt yoksa None
+        """
+        now = time.time()
+
+        game_entry = self.get(f"user:{username.lower()}")
+        if game_entry is None:
+            return None
+        game_id = game_entry["value"]
+
+        latest = self.get(f"latest:{game_id}")
+        if latest is None:
+            return None
+        ply = latest["value"]
+
+        fen_entry = self.get(f"fen:{game_id}:{ply}")
+        if fen_entry is None:
+            return None
+
+        # Pozisyonun yaşı, en son doğrulanan kaydın zamanına göre hesaplanır
+        age = now - latest["stored_at"]
+        fresh = (now - game_entry["stored_at"] < self.game_ttl) and age < self.fen_ttl
+        return {"game_id": game_id, "fen": fen_entry["value"], "ply": ply, "age": age, "fresh": fresh}
@@ -0,0 +1,475 @@
+"""
+Çok kullanıcılı canlı pozisyon takipçisi
+
+Yayında dümeni birçok izleyicinin Lichess hesabı için çeviren yayıncılar
+için, yüzlerce kullanıcıyı aynı anda takip eden asyncio tabanlı bir servis.
+Takipçi kullanıcı durumlarını toplu olarak sorgular (/api/users/status),
+oynayan kullanıcıların oyun akışlarına bağlanır ve her kullanıcı için
+güncel bir satranç tahtası tutar. Böylece herhangi bir kullanıcının dümeni
+ağ beklemeden çevrilebilir.
+
+Kıyaslama için komut satırından çalıştırılabilir:
+
+    python position_tracker.py --players 500
+"""
+import argparse
+import asyncio
+import json
+import ssl
+import threading
+import time
+from urllib.parse import urlsplit
+
+from lichess_api import LICHESS_URL, HEADERS
+from lichess_stream import is_finished_status
+from live_board import LiveBoard
+from request_scheduler import RateLimited, RequestScheduler, endpoint_for, parse_retry_after
+
+
+class AsyncResponse:
+    """
+    asyncio akışları üzerinde çalışan küçük bir HTTP/1.1 yanıtı.
+
+    `read_timeout` verilirse gövdeden her okuma en fazla bu kadar bekler;
+    sessizce ölen bir akış asyncio.TimeoutError ile sonlanır.
+    """
+    def __init__(self, status, headers, reader, writer, read_timeout=None):
+        self.status = status
+        self.headers = headers
+        self.reader = reader
+        self.writer = writer
+        self.read_timeout = read_timeout
+
+    async def _wait(self, read):
+        """
+        Tek bir okumayı okuma zaman aşımıyla bekler.
+        """
+        if self.read_timeout is None:
+            return await read
+        return await asyncio.wait_for(read, self.read_timeout)
+
+    async def iter_chunks(self):
+        """
+        Yanıt gövdesini parça parça döndürür.
+
+        Parçalı (chunked), uzunluğu belirli ve bağlantı kapanana kadar
+        süren gövdelerin üçünü de destekler.
+        """
+        if self.headers.get("transfer-encoding", "").lower() == "chunked":
+            while True:
+                size_line = await self._wait(self.reader.readline())
+                size = int(size_line.split(b";")[0].strip() or b"0", 16)
+                if size == 0:
+                    break
+                data = await self._wait(self.reader.readexactly(size))
+                await self._wait(self.reader.readline())
+                yield data
+        elif "content-length" in self.headers:
+            remaining = int(self.headers["content-length"])
+            while remaining > 0:
+                data = await self._wait(self.reader.read(min(65536, remaining)))
+                if not data:
+                    break
+                remaining -= len(data)
+                yield data
+        else:
+            while True:
+                data = await self._wait(self.reader.read(65536))
+                if not data:
+                    break
+                yield data
+
+    async def read(self):
+        """
+        Tüm gövdeyi okur.
+        """
+        return b"".join([chunk async for chunk in self.iter_chunks()])
+
+    async def iter_lines(self):
+        """
+        NDJSON gövdesini satır satır döndürür.
+        """
+        buffer = b""
+        async for chunk in self.iter_chunks():
+            buffer += chunk
+            *lines, buffer = buffer.split(b"\n")
+            for line in lines:
+                yield line
+        if buffer:
+            yield buffer
+
+    def close(self):
+        """
+        Bağlantıyı kapatır.
+        """
+        self.writer.close()
+
+
+async def http_get(base_url, path, timeout=10, read_timeout=None):
+    """
+    Yeni bir bağlantı üzerinden GET isteği gönderir ve başlıkları okur.
+
+    Parametreler:
+        base_url (str): Sunucunun kök adresi
+        path (str): İstek yolu (sorgu dizesiyle birlikte)
+        timeout (float): Bağlantı ve başlık okuma için zaman aşımı (saniye)
+        read_timeout (float): Gövdeden her okuma için zaman aşımı (saniye), None ise süresiz
+
+    Dönüş değeri:
+        AsyncResponse: Gövdesi henüz okunmamış yanıt
+    """
+    url = urlsplit(base_url)
+    secure = url.scheme == "https"
+    port = url.port or (443 if secure else 80)
+    ssl_context = ssl.create_default_context() if secure else None
+
+    reader, writer = await asyncio.wait_for(
+        asyncio.open_connection(url.hostname, port, ssl=ssl_context), timeout)
+
+    host = url.hostname if url.port is None else f"{url.hostname}:{url.port}"
+    request = (f"GET {path} HTTP/1.1\r\n"
+               f"Host: {host}\r\n"
+               f"User-Agent: {HEADERS['User-Agent']}\r\n"
+               "Accept: */*\r\n"
+               "Connection: close\r\n\r\n")
+    writer.write(request.encode("latin-1"))
+
+    try:
+        await writer.drain()
+
+        # Durum satırı ve başlıklar
+        status_line = await asyncio.wait_for(reader.readline(), timeout)
+        status = int(status_line.split()[1])
+        headers = {}
+        while True:
+            line = await asyncio.wait_for(reader.readline(), timeout)
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+    except BaseException:
+        writer.close()
+        raise
+
+    return AsyncResponse(status, headers, reader, writer, read_timeout)
+
+
+class PositionTracker:
+    """
+    Çok sayıda Lichess kullanıcısının oyunlarını aynı anda takip eden servis.
+
+    Kullanıcı durumları 100'lük gruplar halinde sorgulanır; oynayan her
+    kullanıcının oyun akışı ayrı bir görevde takip edilir. Aynı oyundaki iki
+    kullanıcı tek bir akışı paylaşır. Eşzamanlı akış ve istek sayıları
+    semaforlarla sınırlandırılır; ortak zamanlayıcının hız kovası yalnızca
+    durum sorgularına uygulanır, akışlar eşzamanlı akış sınırına ve 429
+    sonrası genel beklemeye tabidir.
+    """
+    def __init__(self, usernames, base_url=LICHESS_URL, max_streams=200,
+                 max_requests=4, poll_interval=5, batch_size=100, on_update=None, scheduler=None,
+                 stream_read_timeout=60):
+        """
+        Parametreler:
+            usernames (list): Takip edilecek kullanıcı adları
+            base_url (str): Lichess sunucusunun kök adresi
+            max_streams (int): Aynı anda açık tutulacak en fazla oyun akışı
+            max_requests (int): Aynı anda yapılacak en fazla durum sorgusu
+            poll_interval (float): Durum sorguları arasındaki süre (saniye)
+            batch_size (int): Tek sorguda istenecek kullanıcı sayısı (Lichess sınırı 100)
+            on_update (callable): Her pozisyon güncellemesinde (oyun ID'si, tahta) ile çağrılır
+            scheduler (RequestScheduler): İsteklerin izin alacağı ortak zamanlayıcı, None ise sınırsız
+            stream_read_timeout (float): Oyun akışında bu süre veri gelmezse akış ölü sayılır;
+                kullanıcı hâlâ oynuyorsa sonraki durum sorgusu akışı yeniden açar
+        """
+        self.usernames = [username.lower() for username in usernames]
+        self.base_url = base_url.rstrip("/")
+        self.max_streams = max_streams
+        self.max_requests = max_requests
+        self.poll_interval = poll_interval
+        self.batch_size = batch_size
+        self.on_update = on_update
+        self.scheduler = scheduler
+        self.stream_read_timeout = stream_read_timeout
+
+        # Takip durumu
+        self.user_games = {}  # Kullanıcı adı -> oyun ID'si
+        self.boards = {}  # Oyun ID'si -> son bilinen satranç tahtası
+        self.streams = {}  # Oyun ID'si -> akış görevi
+
+        # İstatistikler
+        self.polls = 0
+        self.updates = 0
+        self.errors = 0
+
+        self._loop = None
+        self._thread = None
+        self._stopped = False
+
+    def board_for(self, username):
+        """
+        Kullanıcının son bilinen tahtasını ağa gitmeden döndürür.
+
+        Parametreler:
+            username (str): Lichess kullanıcı adı
+
+        Dönüş değeri:
+            chess.Board: Son pozisyon, kullanıcı oynamıyorsa None
+        """
+        game_id = self.user_games.get(username.lower())
+        if game_id is None:
+            return None
+        return self.boards.get(game_id)
+
+    def snapshot(self, username):
+        """
+        Kullanıcının son bilinen pozisyonunu (oyun ID'si, FEN) olarak döndürür.
+        """
+        game_id = self.user_games.get(username.lower())
+        board = self.boards.get(game_id) if game_id else None
+        if board is None:
+            return None
+        return game_id, board.fen()
+
+    async def run(self):
+        """
+        Durum sorgularını ve oyun akışlarını durdurulana kadar yönetir.
+        """
+        self._stream_slots = asyncio.Semaphore(self.max_streams)
+        self._request_slots = asyncio.Semaphore(self.max_requests)
+
+        try:
+            while not self._stopped:
+                await self.poll_once()
+                await asyncio.sleep(self.poll_interval)
+        finally:
+            # Açık akışları kapat
+            for task in list(self.streams.values()):
+                task.cancel()
+            await asyncio.gather(*self.streams.values(), return_exceptions=True)
+
+    async def request(self, path, stream=False):
+        """
+        Zamanlayıcıdan izin alarak bir GET isteği gönderir.
+
+        Sunucu 429 döndürürse zamanlayıcıya bildirilir; böylece uygulamanın
+        diğer istekleri de Retry-After süresince bekler.
+
+        Parametreler:
+            path (str): İstek yolu
+            stream (bool): Uzun ömürlü oyun akışı mı; akışlar zamanlayıcının hız
+                kovasını kullanmaz, sayıları `max_streams` ile sınırlıdır ve
+                gövdeleri `stream_read_timeout` ile okunur
+
+        Dönüş değeri:
+            AsyncResponse: Gövdesi henüz okunmamış yanıt
+
+        Hatalar:
+            RateLimited: Sunucu 429 döndürdüyse
+        """
+        if self.scheduler:
+            await self.scheduler.acquire_async(endpoint_for(path), bucket=not stream)
+
+        response = await http_get(self.base_url, path,
+                                  read_timeout=self.stream_read_timeout if stream else None)
+        if response.status == 429:
+            response.close()
+            retry_after = response.headers.get("retry-after")
+            if self.scheduler:
+                raise RateLimited(self.scheduler.report_rate_limited(retry_after))
+            raise RateLimited(parse_retry_after(retry_after))
+        return response
+
+    async def poll_once(self):
+        """
+        Tüm kullanıcıların durumunu gruplar halinde bir kez sorgular.
+        """
+        batches = [self.usernames[index:index + self.batch_size]
+                   for index in range(0, len(self.usernames), self.batch_size)]
+        await asyncio.gather(*(self.poll_batch(batch) for batch in batches))
+        self.polls += 1
+
+    async def poll_batch(self, batch):
+        """
+        Tek bir kullanıcı grubunun durumunu sorgular ve yeni oyunlar için akış başlatır.
+
+        Parametreler:
+            batch (list): En fazla `batch_size` kullanıcı adı
+        """
+        path = f"/api/users/status?ids={','.join(batch)}&withGameIds=true"
+
+        try:
+            async with self._request_slots:
+                response = await self.request(path)
+                try:
+                    if response.status != 200:
+                        raise OSError(f"HTTP {response.status}")
+                    statuses = json.loads(await response.read())
+                finally:
+                    response.close()
+        except (OSError, asyncio.TimeoutError, ValueError) as e:
+            self.errors += 1
+            print(f"Kullanıcı durumları alınırken hata oluştu: {e}")
+            return
+
+        playing = set()
+        for status in statuses:
+            username = status["id"]
+            game_id = status.get("playingId")
+            if not game_id:
+                continue
+
+            playing.add(username)
+            self.user_games[username] = game_id
+
+            # Bu oyun henüz takip edilmiyorsa akışını başlat
+            if game_id not in self.streams:
+                self.streams[game_id] = asyncio.create_task(self.follow_game(game_id))
+
+        # Oynamayan kullanıcıları temizle
+        for username in batch:
+            if username not in playing:
+                self.user_games.pop(username, None)
+
+    async def follow_game(self, game_id):
+        """
+        Tek bir oyunun akışını bitene kadar takip eder.
+
+        Parametreler:
+            game_id (str): Takip edilecek oyunun ID'si
+        """
+        try:
+            async with self._stream_slots:
+                response = await self.request(f"/api/stream/game/{game_id}", stream=True)
+                live = LiveBoard()  # Hamleler aynı tahtaya uygulanır
+                try:
+                    # Hata gövdesi (ör. 404) boş bir oyun akışı gibi okunmasın
+                    if response.status != 200:
+                        raise OSError(f"HTTP {response.status}")
+
+                    async for line in response.iter_lines():
+                        if not line.strip():
+                            continue
+
+                        data = json.loads(line)
+                        if data.get("fen") and live.apply(data["fen"], data.get("lm") or data.get("lastMove")):
+                            # Kopya: tahta diğer iş parçacıklarından okunurken değişmesin
+                            board = live.board.copy(stack=False)
+                            self.boards[game_id] = board
+                            self.updates += 1
+                            if self.on_update:
+                                self.on_update(game_id, board)
+
+                        if is_finished_status(data.get("status")):
+                            break
+                finally:
+                    response.close()
+        except (OSError, asyncio.TimeoutError, ValueError, asyncio.IncompleteReadError) as e:
+            self.errors += 1
+            print(f"Oyun akışı takip edilirken hata oluştu ({game_id}): {e}")
+        finally:
+            # Bitmiş oyunun tahtasını bırak; sonraki sorgu yeni oyunu bulur
+            self.streams.pop(game_id, None)
+            self.boards.pop(game_id, None)
+
+    def start_in_thread(self):
+        """
+        Takipçiyi kendi olay döngüsüyle arka plan iş parçacığında çalıştırır.
+
+        Tkinter ana döngüsünü engellememek için arayüzden bu yolla başlatılır.
+        """
+        def run_loop():
+            self._loop = asyncio.new_event_loop()
+            try:
+                self._loop.run_until_complete(self.run())
+            finally:
+                self._loop.close()
+
+        self._stopped = False
+        self._thread = threading.Thread(target=run_loop, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """
+        Takipçiyi durdurur ve açık akışları kapatır.
+        """
+        self._stopped = True
+        loop = self._loop
+        if loop is not None and loop.is_running():
+            for task in list(self.streams.values()):
+                loop.call_soon_threadsafe(task.cancel)
+
+
+async def run_benchmark(players, move_delay, duration, max_streams, scheduler=None):
+    """
+    Yerel taklit sunucuda çok kullanıcılı takipçiyi ölçer.
+
+    Parametreler:
+        players (int): Sanal oyuncu sayısı
+        move_delay (float): Sanal oyunlarda hamleler arası süre (saniye)
+        duration (float): Ölçüm süresi (saniye)
+        max_streams (int): Aynı anda açık tutulacak en fazla oyun akışı
+        scheduler (RequestScheduler): Uygulamadaki gibi bağlanacak ortak zamanlayıcı, None ise yok
+    """
+    from lichess_mock import MockLichessServer
+
+    server = MockLichessServer().start()
+    usernames = server.populate(players, move_delay=move_delay, plies=400)
+
+    # Her güncellemenin, hamlenin sunucuda oynandığı andan ne kadar sonra geldiğini ölç
+    latencies = []
+
+    def on_update(game_id, board):
+        game = server.games[game_id]
+        ply = board.ply()
+        if ply:
+            latencies.append(time.monotonic() - (game.started_at + ply * game.move_delay))
+
+    tracker = PositionTracker(usernames, base_url=server.url, max_streams=max_streams,
+                              poll_interval=1, on_update=on_update, scheduler=scheduler)
+    task = asyncio.create_task(tracker.run())
+
+    # Tüm kullanıcıların tahtası hazır olana kadar geçen süre
+    start = time.monotonic()
+    while sum(1 for username in usernames if tracker.board_for(username)) < len(usernames):
+        if time.monotonic() - start > 60:
+            break
+        await asyncio.sleep(0.01)
+    coverage_time = time.monotonic() - start
+    covered = sum(1 for username in usernames if tracker.board_for(username))
+
+    # Sabit durumda güncelleme gecikmesini ölç
+    latencies.clear()
+    await asyncio.sleep(duration)
+    tracker._stopped = True
+    task.cancel()
+    await asyncio.gather(task, return_exceptions=True)
+    server.stop()
+
+    latencies.sort()
+    print(f"Oyuncu: {players}, akış sınırı: {max_streams}, hamle aralığı: {move_delay} s, "
+          f"zamanlayıcı: {'var' if scheduler else 'yok'}")
+    print(f"Tüm tahtalar hazır: {covered}/{players} kullanıcı, {coverage_time * 1000:.0f} ms")
+    if latencies:
+        median = latencies[len(latencies) // 2] * 1000
+        p95 = latencies[int(len(latencies) * 0.95)] * 1000
+        print(f"Güncelleme: {len(latencies)} hamle, {len(latencies) / duration:.0f} hamle/s, "
+              f"gecikme medyan {median:.1f} ms, p95 {p95:.1f} ms")
+    print(f"Durum sorgusu: {tracker.polls}, hata: {tracker.errors}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Çok kullanıcılı pozisyon takipçisi kıyaslaması")
+    parser.add_argument("--players", type=int, default=500)
+    parser.add_argument("--move-delay", type=float, default=2.0)
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--max-streams", type=int, default=500)
+    parser.add_argument("--scheduler", action="store_true",
+                        help="İstekleri uygulamadaki gibi varsayılan sınırlı zamanlayıcıdan geçir")
+    args = parser.parse_args()
+
+    scheduler = RequestScheduler() if args.scheduler else None
+    asyncio.run(run_benchmark(args.players, args.move_delay, args.duration, args.max_streams, scheduler))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,146 @@
+"""
+Arka plan pozisyon ön yükleyicisi
+
+Kullanıcı adı girildiği andan itibaren aktif oyunu çözen, son FEN'i ve
+taş analizini sıcak tutan arka plan işçisi. Sorgu aralığı oyunun hızına
+göre ayarlanır: bullet'ta sık, yazışmalı oyunlarda seyrek, oyun yokken
+boşta bekleme. Böylece "Dümeni Çevir" tıklandığında veri çoğunlukla
+hazırdır ve animasyon beklemeden başlar.
+"""
+import threading
+import time
+
+# Oyun hızına göre sorgu aralıkları (saniye)
+SPEED_INTERVALS = {
+    "ultraBullet": 0.5,
+    "bullet": 1,
+    "blitz": 2,
+    "rapid": 4,
+    "classical": 8,
+    "correspondence": 60,
+}
+
+# Aktif oyun yokken sorgu aralığı (saniye)
+IDLE_INTERVAL = 15
+
+
+def speed_from_time_control(time_control):
+    """
+    PGN'deki TimeControl değerinden Lichess hız kategorisini hesaplar.
+
+    Lichess, tahmini oyun süresini "başlangıç + 40 x artış" olarak hesaplar.
+
+    Parametreler:
+        time_control (str): Ör. "180+2"; yazışmalı oyunlarda "-"
+
+    Dönüş değeri:
+        str: Hız kategorisi, bilinmiyorsa None
+    """
+    if not time_control:
+        return None
+    if time_control == "-":
+        return "correspondence"
+
+    try:
+        base, _, increment = time_control.partition("+")
+        estimate = int(base) + 40 * int(increment or 0)
+    except ValueError:
+        return None
+
+    if estimate < 30:
+        return "ultraBullet"
+    if estimate < 180:
+        return "bullet"
+    if estimate < 480:
+        return "blitz"
+    if estimate < 1500:
+        return "rapid"
+    return "classical"
+
+
+class PositionPrefetcher:
+    """
+    Son pozisyonu ve analizini arka planda hazır tutan işçi.
+
+    Pozisyonun nereden geldiğini bilmez: `fetch` çağrısı canlı takipçiden,
+    önbellekten ya da ağdan pozisyon getirebilir. Pozisyon değiştiğinde
+    `analyze` ile analiz edilir ve sonuç `latest` içinde saklanır.
+    """
+    def __init__(self, fetch, analyze, on_ready=None):
+        """
+        Parametreler:
+            fetch (callable): (oyun ID'si, FEN, TimeControl) ya da oyun yoksa None döndürür
+            analyze (callable): FEN alır, (chess.Board, taş isimleri) döndürür
+            on_ready (callable): Yeni bir pozisyon analiz edildiğinde `latest` ile çağrılır
+        """
+        self.fetch = fetch
+        self.analyze = analyze
+        self.on_ready = on_ready
+
+        self.latest = None  # Son analiz edilen pozisyon
+        self.interval = IDLE_INTERVAL  # Şu anki sorgu aralığı
+
+        self._stop_event = threading.Event()
+        self._thread = None
+
+    def start(self):
+        """
+        Ön yükleme iş parçacığını başlatır.
+        """
+        if self._thread and self._thread.is_alive():
+            return
+
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """
+        Ön yüklemeyi durdurur.
+        """
+        self._stop_event.set()
+
+    def _run(self):
+        """
+        Pozisyonu sorgulayıp analiz eden ana döngü.
+        """
+        while not self._stop_event.is_set():
+            try:
+                result = self.fetch()
+            except Exception as e:
+                print(f"Pozisyon ön yüklenirken hata oluştu: {e}")
+                result = None
+
+            if result:
+                game_id, fen, time_control = result
+                self.interval = SPEED_INTERVALS.get(speed_from_time_control(time_control), 2)
+
+                # Yalnızca pozisyon değiştiyse yeniden analiz et
+                if not self.latest or self.latest["fen"] != fen or self.latest["game_id"] != game_id:
+                    board, pieces = self.analyze(fen)
+                    self.latest = {
+                        "game_id": game_id,
+                        "fen": fen,
+                        "board": board,
+                        "pieces": pieces,
+                        "fetched_at": time.monotonic(),
+                    }
+                    if self.on_ready:
+                        self.on_ready(self.latest)
+                else:
+                    self.latest["fetched_at"] = time.monotonic()
+            else:
+                # Aktif oyun yok: eski pozisyonu bırak ve boşta bekle
+                self.latest = None
+                self.interval = IDLE_INTERVAL
+
+            self._stop_event.wait(self.interval)
+
+    def age(self):
+        """
+        Son pozisyonun kaç saniye önce doğrulandığını döndürür, pozisyon yoksa None.
+        """
+        latest = self.latest
+        if latest is None:
+            return None
+        return time.monotonic() - latest["fetched_at"]
@@ -0,0 +1,392 @@
+"""
+İstek zamanlayıcısı
+
+Lichess'e giden tüm isteklerin geçtiği, hız sınırını gözeten merkezi
+zamanlayıcı. Her uç nokta grubunun kendi jeton kovası (token bucket)
+vardır; bir istek ancak kovasında jeton varsa gönderilir. Sunucu 429
+döndürdüğünde Retry-After süresi (yoksa Lichess'in önerdiği bir dakika)
+boyunca tüm istekler durdurulur. Bekleyen istekler önceliğe göre sıralanır:
+kullanıcının tıkladığı çevirme, arka plan yenilemelerinin önüne geçer.
+
+Aynı IP'den birden çok dümen çalıştığında sunucunun sınırına takılmamak
+için, sınırın aşıldığını öğrendikten sonra aynı isteği tekrar tekrar
+göndermek yerine bekler ya da arayüze ne kadar beklenmesi gerektiğini
+bildirir.
+
+Taklit sunucuya karşı 429 eklenmiş bir deneme için:
+
+    python request_scheduler.py --requests 30 --rate-limit 0.05
+"""
+import argparse
+import asyncio
+import heapq
+import itertools
+import threading
+import time
+from urllib.parse import urlsplit
+
+import requests
+
+# Öncelikler: küçük değer önce gönderilir
+PRIORITY_INTERACTIVE = 0  # Kullanıcının tıkladığı çevirme
+PRIORITY_LIVE = 1  # Canlı takip ve olay akışları
+PRIORITY_BACKGROUND = 2  # Ön yükleme ve önbellek yenileme
+
+# Uç nokta grubu -> (saniyede jeton, kova kapasitesi). "game-stream" kovası
+# uygulamanın tek oyun takibi içindir; çok kullanıcılı takipçinin uzun ömürlü
+# akışları hızla değil eşzamanlı akış sınırıyla kısılır (bkz. acquire_async)
+ENDPOINT_LIMITS = {
+    "current-game": (1.0, 3),
+    "game-page": (1.0, 3),
+    "game-stream": (0.5, 4),
+    "event-stream": (0.2, 2),
+    "users-status": (1.0, 2),
+    "other": (2.0, 4),
+}
+
+# Retry-After başlığı yoksa beklenecek süre (saniye); Lichess bir dakika önerir
+DEFAULT_RETRY_AFTER = 60
+
+
+def endpoint_for(url):
+    """
+    İstek adresini hız sınırı uygulanacak uç nokta grubuna eşler.
+
+    Parametreler:
+        url (str): Tam adres ya da yol (ör. "/api/user/x/current-game")
+
+    Dönüş değeri:
+        str: ENDPOINT_LIMITS anahtarlarından biri
+    """
+    parts = urlsplit(url).path.strip("/").split("/")
+
+    if len(parts) == 4 and parts[:2] == ["api", "user"] and parts[3] == "current-game":
+        return "current-game"
+    if parts[:3] == ["api", "stream", "game"]:
+        return "game-stream"
+    if parts == ["api", "stream", "event"]:
+        return "event-stream"
+    if parts == ["api", "users", "status"]:
+        return "users-status"
+    if len(parts) == 1 and parts[0]:
+        return "game-page"
+    return "other"
+
+
+def parse_retry_after(value):
+    """
+    Retry-After başlığını saniyeye çevirir; yoksa ya da okunamazsa varsayılanı döndürür.
+    """
+    try:
+        return max(0.0, float(value))
+    except (TypeError, ValueError):
+        return DEFAULT_RETRY_AFTER
+
+
+class RateLimited(requests.exceptions.RequestException):
+    """
+    İstek, hız sınırı nedeniyle izin verilen süre içinde gönderilemediğinde atılır.
+
+    Öznitelikler:
+        retry_in (float): İsteğin gönderilebileceği tahmini süre (saniye)
+    """
+    def __init__(self, retry_in):
+        super().__init__(f"Lichess istek sınırı: {retry_in:.0f} sn sonra tekrar denenebilir")
+        self.retry_in = retry_in
+
+
+class TokenBucket:
+    """
+    Saniyede belirli sayıda jetonla dolan, kapasitesi sınırlı kova.
+    """
+    def __init__(self, rate, capacity):
+        """
+        Parametreler:
+            rate (float): Saniyede eklenen jeton sayısı
+            capacity (int): Kovada birikebilecek en fazla jeton (ani istek hakkı)
+        """
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = float(capacity)
+        self.updated = time.monotonic()
+
+    def refill(self, now):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_time(self, now):
+        """
+        Bir jeton birikene kadar geçecek süreyi döndürür (jeton varsa 0).
+        """
+        self.refill(now)
+        if self.tokens >= 1:
+            return 0.0
+        return (1 - self.tokens) / self.rate
+
+    def take(self, now):
+        self.refill(now)
+        self.tokens -= 1
+
+
+class RequestScheduler:
+    """
+    Lichess isteklerini uç nokta kovaları, genel bekleme ve önceliklerle sıraya koyan zamanlayıcı.
+
+    İş parçacıkları `acquire`, asyncio görevleri `acquire_async` ile izin
+    alır. Aynı uç noktayı bekleyen istekler arasında önce önceliği yüksek,
+    eşitse önce gelen gönderilir. Tüm istekler aynı genel bekleme süresine
+    (429 sonrası) tabidir.
+    """
+    def __init__(self, limits=None):
+        """
+        Parametreler:
+            limits (dict): Uç nokta grubu -> (saniyede jeton, kapasite); varsayılan ENDPOINT_LIMITS
+        """
+        limits = limits or ENDPOINT_LIMITS
+        self.buckets = {name: TokenBucket(rate, capacity) for name, (rate, capacity) in limits.items()}
+        self.cooldown_until = 0.0  # Bu zamana kadar hiçbir istek gönderilmez (monotonic)
+
+        self._condition = threading.Condition()
+        self._waiting = []  # (öncelik, sıra, uç nokta) yığını
+        self._sequence = itertools.count()
+
+        # Ölçümler
+        self.sent = {name: 0 for name in self.buckets}
+        self.rate_limited = 0  # Sunucudan gelen 429 sayısı
+        self.rejected = 0  # Süresi içinde izin alamayan istek sayısı
+        self.max_depth = 0  # Görülen en uzun kuyruk
+        self.total_wait = 0.0  # İsteklerin kuyrukta toplam bekleme süresi
+
+    def _bucket(self, endpoint):
+        return self.buckets.get(endpoint) or self.buckets["other"]
+
+    def _delay(self, ticket, now):
+        """
+        Kuyruktaki bir isteğin gönderilebilmesi için gereken bekleme süresini hesaplar.
+        """
+        # 429 sonrası genel bekleme
+        if now < self.cooldown_until:
+            return self.cooldown_until - now
+
+        # Aynı uç noktada önde bekleyen varsa sırasını bekle
+        priority, sequence, endpoint = ticket
+        for other in self._waiting:
+            if other[2] == endpoint and other[:2] < (priority, sequence):
+                return max(0.01, self._bucket(endpoint).wait_time(now))
+
+        return self._bucket(endpoint).wait_time(now)
+
+    def _enqueue(self, endpoint, priority):
+        ticket = (priority, next(self._sequence), endpoint)
+        heapq.heappush(self._waiting, ticket)
+        self.max_depth = max(self.max_depth, len(self._waiting))
+        return ticket
+
+    def _dequeue(self, ticket):
+        self._waiting.remove(ticket)
+        heapq.heapify(self._waiting)
+        self._condition.notify_all()
+
+    def _grant(self, ticket, now, queued_at):
+        endpoint = ticket[2]
+        self._bucket(endpoint).take(now)
+        self.sent[endpoint] = self.sent.get(endpoint, 0) + 1
+        self.total_wait += now - queued_at
+
+    def acquire(self, endpoint, priority=PRIORITY_BACKGROUND, timeout=None):
+        """
+        İsteğin gönderilmesine izin verilene kadar bekler.
+
+        Parametreler:
+            endpoint (str): Uç nokta grubu (bkz. endpoint_for)
+            priority (int): İsteğin önceliği (PRIORITY_*)
+            timeout (float): En fazla bekleme süresi (saniye), None ise süresiz
+
+        Hatalar:
+            RateLimited: Gereken bekleme `timeout` süresini aşıyorsa, hemen
+        """
+        queued_at = time.monotonic()
+        deadline = None if timeout is None else queued_at + timeout
+
+        with self._condition:
+            ticket = self._enqueue(endpoint, priority)
+            try:
+                while True:
+                    now = time.monotonic()
+                    delay = self._delay(ticket, now)
+                    if delay <= 0:
+                        self._grant(ticket, now, queued_at)
+                        return
+
+                    # Süre yetmeyecekse boşuna bekleme, arayüze hemen bildir
+                    if deadline is not None and now + delay > deadline:
+                        self.rejected += 1
+                        raise RateLimited(delay)
+
+                    self._condition.wait(delay)
+            finally:
+                self._dequeue(ticket)
+
+    async def acquire_async(self, endpoint, priority=PRIORITY_BACKGROUND, bucket=True):
+        """
+        `acquire`'ın olay döngüsünü engellemeyen karşılığı.
+
+        Parametreler:
+            endpoint (str): Uç nokta grubu (bkz. endpoint_for)
+            priority (int): İsteğin önceliği (PRIORITY_*)
+            bucket (bool): False ise uç nokta kovası atlanır, yalnızca 429 sonrası
+                genel bekleme gözetilir. Sayısı çağıranın eşzamanlılık sınırıyla
+                belirlenen uzun ömürlü akışlar içindir; yüzlerce akışı saniyede
+                birkaç jetonla açmak dakikalar sürer.
+        """
+        queued_at = time.monotonic()
+
+        if not bucket:
+            while True:
+                with self._condition:
+                    now = time.monotonic()
+                    if now >= self.cooldown_until:
+                        self.sent[endpoint] = self.sent.get(endpoint, 0) + 1
+                        self.total_wait += now - queued_at
+                        return
+                    delay = self.cooldown_until - now
+                await asyncio.sleep(min(delay, 1.0))
+
+        with self._condition:
+            ticket = self._enqueue(endpoint, priority)
+        try:
+            while True:
+                with self._condition:
+                    now = time.monotonic()
+                    delay = self._delay(ticket, now)
+                    if delay <= 0:
+                        self._grant(ticket, now, queued_at)
+                        return
+                await asyncio.sleep(min(delay, 1.0))
+        finally:
+            with self._condition:
+                self._dequeue(ticket)
+
+    def report_rate_limited(self, retry_after=None):
+        """
+        Sunucudan 429 alındığını bildirir ve tüm istekleri bekletir.
+
+        Parametreler:
+            retry_after (str): Yanıttaki Retry-After başlığı
+
+        Dönüş değeri:
+            float: Genel beklemenin kalan süresi (saniye)
+        """
+        with self._condition:
+            now = time.monotonic()
+            self.cooldown_until = max(self.cooldown_until, now + parse_retry_after(retry_after))
+            self.rate_limited += 1
+            self._condition.notify_all()
+            return self.cooldown_until - now
+
+    def cooldown_remaining(self):
+        """
+        Genel beklemenin kalan süresini döndürür (yoksa 0).
+        """
+        return max(0.0, self.cooldown_until - time.monotonic())
+
+    def metrics(self):
+        """
+        Kuyruk ve sınır ölçümlerini döndürür.
+
+        Dönüş değeri:
+            dict: {"queue_depth", "depth_by_priority", "depth_by_endpoint",
+                   "max_depth", "sent", "rate_limited", "rejected",
+                   "average_wait", "cooldown", "tokens"}
+        """
+        with self._condition:
+            now = time.monotonic()
+            depth_by_priority = {}
+            depth_by_endpoint = {}
+            for priority, _, endpoint in self._waiting:
+                depth_by_priority[priority] = depth_by_priority.get(priority, 0) + 1
+                depth_by_endpoint[endpoint] = depth_by_endpoint.get(endpoint, 0) + 1
+
+            sent_total = sum(self.sent.values())
+            for bucket in self.buckets.values():
+                bucket.refill(now)
+            return {
+                "queue_depth": len(self._waiting),
+                "depth_by_priority": depth_by_priority,
+                "depth_by_endpoint": depth_by_endpoint,
+                "max_depth": self.max_depth,
+                "sent": dict(self.sent),
+                "rate_limited": self.rate_limited,
+                "rejected": self.rejected,
+                "average_wait": self.total_wait / sent_total if sent_total else 0.0,
+                "cooldown": max(0.0, self.cooldown_until - now),
+                "tokens": {name: round(bucket.tokens, 2) for name, bucket in self.buckets.items()},
+            }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="İstek zamanlayıcısı denemesi (taklit sunucuya karşı)")
+    parser.add_argument("--requests", type=int, default=30, help="Gönderilecek istek sayısı")
+    parser.add_argument("--threads", type=int, default=6)
+    parser.add_argument("--rate-limit", type=float, default=0.05, help="Sunucunun 429 döndürme oranı")
+    parser.add_argument("--retry-after", type=int, default=2)
+    args = parser.parse_args()
+
+    from lichess_api import LichessSession
+    from lichess_mock import SAMPLE_MOVES, MockGame, MockLichessServer
+
+    # Betik olarak çalışırken oturumun attığı hata __main__ değil bu modülün sınıfıdır
+    from request_scheduler import RateLimited
+
+    server = MockLichessServer().start()
+    server.add_game(MockGame("mockgame", "beyaz", "siyah", SAMPLE_MOVES, move_delay=1.0))
+    server.configure_faults(rate_limit=args.rate_limit, retry_after=args.retry_after)
+    session = LichessSession(server.url)
+
+    # İş parçacıkları arka plan istekleri gönderir, ana iş parçacığı aynı uç noktaya
+    # etkileşimli istekler; etkileşimli istekler kuyruğun önüne geçmeli
+    path = "/api/user/beyaz/current-game"
+    counter = itertools.count()
+    results = {"ok": 0, "429": 0, "rejected": 0}
+
+    def worker():
+        while next(counter) < args.requests:
+            try:
+                response = session.get(path, priority=PRIORITY_BACKGROUND)
+                key = "ok" if response.status_code == 200 else str(response.status_code)
+                results[key] = results.get(key, 0) + 1
+            except RateLimited:
+                results["429"] += 1
+
+    start = time.perf_counter()
+    threads = [threading.Thread(target=worker) for _ in range(args.threads)]
+    for thread in threads:
+        thread.start()
+
+    interactive_waits = []
+    while any(thread.is_alive() for thread in threads):
+        queued = time.perf_counter()
+        try:
+            session.get(path, priority=PRIORITY_INTERACTIVE, max_wait=3.0)
+            interactive_waits.append(time.perf_counter() - queued)
+        except RateLimited as e:
+            results["rejected"] += 1
+            print(f"Etkileşimli istek reddedildi, {e.retry_in:.1f} sn beklenmeli")
+        metrics = session.scheduler.metrics()
+        print(f"kuyruk {metrics['queue_depth']} {metrics['depth_by_priority']}, "
+              f"bekleme {metrics['cooldown']:.1f} sn, jetonlar {metrics['tokens']['current-game']}")
+        time.sleep(1.5)
+
+    elapsed = time.perf_counter() - start
+    metrics = session.scheduler.metrics()
+    print(f"\n{elapsed:.1f} sn, sonuçlar {results}")
+    print(f"sunucuya ulaşan istek {server.request_count}, sunucu 429 {server.fault_counts['rate_limit']}")
+    print(f"gönderilen {metrics['sent']}, en uzun kuyruk {metrics['max_depth']}, "
+          f"ortalama bekleme {metrics['average_wait'] * 1000:.0f} ms")
+    if interactive_waits:
+        print(f"etkileşimli istek bekleme medyanı {sorted(interactive_waits)[len(interactive_waits) // 2] * 1000:.0f} ms")
+    server.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,262 @@
+"""
+Dümen satrancı kendi kendine oyun simülatörü
+
+"Dümen satrancı" oyunlarının nasıl geçtiğini ölçmek için arayüzsüz
+simülatör: her hamlede dümen hareket edebilen taş tipleri arasından
+rastgele birini seçer (uygulamadaki `process_fen` ile aynı
+`movable_piece_types` analizi), oyuncu da o tipin yasal hamlelerinden
+rastgele birini oynar. Oyunun uzunluğu, dümenin tek hamlesi olan (zorunlu)
+bir tipe ne sıklıkla denk geldiği, dümen genişliği ve sonuçlanma oranı
+toplanır.
+
+Her oyunun rastgele sayı üreteci ana tohumdan ve oyunun sırasından
+türetilir; sonuçlar işçi sayısından ve parça boyutundan bağımsız olarak
+aynı tohumla birebir tekrarlanır. Oyunlar parçalar halinde süreç havuzuna
+dağıtılır; işçiler oyun başına satır değil, birleştirilebilir sayaçlar
+döndürür. Böylece milyonlarca yarım hamle sabit bellekle simüle edilir.
+
+    python self_play.py --games 20000 --workers 8
+    python self_play.py --games 500 --workers 0 --seed 7 --out simulasyon.json
+"""
+import argparse
+import collections
+import json
+import os
+import random
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import chess
+
+from piece_analysis import legal_moves_of, movable_piece_types
+
+# Oyunun bitme nedenleri
+TERMINATIONS = ("checkmate", "stalemate", "insufficient_material", "seventyfive_moves",
+                "fivefold_repetition", "max_plies")
+
+
+def game_rng(seed, index):
+    """
+    `index` sıradaki oyunun rastgele sayı üreteci; yalnızca tohuma ve sıraya bağlıdır.
+    """
+    return random.Random(f"{seed}-{index}")
+
+
+def play_game(rng, max_plies=1000):
+    """
+    Her hamlesi dümenle seçilen taş tipiyle oynanan bir oyun simüle eder.
+
+    Parametreler:
+        rng (random.Random): Oyunun rastgele sayı üreteci
+        max_plies (int): Oyun bu kadar yarım hamlede bitmezse yarıda kesilir
+
+    Dönüş değeri:
+        dict: {"plies", "result", "termination", "forced", "widths"}; `widths`
+        her yarım hamledeki dümen genişliği (dilim sayısı) listesidir
+    """
+    board = chess.Board()
+    forced = 0
+    widths = []
+    termination = "max_plies"
+
+    while len(widths) < max_plies:
+        piece_types = movable_piece_types(board)
+        if not piece_types:
+            termination = "checkmate" if board.is_check() else "stalemate"
+            break
+        if board.is_insufficient_material():
+            termination = "insufficient_material"
+            break
+        if board.halfmove_clock >= 150:
+            termination = "seventyfive_moves"
+            break
+        # Beşinci tekrar en az 16 geri alınabilir yarım hamle gerektirir
+        if board.halfmove_clock >= 16 and board.is_fivefold_repetition():
+            termination = "fivefold_repetition"
+            break
+
+        # Dümeni çevir, sonra seçilen tipin hamlelerinden birini oyna
+        widths.append(len(piece_types))
+        moves = legal_moves_of(board, rng.choice(piece_types))
+        if len(moves) == 1:
+            forced += 1
+        board.push(rng.choice(moves))
+
+    if termination == "checkmate":
+        result = "0-1" if board.turn == chess.WHITE else "1-0"
+    elif termination == "max_plies":
+        result = "*"
+    else:
+        result = "1/2-1/2"
+
+    return {
+        "plies": len(widths),
+        "result": result,
+        "termination": termination,
+        "forced": forced,
+        "widths": widths,
+    }
+
+
+def new_stats():
+    """
+    Boş simülasyon sayaçları.
+    """
+    return {
+        "games": 0,
+        "plies": 0,
+        "forced": 0,
+        "lengths": collections.Counter(),  # Yarım hamle sayısı -> oyun sayısı
+        "results": collections.Counter(),
+        "terminations": collections.Counter(),
+        "widths": [0] * (len(chess.PIECE_TYPES) + 1),  # Dümen genişliği -> yarım hamle sayısı
+    }
+
+
+def merge_stats(stats, part):
+    """
+    `part` sayaçlarını `stats` üzerine ekler.
+    """
+    for name in ("games", "plies", "forced"):
+        stats[name] += part[name]
+    for name in ("lengths", "results", "terminations"):
+        stats[name].update(part[name])
+    for width, count in enumerate(part["widths"]):
+        stats["widths"][width] += count
+    return stats
+
+
+def simulate_chunk(seed, start, count, max_plies):
+    """
+    `start` sırasından başlayarak `count` oyunu simüle edip sayaçlarını döndürür.
+
+    Süreç havuzunda çalışır; girdi ve çıktı yalnızca sayılardan oluşur.
+    """
+    stats = new_stats()
+    for index in range(start, start + count):
+        game = play_game(game_rng(seed, index), max_plies)
+        stats["games"] += 1
+        stats["plies"] += game["plies"]
+        stats["forced"] += game["forced"]
+        stats["lengths"][game["plies"]] += 1
+        stats["results"][game["result"]] += 1
+        stats["terminations"][game["termination"]] += 1
+        for width in game["widths"]:
+            stats["widths"][width] += 1
+    return stats
+
+
+def run_simulation(games, seed=0, workers=None, chunk_size=100, max_plies=1000, progress=None):
+    """
+    Oyunları süreç havuzunda simüle edip sayaçları birleştirir.
+
+    Parametreler:
+        games (int): Simüle edilecek oyun sayısı
+        seed (int): Ana tohum; aynı tohum her zaman aynı oyunları üretir
+        workers (int): İşçi süreç sayısı; 0 ise aynı süreçte çalışır, None ise işlemci sayısı
+        chunk_size (int): Bir parçadaki oyun sayısı
+        max_plies (int): Bir oyunun en fazla yarım hamle sayısı
+        progress (callable): Her parça bittiğinde birleşmiş sayaçlarla çağrılır
+
+    Dönüş değeri:
+        dict: Birleşmiş sayaçlar (bkz. new_stats)
+    """
+    stats = new_stats()
+    chunks = [(start, min(chunk_size, games - start)) for start in range(0, games, chunk_size)]
+
+    def merge(part):
+        merge_stats(stats, part)
+        if progress:
+            progress(stats)
+
+    if workers == 0:
+        for start, count in chunks:
+            merge(simulate_chunk(seed, start, count, max_plies))
+        return stats
+
+    workers = workers or os.cpu_count() or 1
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(simulate_chunk, seed, start, count, max_plies) for start, count in chunks]
+        for future in futures:
+            merge(future.result())
+    return stats
+
+
+def percentile(histogram, fraction):
+    """
+    Değer -> sayı histogramında `fraction` yüzdelik dilimine düşen değer.
+    """
+    total = sum(histogram.values())
+    if not total:
+        return 0
+    seen = 0
+    for value in sorted(histogram):
+        seen += histogram[value]
+        if seen >= fraction * total:
+            return value
+    return value
+
+
+def summarize(stats):
+    """
+    Sayaçlardan ortalamaları, oranları ve dağılımları hesaplar.
+
+    Dönüş değeri:
+        dict: Ortalama/yüzdelik oyun uzunluğu, zorunlu hamle oranı, sonuçlanma
+        oranı, sonuç ve bitiş nedeni sayıları, dümen genişliği dağılımı
+    """
+    games = stats["games"]
+    plies = stats["plies"]
+    results = stats["results"]
+    decisive = results["1-0"] + results["0-1"]
+    return {
+        "games": games,
+        "plies": plies,
+        "mean_length": round(plies / games, 2) if games else 0.0,
+        "length_percentiles": {f"p{int(fraction * 100)}": percentile(stats["lengths"], fraction)
+                               for fraction in (0.1, 0.5, 0.9)},
+        "forced_rate": round(stats["forced"] / plies, 4) if plies else 0.0,
+        "decisive_rate": round(decisive / games, 4) if games else 0.0,
+        "results": {result: results[result] for result in ("1-0", "0-1", "1/2-1/2", "*")},
+        "terminations": {name: stats["terminations"][name] for name in TERMINATIONS},
+        "width_histogram": stats["widths"],
+        "mean_width": round(sum(width * count for width, count in enumerate(stats["widths"])) / plies, 3)
+        if plies else 0.0,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Dümen satrancı kendi kendine oyun simülasyonu")
+    parser.add_argument("--games", type=int, default=2000, help="Simüle edilecek oyun sayısı")
+    parser.add_argument("--seed", type=int, default=0, help="Ana tohum")
+    parser.add_argument("--workers", type=int, help="İşçi süreç sayısı (0: tek süreç)")
+    parser.add_argument("--chunk-size", type=int, default=100, help="Bir parçadaki oyun sayısı")
+    parser.add_argument("--max-plies", type=int, default=1000, help="Bir oyunun en fazla yarım hamle sayısı")
+    parser.add_argument("--out", help="Sayaçların ve özetin yazılacağı JSON dosyası")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+
+    def progress(stats):
+        elapsed = time.perf_counter() - start
+        print(f"\r{stats['games']} oyun, {stats['plies']} yarım hamle, "
+              f"{stats['plies'] / elapsed:.0f} yarım hamle/sn", end="", file=sys.stderr)
+
+    stats = run_simulation(args.games, args.seed, args.workers, args.chunk_size, args.max_plies, progress)
+    elapsed = time.perf_counter() - start
+    print(file=sys.stderr)
+
+    summary = summarize(stats)
+    summary["seconds"] = round(elapsed, 3)
+    summary["plies_per_second"] = round(summary["plies"] / elapsed) if elapsed else 0
+    print(json.dumps(summary, ensure_ascii=False, indent=2))
+
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as handle:
+            stats["lengths"] = {str(length): count for length, count in sorted(stats["lengths"].items())}
+            json.dump({"stats": stats, "summary": summary}, handle, ensure_ascii=False, separators=(",", ":"))
+
+
+if __name__ == "__main__":
+    main()
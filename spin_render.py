@@ -0,0 +1,335 @@
+"""
+Arayüzsüz çevirme animasyonu üretici
+
+Yayın katmanı ve paylaşılacak kısa videolar için çevirmeyi Tk tuvali
+olmadan, yalnızca PIL ile kare kare üretir: dümen (etiketleri ve ağırlıklı
+moddaki dilim sınırları işlenmiş, bkz. wheel_bitmap.py), ok ve son karede
+sonuç şeridi. Açılar uygulamadaki `SpinTrajectory` ile aynı yörüngeden
+gelir; aynı tohum aynı çevirmeyi ve aynı sonucu üretir.
+
+Kareler parçalar halinde süreç havuzuna dağıtılır. İşçiler kareyi çizmekle
+kalmaz, kodlamanın pahalı kısmını da yapar: GIF için renk paletine
+indirgeme, kare dizisi için PNG dosyasını yazma. Çizici her işçiye
+başlangıçta bir kez gönderilir; görevler yalnızca açı listesidir. WebP
+animasyonunu kodlayıcı tek parça halinde yazdığından WebP'de işçiler
+yalnızca kareleri çizer.
+
+    python spin_render.py --out cevirme.gif
+    python spin_render.py --fen "rnbqkbnr/pppppppp/8/8/4P3/8/PPPP1PPP/RNBQKBNR b KQkq - 0 1" --out cevirme.webp
+    python spin_render.py --out kareler/ --workers 4
+    python spin_render.py --benchmark --workers 0 1 2 4
+"""
+import argparse
+import io
+import math
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import chess
+from PIL import Image, ImageDraw
+
+from piece_analysis import PIECE_NAMES, movable_piece_types
+from wheel_bitmap import compose_wheel, load_font
+from wheel_layout import SpinTrajectory, WheelSectors
+
+# Çıktı biçimleri; dizin verilirse numaralı PNG kare dizisi yazılır
+FORMATS = ("gif", "webp", "png")
+
+# Sonuç şeridinin yüksekliği (piksel)
+BANNER_HEIGHT = 60
+
+# Süreç havuzundaki işçinin çizicisi (bkz. _init_worker)
+_renderer = None
+
+
+def default_wheel(size):
+    """
+    Dümen görseli verilmediğinde kullanılacak basit çizilmiş dümen.
+    """
+    image = Image.new("RGBA", (size, size))
+    draw = ImageDraw.Draw(image)
+    draw.ellipse((0, 0, size - 1, size - 1), fill="#8B5A2B", outline="black", width=4)
+    draw.ellipse((size // 3, size // 3, size * 2 // 3, size * 2 // 3), outline="black", width=6)
+    for spoke in range(8):
+        angle = math.radians(spoke * 45)
+        draw.line((size / 2, size / 2, size / 2 + size / 2 * math.cos(angle), size / 2 + size / 2 * math.sin(angle)),
+                  fill="black", width=6)
+    return image
+
+
+class SpinRenderer:
+    """
+    Bir çevirmenin karelerini tuvaldeki yerleşimle PIL üzerinde çizer.
+
+    Arka plan (ve ok) ile etiketleri işlenmiş dümen bir kez hazırlanır;
+    karede yalnızca dümen döndürülüp arka planın üzerine yapıştırılır.
+    Nesne seçilebilir (pickle), süreç havuzuna gönderilebilir.
+    """
+    def __init__(self, wheel, labels, weights=None, arrow=None, size=(640, 480),
+                 background="white", font_size=None, upright=False):
+        """
+        Parametreler:
+            wheel (PIL.Image.Image): Kare dümen görseli
+            labels (list): Dilim etiketleri
+            weights (list): Dilim ağırlıkları, None ise tüm dilimler eşit
+            arrow (PIL.Image.Image): Ok görseli, None ise uygulamadaki gibi kırmızı üçgen
+            size (tuple): Karenin (genişlik, yükseklik) boyutu, sonuç şeridi hariç
+            background (str): Arka plan rengi
+            font_size (int): Etiket yazı boyutu, None ise dilim sayısına göre (uygulamadaki gibi)
+            upright (bool): Etiketler dümen dururken dik mi
+        """
+        self.labels = list(labels)
+        self.sectors = WheelSectors(weights or [1] * len(self.labels))
+        if font_size is None:
+            font_size = 16 if len(self.labels) <= 8 else 11
+        self.wheel = compose_wheel(wheel, self.labels, self.sectors.centers, font_size,
+                                   self.sectors.starts if weights else (), upright)
+
+        width, height = size
+        self.size = (width, height + BANNER_HEIGHT)
+        self.center = (width // 2, height // 2)
+        radius = wheel.width // 2
+
+        # Ok dümenin sağında, 0° yönündedir
+        self.background = Image.new("RGB", self.size, background)
+        center_x, center_y = self.center
+        if arrow is not None:
+            arrow = arrow.convert("RGBA").resize((50, 60))
+            arrow_x = center_x + radius + 100
+            self.background.paste(arrow, (arrow_x - arrow.width // 2, center_y - arrow.height // 2), arrow)
+        else:
+            arrow_x = center_x + radius + 30
+            ImageDraw.Draw(self.background).polygon(
+                [(arrow_x, center_y - 15), (arrow_x + 30, center_y), (arrow_x, center_y + 15)],
+                fill="red", outline="black")
+
+    def outcome(self, trajectory):
+        """
+        Yörüngenin sonunda okun gösterdiği dilimin etiketi.
+        """
+        return self.labels[trajectory.outcome(self.sectors)]
+
+    def render(self, angle, banner=None):
+        """
+        Dümenin `angle` açısındaki karesini çizer.
+
+        Parametreler:
+            angle (float): Dümenin dönüş açısı (derece, saat yönünde)
+            banner (str): Karenin altına yazılacak sonuç metni
+
+        Dönüş değeri:
+            PIL.Image.Image: RGB kare
+        """
+        frame = self.background.copy()
+        rotated = self.wheel.rotate(-angle, resample=Image.BILINEAR)
+        center_x, center_y = self.center
+        frame.paste(rotated, (center_x - rotated.width // 2, center_y - rotated.height // 2), rotated)
+
+        if banner:
+            draw = ImageDraw.Draw(frame)
+            font = load_font(24)
+            top = self.size[1] - BANNER_HEIGHT
+            left, _, right, _ = draw.textbbox((0, 0), banner, font=font)
+            draw.text(((self.size[0] - (right - left)) // 2, top + 15), banner, font=font, fill="#FF5722")
+        return frame
+
+
+def spin_frames(trajectory, fps=30):
+    """
+    Yörüngenin `fps` kare/sn hızla örneklenmiş açıları (son açı dahil).
+    """
+    frame_ms = 1000 / fps
+    count = int(trajectory.duration_ms // frame_ms)
+    return [trajectory.angle_at(index * frame_ms) for index in range(count)] + [trajectory.final_angle]
+
+
+def encode_frame(frame, fmt, path=None):
+    """
+    Kareyi biçime göre kodlamaya hazırlar.
+
+    GIF için kare 256 renkli palete indirgenir (kodlamanın pahalı kısmı);
+    PNG için dosya yazılır ve yolu döner; WebP için kare olduğu gibi döner.
+    """
+    if fmt == "gif":
+        return frame.quantize(colors=256, method=Image.Quantize.FASTOCTREE)
+    if fmt == "png":
+        frame.save(path, compress_level=1)
+        return path
+    return frame
+
+
+def _init_worker(renderer):
+    """
+    İşçi sürecinin çizicisini ayarlar; çizici sürece bir kez gönderilir.
+    """
+    global _renderer
+    _renderer = renderer
+
+
+def render_chunk(start, angles, banners, fmt, directory=None):
+    """
+    Sırası `start`'tan başlayan kareleri çizip kodlar (süreç havuzunda çalışır).
+
+    Parametreler:
+        start (int): İlk karenin sırası (dosya adları için)
+        angles (list): Karelerin açıları
+        banners (list): Karelerin sonuç metinleri (None: şerit yok)
+        fmt (str): Çıktı biçimi
+        directory (str): PNG kare dizisinin yazılacağı dizin
+
+    Dönüş değeri:
+        list: Kodlanmış kareler ya da PNG dosya yolları
+    """
+    frames = []
+    for offset, (angle, banner) in enumerate(zip(angles, banners)):
+        path = os.path.join(directory, f"kare_{start + offset:05d}.png") if directory else None
+        frames.append(encode_frame(_renderer.render(angle, banner), fmt, path))
+    return frames
+
+
+def render_frames(renderer, angles, banners, fmt, workers=None, chunk_size=16, directory=None):
+    """
+    Kareleri süreç havuzunda çizip kodlar; sıra korunur.
+
+    Parametreler:
+        renderer (SpinRenderer): Çizici
+        angles (list): Karelerin açıları
+        banners (list): Karelerin sonuç metinleri
+        fmt (str): Çıktı biçimi ("gif", "webp" ya da "png")
+        workers (int): İşçi süreç sayısı; 0 ise aynı süreçte çalışır, None ise işlemci sayısı
+        chunk_size (int): Bir görevdeki kare sayısı
+        directory (str): PNG kare dizisinin yazılacağı dizin
+
+    Dönüş değeri:
+        list: Kodlanmış kareler ya da PNG dosya yolları
+    """
+    chunks = [(start, angles[start:start + chunk_size], banners[start:start + chunk_size])
+              for start in range(0, len(angles), chunk_size)]
+
+    if workers == 0:
+        _init_worker(renderer)
+        return [frame for start, part, texts in chunks
+                for frame in render_chunk(start, part, texts, fmt, directory)]
+
+    workers = workers or os.cpu_count() or 1
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(renderer,)) as executor:
+        futures = [executor.submit(render_chunk, start, part, texts, fmt, directory)
+                   for start, part, texts in chunks]
+        return [frame for future in futures for frame in future.result()]
+
+
+def write_animation(frames, durations, target, fmt):
+    """
+    Kodlanmış kareleri animasyon dosyasına (ya da dosya benzeri nesneye) yazar.
+
+    Parametreler:
+        frames (list): `render_frames` çıktısı
+        durations (list): Karelerin milisaniye cinsinden süreleri
+        target: Dosya yolu ya da yazılabilir ikili nesne
+        fmt (str): "gif" ya da "webp"
+    """
+    options = {"optimize": False, "disposal": 1} if fmt == "gif" else {"quality": 80, "method": 0}
+    frames[0].save(target, format=fmt.upper(), save_all=True, append_images=frames[1:],
+                   duration=durations, loop=0, **options)
+
+
+def render_spin(renderer, trajectory, out, fps=30, hold_ms=2000, banner=None, workers=None, chunk_size=16):
+    """
+    Çevirmenin animasyonunu üretip yazar.
+
+    Son kare (sonuç şeridiyle) `hold_ms` boyunca ekranda kalır; GIF/WebP'de
+    bu tek bir uzun kare, kare dizisinde son PNG'dir.
+
+    Parametreler:
+        renderer (SpinRenderer): Çizici
+        trajectory (SpinTrajectory): Çevirmenin yörüngesi
+        out (str): .gif/.webp dosyası ya da PNG kare dizisi için dizin
+        fps (int): Saniyedeki kare sayısı
+        hold_ms (int): Son karenin gösterim süresi
+        banner (str): Son karede gösterilecek sonuç metni
+        workers (int): İşçi süreç sayısı (bkz. render_frames)
+        chunk_size (int): Bir görevdeki kare sayısı
+
+    Dönüş değeri:
+        int: Üretilen kare sayısı
+
+    Hatalar:
+        ValueError: Dosya uzantısı desteklenmiyorsa
+    """
+    angles = spin_frames(trajectory, fps)
+    banners = [None] * (len(angles) - 1) + [banner]
+    durations = [round(1000 / fps)] * (len(angles) - 1) + [hold_ms]
+
+    fmt = os.path.splitext(out)[1].lower().lstrip(".") or "png"
+    if fmt not in FORMATS:
+        raise ValueError(f"Desteklenmeyen biçim: {fmt} ({', '.join(FORMATS)})")
+
+    if fmt == "png":
+        os.makedirs(out, exist_ok=True)
+        return len(render_frames(renderer, angles, banners, fmt, workers, chunk_size, out))
+
+    frames = render_frames(renderer, angles, banners, fmt, workers, chunk_size)
+    write_animation(frames, durations, out, fmt)
+    return len(frames)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Dümen çevirmesinin GIF/WebP animasyonu ya da kare dizisi")
+    parser.add_argument("--fen", default=chess.STARTING_FEN, help="Çevirmenin yapıldığı pozisyon")
+    parser.add_argument("--out", default="cevirme.gif", help=".gif, .webp ya da kare dizisi için dizin")
+    parser.add_argument("--wheel", help="Dümen görseli (verilmezse çizilmiş bir dümen)")
+    parser.add_argument("--arrow", help="Ok görseli (verilmezse kırmızı üçgen)")
+    parser.add_argument("--size", type=int, default=300, help="Dümenin piksel boyutu")
+    parser.add_argument("--seconds", type=float, default=5, help="Dönüş süresi (saniye)")
+    parser.add_argument("--rotations", type=int, default=3, help="Tam tur sayısı")
+    parser.add_argument("--fps", type=int, default=30, help="Saniyedeki kare sayısı")
+    parser.add_argument("--seed", type=int, help="Çevirmenin tohumu (aynı tohum aynı sonucu verir)")
+    parser.add_argument("--workers", type=int, nargs="+", default=[None],
+                        help="İşçi süreç sayısı (0: tek süreç); kıyaslamada birden fazla verilebilir")
+    parser.add_argument("--chunk-size", type=int, default=16, help="Bir görevdeki kare sayısı")
+    parser.add_argument("--benchmark", action="store_true", help="Dosya yazmadan işçi sayılarını kıyasla")
+    args = parser.parse_args()
+
+    board = chess.Board(args.fen)
+    labels = [PIECE_NAMES[piece_type] for piece_type in movable_piece_types(board)]
+    if not labels:
+        parser.error("Bu pozisyonda hareket edebilecek taş yok")
+
+    wheel = Image.open(args.wheel).convert("RGBA").resize((args.size, args.size)) if args.wheel \
+        else default_wheel(args.size)
+    arrow = Image.open(args.arrow) if args.arrow else None
+    renderer = SpinRenderer(wheel, labels, arrow=arrow)
+
+    trajectory = SpinTrajectory.random(random.Random(args.seed), args.rotations, args.seconds * 1000)
+    turn_color = "Beyaz" if board.turn else "Siyah"
+    banner = f"{turn_color} TAŞ: {renderer.outcome(trajectory).upper()}"
+
+    if not args.benchmark:
+        start = time.perf_counter()
+        count = render_spin(renderer, trajectory, args.out, args.fps, banner=banner,
+                            workers=args.workers[0], chunk_size=args.chunk_size)
+        elapsed = time.perf_counter() - start
+        print(f"{args.out}: {count} kare, {elapsed:.2f} s ({count / elapsed:.1f} kare/sn), sonuç: {banner}")
+        return
+
+    # Kıyaslama: çizim + kodlama, her biçim ve işçi sayısı için kare/sn
+    angles = spin_frames(trajectory, args.fps)
+    banners = [None] * (len(angles) - 1) + [banner]
+    durations = [round(1000 / args.fps)] * len(angles)
+    print(f"{len(angles)} kare, {renderer.size[0]}x{renderer.size[1]}, {os.cpu_count()} işlemci")
+    for fmt in ("gif", "webp"):
+        for workers in args.workers:
+            start = time.perf_counter()
+            frames = render_frames(renderer, angles, banners, fmt, workers, args.chunk_size)
+            rendered = time.perf_counter() - start
+            write_animation(frames, durations, io.BytesIO(), fmt)
+            total = time.perf_counter() - start
+            label = "tek süreç" if workers == 0 else f"{workers or os.cpu_count()} işçi"
+            print(f"  {fmt:4s} {label:10s}: çizim+palet {len(angles) / rendered:6.1f} kare/sn, "
+                  f"dosyayla birlikte {len(angles) / total:6.1f} kare/sn")
+
+
+if __name__ == "__main__":
+    main()
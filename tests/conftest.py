@@ -0,0 +1,65 @@
+import pytest
+
+from lichess_api import LichessSession
+from lichess_mock import SAMPLE_MOVES, MockGame, MockLichessServer
+from request_scheduler import ENDPOINT_LIMITS, RequestScheduler
+
+
+@pytest.fixture
+def server():
+    """
+    Yavaş ilerleyen tek bir oyunu (beyaz - siyah) oynatan taklit sunucu.
+    """
+    server = MockLichessServer().start()
+    server.add_game(MockGame("mockgame", "beyaz", "siyah", SAMPLE_MOVES, move_delay=60))
+    yield server
+    server.stop()
+
+
+@pytest.fixture
+def session(server):
+    """
+    Taklit sunucuya bağlı, hız sınırı testleri yavaşlatmayan oturum.
+    """
+    limits = {name: (1000.0, 1000) for name in ENDPOINT_LIMITS}
+    return LichessSession(server.url, max_retries=0, scheduler=RequestScheduler(limits))
+
+
+class FakeVar:
+    """
+    tk.StringVar yerine geçen, son değeri saklayan değişken.
+    """
+    def __init__(self):
+        self.value = None
+
+    def set(self, value):
+        self.value = value
+
+
+class FakeRoot:
+    """
+    Tk kök penceresi yerine geçer; after ile verilen işleri hemen çalıştırır.
+    """
+    def after(self, ms, callback=None, *args):
+        if callback:
+            callback(*args)
+
+
+@pytest.fixture
+def make_app():
+    """
+    Pencere açmadan DumenApp örneği üreten fabrika.
+
+    Örnekte yalnızca sahte kök pencere, durum değişkeni ve verilen alanlar bulunur.
+    """
+    from dumen_app import DumenApp
+
+    def make(**fields):
+        app = object.__new__(DumenApp)
+        app.root = FakeRoot()
+        app.status_var = FakeVar()
+        for name, value in fields.items():
+            setattr(app, name, value)
+        return app
+
+    return make
@@ -0,0 +1,92 @@
+import random
+
+import chess
+import pytest
+
+import piece_analysis
+from analysis_cache import OPENING_LINES, AnalysisCache, position_key
+from lichess_mock import random_moves
+
+
+@pytest.fixture(scope="module")
+def fens():
+    # Açılışlarla başlayan oyunlar; aynı pozisyonlar farklı saat alanlarıyla da gelir
+    rng = random.Random(0)
+    fens = []
+    for moves in [line.split() for line in OPENING_LINES.values()] + [random_moves(rng, 80) for _ in range(20)]:
+        board = chess.Board()
+        for uci in moves:
+            board.push_uci(uci)
+            fens.append(board.fen())
+            board.halfmove_clock += 2
+            board.fullmove_number += 7
+            fens.append(board.fen())
+    return fens
+
+
+def test_cached_results_match_uncached_analysis(fens):
+    cache = AnalysisCache()
+    for _ in range(2):
+        for fen in fens:
+            board, names = cache.analyze_fen(fen)
+            expected_board, expected_names = piece_analysis.analyze_fen(fen)
+            assert names == expected_names
+            assert board.fen() == expected_board.fen()
+    assert cache.hits > cache.misses
+
+
+def test_returned_board_is_a_copy():
+    cache = AnalysisCache()
+    board, _ = cache.analyze_fen(chess.STARTING_FEN)
+    board.push_uci("e2e4")
+    assert cache.analyze_fen(chess.STARTING_FEN)[0].fen() == chess.STARTING_FEN
+
+
+def test_castling_and_en_passant_are_part_of_the_key():
+    with_castling = chess.Board("r3k3/8/8/8/8/8/8/4K3 b q - 0 1")
+    without_castling = chess.Board("r3k3/8/8/8/8/8/8/4K3 b - - 0 1")
+    assert position_key(with_castling) != position_key(without_castling)
+
+    with_ep = chess.Board("4k3/8/8/8/3pP3/8/8/4K3 b - e3 0 1")
+    without_ep = chess.Board("4k3/8/8/8/3pP3/8/8/4K3 b - - 0 1")
+    assert position_key(with_ep) != position_key(without_ep)
+
+
+def test_cache_is_bounded(fens):
+    cache = AnalysisCache(maxsize=8)
+    for fen in fens[:50]:
+        cache.analyze_fen(fen)
+    assert len(cache.entries.entries) <= 8
+    assert len(cache.fen_index.entries) <= 8
+
+
+def test_seeded_openings_are_hits():
+    cache = AnalysisCache()
+    assert cache.seed_openings(depth=1) > 20
+    assert (cache.hits, cache.misses) == (0, 0)
+
+    board = chess.Board()
+    for uci in OPENING_LINES["Caro-Kann"].split():
+        board.push_uci(uci)
+        cache.analyze_fen(board.fen())
+    assert cache.misses == 0
+
+
+def test_moves_and_mobility_follow_legal_moves(fens):
+    cache = AnalysisCache()
+    for fen in fens[::5]:
+        board = chess.Board(fen)
+        analysis = cache.analyze(board)
+        legal = list(board.legal_moves)
+
+        moves = analysis.moves_by_type()
+        grouped = [move for type_moves in moves.values() for move in type_moves]
+        assert sorted(map(str, grouped)) == sorted(map(str, legal))
+        assert set(moves) == set(analysis.types)
+
+        mobility = analysis.mobility()
+        instances = analysis.instances()
+        for piece_type in analysis.types:
+            assert mobility[piece_type]["moves"] == len(moves[piece_type])
+            assert mobility[piece_type]["pieces"] == sum(1 for instance in instances if instance[0] == piece_type)
+        assert analysis.labels(per_piece=True) == [piece_analysis.piece_label(*instance) for instance in instances]
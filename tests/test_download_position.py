@@ -0,0 +1,93 @@
+import time
+
+import chess
+import pytest
+import requests
+
+from position_cache import PositionCache
+from request_scheduler import RateLimited
+
+
+@pytest.fixture
+def app(make_app, session):
+    """
+    Yalnızca pozisyon indirmenin kullandığı alanları olan, pencere açmayan uygulama.
+    """
+    fens = []
+    return make_app(session=session, username="beyaz", position_cache=PositionCache(), game_id=None,
+                    time_control=None, tracker=None, follower=None, fens=fens, process_fen=fens.append)
+
+
+def short_timeout(monkeypatch, session, timeout):
+    """
+    Oturumun isteklerini kısa zaman aşımıyla gönderir; takılan sunucu testleri yavaşlatmasın.
+    """
+    get = session.get
+    monkeypatch.setattr(session, "get", lambda path, **kwargs: get(path, **{**kwargs, "timeout": timeout}))
+
+
+def test_downloads_position_from_pgn(server, session, app):
+    position = app.download_position(report=lambda message: None)
+    assert position["game_id"] == "mockgame"
+    assert position["fen"] == chess.STARTING_FEN
+    assert server.request_count == 1
+
+    # İndirme uygulamanın durumunu değiştirmez
+    assert app.game_id is None
+
+
+def test_rate_limit_pauses_all_requests(server, session, app):
+    server.configure_faults(rate_limit=1.0, retry_after=30)
+    with pytest.raises(RateLimited) as error:
+        app.download_position(report=lambda message: None)
+    assert error.value.retry_in == pytest.approx(30, abs=1)
+    assert server.fault_counts["rate_limit"] == 1
+
+    # Genel bekleme sürerken etkileşimli istek sunucuya gitmeden reddedilir
+    with pytest.raises(RateLimited):
+        app.download_position(report=lambda message: None, max_wait=3)
+    assert server.request_count == 1
+
+    app.fetch_game_data()
+    assert "istek sınırına" in app.status_var.value
+    assert app.fens == []
+
+
+def test_truncated_response_is_not_cached(server, session, app):
+    server.configure_faults(truncate=1.0)
+    with pytest.raises(requests.exceptions.RequestException):
+        app.download_position(report=lambda message: None)
+    assert server.fault_counts["truncate"] == 1
+    assert app.position_cache.lookup_position("beyaz") is None
+
+    # Sunucu düzelince pozisyon alınır
+    server.configure_faults()
+    assert app.download_position(report=lambda message: None)["fen"] == chess.STARTING_FEN
+
+
+def test_truncated_response_is_retried(server, app):
+    from lichess_api import LichessSession
+    from request_scheduler import ENDPOINT_LIMITS, RequestScheduler
+
+    app.session = LichessSession(server.url, max_retries=2, backoff=0.01,
+                                 scheduler=RequestScheduler({name: (1000.0, 1000) for name in ENDPOINT_LIMITS}))
+    # Bu tohumla ilk yanıt kesilir, ikincisi tamdır
+    server.configure_faults(truncate=0.5, seed=2)
+    assert app.download_position(report=lambda message: None)["fen"] == chess.STARTING_FEN
+    assert server.fault_counts["truncate"] == 1
+    assert server.request_count == 2
+
+
+def test_timeout_is_reported(monkeypatch, server, session, app):
+    server.configure_faults(timeout=1.0, hang_time=2)
+    short_timeout(monkeypatch, session, 0.3)
+
+    start = time.monotonic()
+    with pytest.raises(requests.exceptions.Timeout):
+        app.download_position(report=lambda message: None)
+    assert time.monotonic() - start < 1.5
+    assert app.position_cache.lookup_position("beyaz") is None
+
+    app.fetch_game_data()
+    assert "yanıt vermedi" in app.status_var.value
+    assert app.fens == []
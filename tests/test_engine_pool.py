@@ -0,0 +1,70 @@
+import chess
+import pytest
+
+from engine_pool import EnginePool, standin_command
+from piece_analysis import movable_piece_types
+
+POSITIONS = [
+    chess.STARTING_FEN,
+    "r1bqkbnr/pppp1ppp/2n5/4p3/2B1P3/5N2/PPPP1PPP/RNBQK2R b KQkq - 3 3",
+    "r1bq1rk1/ppp2ppp/2np1n2/2b1p3/2B1P3/2PP1N2/PP3PPP/RNBQ1RK1 w - - 2 7",
+]
+
+
+@pytest.fixture
+def pool():
+    """
+    Deneme motoruyla (uci_standin.py) çalışan tek motorlu havuz; "last" kuralı
+    sınırlanmamış aramada başka bir taş tipinin hamlesini seçer.
+    """
+    pool = EnginePool(standin_command("--pick", "last"))
+    yield pool
+    pool.close()
+
+
+@pytest.mark.parametrize("fen", POSITIONS)
+def test_root_moves_stay_within_piece_type(pool, fen):
+    board = chess.Board(fen)
+    for piece_type in movable_piece_types(board):
+        hint = pool.best_move(board, piece_type, 0.05)
+        assert hint is not None
+        assert board.piece_type_at(hint["move"].from_square) == piece_type
+        assert hint["move"] in board.legal_moves
+
+
+def test_root_moves_stay_on_square(pool):
+    board = chess.Board()
+    hint = pool.best_move(board, chess.KNIGHT, 0.05, square=chess.B1)
+    assert hint["move"].from_square == chess.B1
+
+
+def test_repeated_analysis_is_cached(pool):
+    board = chess.Board()
+    first = pool.best_move(board, chess.PAWN, 0.05)
+    assert (pool.hits, pool.misses) == (0, 1)
+
+    # Aynı pozisyon başka bir hamle dizisiyle gelse de önbellekten döner
+    transposed = chess.Board()
+    for uci in ["g1f3", "g8f6", "f3g1", "f6g8"]:
+        transposed.push_uci(uci)
+    assert pool.best_move(transposed, chess.PAWN, 0.05) is first
+    assert pool.submit(board, chess.PAWN, 0.05).result() is first
+    assert (pool.hits, pool.misses) == (2, 1)
+    assert pool.started == 1
+
+
+def test_crashed_engine_is_discarded_and_reopened():
+    pool = EnginePool(standin_command("--crash-after", "1"))
+    try:
+        board = chess.Board()
+        assert pool.best_move(board, chess.PAWN, 0.05) is not None
+
+        # İkinci aramada motor yanıt vermeden çıkar: öneri yok, motor havuzdan çıkar
+        assert pool.best_move(board, chess.KNIGHT, 0.05) is None
+        assert pool._engines == []
+
+        # Sonraki istek yeni bir motor açar
+        assert pool.best_move(board, chess.KNIGHT, 0.05) is not None
+        assert pool.started == 2
+    finally:
+        pool.close()
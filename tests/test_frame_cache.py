@@ -0,0 +1,103 @@
+import threading
+import time
+
+import pytest
+from PIL import Image, ImageDraw
+
+from frame_cache import RotationFrameCache
+from wheel_layout import SpinTrajectory
+
+
+class ManualRoot:
+    """
+    after ile zamanlanan işleri sırayla, elle çalıştırılan bir kök pencere.
+    """
+    def __init__(self):
+        self.pending = []
+
+    def after(self, ms, callback):
+        self.pending.append(callback)
+
+    def run(self, timeout=10):
+        deadline = time.monotonic() + timeout
+        while self.pending and time.monotonic() < deadline:
+            self.pending.pop(0)()
+            time.sleep(0.001)
+        return not self.pending
+
+
+@pytest.fixture
+def image():
+    image = Image.new("RGBA", (24, 24))
+    draw = ImageDraw.Draw(image)
+    draw.rectangle((12, 10, 23, 13), fill="red")
+    return image
+
+
+def make_cache(image, step=1.0, frames=None):
+    max_bytes = frames * image.width * image.height * 4 if frames else 160 * 1024 * 1024
+    return RotationFrameCache(image, step=step, max_bytes=max_bytes, to_photo=Image.Image.copy)
+
+
+def test_angles_round_to_steps(image):
+    cache = make_cache(image, step=2.0)
+    assert cache.count == 180
+    assert [cache.index_of(angle) for angle in (0, 0.9, 1.1, 359.5, 360, -2, 721)] == [0, 0, 1, 0, 0, 179, 0]
+
+
+def test_frames_are_rendered_once(image):
+    cache = make_cache(image)
+    frame = cache.get(90.2)
+    assert frame.tobytes() == image.rotate(-90).tobytes()
+    assert cache.get(89.8) is frame
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_budget_evicts_least_recently_used(image):
+    cache = make_cache(image, frames=3)
+    assert cache.capacity() == 3
+    for angle in (0, 10, 20):
+        cache.get(angle)
+    cache.get(0)
+    cache.get(30)
+
+    assert list(cache.frames) == [20, 0, 30]
+    assert cache.size == 3 * cache.frame_bytes
+    assert cache.evictions == 1
+
+
+def test_prewarm_fills_the_budget(image):
+    cache = make_cache(image, step=10.0, frames=20)
+    root = ManualRoot()
+    done = threading.Event()
+    cache.prewarm(root, on_done=done.set)
+    assert root.run()
+
+    assert done.is_set()
+    assert sorted(cache.frames) == list(range(20))
+    assert cache.misses == 0
+
+
+def test_prerender_runs_ahead_of_the_trajectory(image):
+    cache = make_cache(image)
+    trajectory = SpinTrajectory(3.3 * 360, 2000)
+    indices = cache.trajectory_indices(trajectory)
+    assert all(previous != index for previous, index in zip(indices, indices[1:]))
+    assert indices[-1] == cache.index_of(trajectory.final_angle)
+
+    rendered = []
+    render = cache.render
+    cache.render = lambda index: rendered.append(threading.current_thread()) or render(index)
+    cache.prerender(indices, ahead=8)
+    deadline = time.monotonic() + 5
+    while len(cache._ahead) < 8 and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+    # Animasyon bir kareyi atlarsa ondan önceki önden döndürülmüş kareler bırakılır
+    frame = cache.get(indices[2] * cache.step)
+    assert frame.tobytes() == image.rotate(-indices[2] * cache.step).tobytes()
+    assert threading.main_thread() not in rendered
+    assert indices[0] not in cache._ahead and indices[2] not in cache._ahead
+
+    cache.cancel()
+    assert not cache._ahead
@@ -0,0 +1,58 @@
+import os
+import random
+
+import chess
+import pytest
+
+from lichess_api import read_current_game
+from lichess_mock import MockGame, random_moves
+from page_extractor import extract_page_data
+
+FIXTURES = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "fixtures")
+
+
+@pytest.mark.parametrize("ply", [0, 1, 2, 17, 60])
+def test_position_from_mock_pgn(ply):
+    game = MockGame("pgnoyun", "beyaz", "siyah", random_moves(random.Random(ply), 60), clock=300)
+    current = read_current_game(game.pgn(ply))
+    assert current == {
+        "game_id": "pgnoyun",
+        "time_control": "300+0",
+        "fen": game.board_at(ply).fen(),
+        "last_move": game.moves[ply - 1].uci() if ply else None,
+    }
+
+
+@pytest.mark.parametrize("name", ["italian1", "random01"])
+def test_recorded_pgn_matches_recorded_page(name):
+    with open(os.path.join(FIXTURES, name + ".pgn"), encoding="utf-8") as pgn_file:
+        current = read_current_game(pgn_file.read())
+    with open(os.path.join(FIXTURES, name + ".html"), "rb") as page_file:
+        page = extract_page_data([page_file.read()])
+    assert current["game_id"] == name
+    assert current["fen"] == page["fen"]
+    assert current["last_move"] == page["last_move"]
+
+
+def test_fen_header_and_variations():
+    pgn = ('[GameId "kurulum"]\n[TimeControl "-"]\n[SetUp "1"]\n'
+           '[FEN "4k3/8/8/8/8/8/4P3/4K3 w - - 0 1"]\n\n'
+           '1. e4 (1. e3 Kd7) 1... Kd7 *\n')
+    current = read_current_game(pgn)
+    board = chess.Board("4k3/8/8/8/8/8/4P3/4K3 w - - 0 1")
+    board.push_uci("e2e4")
+    board.push_uci("e8d7")
+    assert current["fen"] == board.fen()
+    assert current["last_move"] == "e8d7"
+    assert current["time_control"] == "-"
+
+
+def test_illegal_move_keeps_headers_but_drops_fen():
+    current = read_current_game('[GameId "bozuk"]\n[TimeControl "60+1"]\n\n1. e4 e5 2. Ke3 *\n')
+    assert current["game_id"] == "bozuk"
+    assert current["time_control"] == "60+1"
+    assert current["fen"] is None
+
+
+def test_empty_response():
+    assert read_current_game("") is None
@@ -0,0 +1,183 @@
+import time
+
+import chess
+import pytest
+
+from lichess_mock import SAMPLE_MOVES, MockGame
+from lichess_stream import EventStreamWatcher, GameFollower
+
+
+def wait_for(condition, timeout=10):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        time.sleep(0.02)
+    return False
+
+
+def follow(server, session, game, **options):
+    """
+    Oyunu sunucuya ekler ve "ak" hesabını takip eden işçiyi başlatır.
+
+    Her güncellemede (oyun ID'si, hamle sayısı, FEN, bitti mi) kaydedilir.
+    """
+    server.add_game(game)
+    updates = []
+
+    def record(follower):
+        updates.append((follower.game_id, follower.board.ply(), follower.board.fen(), follower.finished))
+
+    follower = GameFollower("ak", session=session, on_update=record, idle_interval=0.05, **options)
+    follower.start()
+    return follower, updates
+
+
+def assert_positions_of(game, updates):
+    # Her satırdan sonra tahta oyunun o hamle sayısındaki pozisyonudur
+    for game_id, ply, fen, _ in updates:
+        assert game_id == game.game_id
+        assert fen == game.board_at(ply).fen()
+
+
+def test_follower_tracks_every_line_until_game_end(server, session):
+    game = MockGame("hizli", "ak", "kara", SAMPLE_MOVES[:8], move_delay=0.05)
+    follower, updates = follow(server, session, game)
+    try:
+        assert wait_for(lambda: updates and updates[-1][3])
+    finally:
+        follower.stop()
+
+    assert_positions_of(game, updates)
+    plies = [ply for _, ply, _, _ in updates]
+    assert plies == sorted(plies) and plies[-1] == 8
+    assert not any(finished for _, _, _, finished in updates[:-1])
+
+    # Biten oyunun pozisyonu dümene verilmez
+    assert follower.snapshot() is None
+    assert follower.analysis() is None
+
+
+def test_follower_reconnects_after_silent_stream(server, session):
+    # Hamleler arası sessizlik okuma zaman aşımından uzun; her kopuşta oyun yeniden çözülür
+    game = MockGame("yavas", "ak", "kara", SAMPLE_MOVES[:4], move_delay=0.4)
+    follower, updates = follow(server, session, game, read_timeout=0.25, game_id="yavas")
+    try:
+        assert wait_for(lambda: updates and updates[-1][3])
+    finally:
+        follower.stop()
+
+    assert_positions_of(game, updates)
+    assert updates[-1][1] == 4
+    # İlk bağlantı current-game'siz; sonrakiler current-game + akış
+    assert server.request_count >= 3
+    assert follower.live.pushes >= 1
+
+
+def watch(server, session, **options):
+    """
+    "beyaz" hesabının olay akışını dinleyen işçiyi başlatır; olaylar (yeniden bağlanma sayısı, olay) olarak toplanır.
+    """
+    server.tokens["anahtar"] = "beyaz"
+    server.keepalive_interval = 0.1
+    events = []
+    watcher = EventStreamWatcher("anahtar", session=session, retry_delay=0.05, max_retry_delay=0.1,
+                                 on_event=lambda event: events.append((watcher.reconnects, event)),
+                                 **options)
+    watcher.start()
+    return watcher, events
+
+
+def test_reconnects_after_dropped_connection(server, session):
+    server.event_drop_after = 0.3
+    watcher, events = watch(server, session, read_timeout=5)
+    try:
+        assert wait_for(lambda: watcher.reconnects >= 2 and any(count >= 2 for count, _ in events))
+    finally:
+        watcher.stop()
+
+    # Her bağlantıda süren oyun yeniden bildirilir
+    assert server.event_connections >= 3
+    assert all(event["type"] == "gameStart" and event["game"]["gameId"] == "mockgame" for _, event in events)
+
+
+def test_reconnects_after_half_open_connection(server, session):
+    # Sunucu soketi açık tutup susar; okuma zaman aşımı bağlantıyı yarı açık sayar
+    server.event_stall_after = 0.2
+    watcher, events = watch(server, session, read_timeout=0.5)
+    try:
+        assert wait_for(lambda: watcher.reconnects >= 1 and any(count >= 1 for count, _ in events))
+    finally:
+        watcher.stop()
+
+    assert events[0][0] == 0
+    assert server.event_connections >= 2
+
+
+def test_watcher_stops_promptly(server, session):
+    watcher, events = watch(server, session, read_timeout=5)
+    assert wait_for(lambda: events)
+    watcher.stop()
+    assert wait_for(lambda: not watcher._thread.is_alive(), timeout=3)
+    assert not watcher.connected
+
+
+class FakeFollower:
+    def __init__(self, alive=True):
+        self.alive = alive
+
+    def is_alive(self):
+        return self.alive
+
+
+@pytest.fixture
+def game_app(make_app):
+    """
+    Yalnızca on_game_start'ın kullandığı alanları olan, pencere açmayan uygulama fabrikası.
+    """
+    def make(game_id=None, follower=None, armed_fen=None):
+        app = make_app(game_id=game_id, follower=follower, armed_fen=armed_fen, user_color=None,
+                       settings={"auto_spin": True}, restarts=[], spins=0)
+
+        def restart_follower(game_id=None):
+            app.restarts.append(game_id)
+            app.follower = FakeFollower()
+
+        def turn_wheel():
+            app.spins += 1
+
+        app.restart_follower = restart_follower
+        app.turn_wheel = turn_wheel
+        return app
+
+    return make
+
+
+GAME = {"gameId": "mockgame", "color": "white", "isMyTurn": True, "fen": chess.STARTING_FEN}
+
+
+def test_new_game_starts_follower_and_spins(game_app):
+    app = game_app()
+    app.on_game_start("mockgame", GAME)
+    assert app.restarts == ["mockgame"]
+    assert app.spins == 1
+    assert app.armed_fen == chess.STARTING_FEN
+
+
+def test_replayed_game_start_is_ignored_while_following(game_app):
+    app = game_app()
+    app.on_game_start("mockgame", GAME)
+
+    # Yeniden bağlanan olay akışı aynı gameStart'ı tekrar gönderir
+    app.on_game_start("mockgame", GAME)
+    assert app.restarts == ["mockgame"]
+    assert app.spins == 1
+    assert app.armed_fen == chess.STARTING_FEN
+
+
+def test_replayed_game_start_restarts_dead_follower_without_spinning_again(game_app):
+    app = game_app(game_id="mockgame", follower=FakeFollower(alive=False), armed_fen=chess.STARTING_FEN)
+    app.on_game_start("mockgame", GAME)
+    assert app.restarts == ["mockgame"]
+    assert app.spins == 0
+    assert app.armed_fen == chess.STARTING_FEN
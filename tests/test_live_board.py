@@ -0,0 +1,69 @@
+import random
+
+import chess
+import pytest
+
+from lichess_mock import random_moves
+from live_board import LiveBoard, stream_lines
+from piece_analysis import PIECE_NAMES, movable_piece_types
+
+
+def replayed_games(count=40, plies=160, seed=0):
+    rng = random.Random(seed)
+    return [[chess.Move.from_uci(uci) for uci in random_moves(rng, plies)] for _ in range(count)]
+
+
+@pytest.mark.parametrize("abbreviated", [False, True])
+def test_incremental_types_match_full_analysis(abbreviated):
+    for moves in replayed_games():
+        live = LiveBoard()
+        for fen, last_move in stream_lines(chess.Board(), moves, abbreviated):
+            live.apply(fen, last_move)
+            assert live.types == movable_piece_types(live.board)
+            assert live.board.board_fen() == fen.split()[0]
+
+    # Satırlar hamleyle uygulanır, analizin bir kısmı önceki pozisyondan gelir
+    assert live.pushes == len(moves)
+    assert live.reused > 0
+
+
+def test_skipped_line_resyncs_from_fen():
+    moves = replayed_games(count=1, plies=40, seed=1)[0]
+    lines = stream_lines(chess.Board(), moves)
+    del lines[10]
+
+    live = LiveBoard()
+    for fen, last_move in lines:
+        live.apply(fen, last_move)
+        assert live.types == movable_piece_types(chess.Board(fen))
+    assert live.resyncs == 2
+
+
+def test_repeated_line_is_ignored():
+    live = LiveBoard()
+    fen, _ = stream_lines(chess.Board(), [])[0]
+    assert live.apply(fen)
+    assert not live.apply(fen)
+    assert live.resyncs == 1
+
+
+def test_app_spins_with_the_followers_analysis(make_app):
+    from lichess_stream import GameFollower
+
+    class FailingCache:
+        def analyze_fen(self, fen):
+            raise AssertionError("takipçi pozisyonu biliyorken FEN yeniden analiz edildi")
+
+    follower = GameFollower("beyaz")
+    moves = replayed_games(count=1, plies=30, seed=2)[0]
+    for fen, last_move in stream_lines(chess.Board(), moves):
+        follower._apply("mockgame", {"fen": fen, "lm": last_move})
+
+    spins = []
+    app = make_app(username="beyaz", tracker=None, follower=follower, game_id=None,
+                   analysis_cache=FailingCache(), spin_wheel=spins.append)
+    app.fetch_game_data()
+
+    assert app.game_id == "mockgame"
+    assert app.board == follower.board
+    assert spins == [[PIECE_NAMES[piece_type] for piece_type in movable_piece_types(follower.board)]]
@@ -0,0 +1,82 @@
+import random
+
+import chess
+import pytest
+
+from analysis_cache import OPENING_LINES
+from lichess_mock import random_moves
+from opening_book import OpeningBook, write_book
+
+PLIES = 12
+
+
+@pytest.fixture(scope="module")
+def games():
+    # Açılış satırları ağır basar; rastgele oyunlar pozisyon başına çok sayıda giriş ekler
+    rng = random.Random(0)
+    return [moves.split() for moves in OPENING_LINES.values()] * 3 + [random_moves(rng, PLIES) for _ in range(100)]
+
+
+@pytest.fixture
+def book(tmp_path, games):
+    path = tmp_path / "deneme.bin"
+    assert write_book(str(path), games, PLIES) > 0
+    book = OpeningBook(str(path))
+    yield book
+    book.close()
+
+
+def positions(games):
+    for moves in games:
+        board = chess.Board()
+        for uci in moves[:PLIES]:
+            yield board.copy(stack=False)
+            board.push_uci(uci)
+
+
+def test_grouped_moves_match_find_all(book, games):
+    for board in positions(games):
+        expected = {(entry.move, entry.weight) for entry in book.reader.find_all(board)}
+        groups = book.moves_by_type(board)
+        grouped = {(book_move["move"], book_move["weight"]) for moves in groups.values() for book_move in moves}
+        assert grouped == expected
+
+        for piece_type, moves in groups.items():
+            assert all(board.piece_type_at(book_move["move"].from_square) == piece_type for book_move in moves)
+            weights = [book_move["weight"] for book_move in moves]
+            assert weights == sorted(weights, reverse=True)
+
+
+def test_annotations_are_heaviest_move_per_slice(book, games):
+    for board in positions(games):
+        entries = list(book.reader.find_all(board))
+        # Taş tipi başına ve taş başına (kare) dilimler
+        targets = [(piece_type, None) for piece_type in chess.PIECE_TYPES]
+        targets += [(board.piece_type_at(square), square) for square in chess.SquareSet(board.occupied_co[board.turn])]
+
+        annotations = book.annotate(board, targets)
+        for piece_type, square in targets:
+            candidates = [entry for entry in entries
+                          if board.piece_type_at(entry.move.from_square) == piece_type
+                          and (square is None or entry.move.from_square == square)]
+            if not candidates:
+                assert (piece_type, square) not in annotations
+            else:
+                assert annotations[piece_type, square]["weight"] == max(entry.weight for entry in candidates)
+
+
+def test_castling_is_returned_as_king_move(book):
+    board = chess.Board()
+    for uci in OPENING_LINES["İspanyol"].split()[:8]:
+        board.push_uci(uci)
+    king_moves = book.moves_by_type(board)[chess.KING]
+    assert [book_move["san"] for book_move in king_moves] == ["O-O"]
+    assert king_moves[0]["move"] == chess.Move.from_uci("e1g1")
+
+
+def test_repeated_lookups_are_cached(book):
+    board = chess.Board()
+    first = book.moves_by_type(board)
+    assert book.moves_by_type(board) is first
+    book.annotate(board, [(chess.PAWN, None), (chess.KNIGHT, None)])
+    assert (book.hits, book.misses) == (2, 1)
@@ -0,0 +1,109 @@
+import json
+import time
+
+import pytest
+import requests
+
+from overlay_server import OverlayServer, spin_event
+from wheel_layout import SpinTrajectory, WheelSectors
+
+
+@pytest.fixture
+def overlay():
+    overlay = OverlayServer(port=0, queue_size=8).start()
+    yield overlay
+    overlay.stop()
+
+
+def listen(overlay):
+    """
+    Olay akışına bağlanır ve bağlantı sunucuda kaydedilene kadar bekler.
+
+    Dönüş değeri:
+        tuple: (yanıt, (olay adı, veri) üreten okuyucu)
+    """
+    before = overlay.client_count()
+    response = requests.get(overlay.url + "events", stream=True, timeout=5)
+    assert response.headers["Content-Type"] == "text/event-stream"
+    deadline = time.monotonic() + 5
+    while overlay.client_count() == before and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+    def events():
+        event = None
+        # SSE her zaman UTF-8'dir; başlıkta karakter kümesi olmadığından satırlar elle çözülür
+        for line in (raw.decode("utf-8") for raw in response.iter_lines(chunk_size=1)):
+            if line.startswith("event: "):
+                event = line[len("event: "):]
+            elif line.startswith("data: "):
+                yield event, json.loads(line[len("data: "):])
+
+    return response, events()
+
+
+def spin(spin_id):
+    sectors = WheelSectors([3, 1, 1])
+    trajectory = SpinTrajectory(3.25 * 360, 5000)
+    return spin_event(spin_id, "piece", ["Piyon", "At", "Şah"], sectors, trajectory, 1000.4)
+
+
+def test_page_and_unknown_path(overlay):
+    page = requests.get(overlay.url, timeout=5)
+    assert page.status_code == 200
+    assert "EventSource" in page.text
+    assert requests.get(overlay.url + "yok", timeout=5).status_code == 404
+
+
+def test_spin_event_payload():
+    event = spin(3)
+    assert event["labels"] == ["Piyon", "At", "Şah"]
+    assert sum(event["spans"]) == pytest.approx(360, abs=0.01)
+    assert event["offset"] == pytest.approx(-108)
+    assert (event["final_angle"], event["duration_ms"], event["started_at"]) == (1170, 5000, 1000)
+
+
+def test_events_reach_clients_in_order(overlay):
+    response, events = listen(overlay)
+    try:
+        overlay.publish("spin", spin(1))
+        overlay.publish("label", {"spin_id": 1, "index": 2, "text": "Şah\nKitap: O-O"})
+        overlay.publish("result", {"spin_id": 1, "text": "Beyaz TAŞ: ŞAH"})
+
+        assert next(events) == ("spin", spin(1))
+        assert next(events) == ("label", {"spin_id": 1, "index": 2, "text": "Şah\nKitap: O-O"})
+        assert next(events)[0] == "result"
+    finally:
+        response.close()
+
+
+def test_late_client_catches_up_with_the_last_spin(overlay):
+    overlay.publish("spin", spin(1))
+    overlay.publish("result", {"spin_id": 1, "text": "eski"})
+    overlay.publish("spin", spin(2))
+    overlay.publish("label", {"spin_id": 2, "index": 0, "text": "Piyon"})
+
+    response, events = listen(overlay)
+    try:
+        assert next(events) == ("spin", spin(2))
+        assert next(events) == ("label", {"spin_id": 2, "index": 0, "text": "Piyon"})
+    finally:
+        response.close()
+
+
+def test_stalled_client_is_dropped_without_blocking(overlay):
+    response, events = listen(overlay)
+    stalled, _ = overlay.connect()  # Kuyruğunu hiç okumayan istemci
+    try:
+        start = time.perf_counter()
+        for index in range(20):
+            overlay.publish("label", {"spin_id": 1, "index": index, "text": str(index)})
+            if index % 4 == 3:
+                time.sleep(0.05)  # Okuyan istemci yetişsin
+        assert time.perf_counter() - start < 1
+
+        assert stalled.closed
+        assert overlay.dropped == 1
+        assert [data["index"] for _, data in (next(events) for _ in range(20))] == list(range(20))
+        assert overlay.client_count() == 1
+    finally:
+        response.close()
@@ -0,0 +1,70 @@
+import os
+import random
+
+import pytest
+import requests
+
+from lichess_mock import MockGame, random_moves
+from page_extractor import extract_fen_bs4, extract_page_data, find_init_script, last_fen, read_page_data
+
+FIXTURES = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "fixtures")
+
+
+def chunked(data, size):
+    return [data[index:index + size] for index in range(0, len(data), size)]
+
+
+@pytest.fixture(scope="module")
+def game():
+    return MockGame("sayfa", "beyaz", "siyah", random_moves(random.Random(0), 60), move_delay=0)
+
+
+@pytest.mark.parametrize("size", [1, 7, 64, 8192])
+def test_script_found_across_chunk_boundaries(game, size):
+    page = game.page_html().encode("utf-8")
+    data = extract_page_data(chunked(page, size))
+    board = game.board_at(len(game.moves))
+    assert data["fen"] == board.fen()
+    assert data["last_move"] == game.moves[-1].uci()
+    assert data["clock"] == {"white": game.clock, "black": game.clock}
+    assert data["player_color"] == "white"
+
+
+def test_reading_stops_at_script_end(game):
+    page = game.page_html().encode("utf-8")
+    chunks = chunked(page, 256)
+    consumed = []
+
+    def source():
+        for chunk in chunks:
+            consumed.append(chunk)
+            yield chunk
+
+    assert find_init_script(source())
+    assert len(consumed) < len(chunks)
+    assert page.index(b"</script>") < sum(map(len, consumed))
+
+
+def test_page_without_script():
+    assert extract_page_data([b"<html><body>yok</body></html>"]) is None
+
+
+def test_last_fen_follows_document_order():
+    data = {"a": {"fen": "ilk"}, "steps": [{"fen": "ikinci"}, {"uci": "e2e4"}, {"fen": "son"}]}
+    assert last_fen(data) == "son"
+
+
+@pytest.mark.parametrize("name", ["italian1.html", "random01.html"])
+def test_recorded_pages_match_beautifulsoup(name):
+    pytest.importorskip("bs4")
+    with open(os.path.join(FIXTURES, name), "rb") as page_file:
+        page = page_file.read()
+    assert extract_page_data(chunked(page, 1024))["fen"] == extract_fen_bs4(page.decode("utf-8"))
+
+
+def test_read_page_data_closes_response(server, game):
+    server.add_game(game)
+    response = requests.get(f"{server.url}/sayfa", stream=True, timeout=5)
+    data = read_page_data(response, chunk_size=512)
+    assert data["fen"] == game.board_at(len(game.moves)).fen()
+    assert response.raw.closed
@@ -0,0 +1,37 @@
+import random
+
+import chess
+import pytest
+
+from piece_analysis import (PIECE_NAMES, check_against_reference, movable_piece_names, movable_piece_types,
+                            pinned_pieces, random_positions)
+
+
+@pytest.mark.parametrize("seed", [0, 1, 2])
+def test_fast_path_matches_legal_move_generation(seed):
+    assert check_against_reference(3000, seed) == []
+
+
+def test_pinned_pieces_match_is_pinned():
+    for board in random_positions(random.Random(3), 3000):
+        king = board.king(board.turn)
+        expected = sum(chess.BB_SQUARES[square] for square in chess.SquareSet(board.occupied_co[board.turn])
+                       if square != king and board.is_pinned(board.turn, square))
+        assert pinned_pieces(board, king) == expected
+
+
+@pytest.mark.parametrize("fen, names", [
+    # Açmazdaki at hiç oynayamaz, açmazdaki fil hat boyunca oynar
+    ("4k3/8/8/8/4r3/8/4N3/4K3 w - - 0 1", {"Şah"}),
+    ("4k3/8/8/8/7b/8/5B2/4K3 w - - 0 1", {"Fil", "Şah"}),
+    # Şah çekilmişken yalnızca kaçış ya da araya girme hamleleri sayılır
+    ("4k3/8/8/8/8/8/3PP3/r3K3 w - - 0 1", {"Şah"}),
+    # Yalnızca geçerken alma ile oynayabilen piyon
+    ("8/8/4p3/k2pP3/8/8/8/7K w - d6 0 2", {"Piyon", "Şah"}),
+    # Pat
+    ("k7/2Q5/1K6/8/8/8/8/8 b - - 0 1", set()),
+])
+def test_tricky_positions(fen, names):
+    board = chess.Board(fen)
+    assert {PIECE_NAMES[piece_type] for piece_type in movable_piece_types(board)} == names
+    assert set(movable_piece_names(board)) == names
@@ -0,0 +1,29 @@
+import chess
+
+from position_cache import PositionCache
+
+
+def test_disk_entries_survive_restart(tmp_path):
+    path = str(tmp_path / "dumen_cache.sqlite")
+    cache = PositionCache(path=path, namespace="https://lichess.org")
+    cache.store_game_id("Beyaz", "oyun1")
+    cache.store_fen("oyun1", chess.STARTING_FEN)
+
+    reopened = PositionCache(path=path, namespace="https://lichess.org")
+    position = reopened.lookup_position("beyaz")
+    assert position["game_id"] == "oyun1"
+    assert position["fen"] == chess.STARTING_FEN
+
+
+def test_disk_entries_are_separated_by_server(tmp_path):
+    path = str(tmp_path / "dumen_cache.sqlite")
+    live = PositionCache(path=path, namespace="https://lichess.org")
+    live.store_game_id("beyaz", "canli")
+    live.store_fen("canli", chess.STARTING_FEN)
+
+    # Taklit sunucuya geçen uygulama aynı dosyadaki canlı kayıtları görmez
+    mock = PositionCache(path=path, namespace="http://127.0.0.1:8080")
+    assert mock.lookup_position("beyaz") is None
+    mock.store_game_id("beyaz", "taklit")
+
+    assert PositionCache(path=path, namespace="https://lichess.org").get("user:beyaz")["value"] == "canli"
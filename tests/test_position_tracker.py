@@ -0,0 +1,85 @@
+import asyncio
+
+from lichess_mock import MockGame, SAMPLE_MOVES
+from position_tracker import PositionTracker
+from request_scheduler import ENDPOINT_LIMITS, RequestScheduler
+
+
+def follow(tracker, game_id):
+    """
+    Tek bir oyun akışını takipçinin semaforlarıyla baştan sona izler.
+    """
+    async def run():
+        tracker._stream_slots = asyncio.Semaphore(tracker.max_streams)
+        tracker._request_slots = asyncio.Semaphore(tracker.max_requests)
+        await tracker.follow_game(game_id)
+
+    asyncio.run(run())
+
+
+def test_tracks_every_player(server):
+    usernames = server.populate(20, move_delay=0.2, plies=30)
+    updates = []
+
+    async def run():
+        tracker = PositionTracker(usernames, base_url=server.url, poll_interval=0.2,
+                                  on_update=lambda game_id, board: updates.append((game_id, board)))
+        task = asyncio.create_task(tracker.run())
+        for _ in range(200):
+            if all(tracker.board_for(username) for username in usernames):
+                break
+            await asyncio.sleep(0.02)
+        covered = {username: tracker.board_for(username) for username in usernames}
+        await asyncio.sleep(0.5)
+        tracker._stopped = True
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+        return tracker, covered
+
+    tracker, covered = asyncio.run(run())
+    assert all(covered.values())
+    assert tracker.errors == 0
+
+    # Her güncelleme oyunun gerçekten geçtiği bir pozisyondur
+    assert updates
+    for game_id, board in updates:
+        assert board == server.games[game_id].board_at(board.ply())
+
+
+def test_finished_game_is_released(server):
+    server.add_game(MockGame("hizli", "ak", "kara", SAMPLE_MOVES[:6], move_delay=0.05))
+    seen = []
+    tracker = PositionTracker(["ak"], base_url=server.url, on_update=lambda game_id, board: seen.append(board.ply()))
+    tracker.user_games["ak"] = "hizli"
+    follow(tracker, "hizli")
+
+    assert seen[-1] == 6
+    assert seen == sorted(seen)
+    assert "hizli" not in tracker.streams and "hizli" not in tracker.boards
+    assert tracker.errors == 0
+
+
+def test_error_status_is_not_an_idle_game(server):
+    tracker = PositionTracker(["beyaz"], base_url=server.url)
+    follow(tracker, "yokboyle")
+    assert tracker.errors == 1
+    assert tracker.updates == 0
+
+
+def test_rate_limited_stream_pauses_the_scheduler(server):
+    server.configure_faults(rate_limit=1.0, retry_after=30)
+    scheduler = RequestScheduler({name: (1000.0, 1000) for name in ENDPOINT_LIMITS})
+    tracker = PositionTracker(["beyaz"], base_url=server.url, scheduler=scheduler)
+    follow(tracker, "mockgame")
+    assert tracker.errors == 1
+    assert scheduler.rate_limited == 1
+    assert scheduler.cooldown_remaining() > 25
+
+
+def test_silent_stream_times_out(server):
+    # "mockgame" dakikada bir hamle yapar; ilk satırdan sonra akış susar
+    tracker = PositionTracker(["beyaz"], base_url=server.url, stream_read_timeout=0.3)
+    follow(tracker, "mockgame")
+    assert tracker.updates == 1
+    assert tracker.errors == 1
+    assert "mockgame" not in tracker.streams
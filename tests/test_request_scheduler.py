@@ -0,0 +1,113 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from request_scheduler import (PRIORITY_BACKGROUND, PRIORITY_INTERACTIVE, RateLimited, RequestScheduler,
+                               endpoint_for)
+
+
+def scheduler(rate=10.0, capacity=1):
+    return RequestScheduler({"current-game": (rate, capacity), "other": (1000.0, 1000)})
+
+
+@pytest.mark.parametrize("url, endpoint", [
+    ("/api/user/beyaz/current-game", "current-game"),
+    ("https://lichess.org/api/stream/game/abcd1234", "game-stream"),
+    ("/api/stream/event", "event-stream"),
+    ("/api/users/status?ids=a,b", "users-status"),
+    ("/abcd1234", "game-page"),
+    ("/", "other"),
+])
+def test_endpoint_groups(url, endpoint):
+    assert endpoint_for(url) == endpoint
+
+
+def test_bucket_limits_rate():
+    limiter = scheduler(rate=20.0, capacity=1)
+    start = time.monotonic()
+    for _ in range(5):
+        limiter.acquire("current-game")
+    # İlk istek hemen, sonraki dördü saniyede 20 jetonla
+    assert time.monotonic() - start == pytest.approx(0.2, abs=0.08)
+    assert limiter.metrics()["sent"]["current-game"] == 5
+
+
+def test_interactive_requests_jump_the_queue():
+    limiter = scheduler(rate=10.0, capacity=1)
+    limiter.acquire("current-game")
+    order = []
+
+    def request(name, priority):
+        limiter.acquire("current-game", priority)
+        order.append(name)
+
+    background = [threading.Thread(target=request, args=(f"arka{index}", PRIORITY_BACKGROUND))
+                  for index in range(3)]
+    for thread in background:
+        thread.start()
+    time.sleep(0.02)
+    interactive = threading.Thread(target=request, args=("tık", PRIORITY_INTERACTIVE))
+    interactive.start()
+    for thread in background + [interactive]:
+        thread.join()
+
+    assert order[0] == "tık"
+
+
+def test_rate_limit_pauses_every_endpoint():
+    limiter = scheduler()
+    assert limiter.report_rate_limited("30") == pytest.approx(30, abs=0.1)
+
+    # Süre yetmeyecekse beklemeden reddedilir
+    with pytest.raises(RateLimited) as error:
+        limiter.acquire("other", PRIORITY_INTERACTIVE, timeout=3)
+    assert error.value.retry_in == pytest.approx(30, abs=0.5)
+    assert limiter.metrics()["rejected"] == 1
+
+
+def test_missing_retry_after_waits_a_minute():
+    limiter = scheduler()
+    assert limiter.report_rate_limited(None) == pytest.approx(60, abs=0.1)
+
+
+def test_streams_skip_the_bucket_but_not_the_cooldown():
+    limiter = scheduler(rate=0.1, capacity=1)
+
+    async def open_streams(count):
+        for _ in range(count):
+            await limiter.acquire_async("current-game", bucket=False)
+
+    start = time.monotonic()
+    asyncio.run(open_streams(20))
+    assert time.monotonic() - start < 0.1
+    assert limiter.metrics()["sent"]["current-game"] == 20
+
+    limiter.report_rate_limited("0.3")
+    start = time.monotonic()
+    asyncio.run(open_streams(1))
+    assert time.monotonic() - start >= 0.25
+
+
+def test_warm_goes_through_the_scheduler(server):
+    from lichess_api import LichessSession
+
+    limiter = RequestScheduler({"other": (1000.0, 1000)})
+    session = LichessSession(server.url, scheduler=limiter)
+    responses = []
+    head = session.session.head
+    warmed = threading.Event()
+
+    def recorded_head(*args, **kwargs):
+        try:
+            responses.append(head(*args, **kwargs))
+            return responses[-1]
+        finally:
+            warmed.set()
+
+    session.session.head = recorded_head
+    session.warm()
+    assert warmed.wait(5)
+    assert responses[0].status_code == 200
+    assert limiter.metrics()["sent"]["other"] == 1
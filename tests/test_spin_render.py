@@ -0,0 +1,69 @@
+import random
+
+import pytest
+from PIL import Image
+
+from spin_render import BANNER_HEIGHT, SpinRenderer, default_wheel, render_frames, render_spin, spin_frames
+from wheel_layout import SpinTrajectory
+
+LABELS = ["Piyon", "At", "Fil", "Şah"]
+
+
+@pytest.fixture(scope="module")
+def renderer():
+    return SpinRenderer(default_wheel(60), LABELS, weights=[4, 2, 1, 1], size=(200, 140))
+
+
+@pytest.fixture
+def trajectory():
+    return SpinTrajectory.random(random.Random(5), 1, 600)
+
+
+def test_frames_sample_the_trajectory(trajectory):
+    angles = spin_frames(trajectory, fps=20)
+    assert len(angles) == 12 + 1
+    assert angles[0] == 0 and angles[-1] == trajectory.final_angle
+    assert angles == sorted(angles)
+
+
+def test_outcome_follows_the_seed(renderer):
+    outcomes = [renderer.outcome(SpinTrajectory.random(random.Random(seed), 3, 5000)) for seed in range(30)]
+    assert outcomes == [renderer.outcome(SpinTrajectory.random(random.Random(seed), 3, 5000)) for seed in range(30)]
+    assert set(outcomes) <= set(LABELS) and len(set(outcomes)) > 1
+
+
+def test_banner_is_drawn_below_the_wheel(renderer):
+    plain = renderer.render(0)
+    with_banner = renderer.render(0, banner="Sonuç: At")
+    assert plain.size == with_banner.size == (200, 140 + BANNER_HEIGHT)
+
+    banner_box = (0, 140, 200, 140 + BANNER_HEIGHT)
+    assert plain.crop((0, 0, 200, 140)).tobytes() == with_banner.crop((0, 0, 200, 140)).tobytes()
+    assert with_banner.crop(banner_box).tobytes() != plain.crop(banner_box).tobytes()
+
+
+@pytest.mark.parametrize("fmt", ["gif", "webp"])
+def test_worker_pool_matches_single_process(renderer, trajectory, fmt):
+    angles = spin_frames(trajectory, fps=20)
+    banners = [None] * (len(angles) - 1) + ["At"]
+    single = render_frames(renderer, angles, banners, fmt, workers=0, chunk_size=5)
+    pooled = render_frames(renderer, angles, banners, fmt, workers=2, chunk_size=5)
+    assert [frame.tobytes() for frame in single] == [frame.tobytes() for frame in pooled]
+
+
+def test_gif_holds_the_last_frame(tmp_path, renderer, trajectory):
+    out = tmp_path / "cevirme.gif"
+    count = render_spin(renderer, trajectory, str(out), fps=20, hold_ms=1500, banner="At", workers=0)
+    with Image.open(out) as animation:
+        assert animation.n_frames == count == 13
+        animation.seek(count - 1)
+        assert animation.info["duration"] == 1500
+
+
+def test_png_sequence_and_unknown_format(tmp_path, renderer, trajectory):
+    directory = tmp_path / "kareler"
+    assert render_spin(renderer, trajectory, str(directory), fps=20, workers=0) == 13
+    assert sorted(path.name for path in directory.iterdir())[-1] == "kare_00012.png"
+
+    with pytest.raises(ValueError):
+        render_spin(renderer, trajectory, str(tmp_path / "cevirme.mp4"), workers=0)
@@ -0,0 +1,79 @@
+import collections
+import math
+
+import pytest
+from PIL import Image, ImageDraw
+
+from wheel_bitmap import BOUNDARY_RADII, LABEL_OFFSET, compose_wheel, composed_size
+from wheel_layout import WheelSectors
+
+
+@pytest.fixture
+def wheel():
+    wheel = Image.new("RGBA", (100, 100))
+    ImageDraw.Draw(wheel).ellipse((0, 0, 99, 99), fill=(139, 90, 43, 255))
+    return wheel
+
+
+def dark_pixels(image, box):
+    pixels = image.crop(box).load()
+    width, height = box[2] - box[0], box[3] - box[1]
+    return sum(1 for x in range(width) for y in range(height)
+               if pixels[x, y][3] > 128 and sum(pixels[x, y][:3]) < 150)
+
+
+def label_box(image, angle, size=24):
+    half = image.width // 2
+    radius = 50 + LABEL_OFFSET
+    x = half + radius * math.cos(math.radians(angle))
+    y = half + radius * math.sin(math.radians(angle))
+    return (round(x - size), round(y - size), round(x + size), round(y + size))
+
+
+def test_wheel_is_centered(wheel):
+    image = compose_wheel(wheel, [], [])
+    assert image.size == (composed_size(wheel), composed_size(wheel))
+    half = image.width // 2
+    assert image.getpixel((half, half)) == (139, 90, 43, 255)
+    assert image.getpixel((half - 50, half - 50))[3] == 0
+
+
+@pytest.mark.parametrize("upright", [False, True])
+def test_labels_sit_in_the_middle_of_their_slices(wheel, upright):
+    sectors = WheelSectors([1] * 4)
+    image = compose_wheel(wheel, ["At", "", "Kale\nh1", ""], sectors.centers, font_size=14, upright=upright)
+    assert dark_pixels(image, label_box(image, sectors.centers[0])) > 10
+    assert dark_pixels(image, label_box(image, sectors.centers[2])) > 10
+    assert dark_pixels(image, label_box(image, sectors.centers[1])) == 0
+    assert dark_pixels(image, label_box(image, sectors.centers[3])) == 0
+
+
+def test_boundaries_are_drawn_at_slice_starts(wheel):
+    image = compose_wheel(wheel, [], [], boundaries=[90])
+    half = image.width // 2
+    radius = 50 + sum(BOUNDARY_RADII) // 2
+    assert image.getpixel((half, half + radius))[:3] == (0x88, 0x88, 0x88)
+    assert image.getpixel((half, half - radius))[3] == 0
+
+
+def test_same_layout_reuses_its_frame_cache(make_app, wheel):
+    sectors = WheelSectors([1] * 3)
+    app = make_app(wheel_image_original=wheel, settings={"frame_step": 1.0, "frame_cache_mb": 8},
+                   label_frames=collections.OrderedDict(), spin_frames=None, labels_dirty=True,
+                   label_style=(14, False, ()), wheel_sectors=sectors, hints={}, book_moves={})
+
+    layouts = [["Piyon", "At", "Şah"], ["Piyon", "Fil", "Şah"], ["Kale", "At", "Şah"]]
+    caches = []
+    for pieces in layouts[:2] + layouts[:1]:
+        app.wheel_pieces = pieces
+        app.compose_spin_wheel()
+        caches.append(app.spin_frames)
+    assert caches[0] is caches[2] and caches[0] is not caches[1]
+    assert not app.labels_dirty
+
+    # Üçüncü düzen en uzun süredir kullanılmayanı (ikinciyi) atar
+    app.wheel_pieces = layouts[2]
+    app.compose_spin_wheel()
+    assert len(app.label_frames) == 2
+    assert caches[1]._stop_event.is_set()
+    assert caches[0] in app.label_frames.values()
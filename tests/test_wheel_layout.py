@@ -0,0 +1,122 @@
+import math
+import random
+
+import chess
+import pytest
+
+from analysis_cache import AnalysisCache
+from piece_analysis import parse_piece_label, piece_label
+from wheel_layout import RingItems, SpinTrajectory, WheelSectors
+
+
+def linear_index(sectors, wheel_angle, pointer_angle=0):
+    # Dilimleri tek tek dolaşan eski yol
+    for index, (start, span) in enumerate(zip(sectors.starts, sectors.spans)):
+        if (pointer_angle - wheel_angle - start) % 360 < span:
+            return index
+    raise AssertionError("açı hiçbir dilime düşmedi")
+
+
+@pytest.mark.parametrize("weights", [[1], [1] * 6, [3, 1, 1, 7], [1, 40, 2, 2, 5, 1, 9]])
+def test_index_matches_linear_search(weights):
+    sectors = WheelSectors(weights)
+    assert sum(sectors.spans) == pytest.approx(360)
+    rng = random.Random(len(weights))
+    angles = [rng.uniform(-720, 2160) for _ in range(500)] + [-start for start in sectors.starts]
+    for angle in angles:
+        assert sectors.index_at(angle) == linear_index(sectors, angle)
+
+
+def test_equal_weights_match_even_layout():
+    sectors = WheelSectors([1] * 6)
+    assert sectors.centers == pytest.approx([i * 60 for i in range(6)])
+    # Dönmemiş dümende ok ilk dilimin ortasını gösterir
+    assert sectors.index_at(0) == 0
+
+
+def test_spans_follow_weights():
+    sectors = WheelSectors([2, 6, 4])
+    assert sectors.spans == pytest.approx([60, 180, 120])
+
+
+@pytest.mark.parametrize("mode", ["moves", "pieces"])
+@pytest.mark.parametrize("per_piece", [False, True])
+def test_slice_weights_follow_mobility(make_app, mode, per_piece):
+    board = chess.Board("r1bqkbnr/pppp1ppp/2n5/4p3/2B1P3/5N2/PPPP1PPP/RNBQK2R b KQkq - 3 3")
+    cache = AnalysisCache()
+    analysis = cache.analyze(board)
+    app = make_app(board=board, analysis_cache=cache, settings={"slice_weighting": mode})
+    weights = app.slice_weights(analysis.labels(per_piece))
+
+    moves = analysis.moves_by_type()
+    if per_piece:
+        expected = [1 if mode == "pieces" else sum(1 for move in moves[piece_type] if move.from_square == square)
+                    for piece_type, square in analysis.instances()]
+    else:
+        expected = [analysis.mobility()[piece_type][mode] for piece_type in analysis.types]
+    assert weights == expected
+
+    app.settings["slice_weighting"] = "equal"
+    assert app.slice_weights(analysis.labels(per_piece)) is None
+
+
+def test_ring_script_moves_every_item_in_one_call():
+    import tkinter
+
+    tcl = tkinter.Tcl()
+    tcl.eval("set calls {}; proc .tuval {args} {lappend ::calls $args}")
+    sectors = WheelSectors([1] * 30)
+    ring = RingItems(".tuval")
+    for item_id, center in enumerate(sectors.centers, start=1):
+        ring.add(item_id, center, 290)
+    ring.add(99, 0, 100, 300)  # İki uçlu sınır çizgisi
+
+    tcl.eval(ring.script(400, 400, 90))
+    calls = [tcl.splitlist(call) for call in tcl.splitlist(tcl.eval("set calls"))]
+    assert len(calls) == len(ring) == 31
+
+    # Her etiket kendi açısı + dümen açısı yönünde, yarıçap kadar uzakta
+    for (_, item_id, x, y), center in zip(calls, sectors.centers):
+        radians = math.radians(center + 90)
+        assert float(x) == pytest.approx(400 + 290 * math.cos(radians), abs=0.06)
+        assert float(y) == pytest.approx(400 + 290 * math.sin(radians), abs=0.06)
+    assert [float(value) for value in calls[-1][2:]] == pytest.approx([400, 500, 400, 700], abs=0.06)
+
+
+def test_piece_labels_round_trip():
+    for piece_type in chess.PIECE_TYPES:
+        assert parse_piece_label(piece_label(piece_type)) == (piece_type, None)
+        for square in (chess.A1, chess.E4, chess.H8):
+            assert parse_piece_label(piece_label(piece_type, square)) == (piece_type, square)
+
+
+def test_seeded_trajectories_repeat():
+    def final_angles(seed):
+        rng = random.Random(seed)
+        return [SpinTrajectory.random(rng, 3, 5000).final_angle for _ in range(20)]
+
+    assert final_angles(7) == final_angles(7)
+    assert final_angles(7) != final_angles(8)
+
+    rng = random.Random(8)
+    for _ in range(200):
+        assert 3.1 * 360 <= SpinTrajectory.random(rng, 3, 5000).final_angle <= 3.9 * 360
+
+
+def test_angle_only_moves_forward():
+    trajectory = SpinTrajectory(4.5 * 360, 5000)
+    angles = [trajectory.angle_at(elapsed) for elapsed in range(-16, 5200, 16)]
+    assert angles[0] == 0
+    assert angles[-1] == trajectory.final_angle
+    assert all(previous <= angle for previous, angle in zip(angles, angles[1:]))
+
+
+def test_outcome_matches_the_arrow_after_the_spin(make_app):
+    rng = random.Random(9)
+    pieces = ["Piyon", "At", "Fil", "Kale", "Vezir", "Şah"]
+    for weights in ([1] * 6, [8, 3, 5, 4, 2, 1]):
+        sectors = WheelSectors(weights)
+        for _ in range(100):
+            trajectory = SpinTrajectory.random(rng, 3, 5000)
+            app = make_app(wheel_sectors=sectors, wheel_pieces=pieces, current_angle=trajectory.angle_at(5000))
+            assert pieces[trajectory.outcome(sectors)] == app.determine_selected_piece()
@@ -0,0 +1,161 @@
+"""
+Denemeler için küçük UCI motoru
+
+Gerçek bir satranç motoru (ör. Stockfish) kurmadan motor havuzunu ve
+öneri akışını denemek için yazılmış, betiklenebilir UCI taklidi. Arama
+yapmaz: `go` komutunda verilen `searchmoves` listesinden (yoksa tüm yasal
+hamlelerden) belirlenen kurala göre bir hamle seçer, istenirse düşünüyormuş
+gibi bekler ve belirli sayıda aramadan sonra çöker.
+
+    python uci_standin.py --delay 0.05 --pick capture
+"""
+import argparse
+import sys
+import time
+
+import chess
+
+# Taşların kaba değerleri (skor satırı için)
+PIECE_VALUES = {chess.PAWN: 100, chess.KNIGHT: 300, chess.BISHOP: 300, chess.ROOK: 500, chess.QUEEN: 900, chess.KING: 0}
+
+
+def material(board, color):
+    """
+    `color` açısından malzeme farkını santipiyon olarak döndürür.
+    """
+    score = 0
+    for piece_type, value in PIECE_VALUES.items():
+        score += value * (len(board.pieces(piece_type, color)) - len(board.pieces(piece_type, not color)))
+    return score
+
+
+def choose(board, moves, pick):
+    """
+    Betikteki kurala göre bir hamle seçer.
+
+    Parametreler:
+        board (chess.Board): Arama yapılan pozisyon
+        moves (list): Aday hamleler
+        pick (str): "first" (UCI sırasında ilk), "last" ya da "capture" (önce en değerli alma)
+
+    Dönüş değeri:
+        chess.Move: Seçilen hamle
+    """
+    moves = sorted(moves, key=lambda move: move.uci())
+    if pick == "last":
+        return moves[-1]
+    if pick == "capture":
+        def gain(move):
+            captured = board.piece_type_at(move.to_square)
+            return PIECE_VALUES.get(captured, 0) if captured else 0
+        return max(moves, key=gain)
+    return moves[0]
+
+
+def parse_position(tokens):
+    """
+    `position` komutunun ardından gelen kelimelerden tahtayı kurar.
+    """
+    if tokens[0] == "startpos":
+        board = chess.Board()
+        rest = tokens[1:]
+    else:
+        index = tokens.index("moves") if "moves" in tokens else len(tokens)
+        board = chess.Board(" ".join(tokens[1:index]))
+        rest = tokens[index:]
+
+    if rest and rest[0] == "moves":
+        for uci in rest[1:]:
+            board.push_uci(uci)
+    return board
+
+
+def parse_go(tokens):
+    """
+    `go` komutundan düşünme süresini (saniye) ve `searchmoves` listesini ayıklar.
+    """
+    movetime = None
+    searchmoves = []
+    collecting = False
+    for i, token in enumerate(tokens):
+        if token == "movetime" and i + 1 < len(tokens):
+            movetime = int(tokens[i + 1]) / 1000
+            collecting = False
+        elif token == "searchmoves":
+            collecting = True
+        elif collecting and len(token) in (4, 5) and token[1].isdigit():
+            searchmoves.append(token)
+        else:
+            collecting = False
+    return movetime, searchmoves
+
+
+def run(delay=0.0, pick="first", crash_after=None, stdin=sys.stdin, stdout=sys.stdout):
+    """
+    Standart girdiden UCI komutlarını okuyup yanıtlar.
+
+    Parametreler:
+        delay (float): Her aramada beklenecek en fazla süre (saniye); `movetime` daha kısaysa o kullanılır
+        pick (str): Hamle seçme kuralı (bkz. choose)
+        crash_after (int): Bu kadar aramadan sonra yanıt vermeden çık (None ise çökmez)
+    """
+    def send(line):
+        stdout.write(line + "\n")
+        stdout.flush()
+
+    board = chess.Board()
+    searches = 0
+
+    for line in stdin:
+        tokens = line.split()
+        if not tokens:
+            continue
+        command = tokens[0]
+
+        if command == "uci":
+            send("id name DumenStandin")
+            send("id author Dumen Dunyam")
+            send("option name Hash type spin default 16 min 1 max 1024")
+            send("option name Threads type spin default 1 min 1 max 1")
+            send("uciok")
+        elif command == "isready":
+            send("readyok")
+        elif command == "position":
+            board = parse_position(tokens[1:])
+        elif command == "go":
+            searches += 1
+            if crash_after is not None and searches > crash_after:
+                return
+
+            movetime, searchmoves = parse_go(tokens[1:])
+            time.sleep(min(delay, movetime) if movetime is not None else delay)
+
+            moves = [chess.Move.from_uci(uci) for uci in searchmoves] or list(board.legal_moves)
+            if not moves:
+                send("info depth 0 score mate 0")
+                send("bestmove (none)")
+                continue
+
+            move = choose(board, moves, pick)
+            board.push(move)
+            score = -material(board, board.turn)
+            board.pop()
+            send(f"info depth 1 seldepth 1 nodes {len(moves)} score cp {score} pv {move.uci()}")
+            send(f"bestmove {move.uci()}")
+        elif command == "quit":
+            return
+        # ucinewgame, setoption, stop gibi diğer komutlar yok sayılır
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Denemeler için küçük UCI motoru")
+    parser.add_argument("--delay", type=float, default=0.0, help="Her aramada beklenecek süre (saniye)")
+    parser.add_argument("--pick", choices=["first", "last", "capture"], default="first", help="Hamle seçme kuralı")
+    parser.add_argument("--crash-after", type=int, help="Bu kadar aramadan sonra çök")
+    args = parser.parse_args()
+
+    run(delay=args.delay, pick=args.pick, crash_after=args.crash_after)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+"""
+Dilim etiketlerinin dümen görseline işlenmesi
+
+Etiketler tuvalde ayrı yazı öğeleri olduğunda her karede her etiketin
+konumu ve açısı güncellenir; Tk döndürülmüş her yazıyı yeniden çizer ve
+kare başına maliyet dilim sayısıyla artar. Bu modül etiketleri (ve
+ağırlıklı moddaki dilim sınırlarını) çevirme başında bir kez dümen
+görselinin etrafına işler; animasyon sırasında yalnızca bu tek birleşik
+görsel döndürülür. Etiketler dümenle birlikte katı cisim gibi döner.
+
+Birleşik görsel, etiketlere yer açmak için dümenden daha büyüktür;
+dümen merkezi görselin merkezindedir, böylece tuvalde aynı noktaya
+yerleştirilir.
+
+Kıyaslama için:
+
+    python wheel_bitmap.py --slices 6 16 30
+"""
+import argparse
+import math
+import time
+
+from PIL import Image, ImageDraw, ImageFont
+
+# Etiketlerin dümen kenarından uzaklığı ve görselde etiketlere ayrılan pay (piksel)
+LABEL_OFFSET = 40
+LABEL_MARGIN = 48
+
+# Dilim sınırı çizgilerinin dümen kenarına göre başlangıcı ve bitişi (piksel)
+BOUNDARY_RADII = (10, 70)
+
+# Boyuta göre yüklenmiş yazı tipleri
+_fonts = {}
+
+
+def load_font(size):
+    """
+    Etiketler için kalın yazı tipini yükler (Windows'ta Arial, yoksa DejaVu ya da PIL'in varsayılanı).
+    """
+    font = _fonts.get(size)
+    if font is None:
+        for name in ("arialbd.ttf", "Arial Bold.ttf", "DejaVuSans-Bold.ttf"):
+            try:
+                font = ImageFont.truetype(name, size)
+                break
+            except OSError:
+                continue
+        else:
+            font = ImageFont.load_default(size=size)
+        _fonts[size] = font
+    return font
+
+
+def composed_size(wheel):
+    """
+    Dümen ve etiketlerinin sığdığı kare görselin kenar uzunluğu.
+    """
+    return 2 * (wheel.width // 2 + LABEL_OFFSET + LABEL_MARGIN)
+
+
+def compose_wheel(wheel, labels, centers, font_size=16, boundaries=(), upright=False):
+    """
+    Dümen görselinin etrafına dilim etiketlerini ve sınırlarını işler.
+
+    Parametreler:
+        wheel (PIL.Image.Image): Kare dümen görseli
+        labels (list): Etiket metinleri (çok satırlı olabilir)
+        centers (list): Etiketlerin dilim ortası açıları (derece, saat yönünde, 0° sağ)
+        font_size (int): Yazı boyutu
+        boundaries (list): Sınır çizgisi çizilecek dilim başlangıç açıları
+        upright (bool): True ise yazılar dümen dururken dik, değilse dilim yönünde döndürülür
+
+    Dönüş değeri:
+        PIL.Image.Image: Merkezi dümenin merkezi olan RGBA görsel
+    """
+    radius = wheel.width // 2
+    half = composed_size(wheel) // 2
+    image = Image.new("RGBA", (2 * half, 2 * half))
+    image.paste(wheel.convert("RGBA"), (half - radius, half - radius))
+
+    draw = ImageDraw.Draw(image)
+    for start in boundaries:
+        cos, sin = math.cos(math.radians(start)), math.sin(math.radians(start))
+        inner, outer = (radius + offset for offset in BOUNDARY_RADII)
+        draw.line((half + inner * cos, half + inner * sin, half + outer * cos, half + outer * sin),
+                  fill="#888888", width=2)
+
+    font = load_font(font_size)
+    text_radius = radius + LABEL_OFFSET
+    for text, angle in zip(labels, centers):
+        # Etiketi saydam bir parçaya yaz, dilimin yönüne döndür ve yerine yapıştır
+        left, top, right, bottom = draw.multiline_textbbox((0, 0), text, font=font, align="center")
+        patch = Image.new("RGBA", (math.ceil(right - left) + 4, math.ceil(bottom - top) + 4))
+        ImageDraw.Draw(patch).multiline_text((2 - left, 2 - top), text, font=font, fill="black", align="center")
+        if not upright:
+            patch = patch.rotate(-angle, resample=Image.BICUBIC, expand=True)
+
+        x = half + text_radius * math.cos(math.radians(angle))
+        y = half + text_radius * math.sin(math.radians(angle))
+        image.paste(patch, (round(x - patch.width / 2), round(y - patch.height / 2)), patch)
+
+    return image
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Etiketleri dümen görseline işlemenin maliyeti")
+    parser.add_argument("--size", type=int, default=300, help="Dümenin piksel boyutu")
+    parser.add_argument("--slices", type=int, nargs="+", default=[6, 16, 30], help="Denenecek dilim sayıları")
+    parser.add_argument("--frames", type=int, default=100, help="Ölçülen kare sayısı")
+    parser.add_argument("--out", help="Son birleşik görseli bu PNG dosyasına kaydet")
+    args = parser.parse_args()
+
+    from wheel_layout import WheelSectors
+
+    wheel = Image.new("RGBA", (args.size, args.size))
+    ImageDraw.Draw(wheel).ellipse((0, 0, args.size - 1, args.size - 1), fill="#8B5A2B", outline="black", width=4)
+
+    for count in args.slices:
+        sectors = WheelSectors([1] * count)
+        labels = [f"Piyon\n{chr(97 + i % 8)}{2 + i // 8}" for i in range(count)]
+        font_size = 16 if count <= 8 else 11
+
+        start = time.perf_counter()
+        image = compose_wheel(wheel, labels, sectors.centers, font_size, sectors.starts, upright=count > 8)
+        compose = time.perf_counter() - start
+
+        # Karede yapılan tek iş: birleşik görseli döndürmek (dilim sayısından bağımsız)
+        start = time.perf_counter()
+        for frame in range(args.frames):
+            image.rotate(-frame * 3.7)
+        rotate = (time.perf_counter() - start) / args.frames
+
+        print(f"{count:3d} dilim: birleştirme {compose * 1000:.1f} ms / çevirme, "
+              f"döndürme {rotate * 1000:.2f} ms / kare ({image.width}x{image.height})")
+
+    if args.out:
+        image.save(args.out)
+
+
+if __name__ == "__main__":
+    main()
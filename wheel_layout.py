@@ -0,0 +1,251 @@
+"""
+Dümen dilim düzeni
+
+Dümen etrafındaki dilimlerin açılarını hesaplayan ve okun gösterdiği
+dilimi açıya göre ikili aramayla (O(log n)) bulan yardımcılar. Dilimler
+eşit ya da ağırlıklı (ör. hamle sayısıyla orantılı) olabilir.
+
+Açılar derece cinsindendir ve tuval koordinatlarında (y aşağı) ölçülür:
+0° sağ tarafı, artan açı saat yönünü gösterir. Ok 0°'dedir.
+
+Taş başına dilim modunda 30'a yakın etiket olabilir; her karede her etiket
+için ayrı `coords` ve `itemconfig(angle=...)` çağırmak (ve döndürülmüş
+yazıyı yeniden çizdirmek) 60 FPS'i tutturamaz. `RingItems`, dümenle dönen
+tüm öğelerin yeni koordinatlarını tek bir Tcl betiğinde toplar; karede
+yalnızca bir Python -> Tcl geçişi yapılır ve yazılar dik kalır.
+
+Dönüşün tüm yörüngesi (`SpinTrajectory`) çevirme başlarken belirlenir:
+son açı tohumlanabilir bir rastgele sayı üretecinden bir kez çekilir ve
+her karedeki açı yalnızca geçen süreye bağlıdır. Sonuç, son açı ve dilim
+düzeninden animasyon beklenmeden bulunabilir.
+
+Kare başına maliyetin ölçümü için:
+
+    python wheel_layout.py --items 30
+"""
+import argparse
+import bisect
+import itertools
+import math
+import random
+import time
+
+
+class WheelSectors:
+    """
+    Ağırlıklara göre bölünmüş dümen dilimleri.
+
+    İlk dilim, dümen dönmeden önce okun tam ortasına gelecek şekilde
+    yerleştirilir; eşit ağırlıklarda bu, taş isimlerinin eski eşit aralıklı
+    yerleşimiyle aynıdır.
+    """
+    def __init__(self, weights):
+        """
+        Parametreler:
+            weights (list): Her dilimin pozitif ağırlığı
+        """
+        total = float(sum(weights))
+        self.spans = [360 * weight / total for weight in weights]  # Dilim genişlikleri
+        self.offset = -self.spans[0] / 2  # İlk dilimin başlangıç açısı
+
+        # Dilim sınırları, `offset`'ten itibaren birikimli bitiş açıları olarak
+        self.ends = list(itertools.accumulate(self.spans))
+        self.starts = [self.offset + end - span for end, span in zip(self.ends, self.spans)]
+        self.centers = [start + span / 2 for start, span in zip(self.starts, self.spans)]
+
+    def __len__(self):
+        return len(self.spans)
+
+    def index_at(self, wheel_angle, pointer_angle=0):
+        """
+        Dümen `wheel_angle` kadar dönmüşken `pointer_angle` yönündeki dilimi bulur.
+
+        Parametreler:
+            wheel_angle (float): Dümenin toplam dönüş açısı (derece)
+            pointer_angle (float): Okun açısı (derece), varsayılan sağ taraf
+
+        Dönüş değeri:
+            int: Dilimin sırası
+        """
+        relative = (pointer_angle - wheel_angle - self.offset) % 360
+        return min(bisect.bisect_right(self.ends, relative), len(self.ends) - 1)
+
+
+def ease_out(progress):
+    """
+    Dönüş eğrisi: ilk %70 sabit hız, son %30 easeOutQuint ile belirgin yavaşlama.
+
+    Parametreler:
+        progress (float): Geçen sürenin toplam süreye oranı (0-1)
+
+    Dönüş değeri:
+        float: Alınan yolun toplam yola oranı (0-1)
+    """
+    if progress < 0.7:
+        return progress
+    p = (progress - 0.7) / 0.3
+    return 0.7 + 0.3 * (1 - (1 - p) ** 5)
+
+
+class SpinTrajectory:
+    """
+    Bir çevirmenin baştan belirlenmiş yörüngesi: son açı ve süreye göre her andaki açı.
+    """
+    def __init__(self, final_angle, duration_ms):
+        """
+        Parametreler:
+            final_angle (float): Dümenin duracağı toplam dönüş açısı (derece)
+            duration_ms (float): Animasyon süresi (milisaniye)
+        """
+        self.final_angle = final_angle
+        self.duration_ms = duration_ms
+
+    @classmethod
+    def random(cls, rng, rotations, duration_ms):
+        """
+        `rotations` tam turun üzerine rastgele bir bitiş konumu ekleyerek yörünge oluşturur.
+
+        Parametreler:
+            rng (random.Random): Çevirmelerin rastgele sayı üreteci (tohumlanırsa tekrarlanabilir)
+            rotations (int): Tam tur sayısı
+            duration_ms (float): Animasyon süresi (milisaniye)
+        """
+        return cls((rotations + rng.random() * 0.8 + 0.1) * 360, duration_ms)
+
+    def angle_at(self, elapsed_ms):
+        """
+        Çevirme başladıktan `elapsed_ms` milisaniye sonraki açı; süre dolduysa son açı.
+        """
+        if elapsed_ms >= self.duration_ms:
+            return self.final_angle
+        return self.final_angle * ease_out(max(0.0, elapsed_ms / self.duration_ms))
+
+    def outcome(self, sectors, pointer_angle=0):
+        """
+        Dümen durduğunda okun göstereceği dilimin sırası.
+        """
+        return sectors.index_at(self.final_angle, pointer_angle)
+
+
+class RingItems:
+    """
+    Dümenle birlikte dönen tuval öğelerini (etiketler, sınır çizgileri) toplu günceller.
+
+    Her öğe, dümen dönmemişken merkeze göre bir ya da daha çok noktayla
+    kaydedilir. Karede tek bir açı için sinüs/kosinüs hesaplanır ve tüm
+    noktalar bu dönüşle taşınır.
+    """
+    def __init__(self, canvas_path):
+        """
+        Parametreler:
+            canvas_path (str): Tuvalin Tcl yolu (ör. str(canvas) -> ".!canvas")
+        """
+        self.canvas_path = canvas_path
+        self.items = []  # (öğe ID'si, [(dx, dy), ...])
+
+    def __len__(self):
+        return len(self.items)
+
+    def add(self, item_id, angle, *radii):
+        """
+        Öğeyi `angle` yönünde, verilen yarıçaplardaki noktalarla kaydeder.
+
+        Etiket için tek yarıçap (konumu), çizgi için iki yarıçap (iç ve dış uç) verilir.
+        """
+        radians = math.radians(angle)
+        cos, sin = math.cos(radians), math.sin(radians)
+        self.items.append((item_id, [(radius * cos, radius * sin) for radius in radii]))
+
+    def script(self, center_x, center_y, wheel_angle):
+        """
+        Dümen `wheel_angle` kadar dönmüşken tüm öğeleri yerleştiren Tcl betiğini üretir.
+
+        Dönüş değeri:
+            str: `tk.eval` ile tek seferde çalıştırılacak `coords` komutları
+        """
+        radians = math.radians(wheel_angle)
+        cos, sin = math.cos(radians), math.sin(radians)
+        path = self.canvas_path
+        lines = []
+        for item_id, points in self.items:
+            coords = " ".join(f"{center_x + dx * cos - dy * sin:.1f} {center_y + dx * sin + dy * cos:.1f}"
+                              for dx, dy in points)
+            lines.append(f"{path} coords {item_id} {coords}")
+        return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Dümen etiketlerinin kare başına maliyeti")
+    parser.add_argument("--items", type=int, default=30, help="Etiket sayısı")
+    parser.add_argument("--frames", type=int, default=2000, help="Ölçülen kare sayısı")
+    args = parser.parse_args()
+
+    # Her karede yeni bitiş konumu çekmek dümeni kare kare titretir (geri gider);
+    # baştan belirlenen yörüngede açı yalnızca süreye bağlıdır
+    rng = random.Random(0)
+    times = [i * 5000 / args.frames for i in range(args.frames)]
+    jitter = [(3 + rng.random() * 0.8 + 0.1) * 360 * ease_out(elapsed / 5000) for elapsed in times]
+    trajectory = SpinTrajectory.random(rng, 3, 5000)
+    smooth = [trajectory.angle_at(elapsed) for elapsed in times]
+    for name, angles in (("Karede rastgele bitiş", jitter), ("Baştan belirlenen yörünge", smooth)):
+        backwards = sum(1 for previous, angle in zip(angles, angles[1:]) if angle < previous)
+        print(f"{name}: {backwards}/{len(angles) - 1} karede dümen geri gidiyor")
+
+    import tkinter
+
+    sectors = WheelSectors([1] * args.items)
+    try:
+        root = tkinter.Tk()
+        canvas = tkinter.Canvas(root, width=800, height=800)
+        canvas.pack()
+        root.update()
+    except tkinter.TclError:
+        # Ekran yoksa tuvalin yerine çağrıları sayan bir Tcl komutu kullan
+        print("Ekran bulunamadı; tuval yerine boş bir Tcl komutu ölçülüyor")
+        root = tkinter.Tcl()
+        root.eval("proc .canvas {args} {}")
+        canvas = None
+
+    path = str(canvas) if canvas else ".canvas"
+    ids = []
+    for i, angle in enumerate(sectors.centers):
+        if canvas:
+            ids.append(canvas.create_text(0, 0, text=f"Piyon {i}", font=("Arial", 16, "bold"), angle=-angle))
+        else:
+            ids.append(i + 1)
+
+    def per_item(angle):
+        # Eski yol: her etiket için ayrı coords ve angle güncellemesi
+        for item_id, center in zip(ids, sectors.centers):
+            radians = math.radians(center + angle)
+            x, y = 400 + 290 * math.cos(radians), 400 + 290 * math.sin(radians)
+            if canvas:
+                canvas.coords(item_id, x, y)
+                canvas.itemconfig(item_id, angle=-(center + angle))
+            else:
+                root.call(path, "coords", item_id, x, y)
+                root.call(path, "itemconfigure", item_id, "-angle", -(center + angle))
+
+    ring = RingItems(path)
+    for item_id, center in zip(ids, sectors.centers):
+        ring.add(item_id, center, 290)
+    if canvas:
+        for item_id in ids:
+            canvas.itemconfig(item_id, angle=0)
+
+    def batched(angle):
+        # Yeni yol: dik yazılar, tek Tcl çağrısı
+        root.eval(ring.script(400, 400, angle))
+
+    for name, frame in (("Etiket başına", per_item), ("Toplu betik", batched)):
+        start = time.perf_counter()
+        for i in range(args.frames):
+            frame(i * 0.7)
+            if canvas:
+                root.update_idletasks()
+        elapsed = (time.perf_counter() - start) / args.frames
+        print(f"{name}: {elapsed * 1000:.3f} ms / kare ({args.items} etiket, 60 FPS bütçesi 16.7 ms)")
+
+
+if __name__ == "__main__":
+    main()